@@ -0,0 +1,214 @@
+# This Device Class is published under the terms of the MIT License.
+# Required Third Party Libraries, which are included in the Device Class
+# package for convenience purposes, may have a different license. You can
+# find those in the corresponding folders or contact the maintainer.
+#
+# MIT License
+#
+# Copyright (c) 2024 SweepMe! GmbH (sweep-me.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+from __future__ import annotations
+
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+DELIMITERS = [",", ";", "\t", None]
+"""Delimiters tried when detecting the format of text files, None means any whitespace."""
+
+CACHE_SIZE = 8
+"""Maximum number of files kept in the cache."""
+
+_cache: OrderedDict[tuple, tuple[int, int, Table]] = OrderedDict()
+
+
+class Table(NamedTuple):
+    """Imported file with one array per column."""
+
+    names: list[str]
+    """Column names from the header, or 'Column1', 'Column2', ... if the file has no header."""
+
+    columns: list[np.ndarray]
+
+    def column(self, name: str) -> np.ndarray:
+        """Return the column with the given name."""
+        return self.columns[self.names.index(name)]
+
+
+class TextFormat(NamedTuple):
+    """Format of a text file as found by 'detect_format'."""
+
+    skip_rows: int
+    """Number of lines before the first line of data."""
+
+    delimiter: str | None
+    names: list[str]
+
+
+def _split(line: str, delimiter: str | None) -> list[str]:
+    return [token.strip() for token in line.split(delimiter)]
+
+
+def _is_numeric(tokens: list[str]) -> bool:
+    try:
+        [float(token) for token in tokens if token]
+    except ValueError:
+        return False
+    return any(tokens)
+
+
+def detect_format(path: str | os.PathLike, comments: str = "#", max_lines: int = 100) -> TextFormat:
+    """Find the first line of data, the delimiter, and the column names of a text file.
+
+    The first line that can be split into numbers with one of the DELIMITERS is taken as the first line of data. The
+    last non-empty line before it is used as column names if it has the same number of columns.
+
+    Args:
+        path: Path of the file.
+        comments: Characters at the beginning of a comment line.
+        max_lines: Maximum number of lines to search for data.
+
+    Returns:
+        Number of lines to skip, delimiter, and column names.
+    """
+    header_line = ""
+    with open(path, encoding="utf-8", errors="replace") as file:
+        for index, line in enumerate(file):
+            if index >= max_lines:
+                break
+            stripped = line.strip()
+            if not stripped:
+                continue
+            if stripped.startswith(comments):
+                header_line = stripped.lstrip(comments)
+                continue
+
+            for delimiter in DELIMITERS:
+                tokens = _split(stripped, delimiter)
+                if _is_numeric(tokens) and (len(tokens) > 1 or delimiter is None):
+                    names = _split(header_line, delimiter) if header_line else []
+                    if len(names) != len(tokens):
+                        names = ["Column%d" % (i + 1) for i in range(len(tokens))]
+                    return TextFormat(index, delimiter, names)
+
+            header_line = stripped
+
+    msg = f"No numeric data found in the first {max_lines} lines of '{path}'."
+    raise ValueError(msg)
+
+
+def load_text(path: str | os.PathLike, comments: str = "#") -> Table:
+    """Load a text file with columns of numbers.
+
+    The fast np.loadtxt is used first. If lines have missing or invalid values, the file is loaded again with
+    np.genfromtxt that fills them with nan.
+
+    Args:
+        path: Path of the file.
+        comments: Characters at the beginning of a comment line.
+
+    Returns:
+        Column names and arrays.
+    """
+    text_format = detect_format(path, comments)
+    options = {"delimiter": text_format.delimiter, "skiprows": text_format.skip_rows, "comments": comments, "ndmin": 2}
+
+    try:
+        data = np.loadtxt(path, **options)
+    except ValueError:
+        options["skip_header"] = options.pop("skiprows")
+        del options["ndmin"]
+        data = np.genfromtxt(path, invalid_raise=False, **options)
+        # a single column or a single line is returned as 1D array
+        data = data.reshape(-1, len(text_format.names))
+
+    return Table(text_format.names, list(data.T))
+
+
+def load_binary(path: str | os.PathLike) -> Table:
+    """Memory-map a NumPy .npy file, so that only the parts that are used are read from disk.
+
+    The dtype and shape are taken from the header of the file. Structured arrays give one column per field, 2D
+    arrays one column per column, and 1D arrays a single column.
+
+    Args:
+        path: Path of the file.
+
+    Returns:
+        Column names and arrays.
+    """
+    data = np.load(path, mmap_mode="r")
+
+    if data.dtype.names:
+        names = list(data.dtype.names)
+        return Table(names, [data[name] for name in names])
+
+    data = data.reshape(len(data), -1)
+    return Table(["Column%d" % (i + 1) for i in range(data.shape[1])], list(data.T))
+
+
+def load(path: str | os.PathLike, comments: str = "#", use_cache: bool = True) -> Table:
+    """Load a file and keep the result as long as the file is not modified.
+
+    Files with extension .npy are memory-mapped, all other files are loaded as text. The cache is checked by the
+    modification time and size of the file, so that loading the same file again costs only one os.stat call.
+    Memory-mapped files are not cached, as a mapped file cannot be overwritten or deleted on Windows as long as the
+    mapping exists. Mapping them again only reads the header.
+
+    Args:
+        path: Path of the file.
+        comments: Characters at the beginning of a comment line of text files.
+        use_cache: If False, the file is always loaded again.
+
+    Returns:
+        Column names and arrays. The arrays are shared by all callers and must not be modified.
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    key = (str(path), comments)
+
+    if use_cache and key in _cache:
+        mtime, size, table = _cache[key]
+        if (mtime, size) == (stat.st_mtime_ns, stat.st_size):
+            _cache.move_to_end(key)
+            return table
+
+    if path.suffix.lower() == ".npy":
+        return load_binary(path)
+
+    table = load_text(path, comments)
+
+    _cache[key] = (stat.st_mtime_ns, stat.st_size, table)
+    _cache.move_to_end(key)
+    while len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+
+    return table
+
+
+def clear_cache() -> None:
+    """Remove all files from the cache."""
+    _cache.clear()
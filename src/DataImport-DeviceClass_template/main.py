@@ -32,11 +32,27 @@
 
 
 import os
+import sys
+import importlib.util
+from pathlib import Path
 
 from ErrorMessage import error, debug
 
 from EmptyDeviceClass import EmptyDevice # Class comes with SweepMe!
 
+# Import the file import helper from the libraries folder. The module is kept in sys.modules, so that its cache of
+# loaded files is reused if the device class is loaded again for the next run.
+_module_name = "DataImport_template_file_import"
+if _module_name in sys.modules:
+    file_import = sys.modules[_module_name]
+else:
+    _spec = importlib.util.spec_from_file_location(
+        _module_name, Path(__file__).resolve().parent / "libraries" / "file_import.py"
+    )
+    file_import = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(file_import)
+    sys.modules[_module_name] = file_import
+
 class Device(EmptyDevice):
 
     def __init__(self):
@@ -54,22 +70,22 @@ def apply(self):
         """ applying the new setvalue 'self.value' means for DataImport that the new path is available and can be used to read in the data """
     
         filepath_to_load = self.value
-        
-        print(filepath_to_load)
-        
-        with open(filepath_to_load) as datafile:
-        
-            print(datafile)
-        
-            for line in datafile.readlines():
-            
-                print(line.strip())
-       
-                # add your commands to load your files
-            
-        # and then define your values here    
-        self.var1 = [1,2]
-        self.var2 = [3,4]
+
+        # Text files are loaded with np.loadtxt after detecting header, delimiter, and column names. Files with
+        # extension .npy are memory-mapped. Loaded files are cached until they are modified.
+        # If your files need a different format, add your commands to load them here.
+        table = file_import.load(filepath_to_load)
+
+        # one column is needed for each variable
+        if len(table.columns) < len(self.variables):
+            msg = "File '%s' has %i column(s), but %i are needed for the variables %s." % (
+                filepath_to_load, len(table.columns), len(self.variables), ", ".join(self.variables),
+            )
+            raise Exception(msg)
+
+        # and then define your values here, e.g. by column name with table.column("Voltage")
+        self.var1 = table.columns[0]
+        self.var2 = table.columns[1]
         
           
     def call(self):
@@ -0,0 +1,94 @@
+import importlib.util
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Import the file import helper
+file_path = Path(__file__).resolve().parent.parent / "libraries" / "file_import.py"
+spec = importlib.util.spec_from_file_location("file_import", file_path)
+file_import = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(file_import)
+
+
+class TestFileImport(unittest.TestCase):
+    """Test format detection, loading, and caching of files."""
+
+    def setUp(self) -> None:
+        """Create a temporary folder and start with an empty cache."""
+        self.folder = tempfile.TemporaryDirectory()
+        file_import.clear_cache()
+
+    def tearDown(self) -> None:
+        """Remove the temporary folder."""
+        file_import.clear_cache()
+        self.folder.cleanup()
+
+    def write(self, name: str, text: str) -> Path:
+        """Write a text file to the temporary folder."""
+        path = Path(self.folder.name) / name
+        path.write_text(text)
+        return path
+
+    def test_header_and_delimiter(self) -> None:
+        """Comment lines are skipped and the column names are taken from the line before the data."""
+        path = self.write("data.csv", "# Measurement\nDate: today\nVoltage;Current\n1.0;2e-3\n2.0;4e-3\n")
+        table = file_import.load(path)
+        self.assertEqual(table.names, ["Voltage", "Current"])  # noqa: PT009
+        np.testing.assert_array_equal(table.column("Current"), [2e-3, 4e-3])
+
+    def test_whitespace_without_header(self) -> None:
+        """Columns separated by whitespace get default names."""
+        path = self.write("data.txt", "1 2 3\n4 5 6\n")
+        table = file_import.load(path)
+        self.assertEqual(table.names, ["Column1", "Column2", "Column3"])  # noqa: PT009
+        np.testing.assert_array_equal(table.columns[2], [3, 6])
+
+    def test_missing_values(self) -> None:
+        """Missing values are filled with nan."""
+        path = self.write("data.csv", "x,y\n1,2\n3,\n5,6\n")
+        table = file_import.load(path)
+        np.testing.assert_array_equal(table.column("y"), [2, np.nan, 6])
+
+    def test_single_column_with_invalid_values(self) -> None:
+        """A single column with invalid values stays one column."""
+        path = self.write("data.txt", "V\n1\n2\nnan\n-\n4\n")
+        table = file_import.load(path)
+        self.assertEqual(table.names, ["V"])  # noqa: PT009
+        np.testing.assert_array_equal(table.column("V"), [1, 2, np.nan, np.nan, 4])
+
+    def test_cache(self) -> None:
+        """The same file is loaded only once until it is modified."""
+        path = self.write("data.txt", "1 2\n3 4\n")
+        table = file_import.load(path)
+        self.assertIs(file_import.load(path), table)  # noqa: PT009
+
+        path.write_text("1 2\n3 4\n5 6\n")
+        os.utime(path, ns=(0, 10**18))
+        self.assertEqual(len(file_import.load(path).columns[0]), 3)  # noqa: PT009
+
+    def test_binary(self) -> None:
+        """Structured .npy files are memory-mapped with one column per field."""
+        path = Path(self.folder.name) / "data.npy"
+        data = np.zeros(5, dtype=[("time", "f8"), ("signal", "f4")])
+        data["signal"] = np.arange(5)
+        np.save(path, data)
+
+        table = file_import.load(path)
+        self.assertEqual(table.names, ["time", "signal"])  # noqa: PT009
+        self.assertIsInstance(table.column("signal").base, np.memmap)  # noqa: PT009
+        np.testing.assert_array_equal(table.column("signal"), np.arange(5))
+
+    def test_binary_not_cached(self) -> None:
+        """Memory-mapped files are not kept open by the cache."""
+        path = Path(self.folder.name) / "data.npy"
+        np.save(path, np.arange(5.0))
+
+        file_import.load(path)
+        self.assertEqual(len(file_import._cache), 0)  # noqa: PT009, SLF001
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -31,6 +31,8 @@
 
 from collections import OrderedDict
 
+import numpy as np
+
 from EmptyDeviceClass import EmptyDevice
 
 class Device(EmptyDevice):
@@ -69,6 +71,17 @@ def __init__(self):
                                     "CORR:LENG",                # Correction length
                                     "FUNC:IMP:RANG",            # Range value -> must be last and 
                                     ]
+
+        # maximum number of points the instrument can store in one list, longer list sweeps are split into chunks
+        self.list_capacity = 10
+
+        # list commands for each sweep mode that can be used with 'List sweep'
+        self.list_commands = {
+                              "Frequency in Hz": "LIST:FREQ",
+                              "Voltage bias in V": "LIST:BIAS:VOLT",
+                              "Current bias in A": "LIST:BIAS:CURR",
+                              "Voltage RMS in V": "LIST:VOLT",
+                              }
         
     def set_GUIparameter(self):
         
@@ -92,6 +105,14 @@ def set_GUIparameter(self):
                         "Integration": ["Short", "Medium", "Long"], 
 
                         "Trigger": ["Software", "Internal", "External"],
+
+                        "ListSweepCheck": True,
+                        "ListSweepType": ["Sweep", "Custom"],
+                        "ListSweepStart": 1000.0,
+                        "ListSweepEnd": 100000.0,
+                        "ListSweepStepPointsType": ["Step width:", "Points (lin.):", "Points (log.):"],
+                        "ListSweepStepPointsValue": 10,
+                        "ListSweepCustomValues": "",
                         }
                         
         
@@ -155,6 +176,19 @@ def get_GUIparameter(self, parameter = {}):
         
         self.trigger_type = parameter["Trigger"]
 
+        # in case of 'List sweep', all values of the list are measured with one trigger and returned as arrays
+        self.is_list_sweep = parameter.get("SweepValue", "SweepEditor") == "List sweep"
+        self.listtype = parameter.get("ListSweepType", "Sweep")
+
+        if self.is_list_sweep and self.listtype == "Sweep":
+            self.listsweep_start = float(parameter["ListSweepStart"])
+            self.listsweep_end = float(parameter["ListSweepEnd"])
+            self.listsweep_steppoints_type = parameter["ListSweepStepPointsType"]
+            self.listsweep_steppoints_value = float(parameter["ListSweepStepPointsValue"])
+
+        if self.is_list_sweep and self.listtype == "Custom":
+            self.custom_values = str(parameter["ListSweepCustomValues"])
+
     def initialize(self):
                   
         ## store the users device setting       
@@ -169,6 +203,13 @@ def initialize(self):
         # self.port.write("*RST") # reset configuration
         
         self.port.write("*CLS") # clear memory
+
+        if self.is_list_sweep:
+            if self.sweepmode not in self.list_commands:
+                msg = "List sweep is only possible for sweep modes: %s" % ", ".join(self.list_commands.keys())
+                raise ValueError(msg)
+            # check the user input already here so that wrong values are reported before the run starts
+            self.list_values = self.get_list_values()
         
         # self.port.write("DISP:LINE \"Remote control by SweepMe!\"")
             
@@ -236,10 +277,16 @@ def configure(self):
         
         ## other option would be:  self.port.write("INIT:CONT OFF") # in this case one has to use self.port.write("INIT:IMM") before every triger to set the device into 'wait-for-trigger' state
 
+        if self.is_list_sweep:
+            self.configure_list_sweep()
+
 
     def unconfigure(self):
     
         self.port.write("ABOR") # abort any running command
+
+        if self.is_list_sweep:
+            self.unconfigure_list_sweep()
     
         self.port.write("BIAS:VOLT 0V")
         self.port.write("AMPL:ALC OFF")
@@ -322,6 +369,10 @@ def apply(self):
                    
       
     def measure(self):
+
+        if self.is_list_sweep:
+            self.run_list_sweep()
+            return
     
         # trigger
         if self.trigger_type == "Software":
@@ -335,10 +386,16 @@ def measure(self):
         self.port.read() # reading out the answer of the previous *OPC?
                        
     def request_result(self):
+
+        if self.is_list_sweep:
+            return  # results have already been fetched together with the list sweep
         
         self.port.write("FETC?;FREQ?;BIAS:%s?" % self.bias_mode)
 
     def read_result(self):
+
+        if self.is_list_sweep:
+            return
     
         answer = self.port.read().split(';')
 
@@ -352,4 +409,98 @@ def call(self):
         
     def finish(self):
         pass
+
+    def get_list_values(self):
+        """Returns the values of the 'List sweep' as numpy array.
+
+        Returns:
+            numpy.ndarray with all sweep values, independent of the list capacity of the instrument
+        """
+
+        if self.listtype == "Custom":
+            try:
+                return np.array(self.custom_values.split(","), dtype=float)
+            except ValueError:
+                msg = "Wrong custom values format. Please use comma-separated values for custom list sweeps."
+                raise ValueError(msg)
+
+        if self.listsweep_steppoints_type.startswith("Step width"):
+            if self.listsweep_steppoints_value == 0.0:
+                if self.listsweep_end != self.listsweep_start:
+                    msg = "Start and end value must be equal if step width is zero."
+                    raise ValueError(msg)
+                return np.array([self.listsweep_start])
+            points = round(abs(self.listsweep_end - self.listsweep_start) / abs(self.listsweep_steppoints_value) + 1)
+            return np.linspace(self.listsweep_start, self.listsweep_end, points)
+
+        points = int(self.listsweep_steppoints_value)
+        if self.listsweep_steppoints_type.startswith("Points (log.)"):
+            return np.geomspace(self.listsweep_start, self.listsweep_end, points)
+        return np.linspace(self.listsweep_start, self.listsweep_end, points)
+
+    def configure_list_sweep(self):
+        """Prepares the instrument to measure a complete list with a single bus trigger."""
+
+        self.port.write("DISP:PAGE LIST")
+        self.port.write("LIST:MODE SEQ")  # one trigger runs all points of the list
+        self.port.write("TRIG:SOUR BUS")
+
+        # The 4284A is read in ASCII format as the binary format is not supported by all firmware versions.
+        self.port.write("FORM ASC")
+
+        # the parameter that is not swept stays constant and is read only once
+        self.port.write("FREQ?")
+        self.list_frequency = float(self.port.read())
+        self.port.write("BIAS:%s?" % self.bias_mode)
+        self.list_bias = float(self.port.read())
+
+    def unconfigure_list_sweep(self):
+        """Switches back to the measurement display and ASCII data format."""
+
+        self.port.write("FORM ASC")
+        self.port.write("DISP:PAGE MEAS")
+
+    def run_list_sweep(self):
+        """Measures all values of the list sweep.
+
+        Lists longer than the capacity of the instrument are split into several lists that are uploaded and measured
+        one after another.
+        """
+
+        results = []
+        for start_index in range(0, len(self.list_values), self.list_capacity):
+            chunk = self.list_values[start_index:start_index + self.list_capacity]
+
+            list_string = ",".join("%1.5e" % value for value in chunk)
+            self.port.write("%s %s" % (self.list_commands[self.sweepmode], list_string))
+            self.port.write("TRIG:IMM")
+            self.port.write("*OPC?")
+            self.port.read()
+
+            results.append(self.fetch_list_results())
+
+        data = np.concatenate(results)
+        self.R, self.X = data[:, 0], data[:, 1]
+
+        if self.sweepmode.startswith("Frequency"):
+            self.F = self.list_values
+        else:
+            self.F = np.full(len(self.list_values), self.list_frequency)
+
+        if self.sweepmode.startswith("Voltage bias") or self.sweepmode.startswith("Current bias"):
+            self.Bias = self.list_values
+        else:
+            self.Bias = np.full(len(self.list_values), self.list_bias)
+
+    def fetch_list_results(self):
+        """Reads the results of all points of the last list with a single query.
+
+        Returns:
+            numpy.ndarray with one row per point
+        """
+
+        # one value for data A, data B, status and comparator result per point
+        self.port.write("FETC?")
+        answer = self.port.read()
+        return np.array(answer.split(","), dtype=float).reshape((-1, 4))
         
\ No newline at end of file
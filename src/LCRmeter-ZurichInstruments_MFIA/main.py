@@ -34,7 +34,7 @@
 from FolderManager import addFolderToPATH
 addFolderToPATH()  # needed to import zhinst from libs folder of this device class
 
-from zhinst import ziPython as ziP
+# zhinst is imported in 'find_Ports' and 'connect' as importing it takes long
 __api_level__ = 6 #developed on 6
 
 from collections import OrderedDict
@@ -60,10 +60,22 @@ def __init__(self):
         
         self.timeout_autorange = 20 # in s
         self.sampling_rate = 10.0 # in 1/s
+
+        self.timeout_sweep = 600  # in s, maximum time the sweeper module may need for a 'List sweep'
+        self.settling_inaccuracy = 1e-3  # relative inaccuracy the sweeper module waits for before taking data
+
+        # nodes the sweeper module varies for each sweep mode in case of 'List sweep'
+        self.sweeper_gridnodes = {
+                                    "Frequency in Hz": "oscs/0/freq",
+                                    "Voltage bias in V": "imps/0/bias/value",
+                                    "Current bias in A": "imps/0/bias/value",
+                                  }
                   
     def find_Ports(self):
         '''use ZI api to find IDs of all devices it can access - USB comm requires driver install'''
-        
+
+        from zhinst import ziPython as ziP
+
         dev_explorer = ziP.ziDiscovery()
         devs = dev_explorer.findAll()
 
@@ -93,6 +105,13 @@ def set_GUIparameter(self):
                         "Integration": ["Short -> medium precision", "Medium -> high precision ", "Long -> very high precision"], 
 
                         # "Trigger": ["Internal", "External"],
+
+                        "ListSweepCheck": True,
+                        "ListSweepType": ["Sweep"],
+                        "ListSweepStart": 1000.0,
+                        "ListSweepEnd": 100000.0,
+                        "ListSweepStepPointsType": ["Points (log.):", "Points (lin.):", "Step width:"],
+                        "ListSweepStepPointsValue": 50,
                         }
                         
         
@@ -117,12 +136,24 @@ def get_GUIparameter(self, parameter = {}):
         self.frequency = float(parameter['Frequency'])
         
         self.OperatingMode = 0 if parameter['OperatingMode'] == "4-Terminal" else 1
+
+        # in case of 'List sweep', the complete sweep is done by the sweeper module of the device
+        self.is_list_sweep = parameter.get("SweepValue", "SweepEditor") == "List sweep"
+
+        if self.is_list_sweep:
+            self.listsweep_start = float(parameter["ListSweepStart"])
+            self.listsweep_end = float(parameter["ListSweepEnd"])
+            self.listsweep_steppoints_type = parameter["ListSweepStepPointsType"]
+            self.listsweep_steppoints_value = float(parameter["ListSweepStepPointsValue"])
                     
         # self.trigger_type = parameter["Trigger"]
         
         
         
     def connect(self):
+
+        from zhinst import ziPython as ziP
+
         dev_explorer = ziP.ziDiscovery()
         dev_explorer.find(self.devID)
         cpars = dev_explorer.get(self.devID) 
@@ -145,6 +176,11 @@ def initialize(self):
         self.curr_index = self.daq.getInt("/%s/imps/%d/current/inputselect" % (self.devID, imp_index))
         self.volt_index = self.daq.getInt("/%s/imps/%d/voltage/inputselect" % (self.devID, imp_index))
 
+        if self.is_list_sweep and self.sweepmode not in self.sweeper_gridnodes:
+            self.stop_Measurement("List sweep is only possible for sweep modes: %s" %
+                                  ", ".join(self.sweeper_gridnodes.keys()))
+            return False
+
             
     def deinitialize(self):
         pass
@@ -316,6 +352,9 @@ def apply(self):
             
     def adapt(self):
 
+        if self.is_list_sweep:
+            return  # autoranging and settling are handled by the sweeper module
+
         ## 1. we make sure the range is correct
         ## even if 'apply' is not called, external changes might necessitate to trigger autorange again
         trigger_auto_ranging = [
@@ -357,21 +396,22 @@ def adapt(self):
         time.sleep(16.0 * self.time_constant)
 
     def measure(self):
+
+        if self.is_list_sweep:
+            self.run_sweeper()
+            return
      
         self.daq.sync() #  needed to empty the buffer, as we don't want to have values from the settling process
 
-        poll_length = (self.average+0.1)/self.sampling_rate # we poll as many values as needed to do the average. 0.1 is added to make sure we have exactly the number of values for averaging or even one more.
-        poll_timeout = 10000  # [ms] # in case there is no value, we wait 10000 ms to wait for a new value
-        poll_flags = 0
-        poll_return_flat_dict = True
-        data = self.daq.poll(poll_length, poll_timeout, poll_flags, poll_return_flat_dict)
+        # we poll as many values as needed to do the average
+        z, frequency = self.poll_samples(self.polling_topic, self.average, ["z", "frequency"])
 
-        Z = np.mean(data[self.polling_topic]['z']) # we take the average of all polled values
+        Z = np.mean(z) # we take the average of all polled values
         
         self.R = Z.real
         self.X = Z.imag
-        self.F = np.mean(data[self.polling_topic]['frequency']) # we take the last frequency value
-        self.Bias = self.daq.get('/%s/imps/0/bias/value' % (self.devID))[self.devID]['imps']['0']['bias']['value']['value'][0]
+        self.F = np.mean(frequency)
+        self.Bias = self.daq.getDouble('/%s/imps/0/bias/value' % (self.devID))
                        
                        
     def call(self):     
@@ -390,5 +430,107 @@ def subscribe_polling_topic(self):
         except:
             error("Unable to subscribe polling topic of Zurich Instrument MFIA") # prints the error message
             return False
-        
-        
+
+    def poll_samples(self, topic, number_of_samples, fields, timeout=10.0):
+        """Polls a subscribed topic until the requested number of samples has been received.
+
+        The samples are copied into arrays that are allocated once before polling starts, so that no lists have to be
+        concatenated while data is streaming in.
+
+        Args:
+            topic: subscribed node path, e.g. '/dev1234/imps/0/sample'
+            number_of_samples: number of samples to be returned per field
+            fields: names of the sample fields to be returned, e.g. ['z', 'frequency']
+            timeout: maximum time in s to wait for the samples
+
+        Returns:
+            list of numpy arrays, one per field
+        """
+
+        arrays = [None] * len(fields)
+        filled = 0
+
+        t_start = time.time()
+        while filled < number_of_samples:
+            data = self.daq.poll(0.05, 100, 0, True)  # poll length in s, timeout in ms, flags, flat dictionary
+
+            if topic in data:
+                chunk = data[topic]
+                length = min(len(chunk[fields[0]]), number_of_samples - filled)
+
+                for i, field in enumerate(fields):
+                    if arrays[i] is None:
+                        arrays[i] = np.empty(number_of_samples, dtype=np.asarray(chunk[field]).dtype)
+                    arrays[i][filled:filled + length] = chunk[field][:length]
+
+                filled += length
+
+            if time.time() - t_start > timeout:
+                msg = "Zurich Instruments MFIA: Only %i of %i samples received before timeout." % (
+                    filled, number_of_samples)
+                raise TimeoutError(msg)
+
+        return arrays
+
+    def get_list_sweep_points(self):
+        """Returns the number of points and the x-mapping (0: linear, 1: logarithmic) of the 'List sweep'."""
+
+        if self.listsweep_steppoints_type.startswith("Step width"):
+            if self.listsweep_steppoints_value == 0.0:
+                return 1, 0
+            points = round(abs(self.listsweep_end - self.listsweep_start) / abs(self.listsweep_steppoints_value) + 1)
+            return points, 0
+
+        if self.listsweep_steppoints_type.startswith("Points (log.)"):
+            return int(self.listsweep_steppoints_value), 1
+
+        return int(self.listsweep_steppoints_value), 0
+
+    def run_sweeper(self):
+        """Runs the complete 'List sweep' on the device with the sweeper module.
+
+        Settling and averaging of each point are handled by the device, and the whole impedance spectrum is returned
+        with a single read.
+        """
+
+        points, xmapping = self.get_list_sweep_points()
+
+        sweeper = self.daq.sweep()
+        sweeper.set("device", self.devID)
+        sweeper.set("gridnode", self.sweeper_gridnodes[self.sweepmode])
+        sweeper.set("start", self.listsweep_start)
+        sweeper.set("stop", self.listsweep_end)
+        sweeper.set("samplecount", points)
+        sweeper.set("xmapping", xmapping)
+        sweeper.set("scan", 0)  # sequential
+        sweeper.set("loopcount", 1)
+        sweeper.set("bandwidthcontrol", 2)  # automatic bandwidth
+        sweeper.set("settling/inaccuracy", self.settling_inaccuracy)
+        sweeper.set("averaging/sample", self.average)
+
+        sweeper.subscribe(self.polling_topic)
+        sweeper.execute()
+
+        t_start = time.time()
+        while not sweeper.finished():
+            time.sleep(0.05)
+            if time.time() - t_start > self.timeout_sweep:
+                sweeper.finish()
+                sweeper.clear()
+                self.stop_Measurement("Sweep of Zurich Instruments MFIA not finished before timeout.")
+                return False
+
+        data = sweeper.read(True)
+        sweeper.unsubscribe(self.polling_topic)
+        sweeper.clear()
+
+        sample = data[self.polling_topic][0][0]
+
+        self.R = np.asarray(sample["realz"])
+        self.X = np.asarray(sample["imagz"])
+        self.F = np.asarray(sample["frequency"])
+
+        if self.sweepmode.startswith("Frequency"):
+            self.Bias = np.full(len(self.R), self.daq.getDouble('/%s/imps/0/bias/value' % self.devID))
+        else:
+            self.Bias = np.asarray(sample["grid"])
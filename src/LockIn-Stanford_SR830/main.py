@@ -37,6 +37,8 @@
 import time
 from collections import OrderedDict
 
+import numpy as np
+
 
 class Device(EmptyDevice):
 
@@ -273,6 +275,26 @@ def __init__(self):
                                ("30 ks", 3e4),
                             ])
 
+        # sample rates of the data storage, the index 14 for triggered sampling is not used
+        self.sample_rates = OrderedDict([
+                               ("512 Hz", "13"),
+                               ("256 Hz", "12"),
+                               ("128 Hz", "11"),
+                               ("64 Hz", "10"),
+                               ("32 Hz", "9"),
+                               ("16 Hz", "8"),
+                               ("8 Hz", "7"),
+                               ("4 Hz", "6"),
+                               ("2 Hz", "5"),
+                               ("1 Hz", "4"),
+                               ("500 mHz", "3"),
+                               ("250 mHz", "2"),
+                               ("125 mHz", "1"),
+                               ("62.5 mHz", "0"),
+                            ])
+
+        self.buffer_size = 16383  # maximum number of points per data storage channel
+
     def set_GUIparameter(self):
     
         gui_parameter = {
@@ -291,6 +313,9 @@ def set_GUIparameter(self):
                          "Coupling": ["AC", "DC"],
                          "Ground": ["Float", "Ground"],
                          "WaitTimeConstants": 4.0,
+                         "Acquisition": ["Single sample", "Buffer"],
+                         "SampleRate": list(self.sample_rates.keys()),
+                         "BufferTime": 1.0,
                         }
                         
         return gui_parameter
@@ -312,7 +337,16 @@ def get_GUIparameter(self, parameter={}):
         self.channel1 = parameter["Channel1"]
         self.channel2 = parameter["Channel2"]
         self.waittimeconstants = float(parameter["WaitTimeConstants"])
-        
+
+        # in buffered mode, X and Y are recorded by the data storage with the selected sample rate for the buffer time
+        self.is_buffered = parameter.get("Acquisition", "Single sample") == "Buffer"
+        self.sample_rate = parameter.get("SampleRate", "512 Hz")
+        self.buffer_time = float(parameter.get("BufferTime", 1.0))
+        if self.is_buffered:
+            # both channel displays are needed to store X and Y
+            self.channel1 = "None"
+            self.channel2 = "None"
+
         self.variables = ["Magnitude", "Phase", "Frequency", "X", "Y"]
 
         if self.channel1 != "None":
@@ -325,6 +359,9 @@ def get_GUIparameter(self, parameter={}):
         self.variables.append("TimeConstant")
         self.variables.append("Sensitivity")
         self.units = []
+
+        if self.is_buffered:
+            self.variables.append("Time")
         
         if self.input == "A" or self.input == "A-B":
             self.add_units_channels("V")
@@ -392,6 +429,9 @@ def add_units_channels(self, AorV="V"):
         self.units += ["s"]
         self.units += [AorV]
 
+        if self.is_buffered:
+            self.units += ["s"]
+
     def initialize(self): 
 
         self.identification = self.get_identification()
@@ -400,6 +440,9 @@ def initialize(self):
         if "SR810" in self.identification and self.channel2 != "None":
             return Exception("Model SR810 has only one channel. Please select 'None' for second channel.")
         
+        if "SR810" in self.identification and self.is_buffered:
+            raise Exception("Model SR810 has only one channel and cannot store X and Y in buffered mode.")
+
         self.port.write("KCLK 0")  # stop key click
         self.port.write("ALRM 0")  # stop alarm
                         
@@ -429,6 +472,9 @@ def configure(self):
         if self.timeconstant not in ["Auto time", "As is"] and self.timeconstant in self.timeconstants:
             self.port.write(self.timeconstants[self.timeconstant])
 
+        if self.is_buffered:
+            self.configure_buffer()
+
     def reconfigure(self, parameters={}, keys=[]):
         """ 
         function to be overloaded if needed
@@ -553,6 +599,13 @@ def trigger_ready(self):
             time.sleep(delta_time)
     
     def measure(self):
+        if self.is_buffered:
+            self.record_buffer()
+            self.port.write("FREQ?")
+            self.port.write("SENS?")
+            self.port.write("OFLT?")  # time constant
+            return
+
         self.port.write("SNAP?1,2,3,4,9")
         if self.channel1 != "None":
             if "SR810" in self.identification:
@@ -565,6 +618,13 @@ def measure(self):
         self.port.write("OFLT?")  # time constant
         
     def read_result(self):
+        if self.is_buffered:
+            # X, Y, R, and Phi have already been read by 'record_buffer'
+            self.F = float(self.port.read())
+            self.sens = self.read_sensitivity()
+            self.timeconstant = self.read_timeconstant()
+            return
+
         self.X, self.Y, self.R, self.Phi, self.F = map(float, self.port.read().split(","))
         if self.channel1 != "None":
             self.Ch1 = float(self.port.read())
@@ -582,6 +642,8 @@ def call(self):
         time_constant = self.timeconstants_values[self.timeconstant]
         results += [time_constant]
         results += [self.sens]
+        if self.is_buffered:
+            results += [self.buffer_times]
         return results
 
     # here convenience functions starts
@@ -605,6 +667,63 @@ def unit_to_float(unit):
             unit = unit.replace(char, chars[char])
         return float(unit)
         
+    def configure_buffer(self):
+        """Sets the channel displays to X and Y and configures the data storage for a single recording."""
+
+        number_of_points = self.buffer_time * self.unit_to_float(self.sample_rate.replace("Hz", ""))
+        if number_of_points > self.buffer_size:
+            raise Exception("The buffer time of %s s is too long for the sample rate of %s. The data storage only "
+                            "holds %i points." % (self.buffer_time, self.sample_rate, self.buffer_size))
+
+        self.port.write("DDEF 1,0,0")  # channel 1 display: X
+        self.port.write("DDEF 2,0,0")  # channel 2 display: Y
+        self.port.write("SRAT %s" % self.sample_rates[self.sample_rate])
+        self.port.write("SEND 0")  # single shot, recording stops if the buffer is full
+        self.port.write("TSTR 0")  # recording is not started by a trigger
+
+    def record_buffer(self):
+        """Records X and Y for the buffer time and transfers them at once in binary format."""
+
+        self.port.write("REST")  # reset the data storage
+        self.port.write("STRT")
+        time.sleep(self.buffer_time)
+        self.port.write("PAUS")
+
+        self.port.write("SPTS?")
+        number_of_points = int(self.port.read())
+
+        self.X = self.read_buffer(1, number_of_points)
+        self.Y = self.read_buffer(2, number_of_points)
+        self.R = np.hypot(self.X, self.Y)
+        self.Phi = np.degrees(np.arctan2(self.Y, self.X))
+
+        sample_rate = self.unit_to_float(self.sample_rate.replace("Hz", ""))
+        self.buffer_times = np.arange(number_of_points) / sample_rate
+
+    def read_buffer(self, channel, number_of_points):
+        """Returns the points of a data storage channel that are transferred as binary 4-byte floats with 'TRCB?'.
+
+        The binary transfer has no header and no termination character, so the exact number of bytes is read.
+        """
+
+        if number_of_points == 0:
+            return np.array([])
+
+        self.port.write("TRCB?%i,0,%i" % (channel, number_of_points))
+        number_of_bytes = 4 * number_of_points
+
+        if hasattr(self.port.port, "read_bytes"):
+            # VISA resource, e.g. GPIB
+            data = self.port.port.read_bytes(number_of_bytes)
+        else:
+            # pyserial object
+            data = self.port.port.read(number_of_bytes)
+
+        if len(data) != number_of_bytes:
+            raise Exception("Only %i of %i bytes of the data storage were received." % (len(data), number_of_bytes))
+
+        return np.frombuffer(data, dtype="<f4").astype(float)
+
     def get_identification(self):
 
         self.port.write("*IDN?")
@@ -37,6 +37,8 @@
 import math
 from collections import OrderedDict
 
+import numpy as np
+
 
 class Device(EmptyDevice):
 
@@ -172,6 +174,9 @@ def __init__(self):
                                ("30k", "21"),
                             ])
 
+        self.capture_chunk_size = 64  # maximum number of kilobytes per 'CAPTUREGET?' query
+        self.capture_buffer_size = 4096  # maximum capture length in kilobytes
+
     def set_GUIparameter(self):
     
         gui_parameter = {
@@ -192,6 +197,9 @@ def set_GUIparameter(self):
                          "Coupling": ["AC", "DC"],
                          "Ground": ["Float", "Ground"],
                          "WaitTimeConstants": 4.0,
+                         "Acquisition": ["Single sample", "Buffer"],
+                         "SampleRate": "Maximum",
+                         "BufferTime": 1.0,
                         }
                         
         return gui_parameter
@@ -213,6 +221,11 @@ def get_GUIparameter(self, parameter={}):
         self.channel2 = parameter["Channel2"]
         self.waittimeconstants = float(parameter["WaitTimeConstants"])
         
+        # in buffered mode, X, Y, R, and Phase are recorded by the capture buffer for the buffer time
+        self.is_buffered = parameter.get("Acquisition", "Single sample") == "Buffer"
+        self.sample_rate = str(parameter.get("SampleRate", "Maximum"))
+        self.buffer_time = float(parameter.get("BufferTime", 1.0))
+
         self.variables = ["Magnitude", "Phase", "Frequency", "X", "Y", "Sensitivity", "Time constant"]
         self.units = []
         
@@ -223,6 +236,10 @@ def get_GUIparameter(self, parameter={}):
         else:
             self.add_Units_Channels("V")
 
+        if self.is_buffered:
+            self.variables.append("Time")
+            self.units.append("s")
+
     """ here, semantic standard functions start that are called by SweepMe! during a measurement """
 
     def initialize(self): 
@@ -324,6 +341,9 @@ def configure(self):
                 raise Exception('The input mode and sensitivity should match.')
         if self.timeconstant not in ["Auto time", "As is"] and self.timeconstant in self.timeconstant_id_dict:
             self.set_time_constant(self.timeconstant_id_dict[self.timeconstant])
+
+        if self.is_buffered:
+            self.configure_capture()
         # print("Configuring finished.")
 
     def apply(self):
@@ -373,11 +393,11 @@ def adapt_ready(self):
         answer = self.port.read()
         
         # This time reference to wait several time constants.
-        self.time_ref = time.clock()
+        self.time_ref = time.perf_counter()
 
     def trigger_ready(self):
         # make sure that at least several time constants have passed since 'Auto sensitivity' was called
-        delta_time = (self.waittimeconstants * self.unit_to_float(self.timeconstant)) - (time.clock()-self.time_ref)
+        delta_time = (self.waittimeconstants * self.unit_to_float(self.timeconstant)) - (time.perf_counter()-self.time_ref)
         if delta_time > 0.0:
             # wait several time constants to allow for a renewal of the result
             time.sleep(delta_time)
@@ -390,12 +410,23 @@ def measure(self):
         elif self.input.startswith("I"):  # Current related sensitivities
             self.sensitivity_value = self.unit_to_float(self.sensitivities_dict_currents_inverted[sens_id])
 
+        if self.is_buffered:
+            self.record_capture()
+            self.port.write("SNAP? 15,16")  # Internal and External Reference Frequency
+            return
+
         if self.source == "Internal":
             self.port.write("SNAP? 2,3,15") # R, θ, Internal Reference Frequency
         elif self.source != "Internal":
             self.port.write("SNAP? 2,3,16") # R, θ, External Reference Frequency
 
     def read_result(self):
+        if self.is_buffered:
+            # X, Y, R, and Phase have already been read by 'record_capture'
+            internal_frequency, external_frequency = map(float, self.port.read().split(","))
+            self.F = internal_frequency if self.source == "Internal" else external_frequency
+            return
+
         self.R, self.Phase, self.F = map(float, self.port.read().split(","))
         self.X, self.Y = self.R*math.cos(self.Phase), self.R*math.sin(self.Phase)
         # self.Phase, self.F = map(float, self.port.read().split(","))
@@ -411,6 +442,9 @@ def call(self):
         time_constant = self.unit_to_float(self.timeconstant)
         results += [time_constant]
 
+        if self.is_buffered:
+            results += [self.capture_times]
+
         return results
     
     @staticmethod
@@ -454,6 +488,63 @@ def get_identification(self):
         answer = self.port.read()
         return answer
 
+    def configure_capture(self):
+        """
+        This function configures the capture buffer to record X, Y, R, and θ with the selected sample rate. The rate
+        is the maximum capture rate divided by a power of two, the largest rate that does not exceed the selected
+        sample rate is used.
+        Returns:
+            None
+        """
+        self.port.write("CAPTURECFG 3")  # X, Y, R, and θ
+
+        self.port.write("CAPTURERATEMAX?")
+        maximum_rate = float(self.port.read())
+
+        if self.sample_rate.lower() == "maximum":
+            rate_id = 0
+        else:
+            rate_id = int(math.ceil(math.log2(maximum_rate / float(self.sample_rate)) - 1e-9))
+            rate_id = min(max(rate_id, 0), 20)
+        self.port.write("CAPTURERATE %i" % rate_id)
+
+        self.port.write("CAPTURERATE?")
+        self.capture_rate = float(self.port.read())
+
+        # each record consists of four 4-byte floats
+        length_kb = int(math.ceil(16 * self.capture_rate * self.buffer_time / 1024))
+        if length_kb > self.capture_buffer_size:
+            raise Exception("The buffer time of %s s is too long for the capture rate of %s Hz." % (
+                self.buffer_time, self.capture_rate))
+        self.port.write("CAPTURELEN %i" % max(length_kb, 1))
+
+    def record_capture(self):
+        """
+        This function records X, Y, R, and θ for the buffer time and transfers the captured data in binary blocks.
+        Returns:
+            None
+        """
+        self.port.write("CAPTURESTART ONE, IMM")
+        time.sleep(self.buffer_time)
+        self.port.write("CAPTURESTOP")
+
+        self.port.write("CAPTUREBYTES?")
+        number_of_bytes = int(self.port.read())
+
+        chunks = []
+        length_kb = int(math.ceil(number_of_bytes / 1024))
+        for offset in range(0, length_kb, self.capture_chunk_size):
+            size = min(self.capture_chunk_size, length_kb - offset)
+            chunks.append(self.port.port.query_binary_values(
+                "CAPTUREGET? %i, %i" % (offset, size), datatype="f", is_big_endian=False, container=np.array,
+            ))
+
+        data = np.concatenate(chunks) if chunks else np.array([])
+        records = data[:(number_of_bytes // 16) * 4].reshape(-1, 4).astype(float)
+
+        self.X, self.Y, self.R, self.Phase = records.T
+        self.capture_times = np.arange(len(records)) / self.capture_rate
+
     def operation_complete(self):
         self.port.write("*OPC?")
         answer = self.port.read()
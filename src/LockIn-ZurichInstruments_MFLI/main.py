@@ -35,7 +35,7 @@
 from FolderManager import addFolderToPATH
 addFolderToPATH()  # needed to import zhinst from libs folder of this device class
 
-from zhinst import ziPython as ziP
+# zhinst is imported in 'find_ports' and 'connect' as importing it takes long
 
 from EmptyDeviceClass import EmptyDevice
 import numpy as np
@@ -54,7 +54,8 @@ class Device(EmptyDevice):
                     Features:
                     <ul><li>supports synchronous measurements with 1 demodulator </li>
                     <li>easy extension to 4 demodulators (MD option)</li>
-                    <li>supports single getSample and dataAcquisitionModule streaming (improvements needed) </li>
+                    <li>supports single getSample and subscribe/poll streaming</li>
+                    <li>supports hardware frequency sweeps with the sweeper module ('List sweep')</li>
                     <li>supports auto ranging </li>
                     <li>supports auto settling time ("auto : settle_val"). The lockin will wait until val/val_at_inf_wait (settle_val [0,1)) is reached. For filter order 8a nd 0.99 this corresponds to 16 TCs</li>
                     <li>supports dynamic TC based on R eg "0.1 <- 1e-8 -> 0.15 <- 1e-9 -> 0.25 <- 1e-10"   </li>
@@ -81,14 +82,22 @@ def __init__(self):
         self.filters = ["6dB", "12dB", "18dB", "24dB", "30dB", "36dB", "42dB", "48dB"]
 
         # https://blogs.zhinst.com/kivanc/2020/02/20/choose-the-right-tool-to-acquire-lock-in-data/
-        self.daq_methods = ["single", "poll", "daqModule"]
+        self.daq_methods = {
+            "Single sample": "single",
+            "Poll": "poll",
+        }
         self.daq_method = "single"
+
+        self.timeout_sweep = 600  # in s, maximum time the sweeper module may need for a 'List sweep'
+        self.settling_inaccuracy = 1e-3  # relative inaccuracy the sweeper module waits for before taking data
         
         self.R, self.Phi = None, None
         self.time_const = None
         
     def find_ports(self):
         """use ZI api to find IDs of all devices it can access - USB comm requires driver install"""
+        from zhinst import ziPython as ziP
+
         dev_explorer = ziP.ziDiscovery()
         devs = dev_explorer.findAll()
 
@@ -108,7 +117,15 @@ def set_GUIparameter(self):
             "Source": ["Internal", "Aux In 1", "Aux In 2"],
             "Sensitivity": ["Auto", "Auto optimise"],
             "Gain": ["Determined by inst meas range"],
-            "OscillatorFrequency": ""
+            "OscillatorFrequency": "",
+            "Acquisition": list(self.daq_methods.keys()),
+
+            "ListSweepCheck": True,
+            "ListSweepType": ["Sweep"],
+            "ListSweepStart": 1000.0,
+            "ListSweepEnd": 100000.0,
+            "ListSweepStepPointsType": ["Points (log.):", "Points (lin.):", "Step width:"],
+            "ListSweepStepPointsValue": 50,
         }
                         
         return gui_parameter
@@ -149,12 +166,25 @@ def get_GUIparameter(self, parameter={}):
                 raise Warning("ZI MFLI %s: R values not descending in TimeConstant field, "
                               "may result in unexpected behaviour" % self.devID)
 
+        self.daq_method = self.daq_methods[parameter.get("Acquisition", "Single sample")]
+
+        # in case of 'List sweep', the oscillator frequency is swept by the sweeper module of the device
+        self.is_list_sweep = parameter.get("SweepValue", "SweepEditor") == "List sweep"
+        if self.is_list_sweep:
+            self.daq_method = "sweeper"
+            self.listsweep_start = float(parameter["ListSweepStart"])
+            self.listsweep_end = float(parameter["ListSweepEnd"])
+            self.listsweep_steppoints_type = parameter["ListSweepStepPointsType"]
+            self.listsweep_steppoints_value = float(parameter["ListSweepStepPointsValue"])
+
         self.pars = parameter
 
     """ here, semantic standard functions are defined """
 
     def connect(self):
-    
+
+        from zhinst import ziPython as ziP
+
         dev_explorer = ziP.ziDiscovery()
         dev_explorer.find(self.devID)
         cpars = dev_explorer.get(self.devID)  # devID came from findAll --> will work
@@ -233,12 +263,24 @@ def configure(self):
         # time.sleep(1) \shpuld be done
         self.daq.sync()
 
+        self.sample_topic = '/%s/demods/%d/sample' % (self.devID, dm_indx)
+        if self.daq_method == "poll":
+            self.daq.subscribe(self.sample_topic)
+
+    def unconfigure(self):
+
+        if self.daq_method == "poll":
+            self.daq.unsubscribe('*')  # unsubscribing all topics
+
     def reconfigure(self, x, y):
         print("RECONFIG CALLED")
 
     def adapt(self):
         """called at each meas point irrespective of branch"""
         # setup daq
+        if self.daq_method == "sweeper":
+            return  # settling is handled by the sweeper module
+
         if type(self.TCs_list) != float:
             self.update_tc()  # smart measurements with auto integration
         time.sleep(self.pars["WaitTimeConstants"] * self.time_const)
@@ -271,11 +313,21 @@ def measure(self):
             self.Phi = float(dat["phase"])
             return self.R, self.Phi
             
-        elif self.daq_method == "daqModule":
-            return self.sweep_time()
-
         elif self.daq_method == "poll":
-            raise NotImplementedError("the Zi poll is not implemented - please use daqModule")
+            self.daq.sync()  # needed to empty the buffer, as we don't want to have values from the settling process
+
+            # all samples within one time constant are averaged
+            rate = self.daq.getDouble('/%s/demods/0/rate' % self.devID)
+            number_of_samples = max(1, int(round(rate * self.time_const)))
+            x, y = self.poll_samples(self.sample_topic, number_of_samples, ["x", "y"])
+
+            x_mean, y_mean = np.mean(x), np.mean(y)
+            self.R = float(np.sqrt(x_mean**2 + y_mean**2))
+            self.Phi = float(np.degrees(np.arctan2(y_mean, x_mean)))
+            return self.R, self.Phi
+
+        elif self.daq_method == "sweeper":
+            return self.run_sweeper()
     
     def call(self):
         
@@ -360,37 +412,97 @@ def update_tc(self):
             self.daq.sync() 
         return
 
-    def sweep_time(self):
-        """ implementation of the daqmodule. for full streaming a pyqt signal
-        should be emitted to the main"""
-        self.daq_module.set('preview', 1)
-        self.daq_module.execute()
-        timeout = 50 * self.pars["TimeConstant"]
-        t0_measurement = time.time()
-        # The maximum time to wait before reading out new data.
-        while not self.daq_module.finished():
-            t0_loop = time.time()
-            if time.time() - t0_measurement > timeout:
-                raise Exception("Timeout after {} s - recording not complete. Are the streaming nodes enabled? "
-                                "Has a valid signal_path been specified?".format(timeout))
-            # result = self.daq_module.read(True)#flatten neseted dict or die
-            # print(result)
-            progress = float(self.daq_module.progress()[0])
-            print(str(progress*100)+"%")
-            # We don't need to update too quickly.
-            time.sleep(timeout/150)
-            print('meas time: ', time.time() - t0_measurement)
-            result = self.daq_module.read(True)  # true flattens array
-            time.sleep(0.3)
-            dat_keys = [key for key in result.keys() if key.startswith('/%s/demods/0/' % self.devID)]
-            dat = {key: value for key, value in result.items() if key in dat_keys}  # a nested dict mess
-            
-            print('settings:', dat[dat_keys[0]][0])
-            print("array length:", len(dat[dat_keys[0]][0]["value"][0]))
-
-            # print([key if key.find("%s"self.devID)>=0 for key in in result.keys()])
-            self.daq_module.unsubscribe('/%s/demods/0/sample.r' % self.devID)
-            self.daq_module.unsubscribe('/%s/demods/0/sample.r.avg' % self.devID)
-            self.daq_module.unsubscribe('/%s/demods/0/sample.theta' % self.devID)
-            self.daq_module.unsubscribe('/%s/demods/0/sample.theta.avg' % self.devID)
-            return dat
+    def poll_samples(self, topic, number_of_samples, fields, timeout=10.0):
+        """Polls a subscribed topic until the requested number of samples has been received.
+
+        The samples are copied into arrays that are allocated once before polling starts, so that no lists have to be
+        concatenated while data is streaming in.
+
+        Args:
+            topic: subscribed node path, e.g. '/dev1234/demods/0/sample'
+            number_of_samples: number of samples to be returned per field
+            fields: names of the sample fields to be returned, e.g. ['x', 'y']
+            timeout: maximum time in s to wait for the samples
+
+        Returns:
+            list of numpy arrays, one per field
+        """
+
+        arrays = [np.empty(number_of_samples) for _ in fields]
+        filled = 0
+
+        t_start = time.time()
+        while filled < number_of_samples:
+            data = self.daq.poll(0.05, 100, 0, True)  # poll length in s, timeout in ms, flags, flat dictionary
+
+            if topic in data:
+                chunk = data[topic]
+                length = min(len(chunk[fields[0]]), number_of_samples - filled)
+
+                for array, field in zip(arrays, fields):
+                    array[filled:filled + length] = chunk[field][:length]
+
+                filled += length
+
+            if time.time() - t_start > timeout:
+                raise TimeoutError("ZI MFLI %s: Only %i of %i samples received before timeout."
+                                   % (self.devID, filled, number_of_samples))
+
+        return arrays
+
+    def get_list_sweep_points(self):
+        """Returns the number of points and the x-mapping (0: linear, 1: logarithmic) of the 'List sweep'."""
+
+        if self.listsweep_steppoints_type.startswith("Step width"):
+            if self.listsweep_steppoints_value == 0.0:
+                return 1, 0
+            points = round(abs(self.listsweep_end - self.listsweep_start) / abs(self.listsweep_steppoints_value) + 1)
+            return points, 0
+
+        if self.listsweep_steppoints_type.startswith("Points (log.)"):
+            return int(self.listsweep_steppoints_value), 1
+
+        return int(self.listsweep_steppoints_value), 0
+
+    def run_sweeper(self):
+        """Runs a complete oscillator frequency sweep on the device with the sweeper module.
+
+        Settling of each point is handled by the device, and all points are returned with a single read.
+        """
+
+        points, xmapping = self.get_list_sweep_points()
+
+        sweeper = self.daq.sweep()
+        sweeper.set("device", self.devID)
+        sweeper.set("gridnode", "oscs/0/freq")
+        sweeper.set("start", self.listsweep_start)
+        sweeper.set("stop", self.listsweep_end)
+        sweeper.set("samplecount", points)
+        sweeper.set("xmapping", xmapping)
+        sweeper.set("scan", 0)  # sequential
+        sweeper.set("loopcount", 1)
+        sweeper.set("bandwidthcontrol", 0)  # the time constant set by the user is kept
+        sweeper.set("settling/inaccuracy", self.settling_inaccuracy)
+
+        sweeper.subscribe(self.sample_topic)
+        sweeper.execute()
+
+        t_start = time.time()
+        while not sweeper.finished():
+            time.sleep(0.05)
+            if time.time() - t_start > self.timeout_sweep:
+                sweeper.finish()
+                sweeper.clear()
+                raise TimeoutError("ZI MFLI %s: Sweep not finished after %i s." % (self.devID, self.timeout_sweep))
+
+        data = sweeper.read(True)
+        sweeper.unsubscribe(self.sample_topic)
+        sweeper.clear()
+
+        sample = data[self.sample_topic][0][0]
+        x, y = np.asarray(sample["x"]), np.asarray(sample["y"])
+
+        self.R = np.sqrt(x**2 + y**2)
+        self.Phi = np.degrees(np.arctan2(y, x))
+        self.time_const = np.asarray(sample["tc"])
+        return self.R, self.Phi
@@ -0,0 +1,118 @@
+# This Device Class is published under the terms of the MIT License.
+# Required Third Party Libraries, which are included in the Device Class
+# package for convenience purposes, may have a different license. You can
+# find those in the corresponding folders or contact the maintainer.
+#
+# MIT License
+#
+# Copyright (c) 2024 SweepMe! GmbH (sweep-me.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+RQS = 0x40
+"""Bit of the status byte that is set while the instrument requests service."""
+
+
+class ServiceRequestWaiter:
+    """Waits until an instrument signals with a service request (SRQ) that data is available.
+
+    If the VISA resource supports events, the waiting thread sleeps until the SRQ line is asserted, so that the data is
+    read without polling delay and several instruments on one bus can be waited for one after another without adding
+    their waiting times. Otherwise, the status byte is polled with a short interval.
+
+    The instrument must be configured to assert SRQ for the bits given by the mask, e.g. with '*SRE 16' for SCPI
+    instruments.
+    """
+
+    def __init__(self, resource: Any, mask: int, poll_interval: float = 0.005) -> None:
+        """Enable the service request event of the resource.
+
+        Args:
+            resource: Open pyvisa resource of a GPIB instrument.
+            mask: Bits of the status byte that indicate that data is available.
+            poll_interval: Time in s between two serial polls if events are not supported.
+        """
+        self.resource = resource
+        self.mask = mask
+        self.poll_interval = poll_interval
+
+        self.use_events = False
+        try:
+            from pyvisa import constants, errors
+
+            self._event_type = constants.EventType.service_request
+            self._visa_error = errors.VisaIOError
+            self._mechanism = constants.EventMechanism.queue
+            self._timeout_error_code = constants.StatusCode.error_timeout
+            resource.enable_event(self._event_type, self._mechanism)
+            self.use_events = True
+        except Exception:  # noqa: BLE001
+            # pyvisa is not available or the interface does not support events
+            self.use_events = False
+
+    def clear(self) -> None:
+        """Discard service requests of earlier readings, to be called before a new reading is triggered."""
+        if self.use_events:
+            self.resource.discard_events(self._event_type, self._mechanism)
+        self.resource.read_stb()
+
+    def wait(self, timeout: float) -> int:
+        """Wait until one of the bits of the mask is set in the status byte.
+
+        Args:
+            timeout: Maximum time in s to wait.
+
+        Returns:
+            Status byte.
+        """
+        deadline = time.perf_counter() + timeout
+        while True:
+            # a serial poll also resets the service request
+            status_byte = self.resource.read_stb()
+            if status_byte & self.mask:
+                return status_byte
+
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                msg = f"No service request within {timeout} s."
+                raise TimeoutError(msg)
+
+            if self.use_events:
+                try:
+                    # the waiting time is limited, so that a missed event only causes a short delay
+                    self.resource.wait_on_event(self._event_type, int(1000 * min(remaining, 0.5)) + 1)
+                except self._visa_error as e:
+                    if e.error_code != self._timeout_error_code:
+                        raise
+            else:
+                time.sleep(min(self.poll_interval, remaining))
+
+    def close(self) -> None:
+        """Disable the service request event of the resource."""
+        if self.use_events:
+            self.resource.disable_event(self._event_type, self._mechanism)
+            self.use_events = False
+
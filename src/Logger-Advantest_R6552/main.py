@@ -31,11 +31,21 @@
 # Device: Advantest R6552
 
 
+import importlib.util
+from pathlib import Path
+
 from ErrorMessage import error, debug
 
 from EmptyDeviceClass import EmptyDevice # Class comes with SweepMe!
 # If you like to see the source code of EmptyDevice, take a look at the pysweepme package that contains this file
 
+# Import the service request helper from the libraries folder of the driver
+_spec = importlib.util.spec_from_file_location(
+    "service_request", Path(__file__).resolve().parent / "libraries" / "service_request.py"
+)
+service_request = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(service_request)
+
 class Device(EmptyDevice):
 
     ## here you can add html formatted description to your device class that is shown by modules like 'Logger' or 'Switch' that have a description field.
@@ -163,6 +173,10 @@ def __init__(self):
                                 "timeout": 5,
                                 # "EOL": "\r\n",
                                 }
+
+        # Maximum time in s to wait for the service request at the end of a measurement
+        self.measurement_timeout = 5
+        self.service_request = None
             
             
     def set_GUIparameter(self):
@@ -224,6 +238,16 @@ def configure(self):
         # Input terminal
         self.port.write(self.input_terminals[self.input_terminal])
 
+        # Service request at the end of a measurement, so that the bus is not blocked by a pending read (GPIB only)
+        if not self.port_str.startswith("COM"):
+            self.port.write("S0")
+            self.service_request = service_request.ServiceRequestWaiter(self.port.port, service_request.RQS)
+
+    def unconfigure(self):
+        if self.service_request is not None:
+            self.service_request.close()
+            self.service_request = None
+
   
     """ the following functions are called for each measurement point """
        
@@ -232,10 +256,21 @@ def measure(self):
         if self.port_str.startswith("COM"):
             self.port.write("MD?")   # triggers the measurement, same as "*TRG" in case of COM
         else:
+            if self.service_request is not None:
+                self.service_request.clear()
             self.port.write("E")    # triggers the measurement, same as "*TRG" in case of GPIB
                        
     def read_result(self):
-        
+
+        if self.service_request is not None:
+            try:
+                self.service_request.wait(self.measurement_timeout)
+            except TimeoutError:
+                # the reading is requested anyway and the next points are read without waiting for a service request
+                debug("Advantest R6552: No service request received, the reading is requested without waiting.")
+                self.service_request.close()
+                self.service_request = None
+
         answer = self.port.read()
         # print("Reading R6552 multimeter:", answer)
         self.val = float(answer[3:]) # we remove the three header letters and covert to float
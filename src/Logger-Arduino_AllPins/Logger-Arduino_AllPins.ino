@@ -3,6 +3,73 @@ String command;
 String answer;
 String EOL;
 
+// Binary streaming
+// Frame: 0xA5 0x5A, sequence (uint16), one value per pin (uint16), CRC-16/CCITT-FALSE of sequence and values (uint16)
+// All numbers are little endian.
+const byte SYNC_1 = 0xA5;
+const byte SYNC_2 = 0x5A;
+const int MAX_PINS = 32;
+
+int streamPins[MAX_PINS];
+bool streamAnalog[MAX_PINS];
+int numberOfPins = 0;
+bool streaming = false;
+unsigned long interval;  // time between two samples in µs
+unsigned long nextSample;
+uint16_t sequence = 0;
+byte frame[6 + 2 * MAX_PINS];
+
+uint16_t crc16(const byte *data, int length) {
+  uint16_t crc = 0xFFFF;
+  for (int i = 0; i < length; i++) {
+    crc ^= (uint16_t)data[i] << 8;
+    for (int j = 0; j < 8; j++) {
+      crc = (crc & 0x8000) ? (crc << 1) ^ 0x1021 : crc << 1;
+    }
+  }
+  return crc;
+}
+
+void putUInt16(byte *data, uint16_t value) {
+  data[0] = value & 0xFF;
+  data[1] = value >> 8;
+}
+
+void parsePins(String pins) {
+  // Parses a pin list like 2D,12D,0A,1A,
+  String channel;
+  numberOfPins = 0;
+
+  for (int i = 0; i < pins.length() && numberOfPins < MAX_PINS; i++) {
+    char c = pins.charAt(i);
+
+    if (c == 'D' || c == 'A') {
+      streamPins[numberOfPins] = channel.toInt();
+      streamAnalog[numberOfPins] = (c == 'A');
+      numberOfPins++;
+      channel = "";
+    }
+    else if (c == ',') {
+      channel = "";
+    }
+    else {
+      channel += c;
+    }
+  }
+}
+
+void sendFrame() {
+  putUInt16(frame + 2, sequence);
+  for (int i = 0; i < numberOfPins; i++) {
+    uint16_t value = streamAnalog[i] ? analogRead(streamPins[i]) : digitalRead(streamPins[i]);
+    putUInt16(frame + 4 + 2 * i, value);
+  }
+  int length = 4 + 2 * numberOfPins;
+  putUInt16(frame + length, crc16(frame + 2, length - 2));
+  Serial.write(frame, length + 2);
+  sequence++;
+}
+
 void setup() {
 
    for (int i=2; i <= 13; i++){
@@ -23,6 +90,24 @@ void setup() {
 
 void loop() {
 
+  if (streaming) {
+    // X stops streaming, all other characters are ignored
+    if (Serial.available()) {
+      if (Serial.read() == 'X') {
+        streaming = false;
+      }
+    }
+    else if ((long)(micros() - nextSample) >= 0) {
+      // if the serial port cannot keep up, the missed samples are skipped instead of being sent late, so that
+      // they show up as lost sequence numbers
+      unsigned long missed = (micros() - nextSample) / interval;
+      sequence += missed;
+      nextSample += (missed + 1) * interval;
+      sendFrame();
+    }
+    return;
+  }
+
   if (Serial.available()) {
     
     command = Serial.readStringUntil('\n');
@@ -63,5 +148,23 @@ void loop() {
       Serial.print("\n");
    }
 
+    else if (command.startsWith("S")) {
+      // Expects command starting with S followed by the sample rate in Hz and the pins
+      // Example: S1000,2D,12D,0A,1A,\n
+      // Frames are sent until X is received.
+      int separator = command.indexOf(',');
+      unsigned long rate = command.substring(1, separator).toInt();
+      parsePins(command.substring(separator + 1));
+
+      if (rate > 0 && numberOfPins > 0) {
+        frame[0] = SYNC_1;
+        frame[1] = SYNC_2;
+        interval = 1000000UL / rate;
+        sequence = 0;
+        nextSample = micros();
+        streaming = true;
+      }
+    }
+
   }
 }
@@ -0,0 +1,329 @@
+# This Device Class is published under the terms of the MIT License.
+# Required Third Party Libraries, which are included in the Device Class
+# package for convenience purposes, may have a different license. You can
+# find those in the corresponding folders or contact the maintainer.
+#
+# MIT License
+#
+# Copyright (c) 2024 SweepMe! GmbH (sweep-me.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Protocol
+
+import numpy as np
+
+SYNC = b"\xa5\x5a"
+
+
+def _crc_table() -> np.ndarray:
+    table = np.zeros(256, dtype=np.uint16)
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else crc << 1
+        table[byte] = crc & 0xFFFF
+    return table
+
+
+CRC_TABLE = _crc_table()
+
+
+def crc16(data: bytes) -> int:
+    """Return the CRC-16/CCITT-FALSE checksum (polynomial 0x1021, start value 0xFFFF) as calculated by the firmware."""
+    crc = 0xFFFF
+    for byte in data:
+        crc = ((crc << 8) & 0xFFFF) ^ int(CRC_TABLE[(crc >> 8) ^ byte])
+    return crc
+
+
+def frame_size(number_of_values: int) -> int:
+    """Return the size in bytes of a frame: sync, sequence, values, and checksum."""
+    return 6 + 2 * number_of_values
+
+
+def encode_frame(sequence: int, values: list[int] | np.ndarray) -> bytes:
+    """Create a frame as sent by the firmware.
+
+    Args:
+        sequence: Sequence number, counted modulo 65536.
+        values: One value per pin.
+
+    Returns:
+        Frame with sync bytes and checksum.
+    """
+    payload = np.array([sequence % 65536, *values], dtype="<u2").tobytes()
+    return SYNC + payload + np.array([crc16(payload)], dtype="<u2").tobytes()
+
+
+class FrameDecoder:
+    """Decodes a byte stream of frames with a fixed number of values.
+
+    All complete frames of the received bytes are decoded at once with 'np.frombuffer'. The checksums of all frames are
+    calculated in parallel, one byte position after another. If a frame is corrupted, e.g. bytes have been lost, the
+    decoder searches for the next sync bytes.
+    """
+
+    def __init__(self, number_of_values: int) -> None:
+        """Initialize the decoder.
+
+        Args:
+            number_of_values: Number of values per frame, i.e. the number of pins.
+        """
+        self.number_of_values = number_of_values
+        self.frame_size = frame_size(number_of_values)
+        self.dtype = np.dtype([
+            ("sync", "V2"),
+            ("sequence", "<u2"),
+            ("values", "<u2", (number_of_values,)),
+            ("crc", "<u2"),
+        ])
+
+        self.buffer = bytearray()
+        self.corrupted_frames = 0
+        """Number of frames with wrong sync bytes or checksum."""
+
+        self.lost_frames = 0
+        """Number of frames missing according to the sequence numbers."""
+
+        self.last_sequence: int | None = None
+
+    def feed(self, data: bytes) -> tuple[np.ndarray, np.ndarray]:
+        """Decode all complete frames of the received bytes, incomplete frames are kept for the next call.
+
+        Args:
+            data: Received bytes.
+
+        Returns:
+            Sequence numbers with shape (frames,) and values with shape (frames, number_of_values).
+        """
+        self.buffer += data
+        sequences = []
+        values = []
+
+        while True:
+            start = self.buffer.find(SYNC)
+            if start < 0:
+                # the last byte might be the first sync byte
+                del self.buffer[: max(len(self.buffer) - 1, 0)]
+                break
+            if start > 0:
+                del self.buffer[:start]
+
+            number_of_frames = len(self.buffer) // self.frame_size
+            if number_of_frames == 0:
+                break
+
+            frames = np.frombuffer(bytes(self.buffer[: number_of_frames * self.frame_size]), dtype=self.dtype)
+            valid = (frames["sync"] == np.void(SYNC)) & (self._checksums(frames) == frames["crc"])
+            number_of_valid = number_of_frames if valid.all() else int(np.argmin(valid))
+
+            sequences.append(frames["sequence"][:number_of_valid])
+            values.append(frames["values"][:number_of_valid])
+            del self.buffer[: number_of_valid * self.frame_size]
+
+            if number_of_valid < number_of_frames:
+                # skip the sync bytes of the corrupted frame and search for the next frame
+                self.corrupted_frames += 1
+                del self.buffer[: len(SYNC)]
+
+        if sequences:
+            sequence = np.concatenate(sequences)
+            value = np.concatenate(values)
+        else:
+            sequence = np.zeros(0, dtype=np.uint16)
+            value = np.zeros((0, self.number_of_values), dtype=np.uint16)
+
+        self._count_lost(sequence)
+        return sequence, value
+
+    def _checksums(self, frames: np.ndarray) -> np.ndarray:
+        """Calculate the checksums of sequence and values of all frames in parallel."""
+        payload = frames.view(np.uint8).reshape(len(frames), self.frame_size)[:, 2:-2]
+        crc = np.full(len(frames), 0xFFFF, dtype=np.uint16)
+        for column in payload.T:
+            crc = (crc << 8) ^ CRC_TABLE[(crc >> 8) ^ column]
+        return crc
+
+    def _count_lost(self, sequence: np.ndarray) -> None:
+        if not len(sequence):
+            return
+        if self.last_sequence is not None:
+            sequence = np.concatenate([[self.last_sequence], sequence])
+        gaps = (np.diff(sequence.astype(np.int64)) - 1) % 65536
+        self.lost_frames += int(gaps.sum())
+        self.last_sequence = int(sequence[-1])
+
+
+class SampleRingBuffer:
+    """Preallocated ring buffer of samples with one value per pin.
+
+    The buffer keeps the most recent samples and the number of samples written since the start, so that a reader can
+    request all samples received since its last request.
+    """
+
+    def __init__(self, number_of_samples: int, number_of_values: int) -> None:
+        """Allocate the buffer.
+
+        Args:
+            number_of_samples: Number of samples the buffer can hold.
+            number_of_values: Number of values per sample.
+        """
+        self.data = np.zeros((number_of_samples, number_of_values), dtype=np.uint16)
+        self.total_samples = 0
+        """Number of samples written since the buffer was created or cleared."""
+
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        """Number of samples the buffer can hold."""
+        return self.data.shape[0]
+
+    def clear(self) -> None:
+        """Discard all samples."""
+        with self._lock:
+            self.total_samples = 0
+
+    def write(self, samples: np.ndarray) -> None:
+        """Append samples with shape (samples, number_of_values)."""
+        number_of_samples = len(samples)
+        if number_of_samples > self.capacity:
+            samples = samples[-self.capacity :]
+
+        with self._lock:
+            start = (self.total_samples + number_of_samples - len(samples)) % self.capacity
+            first = min(len(samples), self.capacity - start)
+            self.data[start : start + first] = samples[:first]
+            self.data[: len(samples) - first] = samples[first:]
+            self.total_samples += number_of_samples
+
+    def read_since(self, start_sample: int) -> tuple[np.ndarray, int]:
+        """Return a copy of all samples written since the given sample index.
+
+        Args:
+            start_sample: Index of the first sample counted from the start, see 'total_samples'.
+
+        Returns:
+            Samples and the index of the next sample, to be used for the next call. Samples that have already been
+            overwritten are skipped.
+        """
+        with self._lock:
+            end_sample = self.total_samples
+            start_sample = max(start_sample, end_sample - self.capacity)
+            indices = np.arange(start_sample, end_sample) % self.capacity
+            return self.data[indices], end_sample
+
+
+class SerialPort(Protocol):
+    """Minimal port interface needed by the reader, fulfilled by serial.Serial."""
+
+    @property
+    def in_waiting(self) -> int:
+        """Number of bytes that can be read without blocking."""
+
+    def read(self, size: int = 1) -> bytes:
+        """Read up to size bytes, fewer bytes are returned if the port timeout is reached."""
+
+
+class StreamReader:
+    """Reads frames in a background thread and collects the decoded samples in a ring buffer."""
+
+    def __init__(self, port: SerialPort, number_of_values: int, number_of_samples: int = 100000) -> None:
+        """Initialize the reader.
+
+        Args:
+            port: Open serial port with a short read timeout.
+            number_of_values: Number of values per frame.
+            number_of_samples: Number of samples kept in the ring buffer.
+        """
+        self.port = port
+        self.decoder = FrameDecoder(number_of_values)
+        self.samples = SampleRingBuffer(number_of_samples, number_of_values)
+        self.error: Exception | None = None
+
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        """True if the background thread is reading."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start reading in a background thread, the firmware must have been requested to stream."""
+        if self.running:
+            return
+        self._stop_event.clear()
+        self.error = None
+        self._thread = threading.Thread(target=self._read_loop, name="ArduinoStreamReader", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the background thread.
+
+        Args:
+            timeout: Maximum time in s to wait for the thread, at least the read timeout of the port.
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wait_for_samples(self, number_of_samples: int, timeout: float, interval: float = 0.005) -> None:
+        """Wait until the given number of samples has been received since the start.
+
+        Args:
+            number_of_samples: Number of samples counted from the start, see 'SampleRingBuffer.total_samples'.
+            timeout: Maximum time in s to wait.
+            interval: Time in s between two checks.
+        """
+        deadline = time.perf_counter() + timeout
+        while self.samples.total_samples < number_of_samples:
+            self.check_error()
+            if time.perf_counter() > deadline:
+                msg = "No frames received from the Arduino."
+                raise TimeoutError(msg)
+            time.sleep(interval)
+
+    def check_error(self) -> None:
+        """Raise the error that stopped the background thread, if any."""
+        if self.error is not None:
+            error = self.error
+            self.error = None
+            raise error
+
+    def _read_loop(self) -> None:
+        """Read and decode bytes until stopped."""
+        try:
+            while not self._stop_event.is_set():
+                data = self.port.read(max(self.port.in_waiting, 1))
+                if data:
+                    _, values = self.decoder.feed(data)
+                    if len(values):
+                        self.samples.write(values)
+        except Exception as e:  # noqa: BLE001
+            # the error is raised in the main thread by check_error
+            self.error = e
@@ -0,0 +1,172 @@
+# This Device Class is published under the terms of the MIT License.
+# Required Third Party Libraries, which are included in the Device Class
+# package for convenience purposes, may have a different license. You can
+# find those in the corresponding folders or contact the maintainer.
+#
+# MIT License
+#
+# Copyright (c) 2024 SweepMe! GmbH (sweep-me.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+from __future__ import annotations
+
+import importlib.util
+import math
+import os
+import select
+import threading
+import time
+from pathlib import Path
+
+# Import the frame encoding from the binary stream helper next to this file
+_spec = importlib.util.spec_from_file_location("binary_stream", Path(__file__).resolve().parent / "binary_stream.py")
+binary_stream = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(binary_stream)
+
+
+class FirmwareEmulator:
+    """Pseudo terminal that behaves like an Arduino running the AllPins firmware, e.g. to test the driver without board.
+
+    The emulator opens a pseudo terminal (POSIX only) whose slave device can be opened like the serial port of an
+    Arduino, e.g. with serial.Serial(emulator.port_name). The firmware commands are answered from a background thread:
+    'R<pins>' replies with the ASCII values, 'S<rate>,<pins>' starts to send binary frames at the sample rate until
+    'X' is received.
+
+    Analog pins return a sine wave with an amplitude of the full 10 bit range, digital pins a square wave, both with
+    a frequency of 1 Hz plus 0.1 Hz times the pin number.
+    """
+
+    def __init__(self, banner_delay: float = 0.1) -> None:
+        """Open the pseudo terminal and start the firmware.
+
+        Args:
+            banner_delay: Time in s until the start message is sent, like an Arduino after a reset.
+        """
+        import pty
+        import tty
+
+        self.master, self.slave = pty.openpty()
+        tty.setraw(self.slave)  # no echo and no line ending conversion
+        self.port_name = os.ttyname(self.slave)
+
+        self.banner_delay = banner_delay
+        self.start_time = time.perf_counter()
+
+        self.pins: list[tuple[int, bool]] = []
+        self.interval = 0.0
+        self.streaming = False
+        self.sequence = 0
+        self.next_sample = 0.0
+
+        self.received_commands: list[str] = []
+        """All commands received, e.g. to check the commands in tests."""
+
+        self._rx_buffer = b""
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="ArduinoFirmwareEmulator", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop the firmware and close the pseudo terminal."""
+        self._stop_event.set()
+        self._thread.join(1.0)
+        os.close(self.master)
+        os.close(self.slave)
+
+    def value(self, pin: int, is_analog: bool, t: float) -> int:
+        """Return the value of a pin at the time t in s since the start."""
+        phase = 2 * math.pi * (1.0 + 0.1 * pin) * t
+        if is_analog:
+            return round(511.5 + 511.5 * math.sin(phase))
+        return int(math.sin(phase) >= 0)
+
+    @staticmethod
+    def parse_pins(pins: str) -> list[tuple[int, bool]]:
+        """Parse a pin list like '2D,12D,0A,1A,' into pin numbers and whether they are analog."""
+        parsed = []
+        for pin in pins.upper().split(","):
+            if pin and pin[-1] in "AD":
+                parsed.append((int(pin[:-1]), pin[-1] == "A"))
+        return parsed
+
+    def _run(self) -> None:
+        time.sleep(self.banner_delay)
+        self._write(b"Arduino AllPins In\r\n")
+
+        while not self._stop_event.is_set():
+            timeout = max(self.next_sample - time.perf_counter(), 0.0) if self.streaming else 0.01
+            readable, _, _ = select.select([self.master], [], [], min(timeout, 0.01))
+            if readable:
+                try:
+                    self._receive(os.read(self.master, 1024))
+                except OSError:
+                    break
+            if self.streaming:
+                self._send_due_frames()
+
+    def _receive(self, data: bytes) -> None:
+        if self.streaming:
+            # X stops streaming, all other characters are ignored
+            index = data.find(b"X")
+            if index < 0:
+                return
+            self.streaming = False
+            data = data[index + 1 :]
+
+        self._rx_buffer += data
+        while b"\n" in self._rx_buffer:
+            line, _, self._rx_buffer = self._rx_buffer.partition(b"\n")
+            command = line.decode("ascii").strip()
+            if command:
+                self.received_commands.append(command)
+                self._execute(command)
+
+    def _execute(self, command: str) -> None:
+        t = time.perf_counter() - self.start_time
+        if command.startswith("R"):
+            values = [self.value(pin, is_analog, t) for pin, is_analog in self.parse_pins(command[1:])]
+            self._write(("".join("%i," % value for value in values) + "\n").encode("ascii"))
+        elif command.startswith("S"):
+            rate, _, pins = command[1:].partition(",")
+            self.pins = self.parse_pins(pins)
+            if int(rate) > 0 and self.pins:
+                self.interval = 1.0 / int(rate)
+                self.sequence = 0
+                self.next_sample = time.perf_counter()
+                self.streaming = True
+
+    def _send_due_frames(self) -> None:
+        now = time.perf_counter()
+        frames = []
+        while self.next_sample <= now:
+            t = self.next_sample - self.start_time
+            values = [self.value(pin, is_analog, t) for pin, is_analog in self.pins]
+            frames.append(binary_stream.encode_frame(self.sequence, values))
+            self.sequence = (self.sequence + 1) % 65536
+            self.next_sample += self.interval
+        if frames:
+            self._write(b"".join(frames))
+
+    def _write(self, data: bytes) -> None:
+        while data:
+            written = os.write(self.master, data)
+            data = data[written:]
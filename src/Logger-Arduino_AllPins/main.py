@@ -30,8 +30,21 @@
 # Device: Arduino AllPins
 
 
+import importlib.util
+import time
+from pathlib import Path
+
+import numpy as np
+
 from EmptyDeviceClass import EmptyDevice
 
+# Import the binary stream helper from the libraries folder of the driver
+_spec = importlib.util.spec_from_file_location(
+    "binary_stream", Path(__file__).resolve().parent / "libraries" / "binary_stream.py"
+)
+binary_stream = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(binary_stream)
+
 
 class Device(EmptyDevice):
     description = """
@@ -48,6 +61,12 @@ class Device(EmptyDevice):
         resolution in Bit. Most Arduino boards come with a resolution of 10 bit (4096 steps)</li>
         <li>If you select "Numerical", an integer value will be returned independent from the resolution or the 
         voltage range of the Arduino board.</li>
+        <li>With acquisition "Query per point", the pins are read once per point.</li>
+        <li>With acquisition "Stream", the Arduino samples the pins at the given sample rate and sends binary frames
+        with sequence number and checksum that are collected in the background. Each point returns the mean of all
+        samples received since the previous point and the number of samples. At 115200 baud, about 11000 bytes per
+        second can be transferred and each sample takes 6 bytes plus 2 bytes per pin, e.g. 1000 Hz for 2 pins.
+        Sample rates that cannot be transferred raise an error.</li>
         </ul>
         <p>&nbsp;</p>
         <p><strong>Known issues:</strong></p>
@@ -79,6 +98,10 @@ def __init__(self) -> None:
 
         self.max_voltage = 5.0
 
+        # Read timeout in s of the port while streaming, short so that the stream can be stopped quickly
+        self.stream_read_timeout = 0.1
+        self.reader = None
+
         self.unit_dict = {
             "Volt": "V",
             "Numerical": "",
@@ -90,6 +113,8 @@ def set_GUIparameter(self):
             "Analog channels": "0,1,2,3,4,5,6,7",
             "Analog unit": ["Volt", "Numerical"],
             "Resolution in Bit": 10,
+            "Acquisition": ["Query per point", "Stream"],
+            "Sample rate in Hz": "1000",
         }
 
     def get_GUIparameter(self, parameter={}):
@@ -118,6 +143,17 @@ def get_GUIparameter(self, parameter={}):
 
         self.resolution = 2 ** int(parameter["Resolution in Bit"]) - 1
 
+        self.acquisition = parameter.get("Acquisition", "Query per point")
+        self.sample_rate = int(float(parameter.get("Sample rate in Hz", 1000)))
+        self.number_of_pins = len(self.variables)
+
+        if self.acquisition == "Stream":
+            self.variables.append("Samples")
+            self.units.append("")
+
+        self.plottype = [True for x in self.variables]
+        self.savetype = [True for x in self.variables]
+
         self.port_str = parameter["Port"]
         self.driver_name = parameter["Device"]
 
@@ -131,23 +167,39 @@ def initialize(self):
             self.port.read()
             self.device_communication[self.instance_key] = "Connected"
 
+    def configure(self):
+        if self.acquisition == "Stream":
+            # 10 bits are transferred per byte, the firmware would fall behind and skip samples otherwise
+            bytes_per_second = self.sample_rate * binary_stream.frame_size(self.number_of_pins)
+            max_bytes_per_second = self.port_properties["baudrate"] / 10
+            if bytes_per_second > max_bytes_per_second:
+                msg = ("Arduino AllPins: Streaming %i pins at %i Hz needs %i bytes/s, but only %i bytes/s can be "
+                       "transferred at %i baud. Please reduce the sample rate or the number of pins." % (
+                           self.number_of_pins, self.sample_rate, bytes_per_second, max_bytes_per_second,
+                           self.port_properties["baudrate"],
+                       ))
+                raise Exception(msg)
+
+            self.start_stream()
+
+    def unconfigure(self):
+        if self.reader is not None:
+            self.stop_stream()
+
     def deinitialize(self):
         if self.instance_key in self.device_communication:
             self.device_communication.pop(self.instance_key)
 
     def measure(self):
-        command_string = "R"
-        for var in self.variables:
-            if "Digital" in var:
-                pin = int(var.replace("Digital ", ""))
-                command_string += f"{pin}D,"
-            elif "Analog" in var:
-                pin = int(var.replace("Analog ", ""))
-                command_string += f"{pin}A,"
+        if self.reader is not None:
+            return  # frames are collected in the background
 
-        self.port.write(command_string)
+        self.port.write("R" + self.pin_list())
 
     def call(self):
+        if self.reader is not None:
+            return self.read_stream()
+
         self.answer = self.port.read()[:-1]
 
         ret = []
@@ -160,3 +212,52 @@ def call(self):
             ret.append(value)
 
         return ret
+
+    def pin_list(self):
+        """Return the pins in the format of the firmware, e.g. '2D,12D,0A,1A,'."""
+        pin_string = ""
+        for var in self.variables:
+            if "Digital" in var:
+                pin = int(var.replace("Digital ", ""))
+                pin_string += f"{pin}D,"
+            elif "Analog" in var:
+                pin = int(var.replace("Analog ", ""))
+                pin_string += f"{pin}A,"
+        return pin_string
+
+    def start_stream(self):
+        """Let the firmware send frames at the sample rate and collect them in the background."""
+        self.port_timeout = self.port.port.timeout
+        self.port.port.timeout = self.stream_read_timeout
+
+        self.reader = binary_stream.StreamReader(self.port.port, self.number_of_pins)
+        self.port.write(f"S{self.sample_rate},{self.pin_list()}")
+        self.reader.start()
+        self.next_sample = 0
+
+        # the first point needs at least one sample
+        self.reader.wait_for_samples(1, self.port_timeout)
+
+    def stop_stream(self):
+        """Stop the frames of the firmware and the background thread."""
+        self.port.write("X")
+        self.reader.stop()
+        time.sleep(0.05)  # frames still on the way are discarded
+        self.port.port.reset_input_buffer()
+        self.port.port.timeout = self.port_timeout
+        self.reader = None
+
+    def read_stream(self):
+        """Return the mean of all samples received since the previous point and the number of samples."""
+        self.reader.check_error()
+
+        samples, self.next_sample = self.reader.samples.read_since(self.next_sample)
+        number_of_samples = len(samples)
+        if number_of_samples == 0:
+            # no new sample since the previous point, the latest sample is returned again
+            samples, _ = self.reader.samples.read_since(self.next_sample - 1)
+
+        values = np.mean(samples, axis=0)
+        scale = np.array([self.max_voltage / self.resolution if unit == "V" else 1.0 for unit in self.units[:-1]])
+
+        return [*(values * scale), number_of_samples]
@@ -0,0 +1,117 @@
+import importlib.util
+import sys
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+
+def load_library(name: str):  # noqa: ANN201
+    """Import a module from the libraries folder of the driver."""
+    file_path = Path(__file__).resolve().parent.parent / "libraries" / f"{name}.py"
+    spec = importlib.util.spec_from_file_location(name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+binary_stream = load_library("binary_stream")
+
+
+class TestFrames(unittest.TestCase):
+    """Test encoding and decoding of frames."""
+
+    def test_crc(self) -> None:
+        """The checksum is CRC-16/CCITT-FALSE."""
+        self.assertEqual(binary_stream.crc16(b"123456789"), 0x29B1)  # noqa: PT009
+
+    def test_decode(self) -> None:
+        """Frames split across several reads are decoded with their values."""
+        decoder = binary_stream.FrameDecoder(3)
+        data = b"".join(binary_stream.encode_frame(i, [i, 1023, 1]) for i in range(10))
+
+        sequence, values = decoder.feed(data[:25])
+        self.assertEqual(len(sequence), 2)  # noqa: PT009
+        sequence, values = decoder.feed(data[25:])
+        self.assertEqual(sequence.tolist(), list(range(2, 10)))  # noqa: PT009
+        self.assertEqual(values[:, 0].tolist(), list(range(2, 10)))  # noqa: PT009
+        self.assertTrue(np.all(values[:, 1] == 1023))  # noqa: PT009
+        self.assertEqual(decoder.corrupted_frames + decoder.lost_frames, 0)  # noqa: PT009
+
+    def test_resync(self) -> None:
+        """Corrupted and truncated frames are skipped and missing sequence numbers are counted."""
+        decoder = binary_stream.FrameDecoder(2)
+        frames = [binary_stream.encode_frame(i, [i, 2 * i]) for i in range(5)]
+        corrupted = frames[2][:6] + b"\xff" + frames[2][7:]
+        truncated = frames[3][:5]
+
+        sequence, _ = decoder.feed(b"\x00\x11" + frames[0] + frames[1] + corrupted + truncated + frames[4])
+        self.assertEqual(sequence.tolist(), [0, 1, 4])  # noqa: PT009
+        self.assertEqual(decoder.corrupted_frames, 2)  # noqa: PT009
+        self.assertEqual(decoder.lost_frames, 2)  # noqa: PT009
+
+    def test_sequence_wrap(self) -> None:
+        """Sequence numbers wrap around at 65536 without counting lost frames."""
+        decoder = binary_stream.FrameDecoder(1)
+        decoder.feed(binary_stream.encode_frame(65535, [0]) + binary_stream.encode_frame(65536, [0]))
+        self.assertEqual(decoder.lost_frames, 0)  # noqa: PT009
+
+
+class TestRingBuffer(unittest.TestCase):
+    """Test the ring buffer of samples."""
+
+    def test_read_since(self) -> None:
+        """Samples are returned in order, also after wrapping around, and overwritten samples are skipped."""
+        buffer = binary_stream.SampleRingBuffer(4, 1)
+        buffer.write(np.arange(3, dtype=np.uint16).reshape(-1, 1))
+        samples, next_sample = buffer.read_since(0)
+        self.assertEqual(samples[:, 0].tolist(), [0, 1, 2])  # noqa: PT009
+
+        buffer.write(np.arange(3, 9, dtype=np.uint16).reshape(-1, 1))
+        samples, next_sample = buffer.read_since(next_sample)
+        self.assertEqual(samples[:, 0].tolist(), [5, 6, 7, 8])  # noqa: PT009
+        self.assertEqual(next_sample, 9)  # noqa: PT009
+
+
+@unittest.skipIf(sys.platform == "win32", "The firmware emulator needs a pseudo terminal.")
+class TestFirmwareEmulator(unittest.TestCase):
+    """Test streaming from the firmware emulator through a serial port."""
+
+    def setUp(self) -> None:
+        """Start the emulator and open its port."""
+        import serial
+
+        self.emulator = load_library("firmware_emulator").FirmwareEmulator()
+        self.port = serial.Serial(self.emulator.port_name, 115200, timeout=1.0)
+
+    def tearDown(self) -> None:
+        """Close port and emulator."""
+        self.port.close()
+        self.emulator.close()
+
+    def test_query_and_stream(self) -> None:
+        """The ASCII query still works and frames are streamed at the sample rate until stopped."""
+        self.assertEqual(self.port.readline(), b"Arduino AllPins In\r\n")  # noqa: PT009
+
+        self.port.write(b"R2D,0A,\n")
+        self.assertEqual(len(self.port.readline().split(b",")), 3)  # noqa: PT009
+
+        self.port.timeout = 0.05
+        reader = binary_stream.StreamReader(self.port, 2)
+        self.port.write(b"S2000,2D,0A,\n")
+        reader.start()
+        time.sleep(0.3)
+        self.port.write(b"X")
+        reader.stop()
+
+        reader.check_error()
+        samples, _ = reader.samples.read_since(0)
+        self.assertGreater(len(samples), 400)  # noqa: PT009
+        self.assertEqual(reader.decoder.corrupted_frames + reader.decoder.lost_frames, 0)  # noqa: PT009
+        self.assertTrue(set(samples[:, 0].tolist()) <= {0, 1})  # noqa: PT009
+        self.assertLessEqual(int(samples[:, 1].max()), 1023)  # noqa: PT009
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -29,11 +29,20 @@
 # Type: Logger
 # Device: Fluke 8842A
 
-import time
+import importlib.util
+from pathlib import Path
+
 from EmptyDeviceClass import EmptyDevice
 from Ports import GPIBport
 from ErrorMessage import debug
 
+# Import the service request helper from the libraries folder of the driver
+_spec = importlib.util.spec_from_file_location(
+    "service_request", Path(__file__).resolve().parent / "libraries" / "service_request.py"
+)
+service_request = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(service_request)
+
 
 class Device(EmptyDevice):
 
@@ -135,6 +144,10 @@ def __init__(self):
         # Time until external trigger must happen
         self.triggertimeout = 30
 
+        # Status byte bit that is set if a reading is available
+        self.data_available = 1 << 5
+        self.service_request = None
+
         self.port_manager = True
         self.port_types = ['GPIB']
         self.port_properties = {
@@ -192,30 +205,33 @@ def configure(self):
         # Trigger mode
         self.port.write(self.trigger_modes[self.triggermode]["command"])
 
+        # With external trigger, the SRQ of the data available bit is waited for instead of polling the status byte
+        if self.triggermode != "Auto":
+            self.service_request = service_request.ServiceRequestWaiter(self.port.port, self.data_available)
+
+    def unconfigure(self):
+        if self.service_request is not None:
+            self.service_request.close()
+            self.service_request = None
+
     def measure(self):
+        if self.service_request is not None:
+            self.service_request.clear()
         self.port.write("")
 
     def read_result(self):
-        dataavail = True
-        stb = self.port.port.read_stb()
-        if self.triggermode != "Auto":
-            telapsed = 0
-            dataavail = False
-            while telapsed < self.triggertimeout:
-                stb = self.port.port.read_stb()
-                if stb & (1 << 5):
-                    dataavail = True
-                    break
-                time.sleep(0.5)
-                telapsed += 0.5
-
-        if dataavail:
-            answer = self.port.read()
-            value, label = answer.split(',')
-            self.val = float(value)
-            self.overrange = stb & 1
+        if self.service_request is not None:
+            try:
+                stb = self.service_request.wait(self.triggertimeout)
+            except TimeoutError:
+                raise Exception("Trigger timeout")
         else:
-            raise Exception("Trigger timeout")
+            stb = self.port.port.read_stb()
+
+        answer = self.port.read()
+        value, label = answer.split(',')
+        self.val = float(value)
+        self.overrange = stb & 1
 
     def call(self):
         return [self.val, self.overrange]
@@ -0,0 +1,54 @@
+import importlib.util
+import time
+import unittest
+from pathlib import Path
+
+# Import the service request helper
+file_path = Path(__file__).resolve().parent.parent / "libraries" / "service_request.py"
+spec = importlib.util.spec_from_file_location("service_request", file_path)
+service_request = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(service_request)
+
+
+class MockResource:
+    """GPIB resource without event support whose reading becomes available after a delay."""
+
+    def __init__(self, delay: float) -> None:
+        """Start the measurement."""
+        self.ready_at = time.perf_counter() + delay
+        self.polls = 0
+
+    def enable_event(self, event_type: object, mechanism: object) -> None:
+        """Raise like an interface that does not support events."""
+        raise NotImplementedError
+
+    def read_stb(self) -> int:
+        """Return the status byte with the data available bit and RQS once the reading is available."""
+        self.polls += 1
+        return 0x60 if time.perf_counter() >= self.ready_at else 0x00
+
+
+class TestServiceRequestWaiter(unittest.TestCase):
+    """Test waiting for the status byte."""
+
+    def test_data_available(self) -> None:
+        """The status byte is returned shortly after the data is available."""
+        resource = MockResource(0.05)
+        waiter = service_request.ServiceRequestWaiter(resource, 1 << 5)
+        self.assertFalse(waiter.use_events)  # noqa: PT009
+
+        start = time.perf_counter()
+        status_byte = waiter.wait(1.0)
+        self.assertTrue(status_byte & (1 << 5))  # noqa: PT009
+        self.assertLess(time.perf_counter() - start, 0.2)  # noqa: PT009
+        waiter.close()
+
+    def test_timeout(self) -> None:
+        """A TimeoutError is raised if the bit is not set in time."""
+        waiter = service_request.ServiceRequestWaiter(MockResource(10.0), service_request.RQS)
+        with self.assertRaises(TimeoutError):  # noqa: PT027
+            waiter.wait(0.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
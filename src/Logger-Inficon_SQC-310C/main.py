@@ -30,11 +30,18 @@
 # Type: Logger
 # Device: Inficon SQC-310C
 
-import time
+import importlib.util
 from collections import OrderedDict
+from pathlib import Path
 
 from EmptyDeviceClass import EmptyDevice
 
+_spec = importlib.util.spec_from_file_location(
+    "deposition_protocol", Path(__file__).resolve().parent / "libraries" / "deposition_protocol.py"
+)
+deposition_protocol = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(deposition_protocol)
+
 class Device(EmptyDevice):
 
     description = '''
@@ -47,7 +54,7 @@ class Device(EmptyDevice):
                     </ul>
                     <p><strong>Known issues:</strong></p>
                     <ul>
-                    <li>Checksums are not supported or checked yet.&nbsp;</li>
+                    <li>Checksums are not sent or checked yet.&nbsp;</li>
                     </ul>
                     <p><strong>Return variables:</strong></p>
                     <ul>
@@ -92,8 +99,6 @@ def __init__(self):
         self.variables = ["Thickness", "Rate", "XTAL used"]
         self.units = ["nm", "Ang/s", "%"]
         
-        self.sync_character = "!"
-        
         self.response_characters = {
             "A": "Command understood, normal response",
             "C": "Invalid command",
@@ -104,7 +109,9 @@ def __init__(self):
         }
                                 
         self.reading_timeout = 2
-    
+
+        self.codec = None
+
     def set_GUIparameter(self):
     
         gui_parameter = {
@@ -172,8 +179,16 @@ def get_GUIparameter(self, parameter={}):
                 self.plottype += [True, True, True]
                 self.savetype += [True, True, True]
 
+    def connect(self):
+
+        # CRC characters are sent as chr(0) so that the SQC-310C skips the CRC check
+        framing = deposition_protocol.InficonFraming(use_crc=False)
+        self.codec = deposition_protocol.FrameCodec(self.port, framing, timeout=self.reading_timeout)
+
     def initialize(self):
-        
+
+        self.codec.clear()
+
         # Request version
         self.send_message("@")
         answer = self.receive_message()
@@ -243,26 +258,12 @@ def measure(self):
         for i in range(1 ,5, 1):
             if self.parameter["Sensor%i" % i]:
 
-                # Empty line to separate all channels
-                print()
-                
-                #Request thickness
-                self.send_message("N%i" % i)
-                #Get thickness
-                answer = self.receive_message()
-                thickness = float(answer) * 100 # in nm
-                # print("Thickness%i:" % i, thickness)
-                
-                #Request rate
-                self.send_message("L%i" % i)            
-                #Get rate
-                answer = self.receive_message()
-                rate = float(answer)
-                # print("Rate%i:" % i, rate)
-                
+                # Thickness, rate and crystal life of a sensor are requested together
+                thickness, rate, crystal_life = self.query_group(["N%i" % i, "L%i" % i, "PA%i" % i])
 
-                # Request crystal live
-                status, frequency, xtal_life = self.get_crystal_life(i)
+                thickness = float(thickness) * 100  # in nm
+                rate = float(rate)
+                status, frequency, xtal_life = self.parse_crystal_life(crystal_life)
 
                 # adding the values for each sensor
                 self.return_values += [thickness, rate, xtal_life]
@@ -316,7 +317,13 @@ def get_crystal_life(self, sensor):
         """ """
         self.send_message("PA%i" % (int(sensor)))
         answer = self.receive_message()
-        
+
+        return self.parse_crystal_life(answer)
+
+    @staticmethod
+    def parse_crystal_life(answer):
+        """ returns status, frequency and crystal life from the reply of the PA command """
+
         try:
             answer = answer.split(' ') 
 
@@ -429,127 +436,45 @@ def add_layer_to_process(self, process_number, layer_number, film_number, codep
    
     def send_message(self, cmd):
     
-        # print()
-        # print("Command sent", cmd)
-    
         cmd = cmd.replace(".", "").replace(",", "")  # decimal points are removed
-        length_character = self.get_lengthcharacter(cmd)
-        
-        crc = self.calculate_crc(length_character + cmd)
-        command = self.sync_character + length_character + cmd + crc[0] + crc[1]
-        b = bytearray()
-        b.extend(command.encode('latin1'))
-        self.port.write(b)
+        self.codec.write(cmd)
 
-        # self.port.write(command.encode())
-        # self.port.write(command)
-        
         self.last_message = cmd
         
     def receive_message(self):
-       
-        # 1. read until sync_character !
-        starttime = time.perf_counter()
-        while True:
-            if self.port.read(1) == self.sync_character.encode():
-                # print("sync character found")
-                break
-               
-            if time.perf_counter() - starttime > self.reading_timeout:
-                # print("Timeout reached")
-                return False
-               
-        # 2. read length_character
-        length_character = self.port.read(1).decode()
-        
-        # 3. calculate length 
-        length_message = ord(length_character) - 35  # including response character and message
-        
-        # 4. read message completely
-        message = self.port.read(length_message)
-        
-        # print("Message:", message)
-        
-        # 5. read response character
-        response_character = chr(message[0])
-               
-        # 6. read real message
-        reply = message[1:]
-        
-        # 7. read crc1 and crc2 
-        crc1_read = self.port.read(1)
-        crc2_read = self.port.read(1)
-        
-        # 8. evaluate response character
-        if response_character in self.response_characters:
-            if response_character != "A":
+
+        try:
+            reply = self.codec.read()
+        except TimeoutError:
+            return False
+
+        return self.evaluate_reply(reply)
+
+    def query_group(self, commands):
+        """ sends several commands at once and returns the replies in the same order """
+
+        commands = [cmd.replace(".", "").replace(",", "") for cmd in commands]
+        self.last_message = " ".join(commands)
+
+        try:
+            replies = self.codec.query_many(commands)
+        except TimeoutError:
+            # replies of the remaining commands might still arrive and must not be taken for later replies
+            self.codec.clear()
+            return [False] * len(commands)
+
+        return [self.evaluate_reply(reply) for reply in replies]
+
+    def evaluate_reply(self, reply):
+
+        if reply.response in self.response_characters:
+            if reply.response != "A":
                 print()
                 print("Last message:", self.last_message)
-                print(self.response_characters[response_character])
+                print(self.response_characters[reply.response])
                 return True
-                
-            else:
-                pass
-                # print("Message received successfully.")
-           
-        else:
-            print("Unknown response character:", response_character)
-
-        # 9. convert reply
-        reply = reply.decode()
-        # print("Reply:", reply)
-
-        # 10. check crc 
-        length_character = self.get_lengthcharacter(reply, write_or_read="read")
-        
-        #crc1_calc, crc2_calc = self.calculate_crc(length_character + reply)
-        #if crc1_read == crc1_calc and crc2_read == crc2_calc:
-        #    pass
-        #else:
-        #    print("Received checksums:", crc1_read, crc2_read)
-        #    print("Calculated checksums:", crc1_calc, crc2_calc)
-        #    print("Warning: Checksum for message '%s' does not match" % reply)
-            
-        return reply
-        
-    def get_lengthcharacter(self, cmd, write_or_read="write"):
-    
-        if write_or_read == "write":
-            return chr(len(cmd) + 34) # 34 is always added to be not accidentally the sync character "!"
+
         else:
-            return chr(len(cmd) + 35) # 35 is added to returning messages
+            print("Unknown response character:", reply.response)
 
-    def calculate_crc(self, cmd): 
-    
-        # return "00" # can be used for testing, the SQC-310C will ignore checksums in this case
-        
-        crc = 0x3fff               # crc always starts with 0x3fff
-        chars = [ord(x) for x in cmd]
-        for char in chars:
-            crc ^= char            # exclusive OR with crc
-            
-            for i in range(8):        
-                if crc % 2 == 1:   # if bit position 0 has a valeu of 1
-                    crc >>= 1      # 1 bit shifted to the right
-                    crc ^= 0x2001  # OR'd with 0x2001 
-                else:
-                    crc >>= 1      # 1 bit shifted to the right 
-                    
-        crc &= 0x3fff              # the final crc is masked with 0x3fff using logical AND
-        
-        bits = '{0:014b}'.format(crc) # string of the 14 significant bits
-        
-        crc1 = int(bits[7:14], 2)  # crc1 are the first seven bits  
-        crc2 = int(bits[0:7], 2)   # crc2 are thelast seven bits  
-        
-        crc1 = chr(crc1 + 34)      # 34 has be added to make sure the synchronization character "!" is not returned
-        crc2 = chr(crc2 + 34)      # 34 has be added to make sure the synchronization character "!" is not returned
-        
-        # print(ord(crc1), ord(crc2))
-        
-        # testing mode: The crcs are overwritten with chr(0)
-        # The SQC-160 ignores the crc in this case
-        crc1 = chr(0)
-        crc2 = chr(0)
-        
-        return crc1, crc2    
+        return reply.data
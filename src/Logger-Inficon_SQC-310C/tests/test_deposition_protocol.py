@@ -0,0 +1,148 @@
+import importlib.util
+import unittest
+from pathlib import Path
+
+# Import the communication interface
+file_path = Path(__file__).resolve().parent.parent / "libraries" / "deposition_protocol.py"
+spec = importlib.util.spec_from_file_location("deposition_protocol", file_path)
+deposition_protocol = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(deposition_protocol)
+
+FrameCodec = deposition_protocol.FrameCodec
+InficonFraming = deposition_protocol.InficonFraming
+SyconFraming = deposition_protocol.SyconFraming
+
+
+def bitwise_crc(data: bytes) -> bytes:
+    """Calculate the Inficon CRC bit by bit as described in the manual."""
+    crc = 0x3FFF
+    for char in data:
+        crc ^= char
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0x2001 if crc % 2 == 1 else crc >> 1
+    crc &= 0x3FFF
+    return bytes(((crc & 0x7F) + 34, (crc >> 7) + 34))
+
+
+class LoopbackPort:
+    """Stand-in for a serial port that returns prepared replies in small chunks."""
+
+    def __init__(self, chunk_size: int = 3) -> None:
+        """Initialize an empty port."""
+        self.chunk_size = chunk_size
+        self.written = b""
+        self.incoming = bytearray()
+
+    def write(self, data: bytes) -> None:
+        """Store all written bytes."""
+        self.written += data
+
+    def read(self, size: int) -> bytes:
+        """Return at most chunk_size of the requested bytes."""
+        size = min(size, self.chunk_size)
+        data = bytes(self.incoming[:size])
+        del self.incoming[:size]
+        return data
+
+
+def inficon_reply(response: str, data: str) -> bytes:
+    """Create a reply frame as sent by an Inficon instrument."""
+    message = (response + data).encode("latin-1")
+    length = bytes((len(message) + 35,))
+    return b"!" + length + message + bitwise_crc(length + message)
+
+
+def sycon_reply(response: str, data: str) -> bytes:
+    """Create a reply frame as sent by a Sycon instrument."""
+    message = (response + data).encode("latin-1")
+    return b"\x02" + bytes((len(message),)) + message + bytes((sum(message) % 256,))
+
+
+class CrcTest(unittest.TestCase):
+    """Test the table-driven CRC and checksum calculation."""
+
+    def test_crc_matches_bitwise_calculation(self) -> None:
+        """Test that the table-driven CRC equals the bitwise algorithm."""
+        for data in [b"", b"#@", b"%N1", b"0L1?", bytes(range(256))]:
+            assert deposition_protocol.calculate_crc(data) == bitwise_crc(data), f"CRC of {data!r} is incorrect."
+
+    def test_crc_characters_are_not_sync_character(self) -> None:
+        """Test that the CRC characters are never smaller than 34."""
+        for value in range(256):
+            crc = deposition_protocol.calculate_crc(bytes((value,)))
+            assert min(crc) >= 34, "CRC character could be the sync character."
+
+    def test_checksum(self) -> None:
+        """Test the Sycon checksum."""
+        assert deposition_protocol.calculate_checksum(b"Q2,0") == bytes((sum(b"Q2,0") % 256,))
+
+
+class FramingTest(unittest.TestCase):
+    """Test encoding of commands."""
+
+    def test_inficon_encode(self) -> None:
+        """Test the generation of an Inficon frame."""
+        frame = InficonFraming().encode("N1")
+        assert frame == b"!$N1" + bitwise_crc(b"$N1"), "Inficon frame is not generated correctly."
+
+    def test_inficon_encode_without_crc(self) -> None:
+        """Test that the CRC characters are zero if CRC is disabled."""
+        frame = InficonFraming(use_crc=False).encode("N1")
+        assert frame == b"!$N1\x00\x00", "Inficon frame without CRC is not generated correctly."
+
+    def test_sycon_encode(self) -> None:
+        """Test the generation of a Sycon frame."""
+        frame = SyconFraming().encode("S")
+        assert frame == b"\x02\x01SS", "Sycon frame is not generated correctly."
+
+
+class FrameCodecTest(unittest.TestCase):
+    """Test buffered reading of frames from a loopback port."""
+
+    def test_inficon_read(self) -> None:
+        """Test reading an Inficon reply that arrives in chunks."""
+        port = LoopbackPort()
+        port.incoming += inficon_reply("A", "1.234")
+        reply = FrameCodec(port, InficonFraming(), verify=True).read()
+
+        assert reply.response == "A", "Response character is not decoded correctly."
+        assert reply.data == "1.234", "Data is not decoded correctly."
+
+    def test_sync_after_garbage(self) -> None:
+        """Test that bytes before the sync character are discarded."""
+        port = LoopbackPort()
+        port.incoming += b"\x00xyz" + inficon_reply("A", "42")
+        reply = FrameCodec(port, InficonFraming()).read()
+
+        assert reply.data == "42", "Codec does not synchronize to the start of the frame."
+
+    def test_invalid_crc(self) -> None:
+        """Test that a corrupted frame raises an error if verification is enabled."""
+        port = LoopbackPort()
+        frame = bytearray(inficon_reply("A", "42"))
+        frame[3] = ord("7")
+        port.incoming += frame
+
+        with self.assertRaises(ValueError):  # noqa: PT027
+            FrameCodec(port, InficonFraming(), verify=True).read()
+
+    def test_timeout(self) -> None:
+        """Test that an incomplete frame raises a TimeoutError."""
+        port = LoopbackPort()
+        port.incoming += inficon_reply("A", "42")[:4]
+
+        with self.assertRaises(TimeoutError):  # noqa: PT027
+            FrameCodec(port, InficonFraming(), timeout=0.01).read()
+
+    def test_query_many(self) -> None:
+        """Test that a group of commands is written at once and all replies are returned in order."""
+        port = LoopbackPort(chunk_size=64)
+        port.incoming += sycon_reply("A", "0.512") + sycon_reply("A", "1.5") + sycon_reply("A", "12")
+        codec = FrameCodec(port, SyconFraming(), verify=True)
+
+        replies = codec.query_many(["Q2,0", "Q17,0", "Q5,0"])
+
+        expected_written = b"".join(SyconFraming().encode(cmd) for cmd in ["Q2,0", "Q17,0", "Q5,0"])
+        assert port.written == expected_written, "Commands are not written as one group."
+        assert [reply.data for reply in replies] == ["0.512", "1.5", "12"], "Replies are not returned in order."
+        assert not codec.buffer, "Buffer is not empty after reading all replies."
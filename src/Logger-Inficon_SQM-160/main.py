@@ -33,10 +33,17 @@
 # Device: Inficon SQM-160
 
 
-import time
+import importlib.util
+from pathlib import Path
 
 from EmptyDeviceClass import EmptyDevice
 
+_spec = importlib.util.spec_from_file_location(
+    "deposition_protocol", Path(__file__).resolve().parent / "libraries" / "deposition_protocol.py"
+)
+deposition_protocol = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(deposition_protocol)
+
 class Device(EmptyDevice):
 
     description = """
@@ -61,10 +68,7 @@ def __init__(self):
                                     "raw_write": True,
                                     }
 
-        
-        self.sync_character = "!"
-       
-        
+
         self.response_characters = {
                                     "A": "Command understood, normal response",
                                     "C": "Invalid command",
@@ -73,7 +77,8 @@ def __init__(self):
                                 
         self.reading_timeout = 2
 
-        
+        self.codec = None
+
     def set_GUIparameter(self):
         # GUIparameter = {"Reset thickness": False}
         
@@ -124,8 +129,15 @@ def get_GUIparameter(self, parameter={}):
                 self.savetype += [True, True, True]
             
         
+    def connect(self):
+
+        framing = deposition_protocol.InficonFraming(use_crc=True)
+        self.codec = deposition_protocol.FrameCodec(self.port, framing, timeout=self.reading_timeout)
+
     def initialize(self):
-    
+
+        self.codec.clear()
+
         self.number_channels = self.get_number_channels()
         
         # version_string = self.get_version()
@@ -171,21 +183,13 @@ def call(self):
         for i in range(1,7,1):             
             if self.parameter["Sensor%i" % i]:
             
-                # Thickness
-                self.send_message("N%i" %i)
-                answer = self.receive_message()
-                self.d = float(answer)*100.0 # conversion from kA to nm
-
-                # Rate
-                self.send_message("L%i?" %i)
-                answer = self.receive_message()
-                self.r = float(answer)
-                
-                # Xtal used
-                self.send_message("R%i?" %i)
-                answer = self.receive_message()
+                # Thickness, rate and xtal used of a sensor are requested together
+                thickness, rate, xtal_used = self.query_group(["N%i" % i, "L%i?" % i, "R%i?" % i])
+
+                self.d = float(thickness)*100.0 # conversion from kA to nm
+                self.r = float(rate)
                 try:
-                    self.v = float(answer)
+                    self.v = float(xtal_used)
                 except:
                     self.v = float('nan')
             
@@ -199,140 +203,50 @@ def call(self):
 
         return values
 
-    def get_lengthcharacter(self, cmd, write_or_read = "write"):
-    
-        if write_or_read == "write":
-            return chr(len(cmd) + 34) # 34 is always added to be not accidentally the sync character "!"
-        else:
-            return chr(len(cmd) + 35) # 35 is added to returning messages
-
-
     def send_message(self, cmd):
     
-        # print("Command sent", cmd)
-        # print(len(cmd))
         cmd = cmd.replace(".", "").replace(",","") # decimal points are removed
-        length_character = self.get_lengthcharacter(cmd)
-        
-        crc = self.checksum(length_character + cmd)
-        command = self.sync_character + length_character + cmd + crc[0] + crc[1]
-        b = bytearray()
-        b.extend(command.encode('latin1'))
-        self.port.write(b)
-        
-        # print(command)
-        # self.port.write(command.encode())
-        # self.port.write(command)
-        
+        self.codec.write(cmd)
+
         self.last_message = cmd
 
-        
     def receive_message(self):
-       
-        # 1. read until sync_character !
-        starttime = time.perf_counter()
-        while True:
-            if self.port.read(1) == self.sync_character.encode():
-                # print("sync character found")
-                break
-               
-            if time.perf_counter() - starttime > self.reading_timeout:
-                # print("Timeout reached")
-                return False
-               
-        # 2. read length_character
-        length_character = self.port.read(1)
-        
-        # 3. calculate length 
-        length_message = ord(length_character) - 35  # including response character and message
-        # print(length_character, length_message)
-        # print(self.port.in_waiting())
-        
-        # 4. read message completely
-        message = self.port.read(length_message)
-        
-        
-        # print("Message:", message)
 
-        # 5. read response character
-        response_character = chr(message[0])
-               
-        # 6. read real message
-        reply = message[1:]
-        
-        # 7. read crc1 and crc2 
-        crc1_read = self.port.read(1)
-        crc2_read = self.port.read(1)
-        
-        # 8. evaluate responce character
-        if response_character in self.response_characters:
-            if response_character != "A":
+        try:
+            reply = self.codec.read()
+        except TimeoutError:
+            return False
+
+        return self.evaluate_reply(reply)
+
+    def query_group(self, commands):
+        """ sends several commands at once and returns the replies in the same order """
+
+        commands = [cmd.replace(".", "").replace(",", "") for cmd in commands]
+        self.last_message = " ".join(commands)
+
+        try:
+            replies = self.codec.query_many(commands)
+        except TimeoutError:
+            # replies of the remaining commands might still arrive and must not be taken for later replies
+            self.codec.clear()
+            return [False] * len(commands)
+
+        return [self.evaluate_reply(reply) for reply in replies]
+
+    def evaluate_reply(self, reply):
+
+        if reply.response in self.response_characters:
+            if reply.response != "A":
                 print()
                 print("Last message:", self.last_message)
-                print(self.response_characters[response_character])
+                print(self.response_characters[reply.response])
                 return True
-                
-            else:
-                pass
-                # print("Message received successfully.")
-           
-        else:
-            print("Unknown response character:", response_character)
 
-        # 9. convert reply
-        reply = reply.decode()
-        # print("Reply:", reply)
-
-        # 10. check crc 
-        length_character = self.get_lengthcharacter(reply, write_or_read = "read")
-        
-        #crc1_calc, crc2_calc = self.checksum(length_character + reply)
-        #if crc1_read == crc1_calc and crc2_read == crc2_calc:
-        #    pass
-        #else:
-        #    print("Received checksums:", crc1_read, crc2_read)
-        #    print("Calculated checksums:", crc1_calc, crc2_calc)
-        #    print("Warning: Checksum for message '%s' does not match" % reply)
-            
-        return reply
-        
-    def readAnswer(self):
-               
-        x = self.port.read(1)
-
-        if x[0] == ord(self.STX):
-            length = self.port.read(1)[0]-35
-            answer = self.port.read(length)
-            self.port.read(1)
-            return answer[1:] # we cut off the first byte as it is the return error code 
-                 
         else:
-            x = self.port.read(1)
-
-            if x[0] == ord(self.STX):
-            
-                length = self.port.read(1)[0]
-                answer = self.port.read(length)
-
-                return answer[1:].decode(), chr(answer[0])
-                
-            else:
-                print(self.port.read(self.port.in_waiting()))
-        return None    
-                        
-    def writeCommand(self, cmd):
-        
-        length = chr(len(cmd)+34)
-        # print('command:',cmd)
-        # print('length:',length)
-        # checksum = chr(sum([ord(char) for char in cmd]) % 256)
-        checksum = self.crc_calc(length+cmd)
-        # print('crc:',checksum)
-        cmd_to_write = self.STX + length + cmd + checksum[0] + checksum[1]
-        # print('command to write:',cmd_to_write)
-        # print(type(cmd_to_write))
-        self.port.write(bytes(cmd_to_write,'latin1'))
+            print("Unknown response character:", reply.response)
 
+        return reply.data
 
     def reset_thickness(self):
         # if self.Sensor1:
@@ -340,8 +254,8 @@ def reset_thickness(self):
             
         # if self.Sensor2:
             # self.reset_thickness2()
-        self.writeCommand("S") 
-        answer = self.readAnswer()
+        self.send_message("S")
+        answer = self.receive_message()
         
     # def reset_thickness1(self):
         # self.writeCommand("S") 
@@ -370,38 +284,3 @@ def get_version(self):
         answer = self.receive_message()
         # print("Rate Monitor Version:", answer)  
         return answer
-    
-    def checksum(self, cmd): 
-    
-        # return "00" # can be used for testing, the SQC-310C will ignore checksums in this case
-        
-        crc = 0x3fff               # crc always starts with 0x3fff
-        chars = [ord(x) for x in cmd]
-        for char in chars:
-            crc ^= char            # exclusive OR with crc
-            
-            for i in range(8):        
-                if crc % 2 == 1:   # if bit position 0 has a valeu of 1
-                    crc >>= 1      # 1 bit shifted to the right
-                    crc ^= 0x2001  # OR'd with 0x2001 
-                else:
-                    crc >>= 1      # 1 bit shifted to the right 
-                    
-        crc &= 0x3fff              # the final crc is masked with 0x3fff using logical AND
-        
-        bits = '{0:014b}'.format(crc) # string of the 14 significant bits
-        
-        crc1 = int(bits[7:14], 2)  # crc1 are the first seven bits  
-        crc2 = int(bits[0:7], 2)   # crc2 are thelast seven bits  
-        
-        crc1 = chr(crc1 + 34)      # 34 has be added to make sure the synchronization character "!" is not returned
-        crc2 = chr(crc2 + 34)      # 34 has be added to make sure the synchronization character "!" is not returned
-        
-        # print(ord(crc1), ord(crc2))
-        
-        # testing mode: The crcs are overwritten with chr(0)
-        # The SQC-160 ignores the crc in this case
-        # crc1 = chr(0)
-        # crc2 = chr(0)
-        
-        return crc1, crc2    
\ No newline at end of file
@@ -0,0 +1,236 @@
+# This Device Class is published under the terms of the MIT License.
+# Required Third Party Libraries, which are included in the Device Class
+# package for convenience purposes, may have a different license. You can
+# find those in the corresponding folders or contact the maintainer.
+#
+# MIT License
+#
+# Copyright (c) 2024 SweepMe! GmbH (sweep-me.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from __future__ import annotations
+
+import time
+from typing import NamedTuple, Protocol
+
+
+class SerialPort(Protocol):
+    """Minimal port interface needed by the codec, fulfilled by pysweepme ports with raw_read/raw_write."""
+
+    def write(self, data: bytes) -> None:
+        """Write the given bytes."""
+
+    def read(self, size: int) -> bytes:
+        """Read up to size bytes, fewer bytes are returned if the port timeout is reached."""
+
+
+class Reply(NamedTuple):
+    """Decoded reply frame."""
+
+    response: str
+    """Response character, e.g. 'A' if the command was understood."""
+
+    data: str
+    """Message of the reply without response character and checksum."""
+
+
+def _generate_crc_table() -> list[int]:
+    """Precompute the reflected CRC-14 with polynomial 0x2001 for all possible byte values."""
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0x2001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+CRC_TABLE = _generate_crc_table()
+
+
+def calculate_crc(data: bytes) -> bytes:
+    """Return the two CRC characters of the Inficon protocol.
+
+    The 14-bit CRC starts with 0x3FFF and is split into two characters with 7 bits each. 34 is added to each character
+    so that the sync character '!' cannot appear.
+
+    Args:
+        data: Length character and message.
+
+    Returns:
+        Two bytes, the lower 7 bits first.
+    """
+    crc = 0x3FFF
+    for byte in data:
+        crc = (crc >> 8) ^ CRC_TABLE[(crc ^ byte) & 0xFF]
+    crc &= 0x3FFF
+    return bytes(((crc & 0x7F) + 34, (crc >> 7) + 34))
+
+
+def calculate_checksum(data: bytes) -> bytes:
+    """Return the checksum byte of the Sycon protocol, which is the sum of all bytes modulo 256."""
+    return bytes((sum(data) % 256,))
+
+
+class InficonFraming:
+    """Frames of the Inficon protocol as used by the SQC-310 and SQM-160.
+
+    A frame consists of the sync character '!', a length character, the message and two CRC characters.
+    """
+
+    start = b"!"
+
+    def __init__(self, use_crc: bool = True) -> None:
+        """Initialize the framing.
+
+        Args:
+            use_crc: If False, the CRC characters of sent frames are set to chr(0), which makes the instrument skip
+                the CRC check.
+        """
+        self.use_crc = use_crc
+
+    def encode(self, command: str) -> bytes:
+        """Return the complete frame for a command."""
+        message = command.encode("latin-1")
+        length = bytes((len(message) + 34,))
+        crc = calculate_crc(length + message) if self.use_crc else b"\x00\x00"
+        return self.start + length + message + crc
+
+    @staticmethod
+    def frame_size(length_byte: int) -> int:
+        """Return the size of a received frame including sync, length and CRC characters."""
+        # the length character of a reply is the number of bytes of response character and message plus 35
+        return 2 + (length_byte - 35) + 2
+
+    @staticmethod
+    def decode(frame: bytes, verify: bool = False) -> Reply:
+        """Return the response character and message of a complete frame."""
+        if verify and calculate_crc(frame[1:-2]) != frame[-2:]:
+            msg = f"Inficon protocol: Invalid CRC of received frame {frame!r}."
+            raise ValueError(msg)
+        return Reply(chr(frame[2]), frame[3:-2].decode("latin-1"))
+
+
+class SyconFraming:
+    """Frames of the Sycon protocol as used by the STM-100 and the STM-2XM.
+
+    A frame consists of STX, a length byte, the message and a checksum byte.
+    """
+
+    start = b"\x02"
+
+    def encode(self, command: str) -> bytes:
+        """Return the complete frame for a command."""
+        message = command.encode("latin-1")
+        return self.start + bytes((len(message),)) + message + calculate_checksum(message)
+
+    @staticmethod
+    def frame_size(length_byte: int) -> int:
+        """Return the size of a received frame including STX, length and checksum bytes."""
+        # the length byte of a reply is the number of bytes of response character and message
+        return 2 + length_byte + 1
+
+    @staticmethod
+    def decode(frame: bytes, verify: bool = False) -> Reply:
+        """Return the response character and message of a complete frame."""
+        if verify and calculate_checksum(frame[2:-1]) != frame[-1:]:
+            msg = f"Sycon protocol: Invalid checksum of received frame {frame!r}."
+            raise ValueError(msg)
+        return Reply(chr(frame[2]), frame[3:-1].decode("latin-1"))
+
+
+class FrameCodec:
+    """Buffered reading and writing of frames of the deposition monitor protocols.
+
+    Received bytes are collected in a buffer, so that the start of a frame is found without reading byte by byte
+    and the rest of a frame is read with a single call once its length is known.
+    """
+
+    def __init__(
+        self,
+        port: SerialPort,
+        framing: InficonFraming | SyconFraming,
+        timeout: float = 2.0,
+        verify: bool = False,
+    ) -> None:
+        """Initialize the codec.
+
+        Args:
+            port: Port with raw read and write, i.e. self.port of the device class.
+            framing: InficonFraming or SyconFraming instance.
+            timeout: Time in s to wait for a complete frame.
+            verify: If True, the checksum of each received frame is checked.
+        """
+        self.port = port
+        self.framing = framing
+        self.timeout = timeout
+        self.verify = verify
+        self.buffer = bytearray()
+
+    def write(self, command: str) -> None:
+        """Send a single command."""
+        self.port.write(self.framing.encode(command))
+
+    def read(self) -> Reply:
+        """Return the next frame that is received."""
+        self._fill(2)
+        while not self.buffer.startswith(self.framing.start):
+            # everything before the next start character is discarded
+            index = self.buffer.find(self.framing.start)
+            del self.buffer[: index if index > 0 else len(self.buffer)]
+            self._fill(2)
+
+        size = self.framing.frame_size(self.buffer[1])
+        self._fill(size)
+        frame = bytes(self.buffer[:size])
+        del self.buffer[:size]
+
+        return self.framing.decode(frame, self.verify)
+
+    def query(self, command: str) -> Reply:
+        """Send a command and return its reply."""
+        self.write(command)
+        return self.read()
+
+    def query_many(self, commands: list[str]) -> list[Reply]:
+        """Send several commands with one write and return their replies in the same order.
+
+        The instrument answers the commands one after another, so that the replies of a whole sensor group are
+        received without a bus round trip per value.
+        """
+        self.port.write(b"".join(self.framing.encode(command) for command in commands))
+        return [self.read() for _ in commands]
+
+    def clear(self) -> None:
+        """Discard all bytes that have been received but not yet read."""
+        self.buffer.clear()
+
+    def _fill(self, size: int) -> None:
+        """Read from the port until the buffer contains at least size bytes."""
+        start_time = time.perf_counter()
+        while len(self.buffer) < size:
+            chunk = self.port.read(size - len(self.buffer))
+            if chunk:
+                self.buffer += chunk
+            elif time.perf_counter() - start_time > self.timeout:
+                self.buffer.clear()
+                msg = "Deposition monitor: No complete frame received before timeout."
+                raise TimeoutError(msg)
@@ -31,10 +31,17 @@
 # Device: Inficon STM-2XM
 
 
-import time
+import importlib.util
+from pathlib import Path
 
 from EmptyDeviceClass import EmptyDevice
 
+_spec = importlib.util.spec_from_file_location(
+    "deposition_protocol", Path(__file__).resolve().parent / "libraries" / "deposition_protocol.py"
+)
+deposition_protocol = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(deposition_protocol)
+
 class Device(EmptyDevice):
 
     description = """
@@ -82,11 +89,15 @@ def __init__(self):
                                     "raw_write": True,
                                     }
 
-       
-        self.STX = chr(0x02)
-        
+
+        self.codec = None
+
         ## Protocols: 1 - Sycon, 0 - SMDP
-        
+
+    def connect(self):
+
+        self.codec = deposition_protocol.FrameCodec(self.port, deposition_protocol.SyconFraming(), timeout=2)
+
     def set_GUIparameter(self):
         
         GUIparameter = {
@@ -257,50 +268,20 @@ def call(self):
     
         values = []
     
-        if self.Sensor1:
+        for sensor, selected in enumerate([self.Sensor1, self.Sensor2]):
+            if selected:
 
-            # Thickness
-            self.writeCommand("Q2,0")
-            answer = self.readAnswer()
-            self.d1 = float(answer)*100.0 # conversion from kA to nm
-
-            # Rate
-            self.writeCommand("Q17,0")
-            answer = self.readAnswer()
-            self.r1 = float(answer)
-            
-            # Xtal used
-            self.writeCommand("Q5,0")
-            answer = self.readAnswer()
-            try:
-                self.v1 = float(answer)
-            except:
-                self.v1 = float('nan')
-            
-            values += [self.d1, self.r1, self.v1]
-            
-        if self.Sensor2:
+                # Thickness, rate and xtal used of a sensor are requested together
+                thickness, rate, xtal_used = self.queryGroup(["Q2,%i" % sensor, "Q17,%i" % sensor, "Q5,%i" % sensor])
 
-            # Thickness
-            self.writeCommand("Q2,1")
-            answer = self.readAnswer()
-            self.d2 = float(answer)*100.0 # conversion from kA to nm
+                d = float(thickness)*100.0 # conversion from kA to nm
+                r = float(rate)
+                try:
+                    v = float(xtal_used)
+                except:
+                    v = float('nan')
 
-            # Rate
-            self.writeCommand("Q17,1")
-            answer = self.readAnswer()
-            self.r2 = float(answer)
-            
-            # Xtal used
-            self.writeCommand("Q5,1")
-            answer = self.readAnswer()
-            try:
-                self.v2 = float(answer)
-            except:
-                self.v2 = float('nan')
-            
-            values += [self.d2, self.r2, self.v2]
-        
+                values += [d, r, v]
         
         # Tooling factor
         # self.writeCommand("J?")
@@ -316,38 +297,25 @@ def call(self):
         return values
         
     def readAnswer(self):
-               
-        x = self.port.read(1)
 
-        if x[0] == ord(self.STX):
-        
-            
-            length = self.port.read(1)[0]
-            answer = self.port.read(length)
-            self.port.read(1)
-            return answer[1:] # we cut off the first byte as it is the return error code 
-              
-        else:
-            x = self.port.read(1)
-
-            if x[0] == ord(self.STX):
-            
-                length = self.port.read(1)[0]
-                answer = self.port.read(length)
-
-                return answer[1:].decode(), chr(answer[0])
-                
-        #else:
-        #    print(self.port.read(self.port.in_waiting()))
-        #    return None    
+        reply = self.codec.read()
+        return reply.data # the response character is the return error code and not returned
                         
     def writeCommand(self, cmd):
         
-        length = chr(len(cmd))
-        checksum = chr(sum([ord(char) for char in cmd]) % 256)
-        cmd_to_write = (self.STX + length + cmd + checksum).encode("latin1")
-        self.port.write(cmd_to_write)
+        self.codec.write(cmd)
+
+    def queryGroup(self, cmds):
+        """ sends several commands at once and returns the answers in the same order """
+
+        try:
+            replies = self.codec.query_many(cmds)
+        except TimeoutError:
+            # replies of the remaining commands might still arrive and must not be taken for later replies
+            self.codec.clear()
+            return ["nan"] * len(cmds)
 
+        return [reply.data for reply in replies]
 
     def reset_thickness(self):
         if self.Sensor1:
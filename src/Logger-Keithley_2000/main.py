@@ -31,8 +31,25 @@
 # Device: Keithley 2000
 
 
+import importlib.util
+from pathlib import Path
+
 from EmptyDeviceClass import EmptyDevice
 
+# Import the settings cache helper from the libraries folder of the driver
+_spec = importlib.util.spec_from_file_location(
+    "settings_cache", Path(__file__).resolve().parent / "libraries" / "settings_cache.py"
+)
+settings_cache = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(settings_cache)
+
+# Import the service request helper from the libraries folder of the driver
+_spec = importlib.util.spec_from_file_location(
+    "service_request", Path(__file__).resolve().parent / "libraries" / "service_request.py"
+)
+service_request = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(service_request)
+
 class Device(EmptyDevice):
 
     description = """
@@ -42,6 +59,8 @@ class Device(EmptyDevice):
                 <p><strong>NPLC<br /></strong>Number of power line cycles can be set between "Fast (0.1)" to "Slow (10.0)".</p>
                 <p><strong>Temperature unit</strong><br />The temperature unit can be &deg;C, K, or &deg;F</p>
                 <p><strong>Display</strong><br />The display can be switched off during the measurement which can lead to faster measurements.</p>
+                <p><strong>Settings</strong><br />Settings are only sent if they differ from the settings sent before, also across runs. The instrument is reset at the first run and after it was switched off.</p>
+                <p><strong>GPIB</strong><br />The reading is requested when the instrument signals with a service request that the answer to 'READ?' is available. Thus, the bus is not blocked while several instruments measure.</p>
                 <p><strong>Known issues</strong><br />Measurement modes such as "Voltage AC", "Current AC", or "Resistance" leads to errors and further bugfixing is needed. When display is switched off, it sometimes does not switch on again although an appropriate command is sent.</p>
                   """
 
@@ -59,6 +78,10 @@ def __init__(self):
                                     "EOL": "\r", 
                                     "baudrate": 9600, # factory default
                                 }
+
+        # Maximum time in s to wait for the service request of a reading (GPIB only)
+        self.measurement_timeout = 10
+        self.service_request = None
                                  
         
         # this dictionary connects modes to commands. The modes will be displayed to the user in the field 'Mode'
@@ -177,12 +200,16 @@ def initialize(self):
         #self.port.write("*IDN?")
         #print(self.port.read())
     
-        # once at the beginning of the measurement
-        self.port.write("*RST")
+        # Settings sent are remembered for the port, so that only changed settings are sent in the next run.
+        # The instrument is only reset if its state is unknown, i.e. at the first run or after a power cycle.
+        self.settings = settings_cache.get_settings_cache(self.device_communication, "Keithley2000 " + self.port_string)
+        if self.is_power_on() or not self.settings.valid:
+            self.port.write("*RST")
+            self.settings.reset()
         
         self.port.write("*CLS") # reset all values
         
-        self.port.write("SYST:BEEP:STAT OFF")     # control-Beep off
+        self.write_setting("SYST:BEEP:STAT OFF")     # control-Beep off
 
         ## does not seem to work although it should: results in error -113 undefined header
         #if self.port_string.startswith("COM"):
@@ -190,7 +217,7 @@ def initialize(self):
 
     def deinitialize(self):
             
-        self.port.write("SYST:BEEP:STAT ON")     # control-Beep on
+        self.write_setting("SYST:BEEP:STAT ON")     # control-Beep on
 
         ## does not seem to work although it should: results in error -113 undefined header
         #if self.port_string.startswith("COM"):
@@ -203,45 +230,68 @@ def configure(self):
         # print("Channels:", channels)
         
         ## Mode
-        self.port.write(":SENS:FUNC \"%s\"" % self.modes[self.mode])
+        self.write_setting(":SENS:FUNC \"%s\"" % self.modes[self.mode])
             
         ## Temperature unit
         if self.mode == "Temperature":
-            self.port.write(":UNIT:TEMP %s" % self.temperature_unit.replace("°", ""))
+            self.write_setting(":UNIT:TEMP %s" % self.temperature_unit.replace("°", ""))
 
         ## Speed    
-        self.port.write(":SENS:%s:NPLC %s" % (self.modes[self.mode], str(self.nplc)))
+        self.write_setting(":SENS:%s:NPLC %s" % (self.modes[self.mode], str(self.nplc)))
         
         ## Range
         if not self.mode in ["Temperature", "Continuity", "Diode"]:
-            self.port.write(":SENS:%s:RANG:AUTO ON" % (self.modes[self.mode]))
+            self.write_setting(":SENS:%s:RANG:AUTO ON" % (self.modes[self.mode]))
 
         ## Display
         if self.display == "Off":
-            self.port.write(":DISP:ENAB OFF")
+            self.write_setting(":DISP:ENAB OFF")
             
         ## Trigger
         #print("Configuring trigger")
-        self.port.write("INIT:CONT OFF")  # needed to use "READ?" command
+        self.write_setting("INIT:CONT OFF")  # needed to use "READ?" command
         #self.port.write("TRIG:SOUR %s" % self.trigger_types[self.trigger_type])
+
+        ## Service request if the answer is available (message available bit, MAV), GPIB only
+        if self.port_string.startswith("GPIB"):
+            self.write_setting("*SRE 16")
+            self.service_request = service_request.ServiceRequestWaiter(self.port.port, 1 << 4)
         
         ## Average
         # to be added
         
      
     def unconfigure(self):
+        if self.service_request is not None:
+            self.service_request.close()
+            self.service_request = None
+
         if self.display == "Off":
-            self.port.write(":DISP:ENAB ON")  # We switch Display on again if it was switched off
+            self.write_setting(":DISP:ENAB ON")  # We switch Display on again if it was switched off
      
             
     def measure(self): 
         self.port.write("READ?")  # triggers a new measurement                      
 
+    def read_result(self):
+        if self.service_request is not None:
+            # NPLC 10 with auto range can take more than a second
+            self.service_request.wait(self.measurement_timeout)
+
     def call(self):
         answer = self.port.read()  # here we read the response from the "READ?" request in 'measure'
         #print("Response to READ? command:", answer)
 
         return [float(answer)] 
+
+    def is_power_on(self):
+        """Return whether the instrument was switched on since the last call, using the power-on bit of *ESR?."""
+        self.port.write("*ESR?")
+        return bool(int(self.port.read()) & 128)
+
+    def write_setting(self, command):
+        """Send a setting command only if it differs from the last command sent for the same setting."""
+        self.settings.write(self.port, command)
         
         
     """
@@ -32,11 +32,22 @@
 # Type: Logger
 # Device: Keithley 6485
 
+import importlib.util
+import time
+from pathlib import Path
+
 from ErrorMessage import error, debug
 
 from EmptyDeviceClass import EmptyDevice # Class comes with SweepMe!
 # If you like to see the source code of EmptyDevice, take a look at the pysweepme package that contains this file
 
+# Import the trace buffer helper from the libraries folder of the driver
+_spec = importlib.util.spec_from_file_location(
+    "trace_buffer", Path(__file__).resolve().parent / "libraries" / "trace_buffer.py"
+)
+trace_buffer = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(trace_buffer)
+
 class Device(EmptyDevice):
 
     description =   """
@@ -45,6 +56,7 @@ class Device(EmptyDevice):
                     <li>Autozero: Switches autozero on or off. Autozero leads to an internal correction regarding temperature shifts. However, it slows down readings.</li>
                     <li>Perform zero check: If checked, a zero check is performed in the 2 nA range that sets the value for the offset correction that can be used checking "Use zero correction".</li>
                     <li>Use zero correction: Must be checked, if the offset correction should be applied that was found using "Perform zero check".</li>
+                    <li>Acquisition 'Burst': For each measurement point, the given number of readings is taken with a single trigger and stored in the buffer of the instrument together with timestamps. Mean and standard deviation of the readings are returned instead of a filtered value and the readings can be returned as trace. The buffer is transferred as binary data via GPIB and as text via RS-232. The option 'Average' is not used in this mode.</li>
                     </ul>
                     <p><strong>Known issues:</strong></p>
                     <ul>
@@ -79,6 +91,9 @@ def set_GUIparameter(self):
                         "Rate": ['Fast', 'Medium', 'Slow'],
                         "Range": ['Auto', '20 mA', '2 mA', '200 µA', '20 µA', '2 µA', '200 nA', '20 nA', '2 nA'],
                         "Average": 1,
+                        "Acquisition": ["Single reading", "Burst"],
+                        "Burst readings": 100,
+                        "Return trace": False,
                         "": None,
                         "Autozero": True,
                         "Perform zero check": True,
@@ -96,6 +111,20 @@ def get_GUIparameter(self, parameter = {}):
         self.use_autozero = parameter["Autozero"]
         self.perform_zero_check = parameter["Perform zero check"]
         self.use_zero_correction = parameter["Use zero correction"]
+
+        self.port_string = parameter["Port"]
+        self.is_burst = parameter.get("Acquisition", "Single reading") == "Burst"
+        self.burst_count = int(parameter.get("Burst readings", 100))
+        self.return_trace = parameter.get("Return trace", False)
+
+        self.variables = ["Current"]
+        self.units = ["A"]
+        if self.is_burst:
+            self.variables += ["Current std"]
+            self.units += ["A"]
+            if self.return_trace:
+                self.variables += ["Current trace", "Time"]
+                self.units += ["A", "s"]
         
 
     def initialize(self):
@@ -114,6 +143,10 @@ def initialize(self):
             self.stop_Measurement("The number of averages must be above 0.")
             return False
 
+        if self.is_burst and not 1 <= self.burst_count <= 2500:
+            self.stop_Measurement("The number of burst readings must be between 1 and 2500.")
+            return False
+
         self.port.write("*RST")
         # self.port.write(':ARM:COUN 1')
         
@@ -123,7 +156,8 @@ def configure(self):
         self.port.write(':SENS:MED:STAT OFF')
         self.port.write(':SENS:AVER:ADV:STAT OFF')
         
-        if self.average_count == 1:
+        # in burst mode, all readings are returned instead of being filtered
+        if self.average_count == 1 or self.is_burst:
             self.port.write(':SENS:AVER:STAT OFF')
         else:
             self.port.write(':SENS:AVER:STAT ON')
@@ -132,10 +166,13 @@ def configure(self):
      
         ## Rate
         if self.rate == 'Fast':
+            self.nplc = 0.1
             self.port.write('CURR:NPLC 0.1')
         elif self.rate == 'Medium':
+            self.nplc = 1.0
             self.port.write('CURR:NPLC 1')
         elif self.rate == 'Slow':
+            self.nplc = 5.0
             self.port.write('CURR:NPLC 5')
         
         
@@ -186,6 +223,10 @@ def configure(self):
         elif self.Range.replace(" ", "") == '2nA':
             self.port.write("CURR:RANG 2e-9")
 
+        ## Burst
+        if self.is_burst:
+            self.configure_burst()
+
     def measure(self):
         # self.port.write('INITiate')
         # self.port.write('ABORt')
@@ -195,14 +236,81 @@ def measure(self):
         
         # self.port.write(':CONFigure:CURRent:DC')
         # self.port.write(':SENSe:DATA:LATest')
-        
-        self.port.write('READ?')
+
+        if self.is_burst:
+            self.start_burst()
+        else:
+            self.port.write('READ?')
         
     def read_result(self):
+
+        if self.is_burst:
+            self.read_burst()
+            return
         
         result = self.port.read()
         self.current = float(result[:result.find(',')-1])
 
     def call(self):
+
+        if self.is_burst:
+            results = [self.current, self.current_std]
+            if self.return_trace:
+                results += [self.trace_current, self.trace_time]
+            return results
       
-        return [self.current]
\ No newline at end of file
+        return [self.current]
+
+    """ Here, python functions start that wrap the communication commands """
+
+    def configure_burst(self):
+        """Configure trigger model and buffer to store a burst of readings with timestamps."""
+
+        self.port.write("TRIG:COUN %i" % self.burst_count)
+        self.port.write("TRAC:POIN %i" % self.burst_count)
+        self.port.write("TRAC:FEED SENS")
+        self.port.write("TRAC:TST:FORM ABS")
+        self.port.write("FORM:ELEM READ,TIME")
+
+        # binary transfer is only available via GPIB
+        self.is_binary = self.port_string.startswith("GPIB")
+        if self.is_binary:
+            self.port.write("FORM:DATA SREAL")
+            self.port.write("FORM:BORD SWAP")
+        else:
+            self.port.write("FORM:DATA ASC")
+
+    def start_burst(self):
+        """Clear the buffer and trigger a burst of readings."""
+
+        self.port.write("TRAC:CLE")
+        self.port.write("TRAC:FEED:CONT NEXT")
+        self.port.write("INIT")
+
+    def read_burst(self):
+        """Wait until the buffer is filled, then read the readings and calculate their statistics."""
+
+        # generous limit, as the time per reading also depends on autozero and line frequency
+        timeout = 10.0 + 0.2 * self.nplc * self.burst_count
+        start_time = time.perf_counter()
+        while True:
+            self.port.write("TRAC:POIN:ACT?")
+            if int(float(self.port.read())) >= self.burst_count:
+                break
+            if time.perf_counter() - start_time > timeout:
+                raise Exception("Keithley 6485: Burst of %i readings not finished within %1.1f s."
+                                % (self.burst_count, timeout))
+            time.sleep(0.01)
+
+        self.port.write("TRAC:DATA?")
+        if self.is_binary:
+            # header '#0', reading and timestamp with 4 bytes each, and the termination character; read_raw would stop
+            # at the first byte of the data that equals the termination character
+            length = 2 + 4 * 2 * self.burst_count + len(self.port.port.read_termination or "")
+            trace = trace_buffer.parse_binary(self.port.port.read_bytes(length), count=self.burst_count)
+        else:
+            trace = trace_buffer.parse_ascii(self.port.read())
+
+        self.trace_current = trace[:, 0]
+        self.trace_time = trace[:, 1] - trace[0, 1]
+        self.current, self.current_std = trace_buffer.statistics(self.trace_current)
\ No newline at end of file
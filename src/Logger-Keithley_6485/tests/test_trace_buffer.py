@@ -0,0 +1,67 @@
+import importlib.util
+import math
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Import the trace buffer helper
+file_path = Path(__file__).resolve().parent.parent / "libraries" / "trace_buffer.py"
+spec = importlib.util.spec_from_file_location("trace_buffer", file_path)
+trace_buffer = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(trace_buffer)
+
+
+class TestParse(unittest.TestCase):
+    """Test the conversion of buffer contents."""
+
+    def setUp(self) -> None:
+        """Create three readings with timestamps."""
+        self.expected = np.array([[1e-12, 0.0], [2e-12, 0.02], [3e-12, 0.04]])
+
+    def test_indefinite_block(self) -> None:
+        """Blocks with header '#0' end with a termination character."""
+        data = b"#0" + self.expected.astype("<f4").tobytes() + b"\r"
+        np.testing.assert_allclose(trace_buffer.parse_binary(data), self.expected, rtol=1e-6)
+
+    def test_definite_block(self) -> None:
+        """Blocks with length in the header can be big-endian."""
+        block = self.expected.astype(">f4").tobytes()
+        data = b"#2%d" % len(block) + block + b"\n"
+        np.testing.assert_allclose(trace_buffer.parse_binary(data, byte_order=">"), self.expected, rtol=1e-6)
+
+    def test_truncated_indefinite_block(self) -> None:
+        """Missing readings in a block with header '#0' are detected by the expected number of readings."""
+        data = b"#0" + self.expected.astype("<f4").tobytes()[:16] + b"\r"
+        np.testing.assert_allclose(trace_buffer.parse_binary(data, count=2), self.expected[:2], rtol=1e-6)
+        with self.assertRaises(ValueError):  # noqa: PT027
+            trace_buffer.parse_binary(data, count=3)
+
+    def test_ascii(self) -> None:
+        """Units and status characters are removed from ASCII values."""
+        text = "+1.000E-12A,+0.000000E+00,+2.000E-12NADC,+2.000000E-02,+3.000E-12A,+4.000000E-02\r"
+        np.testing.assert_allclose(trace_buffer.parse_ascii(text), self.expected)
+
+    def test_wrong_number_of_values(self) -> None:
+        """Incomplete readings are rejected."""
+        with self.assertRaises(ValueError):  # noqa: PT027
+            trace_buffer.parse_ascii("1,2,3")
+
+
+class TestStatistics(unittest.TestCase):
+    """Test mean and standard deviation of the readings."""
+
+    def test_overflow_is_ignored(self) -> None:
+        """Overflow readings do not contribute to the statistics."""
+        mean, std = trace_buffer.statistics(np.array([1.0, 3.0, 9.91e37]))
+        self.assertEqual(mean, 2.0)  # noqa: PT009
+        self.assertAlmostEqual(std, math.sqrt(2.0))  # noqa: PT009
+
+    def test_no_valid_reading(self) -> None:
+        """Without valid readings, nan is returned."""
+        mean, std = trace_buffer.statistics(np.array([9.91e37]))
+        self.assertTrue(math.isnan(mean) and math.isnan(std))  # noqa: PT009
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+# This Device Class is published under the terms of the MIT License.
+# Required Third Party Libraries, which are included in the Device Class
+# package for convenience purposes, may have a different license. You can
+# find those in the corresponding folders or contact the maintainer.
+#
+# MIT License
+#
+# Copyright (c) 2024 SweepMe! GmbH (sweep-me.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+from __future__ import annotations
+
+import re
+
+import numpy as np
+
+OVERFLOW = 9.9e37
+"""Readings of Keithley electrometers at or above this value indicate an overflow."""
+
+
+def parse_binary(
+    data: bytes,
+    values_per_reading: int = 2,
+    byte_order: str = "<",
+    count: int | None = None,
+) -> np.ndarray:
+    """Convert the answer to 'TRACe:DATA?' in format 'FORMat:DATA SREal' to an array.
+
+    The answer starts with the header of an IEEE 488.2 block, i.e. '#0' for a block of indefinite length or
+    '#<number of digits><number of bytes>', followed by single precision floats. A termination character after the
+    block is removed.
+
+    Args:
+        data: Raw answer of the instrument.
+        values_per_reading: Number of elements per reading, e.g. 2 for reading and timestamp.
+        byte_order: '<' for 'FORMat:BORDer SWAPped' and '>' for 'FORMat:BORDer NORMal'.
+        count: Number of readings that are expected. A block of indefinite length has no header that would reveal
+            missing bytes, so the number of readings should always be checked.
+
+    Returns:
+        Array with one row per reading and one column per element.
+
+    Raises:
+        ValueError: If the answer is not a binary block or does not contain the expected number of readings.
+    """
+    start = data.find(b"#")
+    if start < 0:
+        msg = "The answer does not contain a binary block."
+        raise ValueError(msg)
+
+    digits = int(data[start + 1 : start + 2])
+    if digits == 0:
+        block = data[start + 2 :]
+        # remove the termination character, the length of the block is a multiple of the size of a float
+        block = block[: len(block) - len(block) % 4]
+    else:
+        length = int(data[start + 2 : start + 2 + digits])
+        block = data[start + 2 + digits : start + 2 + digits + length]
+
+    values = np.frombuffer(block, dtype=byte_order + "f4").astype(float)
+    readings = _reshape(values, values_per_reading)
+
+    if count is not None and len(readings) != count:
+        msg = f"The binary block contains {len(readings)} readings instead of {count}."
+        raise ValueError(msg)
+    return readings
+
+
+def parse_ascii(text: str, values_per_reading: int = 2) -> np.ndarray:
+    """Convert the answer to 'TRACe:DATA?' in format 'FORMat:DATA ASCii' to an array.
+
+    Units and status characters that are appended to the values, e.g. '-1.234E-12A' or '+1.234E-12NADC', are removed.
+
+    Args:
+        text: Answer of the instrument with comma separated values.
+        values_per_reading: Number of elements per reading, e.g. 2 for reading and timestamp.
+
+    Returns:
+        Array with one row per reading and one column per element.
+    """
+    tokens = [token for token in text.strip().split(",") if token.strip()]
+    values = np.array([float(re.sub(r"[A-Za-z]+$", "", token.strip())) for token in tokens])
+    return _reshape(values, values_per_reading)
+
+
+def _reshape(values: np.ndarray, values_per_reading: int) -> np.ndarray:
+    if len(values) % values_per_reading:
+        msg = f"The number of values {len(values)} is not a multiple of {values_per_reading} values per reading."
+        raise ValueError(msg)
+    return values.reshape(-1, values_per_reading)
+
+
+def statistics(readings: np.ndarray) -> tuple[float, float]:
+    """Return mean and standard deviation of all readings that are not an overflow.
+
+    Args:
+        readings: Readings of the buffer.
+
+    Returns:
+        Mean and sample standard deviation, nan if no valid reading is available, standard deviation is nan for a
+        single reading.
+    """
+    valid = readings[np.abs(readings) < OVERFLOW]
+    if len(valid) == 0:
+        return float("nan"), float("nan")
+    if len(valid) == 1:
+        return float(valid[0]), float("nan")
+    return float(np.mean(valid)), float(np.std(valid, ddof=1))
@@ -30,10 +30,28 @@
 # Type: Logger
 # Device: Keithley 6514
 
+import importlib.util
+import time
+from pathlib import Path
+
 from ErrorMessage import error, debug
 
 from EmptyDeviceClass import EmptyDevice  # Class comes with SweepMe!
 
+# Import the settings cache helper from the libraries folder of the driver
+_spec = importlib.util.spec_from_file_location(
+    "settings_cache", Path(__file__).resolve().parent / "libraries" / "settings_cache.py"
+)
+settings_cache = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(settings_cache)
+
+# Import the trace buffer helper from the libraries folder of the driver
+_spec = importlib.util.spec_from_file_location(
+    "trace_buffer", Path(__file__).resolve().parent / "libraries" / "trace_buffer.py"
+)
+trace_buffer = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(trace_buffer)
+
 
 class Device(EmptyDevice):
 
@@ -54,7 +72,14 @@ class Device(EmptyDevice):
                     <ul>
                     <li>The option 'Rate' can be used to change the NPLC being 0.1 (Fast), 1.0 (Medium), and 10.0 (Slow)</li>
                     <li>'Average' can be used to set the number of values the instrument takes before returning the averaged value.</li>
+                    <li>Acquisition 'Burst': For each measurement point, the given number of readings is taken with a
+                    single trigger and stored in the buffer of the instrument together with timestamps. Mean and
+                    standard deviation of the readings are returned instead of a filtered value and the readings can
+                    be returned as trace. The buffer is transferred as binary data via GPIB and as text via RS-232.
+                    The option 'Average' is not used in this mode.</li>
                     <li>Adjust the option 'Line frequency in Hz' to the frequency of your countries power line frequency.</li>
+                    <li>Settings are only sent if they differ from the settings sent before, also across runs. The
+                    instrument is reset at the first run and after it was switched off.</li>
                     </ul>
                     <p>&nbsp;</p>
                     <p><strong>Manual:</strong></p>
@@ -83,6 +108,9 @@ def set_GUIparameter(self):
                         "Range": ["Auto"],
                         "Rate": ['Fast', 'Medium', 'Slow'],
                         "Average": 1,
+                        "Acquisition": ["Single reading", "Burst"],
+                        "Burst readings": 100,
+                        "Return trace": False,
                         "Line frequency in Hz": ["50", "60"],
                         # "Autozero": True,
                         # "Perform zero check": True,
@@ -96,6 +124,20 @@ def get_GUIparameter(self, parameter={}):
         self.rate = parameter['Rate']
         self.line_frequency = parameter['Line frequency in Hz']
         self.average_count = int(parameter['Average'])
+        self.port_string = parameter['Port']
+
+        self.is_burst = parameter.get('Acquisition', "Single reading") == "Burst"
+        self.burst_count = int(parameter.get('Burst readings', 100))
+        self.return_trace = parameter.get('Return trace', False)
+
+        self.variables = ["Current"]
+        self.units = ["A"]
+        if self.is_burst:
+            self.variables += ["Current std"]
+            self.units += ["A"]
+            if self.return_trace:
+                self.variables += ["Current trace", "Time"]
+                self.units += ["A", "s"]
 
         self.mode = "CURR"
 
@@ -104,33 +146,47 @@ def initialize(self):
         identification = self.get_identification()
         print("Identification:", identification)
 
-        self.reset()
+        # Settings sent are remembered for the port, so that only changed settings are sent in the next run.
+        # The instrument is only reset if its state is unknown, i.e. at the first run or after a power cycle.
+        self.settings = settings_cache.get_settings_cache(self.device_communication, "Keithley 6514 " + self.port_string)
+        if self.is_power_on() or not self.settings.valid:
+            self.reset()
 
         self.set_line_frequency(self.line_frequency)
 
+        if self.is_burst and not 1 <= self.burst_count <= 2500:
+            raise Exception("The number of burst readings must be between 1 and 2500.")
+
     def configure(self):
 
         # Measurement mode
-        self.port.write(":CONF:%s" % self.mode)
+        if self.settings.write(self.port, ":CONF:%s" % self.mode):
+            # all settings of the function are set to default values
+            self.settings.reset()
+            self.settings.update(":CONF:%s" % self.mode)
         # self.port.write(":SENS:FUNC:%s" % self.mode)
 
         # Filters
-        self.port.write(':SENS:MED:STAT OFF')  # Median filter off
+        self.write_setting(':SENS:MED:STAT OFF')  # Median filter off
 
-        if self.average_count == 1:
-            self.port.write(':SENS:AVER:STAT OFF')
+        # in burst mode, all readings are returned instead of being filtered
+        if self.average_count == 1 or self.is_burst:
+            self.write_setting(':SENS:AVER:STAT OFF')
         else:
-            self.port.write(':SENS:AVER:STAT ON')
-            self.port.write(':SENS:AVER:TCON REP')
-            self.port.write(':SENS:AVER:COUN %i' % self.average_count)
+            self.write_setting(':SENS:AVER:STAT ON')
+            self.write_setting(':SENS:AVER:TCON REP')
+            self.write_setting(':SENS:AVER:COUN %i' % self.average_count)
 
         # Rate
         if self.rate == 'Fast':
-            self.port.write(':SENS:%s:NPLC 0.1' % self.mode)
+            self.nplc = 0.1
+            self.write_setting(':SENS:%s:NPLC 0.1' % self.mode)
         elif self.rate == 'Medium':
-            self.port.write(':SENS:%s:NPLC 1' % self.mode)
+            self.nplc = 1.0
+            self.write_setting(':SENS:%s:NPLC 1' % self.mode)
         elif self.rate == 'Slow':
-            self.port.write(':SENS:%s:NPLC 10' % self.mode)
+            self.nplc = 10.0
+            self.write_setting(':SENS:%s:NPLC 10' % self.mode)
 
         """
         # Zero check
@@ -162,7 +218,7 @@ def configure(self):
 
         # Range
         if self.range == 'Auto':
-            self.port.write(":SENS:%s:RANG:AUTO ON" % self.mode)
+            self.write_setting(":SENS:%s:RANG:AUTO ON" % self.mode)
         # elif self.Range.replace(" ", "") == '20mA':
         #     self.port.write(":SENS:CURR:RANG 2e-2")
         # elif self.Range.replace(" ", "") == '2mA':
@@ -180,6 +236,9 @@ def configure(self):
         # elif self.Range.replace(" ", "") == '2nA':
         #     self.port.write(":SENS:CURR:RANG 2e-9")
 
+        # Trigger count, buffer, and data format
+        self.configure_burst()
+
         # if self.read_error_count() > 0:
             # print("Errors after configure:", self.read_all_errors())
 
@@ -192,9 +251,16 @@ def measure(self):
         # self.port.write(':CONFigure:CURRent:DC')
         # self.port.write(':SENSe:DATA:LATest')
         
-        self.port.write('READ?')
+        if self.is_burst:
+            self.start_burst()
+        else:
+            self.port.write('READ?')
         
     def read_result(self):
+
+        if self.is_burst:
+            self.read_burst()
+            return
         
         result = self.port.read()
         # print("Result:", result)
@@ -202,6 +268,13 @@ def read_result(self):
         self.measured_value = float(result.split(',')[0])
 
     def call(self):
+
+        if self.is_burst:
+            results = [self.measured_value, self.measured_std]
+            if self.return_trace:
+                results += [self.trace_current, self.trace_time]
+            return results
+
         return [self.measured_value]
 
     """ Here, python functions start that wrap the communication commands """
@@ -214,10 +287,79 @@ def get_identification(self):
     def reset(self):
 
         self.port.write("*RST")
+        self.settings.reset()
+
+    def is_power_on(self):
+        """Return whether the instrument was switched on since the last call, using the power-on bit of *ESR?."""
+
+        self.port.write("*ESR?")
+        return bool(int(self.port.read()) & 128)
+
+    def write_setting(self, command):
+        """Send a setting command only if it differs from the last command sent for the same setting."""
+
+        self.settings.write(self.port, command)
+
+    def configure_burst(self):
+        """Configure trigger model and buffer to store a burst of readings with timestamps, or single readings."""
+
+        if not self.is_burst:
+            self.write_setting(":TRIG:COUN 1")
+            self.write_setting(":FORM:DATA ASC")
+            return
+
+        self.write_setting(":TRIG:COUN %i" % self.burst_count)
+        self.write_setting(":TRAC:POIN %i" % self.burst_count)
+        self.write_setting(":TRAC:FEED SENS")
+        self.write_setting(":TRAC:TST:FORM ABS")
+        self.write_setting(":FORM:ELEM READ,TST")
+
+        # binary transfer is only available via GPIB
+        self.is_binary = self.port_string.startswith("GPIB")
+        if self.is_binary:
+            self.write_setting(":FORM:DATA SREAL")
+            self.write_setting(":FORM:BORD SWAP")
+        else:
+            self.write_setting(":FORM:DATA ASC")
+
+    def start_burst(self):
+        """Clear the buffer and trigger a burst of readings."""
+
+        self.port.write(":TRAC:CLE")
+        self.port.write(":TRAC:FEED:CONT NEXT")
+        self.port.write(":INIT")
+
+    def read_burst(self):
+        """Wait until the buffer is filled, then read the readings and calculate their statistics."""
+
+        # generous limit, as the time per reading also depends on autozero and line frequency
+        timeout = 10.0 + 0.2 * self.nplc * self.burst_count
+        start_time = time.perf_counter()
+        while True:
+            self.port.write(":TRAC:POIN:ACT?")
+            if int(float(self.port.read())) >= self.burst_count:
+                break
+            if time.perf_counter() - start_time > timeout:
+                raise Exception("Keithley 6514: Burst of %i readings not finished within %1.1f s."
+                                % (self.burst_count, timeout))
+            time.sleep(0.01)
+
+        self.port.write(":TRAC:DATA?")
+        if self.is_binary:
+            # header '#0', reading and timestamp with 4 bytes each, and the termination character; read_raw would stop
+            # at the first byte of the data that equals the termination character
+            length = 2 + 4 * 2 * self.burst_count + len(self.port.port.read_termination or "")
+            trace = trace_buffer.parse_binary(self.port.port.read_bytes(length), count=self.burst_count)
+        else:
+            trace = trace_buffer.parse_ascii(self.port.read())
+
+        self.trace_current = trace[:, 0]
+        self.trace_time = trace[:, 1] - trace[0, 1]
+        self.measured_value, self.measured_std = trace_buffer.statistics(self.trace_current)
 
     def set_line_frequency(self, frequency):
 
-        self.port.write(":SYST:LFR %i" % int(frequency))
+        self.write_setting(":SYST:LFR %i" % int(frequency))
 
     def set_nplc(self, nplc):
 
@@ -0,0 +1,123 @@
+# This Device Class is published under the terms of the MIT License.
+# Required Third Party Libraries, which are included in the Device Class
+# package for convenience purposes, may have a different license. You can
+# find those in the corresponding folders or contact the maintainer.
+#
+# MIT License
+#
+# Copyright (c) 2024 SweepMe! GmbH (sweep-me.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+from __future__ import annotations
+
+from typing import Protocol
+
+
+class Port(Protocol):
+    """Minimal port interface needed by the cache, fulfilled by the SweepMe! port objects."""
+
+    def write(self, command: str) -> None:
+        """Write a command to the instrument."""
+
+
+class SettingsCache:
+    """Shadow copy of the settings that have been sent to an instrument.
+
+    For each setting, the last command sent is remembered, so that commands that would not change the state of the
+    instrument can be skipped. This saves time for instruments with slow interfaces or without readback and avoids
+    unnecessary relay switching or filter resets.
+
+    The cache is only valid as long as the instrument is not changed otherwise. It must be reset whenever the
+    instrument is reset to default settings, and invalidated if its state is unknown, e.g. after a power cycle or if
+    settings may have been changed at the front panel.
+    """
+
+    def __init__(self) -> None:
+        """Create an invalid cache, i.e. the state of the instrument is unknown."""
+        self.valid = False
+        self.commands: dict[str, str] = {}
+
+    def reset(self) -> None:
+        """Forget all commands after the instrument has been reset to known default settings."""
+        self.commands.clear()
+        self.valid = True
+
+    def invalidate(self) -> None:
+        """Mark the state of the instrument as unknown, so that the instrument needs to be reset."""
+        self.commands.clear()
+        self.valid = False
+
+    def forget(self, key: str) -> None:
+        """Forget a setting that might have been changed by the instrument itself, e.g. a range during autoranging."""
+        self.commands.pop(key, None)
+
+    def is_sent(self, key: str, command: str) -> bool:
+        """Return whether the given command is the last command that has been sent for the setting."""
+        return self.valid and self.commands.get(key) == command
+
+    def write(self, port: Port, command: str, key: str | None = None) -> bool:
+        """Write a setting command unless it is the last command that has been sent for the same setting.
+
+        Args:
+            port: Port used to write the command.
+            command: Complete command including the value, e.g. 'SENS 12'.
+            key: Name of the setting, default is the command header before the first space.
+
+        Returns:
+            True if the command has been written, False if it has been skipped.
+        """
+        if key is None:
+            key = command.split(" ")[0]
+
+        if self.is_sent(key, command):
+            return False
+
+        port.write(command)
+        self.update(command, key)
+        return True
+
+    def update(self, command: str, key: str | None = None) -> None:
+        """Remember a setting command that has been sent without using 'write'.
+
+        Args:
+            command: Complete command including the value, e.g. 'SENS 12'.
+            key: Name of the setting, default is the command header before the first space.
+        """
+        if key is None:
+            key = command.split(" ")[0]
+        self.commands[key] = command
+
+
+def get_settings_cache(device_communication: dict, identifier: str) -> SettingsCache:
+    """Return the cache of an instrument that is shared by all driver instances and runs using the same port.
+
+    Args:
+        device_communication: Dictionary of SweepMe! that is shared by all drivers.
+        identifier: Unique name of the instrument, e.g. driver name and port.
+
+    Returns:
+        Cache of the instrument, a new invalid cache if the instrument is used for the first time.
+    """
+    key = "Settings cache " + identifier
+    if key not in device_communication:
+        device_communication[key] = SettingsCache()
+    return device_communication[key]
@@ -32,9 +32,27 @@
 # Type: Logger
 # Device: Keithley 6517B
 
+import importlib.util
+import time
+from pathlib import Path
+
 from pysweepme.ErrorMessage import error, debug
 from pysweepme.EmptyDeviceClass import EmptyDevice  # Class comes with SweepMe!
 
+# Import the settings cache helper from the libraries folder of the driver
+_spec = importlib.util.spec_from_file_location(
+    "settings_cache", Path(__file__).resolve().parent / "libraries" / "settings_cache.py"
+)
+settings_cache = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(settings_cache)
+
+# Import the trace buffer helper from the libraries folder of the driver
+_spec = importlib.util.spec_from_file_location(
+    "trace_buffer", Path(__file__).resolve().parent / "libraries" / "trace_buffer.py"
+)
+trace_buffer = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(trace_buffer)
+
 
 class Device(EmptyDevice):
 
@@ -55,12 +73,19 @@ class Device(EmptyDevice):
                     <li>'Range' can be used to set the upper limit of the expected current measurements. Default is Auto.</li>
                     <li>The option 'Rate' can be used to change the NPLC being 0.01 (Very Fast), 0.1 (Fast), 1.0 (Medium) and 10.0 (Slow)</li>
                     <li>'Average' can be used to set the number of values the instrument takes before returning the averaged value.</li>
+                    <li>Acquisition 'Burst': For each measurement point, the given number of readings is taken with a
+                    single trigger and stored in the buffer of the instrument together with timestamps. Mean and
+                    standard deviation of the readings are returned instead of a filtered value and the readings can
+                    be returned as trace. The buffer is transferred as binary data via GPIB and as text via RS-232.
+                    The option 'Average' is not used in this mode.</li>
                     <li>'Source voltage in V' can be used to set the value of your voltage for SVMI. Can be set between 0 V and 1000 V\n 
                     Resolution for voltages lower than 100 V is 5 mV for voltages greater than 100 V it's 50 mV.</li>
                     <li>'Source voltage limit in V' manually sets the upper limit for the source voltage.</li>
                     <li>'Source voltage connection' sets how your source voltage is connected, either as independent source (Hi and Lo)\n
                     or as Source Voltage Measure Current (Hi and Hi).<\li>
                     <li>Adjust the option 'Line sync' to enable/disable the line sync to your countries power line frequency.</li>
+                    <li>Settings are only sent if they differ from the settings sent before, also across runs. The
+                    instrument is reset at the first run and after it was switched off.</li>
                     </ul>
                     <p>&nbsp;</p>
                     <p><strong>User's Manual:</strong></p>
@@ -106,6 +131,9 @@ def set_GUIparameter(self):
                 ],
             "Rate": ['Very Fast', 'Fast', 'Medium', 'Slow'],
             "Average": 1,
+            "Acquisition": ["Single reading", "Burst"],
+            "Burst readings": 100,
+            "Return trace": False,
             "Source voltage in V": "0.0",
             "Source voltage limit in V": 5.000,
             "Source voltage connection": ["V-SOURCE HI and INPUT HI", "V-SOURCE HI and V-SOURCE LO"],
@@ -129,6 +157,20 @@ def get_GUIparameter(self, parameter={}):
         self.line_sync = parameter['Line sync']
         self.perform_zero_check = parameter['Perform zero check']
         self.use_zero_correction = parameter['Use zero correction']
+        self.port_string = parameter['Port']
+
+        self.is_burst = parameter.get('Acquisition', "Single reading") == "Burst"
+        self.burst_count = int(parameter.get('Burst readings', 100))
+        self.return_trace = parameter.get('Return trace', False)
+
+        self.variables = ["Current"]
+        self.units = ["A"]
+        if self.is_burst:
+            self.variables += ["Current std"]
+            self.units += ["A"]
+            if self.return_trace:
+                self.variables += ["Current trace", "Time"]
+                self.units += ["A", "s"]
         
         self.mode = "CURR"
 
@@ -137,7 +179,11 @@ def initialize(self):
         # identification = self.get_identification()
         # print("Identification:", identification)
 
-        self.reset()
+        # Settings sent are remembered for the port, so that only changed settings are sent in the next run.
+        # The instrument is only reset if its state is unknown, i.e. at the first run or after a power cycle.
+        self.settings = settings_cache.get_settings_cache(self.device_communication, "Keithley 6517 " + self.port_string)
+        if self.is_power_on() or not self.settings.valid:
+            self.reset()
 
         self.set_line_sync(self.line_sync)
         
@@ -149,63 +195,79 @@ def initialize(self):
     def configure(self):
 
         # Measurement mode
-        self.port.write(":CONF:%s" % self.mode)
+        if self.settings.write(self.port, ":CONF:%s" % self.mode):
+            # all settings of the function are set to default values
+            self.settings.reset()
+            self.settings.update(":CONF:%s" % self.mode)
         
         # Filters
-        self.port.write(":SENS:%s:MED:STAT OFF" % self.mode)  # Median filter off
+        self.write_setting(":SENS:%s:MED:STAT OFF" % self.mode)  # Median filter off
         
         # Averaging method
-        if self.average_count == 1:
-            self.port.write(":SENS:%s:AVER:STAT OFF" % self.mode)
+        # in burst mode, all readings are returned instead of being filtered
+        if self.average_count == 1 or self.is_burst:
+            self.write_setting(":SENS:%s:AVER:STAT OFF" % self.mode)
         else:
-            self.port.write(':SENS:%s:AVER:STAT ON' % self.mode)
-            self.port.write(':SENS:%s:AVER:TCON REP' % self.mode)
-            self.port.write(':SENS:%s:AVER:COUN %i' % (self.mode, self.average_count))
+            self.write_setting(':SENS:%s:AVER:STAT ON' % self.mode)
+            self.write_setting(':SENS:%s:AVER:TCON REP' % self.mode)
+            self.write_setting(':SENS:%s:AVER:COUN %i' % (self.mode, self.average_count))
 
         # Rate
         if self.rate == 'Very Fast':
-            self.port.write(':SENS:%s:NPLC 0.01' % self.mode)
+            self.nplc = 0.01
+            self.write_setting(':SENS:%s:NPLC 0.01' % self.mode)
         elif self.rate == 'Fast':
-            self.port.write(':SENS:%s:NPLC 0.1' % self.mode)
+            self.nplc = 0.1
+            self.write_setting(':SENS:%s:NPLC 0.1' % self.mode)
         elif self.rate == 'Medium':
-            self.port.write(':SENS:%s:NPLC 1' % self.mode)
+            self.nplc = 1.0
+            self.write_setting(':SENS:%s:NPLC 1' % self.mode)
         elif self.rate == 'Slow':
-            self.port.write(':SENS:%s:NPLC 10' % self.mode)
+            self.nplc = 10.0
+            self.write_setting(':SENS:%s:NPLC 10' % self.mode)
 
         # Zero check
         if self.perform_zero_check:
-            self.port.write(":SENS:%s:RANG:AUTO OFF" % self.mode)
+            self.write_setting(":SENS:%s:RANG:AUTO OFF" % self.mode)
             
             # Change to 20 pA range
-            self.port.write(":SENS:%s:RANG 20E-12" % self.mode)
+            self.write_setting(":SENS:%s:RANG 20E-12" % self.mode)
                       
-            self.port.write(':SYST:ZCH ON')
+            self.write_setting(':SYST:ZCH ON')
             
             self.port.write(':INIT')
             
-        self.port.write(':SYST:ZCH OFF')
+        self.write_setting(':SYST:ZCH OFF')
 
         # Zero correction
         if self.use_zero_correction:
-            self.port.write(':SYST:ZCOR ON')
+            self.write_setting(':SYST:ZCOR ON')
         else:
-            self.port.write(':SYST:ZCOR OFF')
+            self.write_setting(':SYST:ZCOR OFF')
         
         # Range
         self.range = self.replace_units(self.range)
         if self.range == 'Auto':
-            self.port.write(":SENS:%s:RANG:AUTO ON" % self.mode)
+            self.write_setting(":SENS:%s:RANG:AUTO ON" % self.mode)
+            # the range is changed by the instrument during autoranging
+            self.settings.forget(":SENS:%s:RANG" % self.mode)
         else:
             self.range = self.range.replace("A", "")
-            self.port.write("SENS:%s:RANG %s" % (self.mode, self.range))
+            self.write_setting(":SENS:%s:RANG:AUTO OFF" % self.mode)
+            self.write_setting(":SENS:%s:RANG %s" % (self.mode, self.range))
 
         # Source Voltage Measure Current        
-        self.port.write(":SOUR:VOLT:LIM:STAT ON")
+        self.write_setting(":SOUR:VOLT:LIM:STAT ON")
         # Set voltage limit 
-        self.port.write(":SOUR:VOLT:LIM %f" % self.source_voltage_limit)
-        self.port.write(":SOUR:VOLT %f" % self.source_voltage)
+        self.write_setting(":SOUR:VOLT:LIM %f" % self.source_voltage_limit)
+        self.write_setting(":SOUR:VOLT %f" % self.source_voltage)
         if self.source_voltage_connection == "V-SOURCE HI and INPUT HI":
-            self.port.write(":SOUR:VOLT:MCON ON")
+            self.write_setting(":SOUR:VOLT:MCON ON")
+        else:
+            self.write_setting(":SOUR:VOLT:MCON OFF")
+
+        # Trigger count, buffer, and data format
+        self.configure_burst()
 
         # Checking for errors occuring during initialize and config
         while True:
@@ -222,7 +284,7 @@ def reconfigure(self, parameter={}, keys=[]):
             else:
                 self.source_voltage = float(parameter['Source voltage in V'])
 
-            self.port.write(":SOUR:VOLT %f" % self.source_voltage)
+            self.write_setting(":SOUR:VOLT %f" % self.source_voltage)
             self.port.write(":OUTP:STAT ON")
 
     def poweron(self):
@@ -232,9 +294,16 @@ def poweroff(self):
         self.port.write(":OUTP:STAT OFF")
 
     def measure(self):
-        self.port.write('READ?')
+        if self.is_burst:
+            self.start_burst()
+        else:
+            self.port.write('READ?')
                 
     def read_result(self):
+
+        if self.is_burst:
+            self.read_burst()
+            return
         
         result = self.port.read()
         # print("Result:", result)
@@ -247,6 +316,13 @@ def read_result(self):
         # self.measured_value = float(result.split(",")[0].rstrip("ABCDEFGHIJKLMNOPQRSTUVWXYZ"))
 
     def call(self):
+
+        if self.is_burst:
+            results = [self.measured_value, self.measured_std]
+            if self.return_trace:
+                results += [self.trace_current, self.trace_time]
+            return results
+
         return [self.measured_value]
 
     """ Here, convenience function start """
@@ -273,11 +349,81 @@ def get_identification(self):
     def reset(self):
 
         self.port.write("*RST")
+        self.settings.reset()
+
+    def is_power_on(self):
+        """Return whether the instrument was switched on since the last call, using the power-on bit of *ESR?."""
+
+        self.port.write("*ESR?")
+        return bool(int(self.port.read()) & 128)
+
+    def write_setting(self, command):
+        """Send a setting command only if it differs from the last command sent for the same setting."""
+
+        self.settings.write(self.port, command)
+
+    def configure_burst(self):
+        """Configure trigger model and buffer to store a burst of readings with timestamps, or single readings."""
+
+        if not self.is_burst:
+            self.write_setting(":TRIG:COUN 1")
+            self.write_setting(":FORM:DATA ASC")
+            return
+
+        self.write_setting(":TRIG:COUN %i" % self.burst_count)
+        self.write_setting(":TRAC:POIN %i" % self.burst_count)
+        self.write_setting(":TRAC:FEED SENS")
+        self.write_setting(":TRAC:TST:FORM ABS")
+        self.write_setting(":TRAC:ELEM TST")
+        self.write_setting(":FORM:ELEM READ,TST")
+
+        # binary transfer is only available via GPIB
+        self.is_binary = self.port_string.startswith("GPIB")
+        if self.is_binary:
+            self.write_setting(":FORM:DATA SREAL")
+            self.write_setting(":FORM:BORD SWAP")
+        else:
+            self.write_setting(":FORM:DATA ASC")
+
+    def start_burst(self):
+        """Clear the buffer and trigger a burst of readings."""
+
+        self.port.write(":TRAC:CLE")
+        self.port.write(":TRAC:FEED:CONT NEXT")
+        self.port.write(":INIT")
+
+    def read_burst(self):
+        """Wait until the buffer is filled, then read the readings and calculate their statistics."""
+
+        # generous limit, as the time per reading also depends on autozero and line frequency
+        timeout = 10.0 + 0.2 * self.nplc * self.burst_count
+        start_time = time.perf_counter()
+        while True:
+            self.port.write(":TRAC:POIN:ACT?")
+            if int(float(self.port.read())) >= self.burst_count:
+                break
+            if time.perf_counter() - start_time > timeout:
+                raise Exception("Keithley 6517B: Burst of %i readings not finished within %1.1f s."
+                                % (self.burst_count, timeout))
+            time.sleep(0.01)
+
+        self.port.write(":TRAC:DATA?")
+        if self.is_binary:
+            # header '#0', reading and timestamp with 4 bytes each, and the termination character; read_raw would stop
+            # at the first byte of the data that equals the termination character
+            length = 2 + 4 * 2 * self.burst_count + len(self.port.port.read_termination or "")
+            trace = trace_buffer.parse_binary(self.port.port.read_bytes(length), count=self.burst_count)
+        else:
+            trace = trace_buffer.parse_ascii(self.port.read())
+
+        self.trace_current = trace[:, 0]
+        self.trace_time = trace[:, 1] - trace[0, 1]
+        self.measured_value, self.measured_std = trace_buffer.statistics(self.trace_current)
 
     def set_line_sync(self, state):
 
         state = "ON" if state else "OFF"
-        self.port.write(f":SYST:LSYN:STAT {state}")
+        self.write_setting(f":SYST:LSYN:STAT {state}")
     
     def read_error(self):
 
@@ -0,0 +1,238 @@
+# This Device Class is published under the terms of the MIT License.
+# Required Third Party Libraries, which are included in the Device Class
+# package for convenience purposes, may have a different license. You can
+# find those in the corresponding folders or contact the maintainer.
+#
+# MIT License
+#
+# Copyright (c) 2024 SweepMe! GmbH (sweep-me.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import NamedTuple, Protocol
+
+
+class SerialPort(Protocol):
+    """Minimal port interface needed by the stream, fulfilled by serial.Serial."""
+
+    def readline(self) -> bytes:
+        """Read until a line feed, an incomplete line is returned if the port timeout is reached."""
+
+
+class WeightReading(NamedTuple):
+    """Weight sent by the balance."""
+
+    timestamp: float
+    """Time of reception in s, as returned by time.perf_counter()."""
+
+    weight: float
+    unit: str
+
+    balance_stable: bool
+    """Stability flag of the balance, 'S' for stable or 'D' for dynamic."""
+
+
+def parse_weight(line: str, timestamp: float = 0.0) -> WeightReading | None:
+    """Parse a weight response of the KERN communication protocol, e.g. 'S S     12.345 g'.
+
+    Args:
+        line: Response to 'S', 'SI', or 'SIR'.
+        timestamp: Time of reception in s.
+
+    Returns:
+        The reading or None if the line is not a valid weight, e.g. an overload 'S +' or a reply to another command.
+    """
+    values = line.split()  # split without argument to remove multiple spaces
+    if len(values) < 4 or values[0] != "S" or values[1] not in ["S", "D"]:
+        return None
+    try:
+        weight = float(values[2])
+    except ValueError:
+        return None
+    return WeightReading(timestamp, weight, values[3], values[1] == "S")
+
+
+class WeightStream:
+    """Collects the continuous weight output of a balance ('SIR') in a background thread.
+
+    The readings are stored with time stamps in a ring buffer. Whether the weight is stable is decided on the host: the
+    weight is stable if all readings within the drift window differ by not more than the drift tolerance. Thus, the
+    criterion can be adapted to the application, e.g. dosing or evaporation, and reading the weight never blocks.
+    """
+
+    def __init__(
+        self,
+        port: SerialPort,
+        unit: str,
+        drift_window: float = 1.0,
+        drift_tolerance: float = 0.0,
+        maxlen: int = 10000,
+    ) -> None:
+        """Initialize the stream.
+
+        Args:
+            port: Open serial port with a read timeout that is short compared to the drift window.
+            unit: Unit of the weight, readings in other units are discarded.
+            drift_window: Time in s the weight must stay within the drift tolerance to be stable.
+            drift_tolerance: Maximum difference between readings within the drift window, in the unit of the weight.
+            maxlen: Number of readings kept in the ring buffer.
+        """
+        self.port = port
+        self.unit = unit
+        self.drift_window = drift_window
+        self.drift_tolerance = drift_tolerance
+
+        self.readings: deque[WeightReading] = deque(maxlen=maxlen)
+        self.last_stable: WeightReading | None = None
+        """Filtered weight of the last drift window in which the weight was stable."""
+
+        self.error: Exception | None = None
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        """True if the background thread is reading."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start reading in a background thread, the balance must have been requested to send continuously."""
+        if self.running:
+            return
+        self._stop_event.clear()
+        self.error = None
+        self._thread = threading.Thread(target=self._read_loop, name="KernWeightStream", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the background thread.
+
+        Args:
+            timeout: Maximum time in s to wait for the thread, at least the read timeout of the port.
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def clear(self) -> None:
+        """Discard all readings, e.g. after tare or zero."""
+        with self._lock:
+            self.readings.clear()
+            self.last_stable = None
+
+    def add(self, reading: WeightReading) -> None:
+        """Add a reading to the ring buffer and update the last stable weight."""
+        if reading.unit != self.unit:
+            return
+        with self._lock:
+            self.readings.append(reading)
+            stable = self._stable_weight()
+            if stable is not None:
+                self.last_stable = stable
+
+    def latest(self) -> WeightReading | None:
+        """Return the latest reading or None if nothing has been received."""
+        with self._lock:
+            return self.readings[-1] if self.readings else None
+
+    def is_stable(self) -> bool:
+        """Return whether the weight is stable at the latest reading."""
+        with self._lock:
+            return self._stable_weight() is not None
+
+    def readings_since(self, timestamp: float) -> list[WeightReading]:
+        """Return all readings received after the given time stamp, e.g. the readings since the last point."""
+        with self._lock:
+            return [reading for reading in self.readings if reading.timestamp > timestamp]
+
+    def wait_for_reading(self, timeout: float, interval: float = 0.01) -> WeightReading:
+        """Wait until at least one reading has been received.
+
+        Args:
+            timeout: Maximum time in s to wait.
+            interval: Time in s between two checks.
+
+        Returns:
+            The latest reading.
+        """
+        deadline = time.perf_counter() + timeout
+        while True:
+            self.check_error()
+            reading = self.latest()
+            if reading is not None:
+                return reading
+            if time.perf_counter() > deadline:
+                msg = "No weight received from the balance."
+                raise TimeoutError(msg)
+            time.sleep(interval)
+
+    def check_error(self) -> None:
+        """Raise the error that stopped the background thread, if any."""
+        if self.error is not None:
+            error = self.error
+            self.error = None
+            raise error
+
+    def _stable_weight(self) -> WeightReading | None:
+        """Return the mean weight of the drift window if the weight is stable, must be called with the lock held."""
+        if not self.readings:
+            return None
+        latest = self.readings[-1]
+        start = latest.timestamp - self.drift_window
+
+        # the drift window must be covered by readings, otherwise a single reading would always be stable
+        if self.readings[0].timestamp > start:
+            return None
+
+        weights = []
+        for reading in reversed(self.readings):
+            if reading.timestamp < start:
+                break
+            weights.append(reading.weight)
+        if max(weights) - min(weights) > self.drift_tolerance:
+            return None
+        return WeightReading(latest.timestamp, sum(weights) / len(weights), latest.unit, latest.balance_stable)
+
+    def _read_loop(self) -> None:
+        """Read lines until the stream is stopped."""
+        partial_line = b""
+        try:
+            while not self._stop_event.is_set():
+                line = partial_line + self.port.readline()
+                if not line.endswith(b"\n"):
+                    # incomplete line due to the port timeout, the rest is read with the next call
+                    partial_line = line
+                    continue
+                partial_line = b""
+                reading = parse_weight(line.decode("ascii", errors="replace"), time.perf_counter())
+                if reading is not None:
+                    self.add(reading)
+        except Exception as e:  # noqa: BLE001
+            # the error is raised in the main thread by check_error
+            self.error = e
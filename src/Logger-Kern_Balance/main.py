@@ -31,11 +31,21 @@
 # Device: Kern Balance
 
 
+import importlib.util
+from pathlib import Path
+
 from ErrorMessage import error, debug
 
 from EmptyDeviceClass import EmptyDevice # Class comes with SweepMe!
 # If you like to see the source code of EmptyDevice, take a look at the pysweepme package that contains this file
 
+# Import the weight stream helper from the libraries folder of the driver
+_spec = importlib.util.spec_from_file_location(
+    "weight_stream", Path(__file__).resolve().parent / "libraries" / "weight_stream.py"
+)
+weight_stream = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(weight_stream)
+
 class Device(EmptyDevice):
 
     ## here you can add html formatted description to your device class that is shown by modules like 'Logger' or 'Switch' that have a description field.
@@ -80,6 +90,17 @@ class Device(EmptyDevice):
                       <li>The option "Initial zero" triggers the zero function at the
                       beginning of a run in order to create a new zero reference level.
                       </li>
+                      <li>Acquisition "Query per point" requests a weight at each point.
+                      With "Read stabilized", the balance only replies once the weight is
+                      stable, which can take seconds.
+                      </li>
+                      <li>Acquisition "Continuous" lets the balance send weights
+                      continuously (SIR) that are collected in the background. Each point
+                      returns the latest weight without waiting. The weight is stable if
+                      all weights within the "Drift window in s" differ by not more than
+                      the "Drift tolerance" in the selected unit. With "Read stabilized",
+                      the mean weight of the last stable drift window is returned.
+                      </li>
                     </ul>
                     """
 
@@ -101,6 +122,10 @@ def __init__(self):
                                 "parity": "N",
                                 "timeout": 10,
                                 }
+
+        # Read timeout in s of the port while the weight is streamed, short so that the stream can be stopped quickly
+        self.stream_read_timeout = 0.2
+        self.stream = None
             
     def set_GUIparameter(self):
     
@@ -110,6 +135,10 @@ def set_GUIparameter(self):
                         "Read stabilized": False,
                         "Initial zero": False,
                         "Initial tare": False,
+                        " ": None, # empty line
+                        "Acquisition": ["Query per point", "Continuous"],
+                        "Drift window in s": "1.0",
+                        "Drift tolerance": "0.0",
                         }
 
         
@@ -122,6 +151,9 @@ def get_GUIparameter(self, parameter):
         self.do_initial_tare = parameter["Initial tare"]
         self.unit_str = parameter["Mode"].split(" ")[-1]
         self.variable_str = parameter["Mode"].split(" ")[0]
+        self.acquisition = parameter.get("Acquisition", "Query per point")
+        self.drift_window = float(parameter.get("Drift window in s", 1.0))
+        self.drift_tolerance = float(parameter.get("Drift tolerance", 0.0))
 
 
         self.shortname = "Balance" # short name will be shown in the sequencer
@@ -160,9 +192,28 @@ def initialize(self):
         self.port.write("U %s" % self.unit_str)
         answer = self.port.read()
         # print("Unit:    ", answer)
-               
+
+    def configure(self):
+
+        if self.acquisition == "Continuous":
+            self.stream = weight_stream.WeightStream(
+                self.port.port,
+                self.unit_str,
+                drift_window=self.drift_window,
+                drift_tolerance=self.drift_tolerance,
+            )
+            self.start_stream()
+
+    def unconfigure(self):
+
+        if self.stream is not None:
+            self.stop_stream()
+            self.stream = None
      
     def measure(self):
+
+        if self.stream is not None:
+            return  # weights are collected in the background
         
         if self.is_read_stabilied:
             self.port.write("S") # send stable value
@@ -170,6 +221,10 @@ def measure(self):
             self.port.write("SI") # = Send Immediately (can be also unstable value)
         
     def read_result(self):
+
+        if self.stream is not None:
+            self.read_stream()
+            return
         
         weight = float('nan') # default value that will be overwritten, whenever the balance responds with a correct value
         
@@ -206,11 +261,54 @@ def call(self):
         
         
     def tare(self):
+        is_streaming = self.stream is not None and self.stream.running
+        if is_streaming:
+            self.stop_stream()
+
         self.port.write("T")
         answer = self.port.read()  
+
+        if is_streaming:
+            self.stream.clear()
+            self.start_stream()
         
     def zero(self):
+        is_streaming = self.stream is not None and self.stream.running
+        if is_streaming:
+            self.stop_stream()
+
         self.port.write("Z")
         answer = self.port.read()
 
+        if is_streaming:
+            self.stream.clear()
+            self.start_stream()
+
+    def start_stream(self):
+        """Let the balance send weights continuously and collect them in the background."""
+        self.port_timeout = self.port.port.timeout
+        self.port.port.timeout = self.stream_read_timeout
+        self.port.write("SIR")  # send immediately and repeat
+        self.stream.start()
+
+    def stop_stream(self):
+        """Stop the continuous output of the balance and the background thread."""
+        self.port.write("SI")  # any new weight command ends the repetition of SIR
+        self.stream.stop()
+        self.port.port.reset_input_buffer()  # discard the reply to SI and weights sent in the meantime
+        self.port.port.timeout = self.port_timeout
+
+    def read_stream(self):
+        """Take the latest weight collected in the background without waiting for a stable weight."""
+        latest = self.stream.wait_for_reading(self.port_timeout)
+        self.stream.check_error()
+
+        self.is_stable = self.stream.is_stable()
+
+        if self.is_read_stabilied:
+            stable = self.stream.last_stable
+            self.weight = stable.weight if stable is not None else float("nan")
+        else:
+            self.weight = latest.weight
+
              
\ No newline at end of file
@@ -0,0 +1,93 @@
+import importlib.util
+import time
+import unittest
+from pathlib import Path
+
+# Import the weight stream helper
+file_path = Path(__file__).resolve().parent.parent / "libraries" / "weight_stream.py"
+spec = importlib.util.spec_from_file_location("weight_stream", file_path)
+weight_stream = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(weight_stream)
+
+WeightReading = weight_stream.WeightReading
+
+
+class MockBalance:
+    """Serial port of a balance that sends the given lines, split into chunks like a port with a short timeout."""
+
+    def __init__(self, lines: list[str]) -> None:
+        """Prepare the chunks to be read, every line is split in two parts."""
+        self.chunks = []
+        for line in lines:
+            data = (line + "\r\n").encode("ascii")
+            self.chunks += [data[:5], data[5:]]
+
+    def readline(self) -> bytes:
+        """Return the next chunk or nothing after a short timeout."""
+        if self.chunks:
+            return self.chunks.pop(0)
+        time.sleep(0.01)
+        return b""
+
+
+class TestParseWeight(unittest.TestCase):
+    """Test parsing of weight responses."""
+
+    def test_weight(self) -> None:
+        """Stable and dynamic weights are parsed, other replies are ignored."""
+        self.assertEqual(weight_stream.parse_weight("S S     12.345 g", 1.0), WeightReading(1.0, 12.345, "g", True))  # noqa: PT009
+        self.assertFalse(weight_stream.parse_weight("S D   -0.002 kg").balance_stable)  # noqa: PT009
+        self.assertIsNone(weight_stream.parse_weight("S +"))  # noqa: PT009
+        self.assertIsNone(weight_stream.parse_weight("T S 0.000 g"))  # noqa: PT009
+
+
+class TestStability(unittest.TestCase):
+    """Test the host-side stability detection."""
+
+    def setUp(self) -> None:
+        """Create a stream with a drift window of 1 s and a tolerance of 0.01 g."""
+        self.stream = weight_stream.WeightStream(MockBalance([]), "g", drift_window=1.0, drift_tolerance=0.01)
+
+    def test_window_not_covered(self) -> None:
+        """The weight is not stable before readings cover the drift window."""
+        self.stream.add(WeightReading(0.0, 1.0, "g", True))
+        self.stream.add(WeightReading(0.5, 1.0, "g", True))
+        self.assertFalse(self.stream.is_stable())  # noqa: PT009
+        self.assertIsNone(self.stream.last_stable)  # noqa: PT009
+
+    def test_drift(self) -> None:
+        """The mean weight of a stable window is kept while the weight drifts afterwards."""
+        for i in range(11):
+            self.stream.add(WeightReading(0.1 * i, 1.0 + 0.001 * (i % 2), "g", True))
+        self.assertTrue(self.stream.is_stable())  # noqa: PT009
+        self.assertAlmostEqual(self.stream.last_stable.weight, 1.0005, places=4)  # noqa: PT009
+
+        self.stream.add(WeightReading(1.1, 1.5, "g", False))
+        self.assertFalse(self.stream.is_stable())  # noqa: PT009
+        self.assertAlmostEqual(self.stream.last_stable.weight, 1.0005, places=4)  # noqa: PT009
+
+    def test_wrong_unit(self) -> None:
+        """Readings in another unit are discarded."""
+        self.stream.add(WeightReading(0.0, 1.0, "kg", True))
+        self.assertIsNone(self.stream.latest())  # noqa: PT009
+
+
+class TestBackgroundReading(unittest.TestCase):
+    """Test collecting weights in the background thread."""
+
+    def test_stream(self) -> None:
+        """All complete lines are collected, also if split by the port timeout."""
+        stream = weight_stream.WeightStream(MockBalance(["S D 1.000 g", "S S 2.000 g", "ES"]), "g")
+        stream.start()
+        stream.wait_for_reading(1.0)
+        deadline = time.perf_counter() + 1.0
+        while len(stream.readings_since(0.0)) < 2 and time.perf_counter() < deadline:
+            time.sleep(0.01)
+        stream.stop()
+
+        self.assertFalse(stream.running)  # noqa: PT009
+        self.assertEqual([reading.weight for reading in stream.readings_since(0.0)], [1.0, 2.0])  # noqa: PT009
+
+
+if __name__ == "__main__":
+    unittest.main()
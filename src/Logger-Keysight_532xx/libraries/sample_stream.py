@@ -0,0 +1,90 @@
+# This Device Class is published under the terms of the MIT License.
+# Required Third Party Libraries, which are included in the Device Class
+# package for convenience purposes, may have a different license. You can
+# find those in the corresponding folders or contact the maintainer.
+#
+# MIT License
+#
+# Copyright (c) 2024 SweepMe! GmbH (sweep-me.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+from __future__ import annotations
+
+import numpy as np
+
+
+class SampleStream:
+    """Samples fetched from the reading memory of an instrument, indexed by the total number of samples received.
+
+    Samples are appended in blocks as they are fetched. Samples that are no longer needed can be discarded, so that
+    the memory is bounded by the number of samples of one measurement point.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        """Create an empty stream.
+
+        Args:
+            capacity: Initial size of the array, the array grows if needed.
+        """
+        self._data = np.empty(capacity)
+        self._length = 0  # number of samples kept in the array
+        self.first = 0
+        """Index of the first sample that is kept."""
+
+    @property
+    def total(self) -> int:
+        """Number of samples received since the stream was created."""
+        return self.first + self._length
+
+    def append(self, values: np.ndarray) -> None:
+        """Append new samples at the end of the stream."""
+        values = np.asarray(values, dtype=float).ravel()
+        required = self._length + len(values)
+        if required > len(self._data):
+            data = np.empty(max(required, 2 * len(self._data)))
+            data[: self._length] = self._data[: self._length]
+            self._data = data
+        self._data[self._length : required] = values
+        self._length = required
+
+    def discard_before(self, index: int) -> None:
+        """Discard all samples before the given index."""
+        count = min(max(index - self.first, 0), self._length)
+        self._data[: self._length - count] = self._data[count : self._length]
+        self._length -= count
+        self.first += count
+
+    def get(self, start: int, count: int) -> np.ndarray:
+        """Return a copy of the samples with index start to start + count - 1.
+
+        Args:
+            start: Index of the first sample.
+            count: Number of samples.
+
+        Returns:
+            Samples, fewer samples are returned if they have not been received yet.
+        """
+        if start < self.first:
+            msg = f"Sample {start} has already been discarded."
+            raise IndexError(msg)
+        offset = start - self.first
+        return self._data[offset : min(offset + count, self._length)].copy()
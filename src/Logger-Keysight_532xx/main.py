@@ -32,11 +32,35 @@
 # Device: Keysight 532xxA Frequency Counter
 
 
+import importlib.util
+import time
+from pathlib import Path
+
+import numpy as np
+
 from EmptyDeviceClass import EmptyDevice
 
+# Import the sample stream helper from the libraries folder of the driver
+_spec = importlib.util.spec_from_file_location(
+    "sample_stream", Path(__file__).resolve().parent / "libraries" / "sample_stream.py"
+)
+sample_stream = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(sample_stream)
+
 class Device(EmptyDevice):
     
-    description = """ """
+    description = """
+                  <p><strong>Modes:</strong></p>
+                  <ul>
+                  <li>Single gate: For each measurement point, the events are counted during one gate with the
+                  given integration time.</li>
+                  <li>Continuous: The counter runs timed gates one after another and stores the counts in its reading
+                  memory, which is fetched as binary data. For each measurement point, the counts of the given number
+                  of gates that start after the point began are summed. Thus, there is no dead time due to the bus
+                  communication and the counter is not reconfigured for each point. The counts of the single gates can
+                  be returned as trace.</li>
+                  </ul>
+                  """
 
     def __init__(self):
         
@@ -51,6 +75,8 @@ def __init__(self):
         self.port_manager = True
         self.port_types = ["USB", "GPIB", "TCPIP"]
         self.port_properties = {}
+
+        self.max_samples = 1000000  # size of the reading memory
         
         
         
@@ -60,6 +86,9 @@ def set_GUIparameter(self):
                         "Channel" : ["1", "2"],
                         "Integration time in s" : "0.05",
                         "Voltage threshhold in V" : "2.5",
+                        "Mode": ["Single gate", "Continuous"],
+                        "Gates per point": 10,
+                        "Return trace": False,
                         }
                         
         return GUIparameter
@@ -69,6 +98,16 @@ def get_GUIparameter(self, parameter={}):
         self.integration_time = float(parameter["Integration time in s"])  # conversion to s
         self.thresh = float(parameter["Voltage threshhold in V"])
         self.channel = str(parameter["Channel"])
+
+        self.is_continuous = parameter.get("Mode", "Single gate") == "Continuous"
+        self.gates_per_point = int(parameter.get("Gates per point", 10))
+        self.return_trace = parameter.get("Return trace", False)
+
+        if self.is_continuous and self.return_trace:
+            self.variables = ["Counts", "Integration time", "Counts per gate"]
+            self.units = ["#", "s", "#"]
+            self.plottype = [True, True, True]
+            self.savetype = [True, True, True]
         
         
     def connect(self):
@@ -96,20 +135,93 @@ def initialize(self):
         pass
         
     def configure(self):
+
+        if self.is_continuous:
+            self.start_continuous()
+
         # set threshhold level to count as a valid event
         self.port.write(":INPut:LEV%s:ABS %s" % (self.channel, self.thresh))
-            
+
+        if self.is_continuous:
+            self.port.write(":INIT")
+
+    def unconfigure(self):
+
+        if self.is_continuous:
+            self.port.write(":ABOR")
+            # the counter is not reset, so that a later run with 'Single gate' would get a binary block otherwise
+            self.port.write(":FORM ASC")
            
     def measure(self):
-        self.port.write(":MEASure:TOTalize:TIMed? %s,(@%s)" % (self.integration_time, self.channel))
+
+        if self.is_continuous:
+            # the gate that is running now started before the measurement point and is skipped
+            self.fetch_samples()
+            self.point_start = self.stream.total + 1
+            self.stream.discard_before(self.point_start)
+        else:
+            self.port.write(":MEASure:TOTalize:TIMed? %s,(@%s)" % (self.integration_time, self.channel))
 
 
     def call(self):
+
+        if self.is_continuous:
+            counts = self.wait_for_samples(self.point_start, self.gates_per_point)
+            results = [np.sum(counts), self.gates_per_point * self.integration_time]
+            if self.return_trace:
+                results.append(counts)
+            return results
+
         self.counts = self.port.read()
         self.integ = float(self.integration_time)
         # print(self.counts)
         return [self.counts, self.integ]
 
+    """ Here, convenience functions start """
+
+    def start_continuous(self):
+        """Configure timed gates that are stored in the reading memory as binary data."""
+
+        self.port.write(":CONF:TOT:TIM %s,(@%s)" % (self.integration_time, self.channel))
+        self.port.write(":TRIG:SOUR IMM")
+        self.port.write(":TRIG:COUN 1")
+        self.port.write(":SAMP:COUN %i" % self.max_samples)
+        self.port.write(":FORM REAL,64")
+
+        self.stream = sample_stream.SampleStream()
+        self.init_total = 0  # number of samples received when the measurement was started
+
+    def fetch_samples(self):
+        """Move all samples of the reading memory to the stream."""
+
+        self.port.write(":DATA:POIN?")
+        count = int(self.port.read())
+
+        if count > 0:
+            samples = self.port.port.query_binary_values(
+                ":R? %i" % count, datatype="d", is_big_endian=True, container=np.array,
+            )
+            self.stream.append(samples)
+
+        # the measurement stops once the number of samples is reached and is started again
+        if self.stream.total - self.init_total >= self.max_samples:
+            self.port.write(":INIT")
+            self.init_total = self.stream.total
+
+    def wait_for_samples(self, start, count):
+        """Fetch samples until the given samples have been received and return them."""
+
+        timeout = 10.0 + 2 * (count + 1) * self.integration_time
+        start_time = time.perf_counter()
+
+        while self.stream.total < start + count:
+            if time.perf_counter() - start_time > timeout:
+                raise Exception("Keysight 532xxA: %i gates not finished within %1.1f s." % (count, timeout))
+            time.sleep(min(self.integration_time, 0.1))
+            self.fetch_samples()
+
+        return self.stream.get(start, count)
+
 
     
     
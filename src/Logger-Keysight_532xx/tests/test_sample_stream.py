@@ -0,0 +1,46 @@
+import importlib.util
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Import the sample stream helper
+file_path = Path(__file__).resolve().parent.parent / "libraries" / "sample_stream.py"
+spec = importlib.util.spec_from_file_location("sample_stream", file_path)
+sample_stream = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(sample_stream)
+
+
+class TestSampleStream(unittest.TestCase):
+    """Test slicing of streamed samples."""
+
+    def test_slices_by_total_index(self) -> None:
+        """Samples are addressed by their index since the start, also after older samples are discarded."""
+        stream = sample_stream.SampleStream(capacity=4)
+        stream.append(np.arange(10))
+        stream.discard_before(6)
+        stream.append(np.arange(10, 13))
+
+        self.assertEqual(stream.total, 13)  # noqa: PT009
+        self.assertEqual(stream.first, 6)  # noqa: PT009
+        np.testing.assert_array_equal(stream.get(7, 4), [7, 8, 9, 10])
+
+    def test_incomplete_slice(self) -> None:
+        """Only samples received so far are returned."""
+        stream = sample_stream.SampleStream()
+        stream.append([1.0, 2.0])
+        self.assertEqual(len(stream.get(1, 5)), 1)  # noqa: PT009
+        self.assertEqual(len(stream.get(3, 5)), 0)  # noqa: PT009
+
+    def test_discarded_samples(self) -> None:
+        """Discarded samples cannot be returned."""
+        stream = sample_stream.SampleStream()
+        stream.append([1.0, 2.0, 3.0])
+        stream.discard_before(10)
+        self.assertEqual(stream.first, 3)  # noqa: PT009
+        with self.assertRaises(IndexError):  # noqa: PT027
+            stream.get(1, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
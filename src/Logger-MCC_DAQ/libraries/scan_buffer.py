@@ -0,0 +1,204 @@
+# This Device Class is published under the terms of the MIT License.
+# Required Third Party Libraries, which are included in the Device Class
+# package for convenience purposes, may have a different license. You can
+# find those in the corresponding folders or contact the maintainer.
+#
+# MIT License
+#
+# Copyright (c) 2024 SweepMe! GmbH (sweep-me.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from __future__ import annotations
+
+import ctypes
+import time
+from typing import Any
+
+import numpy as np
+
+COUNT_MODULUS = 2**32
+"""The sample count of continuous scans is a signed 32-bit integer that rolls over."""
+
+
+class ScanRingBuffer:
+    """Reads a continuous background scan of the Universal Library from its circular Windows buffer.
+
+    The buffer is allocated with 'scaled_win_buf_alloc', 'win_buf_alloc', or 'win_buf_alloc_32' and exposed as a
+    numpy array without copying. While the device fills the buffer, 'get_status' reports the total number of samples
+    transferred. The reader keeps track of the samples that have already been read, so that every sample is returned
+    exactly once, and raises a BufferError if the device has overwritten samples that have not been read yet.
+    """
+
+    def __init__(
+        self,
+        ul: Any,
+        board_num: int,
+        number_of_channels: int,
+        points_per_channel: int,
+        function_type: Any,
+        scaled: bool = True,
+        resolution: int = 16,
+    ) -> None:
+        """Allocate the buffer.
+
+        Args:
+            ul: The module 'mcculw.ul' or a stand-in with the same functions.
+            board_num: Board number of the device.
+            number_of_channels: Number of channels per scan.
+            points_per_channel: Number of scans that fit into the buffer.
+            function_type: FunctionType.AIFUNCTION, used to request the status of the scan.
+            scaled: If True, the buffer holds values in engineering units, otherwise raw counts.
+            resolution: Resolution of the ADC in bits, used to select the buffer type for raw counts.
+        """
+        self.ul = ul
+        self.board_num = board_num
+        self.number_of_channels = number_of_channels
+        self.function_type = function_type
+        self.size = number_of_channels * points_per_channel
+
+        if scaled:
+            self.memhandle = ul.scaled_win_buf_alloc(self.size)
+            ctype = ctypes.c_double
+        elif resolution <= 16:
+            self.memhandle = ul.win_buf_alloc(self.size)
+            ctype = ctypes.c_ushort
+        else:
+            self.memhandle = ul.win_buf_alloc_32(self.size)
+            ctype = ctypes.c_uint32
+
+        if not self.memhandle:
+            msg = "Unable to allocate a buffer for %i samples." % self.size
+            raise MemoryError(msg)
+
+        self.data = np.ctypeslib.as_array(ctypes.cast(self.memhandle, ctypes.POINTER(ctype)), shape=(self.size,))
+
+        self.is_running = False
+        self._last_count = 0  # count reported by the device at the last status request
+        self._acquired = 0  # samples acquired since the start, without roll-over
+        self._read = 0  # samples read since the start
+
+    def start(self, low_channel: int, high_channel: int, rate: int, ul_range: Any, options: int) -> int:
+        """Start the scan, the options must contain BACKGROUND and CONTINUOUS.
+
+        Args:
+            low_channel: First channel of the scan.
+            high_channel: Last channel of the scan.
+            rate: Scans per second.
+            ul_range: ULRange of the analog inputs.
+            options: ScanOptions of the scan.
+
+        Returns:
+            The actual number of scans per second.
+        """
+        if high_channel - low_channel + 1 != self.number_of_channels:
+            msg = "The buffer was allocated for %i channels, but %i channels are scanned." % (
+                self.number_of_channels,
+                high_channel - low_channel + 1,
+            )
+            raise ValueError(msg)
+
+        self._last_count = 0
+        self._acquired = 0
+        self._read = 0
+
+        actual_rate = self.ul.a_in_scan(
+            self.board_num, low_channel, high_channel, self.size, rate, ul_range, self.memhandle, options,
+        )
+        self.is_running = True
+        return actual_rate
+
+    def stop(self) -> None:
+        """Stop the scan."""
+        if self.is_running:
+            self.ul.stop_background(self.board_num, self.function_type)
+            self.is_running = False
+
+    def free(self) -> None:
+        """Stop the scan and release the buffer."""
+        self.stop()
+        if self.memhandle:
+            self.ul.win_buf_free(self.memhandle)
+            self.memhandle = None
+            self.data = None
+
+    def _update(self) -> None:
+        """Request the number of samples acquired by the device."""
+        _, count, _ = self.ul.get_status(self.board_num, self.function_type)
+        self._acquired += (count - self._last_count) % COUNT_MODULUS
+        self._last_count = count
+
+    def available(self) -> int:
+        """Return the number of complete scans that have not been read yet."""
+        self._update()
+
+        unread = self._acquired - self._read
+        if unread > self.size:
+            msg = "Scan buffer overrun, %i samples were overwritten before they were read." % (unread - self.size)
+            raise BufferError(msg)
+
+        return unread // self.number_of_channels
+
+    def skip(self) -> None:
+        """Discard all samples acquired so far, e.g. samples from before the last sweep step.
+
+        Samples that have been overwritten are discarded as well, so that skipping never raises a BufferError.
+        """
+        self._update()
+        self._read = self._acquired - self._acquired % self.number_of_channels
+
+    def read(self, number_of_scans: int | None = None, timeout: float = 10.0, interval: float = 0.005) -> np.ndarray:
+        """Return the next scans, waiting until they have been acquired.
+
+        Args:
+            number_of_scans: Number of scans to read, None to read all available scans without waiting.
+            timeout: Maximum time in s to wait for the scans.
+            interval: Time in s between two status requests while waiting.
+
+        Returns:
+            Array with one row per channel and one column per scan.
+        """
+        if number_of_scans is None:
+            number_of_scans = self.available()
+        elif number_of_scans * self.number_of_channels > self.size:
+            msg = "Cannot read %i scans at once from a buffer with %i scans." % (
+                number_of_scans,
+                self.size // self.number_of_channels,
+            )
+            raise ValueError(msg)
+
+        deadline = time.perf_counter() + timeout
+        while self.available() < number_of_scans:
+            if time.perf_counter() > deadline:
+                msg = "Only %i of %i scans were acquired within %s s." % (self.available(), number_of_scans, timeout)
+                raise TimeoutError(msg)
+            time.sleep(interval)
+
+        number_of_samples = number_of_scans * self.number_of_channels
+        start = self._read % self.size
+        end = start + number_of_samples
+        if end <= self.size:
+            samples = self.data[start:end].copy()
+        else:
+            samples = np.concatenate((self.data[start:], self.data[: end - self.size]))
+        self._read += number_of_samples
+
+        # the data is acquired scan by scan, i.e. interleaved by channel
+        return samples.reshape(number_of_scans, self.number_of_channels).T
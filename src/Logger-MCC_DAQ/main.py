@@ -30,19 +30,45 @@
 # Type: Logger
 # Device: Measurement Computing Corporation DAQ devices
 
+import importlib.util
+from pathlib import Path
+
+import numpy as np
 from pysweepme import addFolderToPATH
 from pysweepme.EmptyDeviceClass import EmptyDevice
 
 addFolderToPATH()
 
-# this driver needs libraries installed by the manufacturer software InstaCal
-try:
-    from mcculw import ul
-    from mcculw.device_info import DaqDeviceInfo
-    from mcculw.enums import AnalogInputMode, InterfaceType, ULRange
-except FileNotFoundError as e:
-    msg = "MCC DAQ Software missing. Install InstaCal and Universal Library (UL)."
-    raise ImportError(msg) from e
+# Import the scan buffer helper from the libraries folder of the driver
+_spec = importlib.util.spec_from_file_location(
+    "scan_buffer", Path(__file__).resolve().parent / "libraries" / "scan_buffer.py",
+)
+scan_buffer = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(scan_buffer)
+
+# mcculw is imported on first use in 'import_mcculw'
+ul = None
+DaqDeviceInfo = None
+AnalogInputMode = None
+InterfaceType = None
+ULRange = None
+FunctionType = None
+ScanOptions = None
+TrigType = None
+
+
+def import_mcculw() -> None:
+    """Import the Universal Library only when needed, as it loads the InstaCal DLLs."""
+    global ul, DaqDeviceInfo, AnalogInputMode, InterfaceType, ULRange, FunctionType, ScanOptions, TrigType  # noqa: PLW0603
+
+    # this driver needs libraries installed by the manufacturer software InstaCal
+    try:
+        from mcculw import ul
+        from mcculw.device_info import DaqDeviceInfo
+        from mcculw.enums import AnalogInputMode, FunctionType, InterfaceType, ScanOptions, TrigType, ULRange
+    except FileNotFoundError as e:
+        msg = "MCC DAQ Software missing. Install InstaCal and Universal Library (UL)."
+        raise ImportError(msg) from e
 
 
 class Device(EmptyDevice):
@@ -54,6 +80,15 @@ class Device(EmptyDevice):
 
                 <p>If your device supports additional AI ranges, they can be added by extending the
                 <code>available_ai_ranges</code> dictionary.</p>
+
+                <p>Acquisition:</p>
+                <ul>
+                <li>Single sample: each channel is read once per measurement point.</li>
+                <li>Scan: all channels between the lowest and highest selected channel are sampled by the device
+                with the given sample rate in a continuous background scan. For each measurement point, the given
+                number of samples is taken after the sweep step and returned as average or as arrays.</li>
+                <li>Trigger: the scan starts at an edge of the external trigger input.</li>
+                </ul>
                 """
 
     def __init__(self):
@@ -72,20 +107,36 @@ def __init__(self):
             "Differential": "DIFFERENTIAL",
         }
 
-        # AI Range
+        # AI Range, names of the ULRange members
         self.available_ai_ranges = {
-            "10 V": ULRange.BIP10VOLTS,
-            "5 V": ULRange.BIP5VOLTS,
-            "2 V": ULRange.BIP2VOLTS,
-            "1 V": ULRange.BIP1VOLTS,
+            "10 V": "BIP10VOLTS",
+            "5 V": "BIP5VOLTS",
+            "2 V": "BIP2VOLTS",
+            "1 V": "BIP1VOLTS",
         }
         self.ai_range = None
 
+        self.acquisition_modes = ["Single sample", "Scan: average", "Scan: arrays"]
+
+        # names of the TrigType members
+        self.trigger_types = {
+            "None": None,
+            "External rising edge": "TRIG_POS_EDGE",
+            "External falling edge": "TRIG_NEG_EDGE",
+        }
+
+        self.buffer_time = 10.0  # time in s that fits into the ring buffer of the scan
+        self.scan_buffer = None
+
     def set_GUIparameter(self):
         gui_parameter = {
             "Analog input mode": list(self.measurement_modes.keys()),
             "Analog input channels": "1, 2",
             "Analog input range": list(self.available_ai_ranges.keys()),
+            "Acquisition": self.acquisition_modes,
+            "Sample rate in Hz": 1000,
+            "Samples per point": 100,
+            "Trigger": list(self.trigger_types.keys()),
         }
 
         return gui_parameter
@@ -101,9 +152,21 @@ def get_GUIparameter(self, parameter):
             self.variables.append("AI%d" % self.analog_inputs[i])
             self.units.append("V")
 
-        self.ai_range = self.available_ai_ranges[parameter["Analog input range"]]
+        self.ai_range_name = self.available_ai_ranges[parameter["Analog input range"]]
+
+        self.acquisition = parameter.get("Acquisition", "Single sample")
+        self.is_scan = self.acquisition.startswith("Scan")
+        self.sample_rate = int(float(parameter.get("Sample rate in Hz", 1000)))
+        self.samples_per_point = int(float(parameter.get("Samples per point", 100)))
+        self.trigger_type_name = self.trigger_types[parameter.get("Trigger", "None")]
+
+        if self.acquisition == "Scan: arrays":
+            self.variables.append("Time")
+            self.units.append("s")
 
     def find_ports(self):
+        import_mcculw()
+
         ul.ignore_instacal()
         ul.release_daq_device(self.board_num)
 
@@ -115,6 +178,10 @@ def find_ports(self):
             return ["No device was found"]
 
     def connect(self):
+        import_mcculw()
+
+        self.ai_range = ULRange[self.ai_range_name]
+
         ul.ignore_instacal()
 
         inventory = ul.get_daq_device_inventory(InterfaceType.ANY)
@@ -149,11 +216,27 @@ def initialize(self):
             msg = "The DAQ device does not support this AI range."
             raise Exception(msg)
 
+        if self.is_scan and not self.ai_info.supports_scan:
+            msg = "The DAQ device does not support analog input scans."
+            raise Exception(msg)
+
     def configure(self):
         # Input mode
         ul.a_input_mode(self.board_num, AnalogInputMode[self.analog_input_mode])
 
+        if self.is_scan:
+            self.start_scan()
+
+    def unconfigure(self):
+        if self.scan_buffer is not None:
+            self.scan_buffer.free()
+            self.scan_buffer = None
+
     def measure(self):
+        if self.is_scan:
+            self.measure_scan()
+            return
+
         self.data = []
 
         for ai in self.analog_inputs:
@@ -176,6 +259,74 @@ def measure(self):
     def call(self):
         return self.data
 
+    def start_scan(self):
+        """Start a continuous background scan of all channels between the lowest and highest selected channel."""
+        self.low_channel = min(self.analog_inputs)
+        self.high_channel = max(self.analog_inputs)
+        number_of_channels = self.high_channel - self.low_channel + 1
+        self.scan_rows = [ai - self.low_channel for ai in self.analog_inputs]
+
+        supported_options = self.ai_info.supported_scan_options
+        options = ScanOptions.BACKGROUND | ScanOptions.CONTINUOUS
+
+        # scaled data is returned in V, otherwise the raw counts are converted after reading
+        self.is_scaled = bool(supported_options & ScanOptions.SCALEDATA)
+        if self.is_scaled:
+            options |= ScanOptions.SCALEDATA
+
+        if self.trigger_type_name is not None:
+            if not supported_options & ScanOptions.EXTTRIGGER:
+                msg = "The DAQ device does not support an external trigger for analog input scans."
+                raise Exception(msg)
+            ul.set_trigger(self.board_num, TrigType[self.trigger_type_name], 0, 0)
+            options |= ScanOptions.EXTTRIGGER
+
+        # the buffer holds several seconds of data, but at least four measurement points
+        points_per_channel = max(int(self.sample_rate * self.buffer_time), 4 * self.samples_per_point)
+
+        self.scan_buffer = scan_buffer.ScanRingBuffer(
+            ul,
+            self.board_num,
+            number_of_channels,
+            points_per_channel,
+            FunctionType.AIFUNCTION,
+            scaled=self.is_scaled,
+            resolution=self.ai_info.resolution,
+        )
+        self.actual_sample_rate = self.scan_buffer.start(
+            self.low_channel, self.high_channel, self.sample_rate, self.ai_range, options,
+        )
+
+    def measure_scan(self):
+        """Read the samples per point acquired after the sweep step and return averages or arrays per channel."""
+        # samples acquired before the sweep step are discarded
+        self.scan_buffer.skip()
+
+        # without trigger, a timeout of twice the acquisition time plus one second is used
+        timeout = 2 * self.samples_per_point / self.actual_sample_rate + 1.0
+        if self.trigger_type_name is not None:
+            timeout += 60.0
+        samples = self.scan_buffer.read(self.samples_per_point, timeout=timeout)[self.scan_rows]
+
+        if not self.is_scaled:
+            samples = self.counts_to_volts(samples)
+
+        if self.acquisition == "Scan: average":
+            self.data = list(np.mean(samples, axis=1))
+        else:
+            self.data = list(samples) + [np.arange(self.samples_per_point) / self.actual_sample_rate]
+
+    def counts_to_volts(self, counts):
+        """Convert raw counts to V using the linear relation of the AI range."""
+        full_scale = 2**self.ai_info.resolution - 1
+        if self.ai_info.resolution <= 16:
+            zero = ul.to_eng_units(self.board_num, self.ai_range, 0)
+            span = ul.to_eng_units(self.board_num, self.ai_range, full_scale) - zero
+        else:
+            zero = ul.to_eng_units_32(self.board_num, self.ai_range, 0)
+            span = ul.to_eng_units_32(self.board_num, self.ai_range, full_scale) - zero
+        return zero + counts.astype(float) * (span / full_scale)
+
     def create_device_list(self):
         device_list = []
         inventory = ul.get_daq_device_inventory(InterfaceType.ANY)
@@ -0,0 +1,67 @@
+"""Stand-in for 'mcculw.ul' to test continuous background scans without hardware.
+
+Only the functions used for analog input scans are provided. The scan runs with the requested rate in real time and
+the buffer is filled whenever the status is requested. The value of a sample is 'scan index + channel / 100', so that
+missing or duplicated samples can be detected.
+"""
+
+import ctypes
+import time
+
+
+class MockUL:
+    """Emulates a background scan that writes into a circular buffer."""
+
+    def __init__(self, packet_size=1):
+        """Initialize without a running scan.
+
+        Args:
+            packet_size: Number of scans that are transferred at once, like USB packets of real devices.
+        """
+        self.packet_size = packet_size
+        self.buffers = {}
+        self.scan = None
+
+    def scaled_win_buf_alloc(self, num_points):
+        return self._allocate(ctypes.c_double, num_points)
+
+    def win_buf_alloc(self, num_points):
+        return self._allocate(ctypes.c_ushort, num_points)
+
+    def win_buf_free(self, memhandle):
+        del self.buffers[memhandle]
+
+    def a_in_scan(self, board_num, low_chan, high_chan, num_points, rate, ul_range, memhandle, options):
+        self.scan = {
+            "channels": high_chan - low_chan + 1,
+            "size": num_points,
+            "rate": rate,
+            "buffer": self.buffers[memhandle],
+            "start": time.perf_counter(),
+            "written": 0,
+        }
+        return rate
+
+    def get_status(self, board_num, function_type):
+        if self.scan is None:
+            return 0, 0, -1
+
+        scan = self.scan
+        scans = int((time.perf_counter() - scan["start"]) * scan["rate"])
+        scans -= scans % self.packet_size
+        samples = scans * scan["channels"]
+
+        for index in range(scan["written"], samples):
+            scan["buffer"][index % scan["size"]] = index // scan["channels"] + (index % scan["channels"]) / 100
+        scan["written"] = samples
+
+        return 1, samples, (samples - scan["channels"]) % scan["size"] if samples else -1
+
+    def stop_background(self, board_num, function_type):
+        self.scan = None
+
+    def _allocate(self, ctype, num_points):
+        array = (ctype * num_points)()
+        memhandle = ctypes.addressof(array)
+        self.buffers[memhandle] = array
+        return memhandle
@@ -0,0 +1,70 @@
+import importlib.util
+import sys
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Import the scan buffer helper and the stand-in for mcculw.ul
+file_path = Path(__file__).resolve().parent.parent / "libraries" / "scan_buffer.py"
+spec = importlib.util.spec_from_file_location("scan_buffer", file_path)
+scan_buffer = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(scan_buffer)
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from mock_ul import MockUL  # noqa: E402
+
+AIFUNCTION = 1
+
+
+class TestScanRingBuffer(unittest.TestCase):
+    """Test reading a continuous scan from the circular buffer."""
+
+    def setUp(self) -> None:
+        """Create a buffer for three channels that holds 100 scans."""
+        self.ul = MockUL(packet_size=4)
+        self.buffer = scan_buffer.ScanRingBuffer(self.ul, 0, 3, 100, AIFUNCTION)
+        self.addCleanup(self.buffer.free)
+
+    def test_scans_are_continuous(self) -> None:
+        """Reading several times wraps around the buffer without missing or duplicating scans."""
+        self.buffer.start(0, 2, 2000, None, 0)
+        blocks = [self.buffer.read(70, timeout=2.0) for _ in range(4)]
+        data = np.concatenate(blocks, axis=1)
+
+        self.assertEqual(data.shape, (3, 280))  # noqa: PT009
+        np.testing.assert_allclose(data[0], np.arange(280))
+        np.testing.assert_allclose(data[2], np.arange(280) + 0.02)
+
+    def test_skip(self) -> None:
+        """Skipped scans are not returned."""
+        self.buffer.start(0, 2, 2000, None, 0)
+        time.sleep(0.02)
+        self.buffer.skip()
+        first_scan = self.buffer.read(1, timeout=1.0)[0, 0]
+        self.assertGreaterEqual(first_scan, 20)  # noqa: PT009
+
+    def test_overrun(self) -> None:
+        """Scans that are overwritten before they are read raise an error."""
+        self.buffer.start(0, 2, 10000, None, 0)
+        time.sleep(0.05)
+        with self.assertRaises(BufferError):  # noqa: PT027
+            self.buffer.read(10)
+
+    def test_skip_after_overrun(self) -> None:
+        """Skipping discards overwritten scans without an error and reading continues with new scans."""
+        self.buffer.start(0, 2, 10000, None, 0)
+        time.sleep(0.05)
+        self.buffer.skip()
+        data = self.buffer.read(10, timeout=1.0)
+        np.testing.assert_allclose(np.diff(data[0]), np.ones(9))
+
+    def test_wrong_number_of_channels(self) -> None:
+        """The scanned channels must match the buffer."""
+        with self.assertRaises(ValueError):  # noqa: PT027
+            self.buffer.start(0, 3, 1000, None, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+# This Device Class is published under the terms of the MIT License.
+# Required Third Party Libraries, which are included in the Device Class
+# package for convenience purposes, may have a different license. You can
+# find those in the corresponding folders or contact the maintainer.
+#
+# MIT License
+#
+# Copyright (c) 2024 SweepMe! GmbH (sweep-me.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+from __future__ import annotations
+
+import threading
+import time
+
+import numpy as np
+
+FULL_SCALE = 32768.0  # full scale of 16 bit samples
+
+
+class AudioRingBuffer:
+    """Preallocated ring buffer that is filled by the callback of an audio input stream.
+
+    The callback only copies the received frames into the buffer, so that no samples are lost while the analysis of
+    a measurement point is running. The buffer keeps the most recent frames and the number of frames received since
+    the start, so that a reader can request the frames of a given time window.
+    """
+
+    def __init__(self, number_of_frames: int, channels: int, dtype: np.dtype | str = np.int16) -> None:
+        """Allocate the buffer.
+
+        Args:
+            number_of_frames: Number of frames the buffer can hold, each frame contains one sample per channel.
+            channels: Number of interleaved channels.
+            dtype: Sample format of the stream.
+        """
+        self.channels = channels
+        self.data = np.zeros((number_of_frames, channels), dtype=dtype)
+        self.total_frames = 0
+        """Number of frames written since the buffer was created or cleared."""
+
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        """Number of frames the buffer can hold."""
+        return self.data.shape[0]
+
+    def clear(self) -> None:
+        """Discard all frames."""
+        with self._lock:
+            self.total_frames = 0
+
+    def write(self, raw: bytes) -> None:
+        """Append interleaved frames as received by the stream callback.
+
+        Args:
+            raw: Interleaved samples of all channels.
+        """
+        frames = np.frombuffer(raw, dtype=self.data.dtype).reshape(-1, self.channels)
+        number_of_frames = len(frames)
+        if number_of_frames > self.capacity:
+            frames = frames[-self.capacity :]
+
+        with self._lock:
+            start = (self.total_frames + number_of_frames - len(frames)) % self.capacity
+            first = min(len(frames), self.capacity - start)
+            self.data[start : start + first] = frames[:first]
+            self.data[: len(frames) - first] = frames[first:]
+            self.total_frames += number_of_frames
+
+    def read(
+        self,
+        start_frame: int,
+        number_of_frames: int,
+        timeout: float = 10.0,
+        interval: float = 0.005,
+    ) -> np.ndarray:
+        """Wait until the requested frames have been received and return a copy of them.
+
+        Args:
+            start_frame: Index of the first frame counted from the start of the stream, see 'total_frames'.
+            number_of_frames: Number of frames to return.
+            timeout: Maximum time in s to wait for the frames.
+            interval: Time in s between two checks for new frames.
+
+        Returns:
+            Array with shape (number_of_frames, channels).
+        """
+        if number_of_frames > self.capacity:
+            msg = "The number of frames requested exceeds the size of the buffer."
+            raise ValueError(msg)
+
+        end_frame = start_frame + number_of_frames
+        deadline = time.perf_counter() + timeout
+        while self.total_frames < end_frame:
+            if time.perf_counter() > deadline:
+                msg = "Audio stream did not deliver the requested frames in time."
+                raise TimeoutError(msg)
+            time.sleep(interval)
+
+        with self._lock:
+            if self.total_frames - start_frame > self.capacity:
+                msg = "Frames have been overwritten before they were read, increase the buffer size."
+                raise BufferError(msg)
+            indices = np.arange(start_frame, end_frame) % self.capacity
+            return self.data[indices]
+
+
+def rms(samples: np.ndarray) -> float:
+    """Return the root mean square of all samples."""
+    samples = samples.astype(float)
+    return float(np.sqrt(np.mean(samples * samples)))
+
+
+def peak(samples: np.ndarray) -> float:
+    """Return the largest absolute value of all samples."""
+    return float(np.max(np.abs(samples.astype(float))))
+
+
+def level(value: float, full_scale_level: float, full_scale: float = FULL_SCALE) -> float:
+    """Convert an RMS value to a sound pressure level.
+
+    Args:
+        value: RMS value in units of the samples.
+        full_scale_level: Level in dB SPL of a signal with an RMS value equal to full scale, from a calibration of the
+            microphone.
+        full_scale: Full scale of the samples.
+
+    Returns:
+        Level in dB SPL, -inf for silence.
+    """
+    with np.errstate(divide="ignore"):
+        return float(full_scale_level + 20.0 * np.log10(value / full_scale))
+
+
+def band_centers(rate: float, fraction: int = 1, reference: float = 1000.0) -> np.ndarray:
+    """Return the center frequencies of octave or fractional octave bands between 20 Hz and the Nyquist frequency.
+
+    Args:
+        rate: Sample rate in Hz.
+        fraction: Number of bands per octave, e.g. 1 for octave bands and 3 for third-octave bands.
+        reference: Center frequency in Hz of the band that all other bands are derived from.
+
+    Returns:
+        Center frequencies in Hz.
+    """
+    half_width = 2.0 ** (1.0 / (2 * fraction))
+    low = int(np.ceil(fraction * np.log2(20.0 / reference)))
+    high = int(np.floor(fraction * np.log2(rate / 2.0 / half_width / reference)))
+    return reference * 2.0 ** (np.arange(low, high + 1) / fraction)
+
+
+def band_spectrum(samples: np.ndarray, rate: float, fraction: int = 1) -> tuple[np.ndarray, np.ndarray]:
+    """Calculate the mean square value of the samples in octave or fractional octave bands.
+
+    The power spectrum of a Hann windowed FFT is summed over all bins of a band. It is scaled so that the sum of all
+    bands equals the mean square value of the samples if the bands cover the whole spectrum. For several channels,
+    the spectra of all channels are averaged.
+
+    Args:
+        samples: Array with shape (frames,) or (frames, channels).
+        rate: Sample rate in Hz.
+        fraction: Number of bands per octave, e.g. 1 for octave bands and 3 for third-octave bands.
+
+    Returns:
+        Center frequencies in Hz and mean square values in units of the samples squared.
+    """
+    samples = samples.astype(float)
+    if samples.ndim == 1:
+        samples = samples[:, np.newaxis]
+    number_of_frames = samples.shape[0]
+
+    window = np.hanning(number_of_frames)
+    spectrum = np.fft.rfft((samples - samples.mean(axis=0)) * window[:, np.newaxis], axis=0)
+    power = np.mean(np.abs(spectrum) ** 2, axis=1) / (number_of_frames * np.sum(window**2))
+    # one-sided spectrum: all bins except DC and Nyquist contain the power of the negative frequencies as well
+    power[1 : (number_of_frames + 1) // 2] *= 2.0
+
+    frequencies = np.fft.rfftfreq(number_of_frames, 1.0 / rate)
+    centers = band_centers(rate, fraction)
+    half_width = 2.0 ** (1.0 / (2 * fraction))
+    edges = np.searchsorted(frequencies, np.concatenate((centers / half_width, centers[-1:] * half_width)))
+    cumulative = np.concatenate(([0.0], np.cumsum(power)))
+    return centers, cumulative[edges[1:]] - cumulative[edges[:-1]]
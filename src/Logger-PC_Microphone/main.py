@@ -34,20 +34,35 @@
 """
 This Device Class is an example how to interact with a microphone.
 Duration is the time per waveform snippet that is used to calculate the rms value.
+
+The audio stream is opened once during configure and runs in the background. Its callback writes all samples into
+a ring buffer, and for each measurement point the samples of the given duration after the sweep step are analyzed.
+The sound level in dB SPL needs a calibration of the microphone, i.e. the level of a signal whose RMS value equals
+full scale. Optionally, the level is returned for octave or third-octave bands.
 """
 
 import os, sys
 import time
+import importlib.util
+from pathlib import Path
+
+import numpy as np
 
 import FolderManager
 FolderManager.addFolderToPATH()
 # needed to load pyaudio libraray from libs folder of this DC
 import pyaudio
 import wave
-import audioop
 
 from EmptyDeviceClass import EmptyDevice
 
+# Import the audio analysis helper from the libraries folder of the driver
+_spec = importlib.util.spec_from_file_location(
+    "audio_analysis", Path(__file__).resolve().parent / "libraries" / "audio_analysis.py"
+)
+audio_analysis = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(audio_analysis)
+
 class Device(EmptyDevice):
 
     def __init__(self):
@@ -67,12 +82,26 @@ def __init__(self):
         self.RATE = 44100
         self.RECORD_SECONDS = 0.03
         self.WAVE_OUTPUT_FILENAME = self.tempfolder + os.sep + "mic%i_%s.wav"
+
+        self.BUFFER_SECONDS = 10.0  # minimum time that fits into the ring buffer of the stream
+
+        # number of bands per octave
+        self.spectrum_modes = {
+            "None": 0,
+            "Octave bands": 1,
+            "Third-octave bands": 3,
+        }
+
+        self.stream = None
+        self.buffer = None
         
     def set_GUIparameter(self):
     
         GUIparameter = {
                         "Channels": 2,
                         "Duration": 0.5,
+                        "Level at full scale in dB SPL": 120.0,
+                        "Spectrum": list(self.spectrum_modes.keys()),
                         }
                         
         return GUIparameter
@@ -86,6 +115,20 @@ def get_GUIparameter(self, parameter = {}):
             self.RECORD_SECONDS = float(parameter["Duration"])
 
         self.CHANNELS = int(parameter.get("Channels", 2))
+
+        self.full_scale_level = float(parameter.get("Level at full scale in dB SPL", 120.0))
+        self.bands_per_octave = self.spectrum_modes[parameter.get("Spectrum", "None")]
+
+        self.variables = ["Volume", "Peak", "Sound level"]
+        self.units = ["", "", "dB SPL"]
+        self.plottype = [True, True, True]
+        self.savetype = [False, True, True]
+
+        if self.bands_per_octave:
+            self.variables += ["Band frequency", "Band level"]
+            self.units += ["Hz", "dB SPL"]
+            self.plottype += [True, True]
+            self.savetype += [True, True]
          
     def find_Ports(self):
         mics = []
@@ -110,43 +153,67 @@ def poweron(self):
         pass
 
     def connect(self):
-        pass          
-        
-    def start(self):
-        self.count += 1
+        pass
+
+    def configure(self):
+        self.number_of_frames = max(int(self.RATE * self.RECORD_SECONDS), 1)
+
+        # the buffer holds several seconds, but at least four measurement points
+        buffer_frames = max(int(self.RATE * self.BUFFER_SECONDS), 4 * self.number_of_frames)
+        self.buffer = audio_analysis.AudioRingBuffer(buffer_frames, self.CHANNELS, np.int16)
+
         self.stream = self.p.open(
             format=self.FORMAT,
             channels=self.CHANNELS,
             rate=self.RATE,
             input=True,
             frames_per_buffer=self.CHUNK,
-            input_device_index = self.dev_index
+            input_device_index = self.dev_index,
+            stream_callback=self.stream_callback,
             )
+        self.stream.start_stream()
+
+    def unconfigure(self):
+        if self.stream is not None:
+            self.stream.stop_stream()
+            self.stream.close()
+            self.stream = None
+
+    def stream_callback(self, in_data, frame_count, time_info, status):
+        """Called by PortAudio in a separate thread whenever new samples are available."""
+        self.buffer.write(in_data)
+        return None, pyaudio.paContinue
+        
+    def start(self):
+        self.count += 1
      
     def apply(self):
         pass
              
     def measure(self):
-        self.frames = []
+        # only samples received after the sweep step are used
+        start_frame = self.buffer.total_frames
+        timeout = self.RECORD_SECONDS + 1.0
+        self.samples = self.buffer.read(start_frame, self.number_of_frames, timeout=timeout)
 
-        for i in range(0, int(self.RATE / self.CHUNK * self.RECORD_SECONDS)):
-            data = self.stream.read(self.CHUNK)
-            self.frames.append(data)
-        
-        self.rms = audioop.rms(self.frames[-1], 2)    # calculation of the volume
-            
     def call(self):
-        self.stream.stop_stream()
-        self.stream.close()
-        
-        return [self.rms]    
+        rms = audio_analysis.rms(self.samples)
+        peak = audio_analysis.peak(self.samples)
+        results = [rms, peak, audio_analysis.level(rms, self.full_scale_level)]
+
+        if self.bands_per_octave:
+            centers, mean_squares = audio_analysis.band_spectrum(self.samples, self.RATE, self.bands_per_octave)
+            band_levels = [audio_analysis.level(np.sqrt(value), self.full_scale_level) for value in mean_squares]
+            results += [centers, np.array(band_levels)]
+
+        return results
         
     def finish(self):
         wf = wave.open(self.WAVE_OUTPUT_FILENAME %(self.dev_index, self.count), 'wb')
         wf.setnchannels(self.CHANNELS)
         wf.setsampwidth(self.p.get_sample_size(self.FORMAT))
         wf.setframerate(self.RATE)
-        wf.writeframes(b''.join(self.frames))
+        wf.writeframes(self.samples.tobytes())
         wf.close()
 
         
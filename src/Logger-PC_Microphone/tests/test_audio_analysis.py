@@ -0,0 +1,70 @@
+import importlib.util
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Import the audio analysis helper
+file_path = Path(__file__).resolve().parent.parent / "libraries" / "audio_analysis.py"
+spec = importlib.util.spec_from_file_location("audio_analysis", file_path)
+audio_analysis = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(audio_analysis)
+
+
+def frames(start: int, number_of_frames: int, channels: int = 2) -> np.ndarray:
+    """Return int16 frames whose value is the frame index plus the channel index."""
+    return (np.arange(start, start + number_of_frames)[:, np.newaxis] + np.arange(channels)).astype(np.int16)
+
+
+class TestAudioRingBuffer(unittest.TestCase):
+    """Test the ring buffer that is filled by the stream callback."""
+
+    def test_wrap_around(self) -> None:
+        """Frames are returned in order after the write position wrapped around."""
+        buffer = audio_analysis.AudioRingBuffer(100, 2)
+        for start in range(0, 240, 40):
+            buffer.write(frames(start, 40).tobytes())
+
+        np.testing.assert_array_equal(buffer.read(170, 60, timeout=0.0), frames(170, 60))
+        self.assertEqual(buffer.total_frames, 240)  # noqa: PT009
+
+    def test_overrun(self) -> None:
+        """Reading frames that have been overwritten raises an error."""
+        buffer = audio_analysis.AudioRingBuffer(100, 2)
+        buffer.write(frames(0, 150).tobytes())
+        with self.assertRaises(BufferError):  # noqa: PT027
+            buffer.read(10, 50, timeout=0.0)
+
+    def test_timeout(self) -> None:
+        """A timeout is raised if the stream does not deliver enough frames."""
+        buffer = audio_analysis.AudioRingBuffer(100, 2)
+        buffer.write(frames(0, 10).tobytes())
+        with self.assertRaises(TimeoutError):  # noqa: PT027
+            buffer.read(0, 20, timeout=0.01)
+
+
+class TestAnalysis(unittest.TestCase):
+    """Test the level and spectrum calculation."""
+
+    def setUp(self) -> None:
+        """Create one second of a 1 kHz sine at half full scale."""
+        self.rate = 48000
+        time = np.arange(self.rate) / self.rate
+        self.samples = (16384 * np.sin(2 * np.pi * 1000 * time)).astype(np.int16)
+
+    def test_levels(self) -> None:
+        """RMS, peak, and level of a sine."""
+        rms = audio_analysis.rms(self.samples)
+        self.assertAlmostEqual(rms, 16384 / np.sqrt(2), delta=1.0)  # noqa: PT009
+        self.assertAlmostEqual(audio_analysis.peak(self.samples), 16384, delta=1.0)  # noqa: PT009
+        self.assertAlmostEqual(audio_analysis.level(rms, 120.0), 120.0 - 20 * np.log10(2 * np.sqrt(2)), places=2)  # noqa: PT009
+
+    def test_band_spectrum(self) -> None:
+        """The power of a sine is found in the band around its frequency and sums up to the mean square value."""
+        centers, mean_squares = audio_analysis.band_spectrum(self.samples, self.rate, fraction=3)
+        self.assertAlmostEqual(centers[np.argmax(mean_squares)], 1000.0)  # noqa: PT009
+        self.assertAlmostEqual(np.sum(mean_squares) / audio_analysis.rms(self.samples) ** 2, 1.0, places=3)  # noqa: PT009
+
+
+if __name__ == "__main__":
+    unittest.main()
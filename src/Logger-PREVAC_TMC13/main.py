@@ -30,15 +30,18 @@
 # Device: PREVAC TMC13
 from __future__ import annotations
 
-# Import the communication interface
-from imp import load_source
+import importlib.util
 from pathlib import Path
 
 from pysweepme.EmptyDeviceClass import EmptyDevice
 from pysweepme.ErrorMessage import debug
 
-prevac_protocol_path = str(Path(__file__).resolve().parent / "libraries" / "prevac_protocol.py")
-PrevacCommunication = load_source("prevac_protocol", prevac_protocol_path)
+# Import the communication interface, 'imp' is deprecated and removed in Python 3.12
+_spec = importlib.util.spec_from_file_location(
+    "prevac_protocol", Path(__file__).resolve().parent / "libraries" / "prevac_protocol.py",
+)
+PrevacCommunication = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(PrevacCommunication)
 
 
 class Device(EmptyDevice):
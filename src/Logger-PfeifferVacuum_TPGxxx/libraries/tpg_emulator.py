@@ -0,0 +1,190 @@
+# This Device Class is published under the terms of the MIT License.
+# Required Third Party Libraries, which are included in the Device Class
+# package for convenience purposes, may have a different license. You can
+# find those in the corresponding folders or contact the maintainer.
+#
+# MIT License
+#
+# Copyright (c) 2024 SweepMe! GmbH (sweep-me.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+from __future__ import annotations
+
+import math
+import time
+
+ACK = b"\x06"
+NAK = b"\x15"
+ENQ = 0x05
+ETX = 0x03
+
+CONTINUOUS_INTERVALS = {0: 0.1, 1: 1.0, 2: 60.0}
+"""Interval in s of the continuous output for the parameter of 'COM'."""
+
+
+class TPGEmulator:
+    """Serial port stand-in that behaves like a Pfeiffer Vacuum TPG controller, e.g. to test the driver without gauges.
+
+    Mnemonics are terminated by CR or LF and acknowledged with ACK or NAK. The reply is sent after ENQ has been
+    received, ETX resets the interface. The emulator knows 'PRx', 'PRX', and the continuous mode 'COM'.
+
+    The pressures follow a pump-down curve that decays exponentially from the start pressure to the base pressure.
+    """
+
+    def __init__(
+        self,
+        channels: int = 6,
+        supports_prx: bool = True,
+        start_pressure: float = 1000.0,
+        base_pressure: float = 1e-6,
+        time_constant: float = 10.0,
+        timeout: float = 0.1,
+    ) -> None:
+        """Initialize the emulator.
+
+        Args:
+            channels: Number of gauges, e.g. 1, 2, or 6.
+            supports_prx: False to emulate a controller that does not know 'PRX'.
+            start_pressure: Pressure in mbar at the creation of the emulator.
+            base_pressure: Pressure in mbar that is reached after a long time.
+            time_constant: Time in s of the exponential decay of the pressure.
+            timeout: Read timeout in s, like the timeout of a serial port.
+        """
+        self.channels = channels
+        self.supports_prx = supports_prx
+        self.start_pressure = start_pressure
+        self.base_pressure = base_pressure
+        self.time_constant = time_constant
+        self.timeout = timeout
+
+        self.start_time = time.perf_counter()
+        self.status = [0] * channels
+        """Status of each gauge, e.g. 5 for 'No sensor'."""
+
+        self.rx_buffer = bytearray()
+        self.tx_buffer = bytearray()
+        self.pending = ""  # acknowledged mnemonic that is executed with ENQ
+
+        self.continuous_interval: float | None = None
+        self.next_output = 0.0
+
+        self.received_mnemonics: list[str] = []
+        """All mnemonics received, e.g. to count the transactions in tests."""
+
+    @property
+    def in_waiting(self) -> int:
+        """Number of bytes that can be read."""
+        self._update()
+        return len(self.tx_buffer)
+
+    def write(self, data: bytes) -> int:
+        """Receive bytes, ENQ and ETX are handled immediately."""
+        self._update()
+        for char in data:
+            if char == ENQ:
+                self._enquire()
+            elif char == ETX:
+                self.rx_buffer.clear()
+                self.pending = ""
+                self.continuous_interval = None
+            elif char in b"\r\n":
+                mnemonic = self.rx_buffer.decode("ascii").strip().upper()
+                self.rx_buffer.clear()
+                if mnemonic:
+                    self._receive(mnemonic)
+            else:
+                self.rx_buffer.append(char)
+        return len(data)
+
+    def readline(self) -> bytes:
+        """Return the next line or the bytes received until the timeout."""
+        deadline = time.perf_counter() + self.timeout
+        while True:
+            self._update()
+            index = self.tx_buffer.find(b"\n")
+            if index >= 0 or time.perf_counter() > deadline:
+                end = index + 1 if index >= 0 else len(self.tx_buffer)
+                line = bytes(self.tx_buffer[:end])
+                del self.tx_buffer[:end]
+                return line
+            time.sleep(0.001)
+
+    def reset_input_buffer(self) -> None:
+        """Discard all bytes that have not been read yet."""
+        self._update()
+        self.tx_buffer.clear()
+
+    def close(self) -> None:
+        """Nothing to close, only needed to be used like a serial port."""
+
+    def pressure(self) -> float:
+        """Return the current pressure in mbar of the pump-down curve."""
+        elapsed = time.perf_counter() - self.start_time
+        return self.base_pressure + (self.start_pressure - self.base_pressure) * math.exp(-elapsed / self.time_constant)
+
+    def _send(self, data: bytes) -> None:
+        self.tx_buffer += data + b"\r\n"
+
+    def _receive(self, mnemonic: str) -> None:
+        """Acknowledge a known mnemonic, any mnemonic ends the continuous output."""
+        self.received_mnemonics.append(mnemonic)
+        self.continuous_interval = None
+
+        name, _, parameter = mnemonic.partition(",")
+        known = (
+            (name == "PRX" and self.supports_prx)
+            or (name[:2] == "PR" and name[2:].isdigit() and 1 <= int(name[2:]) <= self.channels)
+            or (name == "COM" and parameter in {"", "0", "1", "2"})
+        )
+        if known:
+            self.pending = mnemonic
+            self._send(ACK)
+        else:
+            self.pending = ""
+            self._send(NAK)
+
+    def _enquire(self) -> None:
+        """Send the reply to the acknowledged mnemonic."""
+        if not self.pending:
+            return
+        name, _, parameter = self.pending.partition(",")
+        if name == "PRX":
+            self._send(self._measurements(range(self.channels)))
+        elif name == "COM":
+            self.continuous_interval = CONTINUOUS_INTERVALS[int(parameter or 1)]
+            self.next_output = time.perf_counter() + self.continuous_interval
+            self._send(self._measurements(range(self.channels)))
+        else:
+            self._send(self._measurements([int(name[2:]) - 1]))
+
+    def _measurements(self, indices: range | list[int]) -> bytes:
+        pressure = self.pressure()
+        return ",".join("%i,%.4E" % (self.status[i], pressure) for i in indices).encode("ascii")
+
+    def _update(self) -> None:
+        """Send the lines of the continuous output that are due."""
+        if self.continuous_interval is None:
+            return
+        now = time.perf_counter()
+        while now >= self.next_output:
+            self._send(self._measurements(range(self.channels)))
+            self.next_output += self.continuous_interval
@@ -0,0 +1,260 @@
+# This Device Class is published under the terms of the MIT License.
+# Required Third Party Libraries, which are included in the Device Class
+# package for convenience purposes, may have a different license. You can
+# find those in the corresponding folders or contact the maintainer.
+#
+# MIT License
+#
+# Copyright (c) 2024 SweepMe! GmbH (sweep-me.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import NamedTuple, Protocol
+
+ACK = b"\x06"
+NAK = b"\x15"
+ENQ = b"\x05"
+ETX = b"\x03"
+
+CONTINUOUS_INTERVALS = {"100 ms": 0, "1 s": 1, "1 min": 2}
+"""Parameter of the mnemonic 'COM' for the interval of the continuous output."""
+
+
+class SerialPort(Protocol):
+    """Minimal port interface needed by the client, fulfilled by serial.Serial and the TPGEmulator."""
+
+    def write(self, data: bytes) -> int | None:
+        """Write the given bytes."""
+
+    def readline(self) -> bytes:
+        """Read until a line feed, an incomplete line is returned if the port timeout is reached."""
+
+    def reset_input_buffer(self) -> None:
+        """Discard all received bytes."""
+
+
+class TPGError(Exception):
+    """Raised if the controller does not acknowledge a mnemonic or does not reply."""
+
+
+class Measurement(NamedTuple):
+    """Status and pressure of one gauge."""
+
+    status: int
+    """0 OK, 1 underrange, 2 overrange, 3 sensor error, 4 sensor off, 5 no sensor, 6 identification error."""
+
+    pressure: float
+
+
+class Reading(NamedTuple):
+    """Measurements of all gauges received at the same time."""
+
+    timestamp: float
+    """Time of reception in s, as returned by time.perf_counter()."""
+
+    measurements: list[Measurement]
+    """Measurements of gauge 1, 2, ..."""
+
+
+def parse_measurements(line: str) -> list[Measurement]:
+    """Parse the reply to 'PRx', 'PRX', or a line of the continuous output, e.g. '0,1.0000E-03,5,2.0000E-02'.
+
+    Args:
+        line: Pairs of status and pressure separated by commas.
+
+    Returns:
+        Measurements in the order of the gauges.
+    """
+    values = line.strip().split(",")
+    if len(values) < 2 or len(values) % 2:
+        msg = f"Reply '{line.strip()}' does not consist of pairs of status and pressure."
+        raise TPGError(msg)
+    return [Measurement(int(status), float(pressure)) for status, pressure in zip(values[::2], values[1::2])]
+
+
+class TPGClient:
+    """Communicates with Pfeiffer Vacuum TPG controllers using the ACK/ENQ protocol.
+
+    Each mnemonic is acknowledged by the controller with ACK or NAK and the reply is only sent after the host has
+    sent ENQ. Thus, every query consists of two writes and two reads. To read several gauges, the pressures of all
+    gauges are requested with 'PRX' in one query. Controllers that do not know 'PRX' are read gauge by gauge.
+
+    In continuous mode ('COM'), the controller sends the pressures of all gauges in a fixed interval without being
+    asked. The lines are read in a background thread and the latest reading is available without waiting.
+    """
+
+    def __init__(self, port: SerialPort, maxlen: int = 10000) -> None:
+        """Initialize the client.
+
+        Args:
+            port: Open serial port with a read timeout.
+            maxlen: Number of readings of the continuous mode kept in the ring buffer.
+        """
+        self.port = port
+
+        self.supports_prx: bool | None = None
+        """Whether 'PRX' is known by the controller, None until it has been tried."""
+
+        self.readings: deque[Reading] = deque(maxlen=maxlen)
+        self.error: Exception | None = None
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def query(self, mnemonic: str) -> str:
+        """Send a mnemonic, wait for the acknowledgement, and request the reply with ENQ.
+
+        Args:
+            mnemonic: Mnemonic with parameters, e.g. 'PR1' or 'COM,1'.
+
+        Returns:
+            Reply without line ending.
+        """
+        self.port.write((mnemonic + "\r\n").encode("ascii"))
+        acknowledgement = self._read_line()
+        if acknowledgement == NAK:
+            msg = f"Mnemonic '{mnemonic}' was not acknowledged."
+            raise TPGError(msg)
+        if acknowledgement != ACK:
+            msg = f"Unexpected acknowledgement {acknowledgement!r} to mnemonic '{mnemonic}'."
+            raise TPGError(msg)
+
+        self.port.write(ENQ)
+        return self._read_line().decode("ascii", errors="replace")
+
+    def read_pressures(self, channels: list[int]) -> dict[int, Measurement]:
+        """Read the status and pressure of the given gauges, with a single query if possible.
+
+        Args:
+            channels: Gauge numbers starting at 1.
+
+        Returns:
+            Measurement of each gauge.
+        """
+        if len(channels) > 1 and self.supports_prx is not False:
+            try:
+                measurements = parse_measurements(self.query("PRX"))
+            except TPGError:
+                measurements = []
+                # the interface is reset, so that a refused 'PRX' does not affect the next mnemonic
+                self.reset()
+            self.supports_prx = len(measurements) >= max(channels)
+            if self.supports_prx:
+                return {channel: measurements[channel - 1] for channel in channels}
+
+        return {channel: parse_measurements(self.query("PR%i" % channel))[0] for channel in channels}
+
+    def reset(self, delay: float = 0.05) -> None:
+        """Reset the interface of the controller with ETX and discard all received bytes.
+
+        Args:
+            delay: Time in s to wait for bytes that are still on the way before they are discarded.
+        """
+        self.port.write(ETX)
+        time.sleep(delay)
+        self.port.reset_input_buffer()
+
+    @property
+    def running(self) -> bool:
+        """True if the continuous output is read in the background."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start_continuous(self, interval: int = 0) -> None:
+        """Let the controller send the pressures of all gauges continuously and read them in a background thread.
+
+        Args:
+            interval: 0 for 100 ms, 1 for 1 s, or 2 for 1 min, see CONTINUOUS_INTERVALS.
+        """
+        if self.running:
+            return
+        with self._lock:
+            self.readings.clear()
+        first_line = self.query("COM,%i" % interval)
+        self._add(first_line)
+
+        self._stop_event.clear()
+        self.error = None
+        self._thread = threading.Thread(target=self._read_loop, name="TPGContinuous", daemon=True)
+        self._thread.start()
+
+    def stop_continuous(self, timeout: float = 5.0) -> None:
+        """Stop the continuous output and the background thread.
+
+        Args:
+            timeout: Maximum time in s to wait for the thread, at least the read timeout of the port.
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.reset()
+
+    def latest(self) -> Reading | None:
+        """Return the latest reading of the continuous mode or None if nothing has been received."""
+        with self._lock:
+            return self.readings[-1] if self.readings else None
+
+    def readings_since(self, timestamp: float) -> list[Reading]:
+        """Return all readings of the continuous mode received after the given time stamp."""
+        with self._lock:
+            return [reading for reading in self.readings if reading.timestamp > timestamp]
+
+    def check_error(self) -> None:
+        """Raise the error that stopped the background thread, if any."""
+        if self.error is not None:
+            error = self.error
+            self.error = None
+            raise error
+
+    def _read_line(self) -> bytes:
+        """Read a line and remove the line ending, raise a TPGError if nothing is received."""
+        line = self.port.readline()
+        if not line.endswith(b"\n"):
+            msg = "No reply from the controller."
+            raise TPGError(msg)
+        return line.rstrip(b"\r\n")
+
+    def _add(self, line: str) -> None:
+        reading = Reading(time.perf_counter(), parse_measurements(line))
+        with self._lock:
+            self.readings.append(reading)
+
+    def _read_loop(self) -> None:
+        """Read lines of the continuous output until stopped."""
+        partial_line = b""
+        try:
+            while not self._stop_event.is_set():
+                line = partial_line + self.port.readline()
+                if not line.endswith(b"\n"):
+                    # incomplete line due to the port timeout, the rest is read with the next call
+                    partial_line = line
+                    continue
+                partial_line = b""
+                self._add(line.decode("ascii", errors="replace"))
+        except Exception as e:  # noqa: BLE001
+            # the error is raised in the main thread by check_error
+            self.error = e
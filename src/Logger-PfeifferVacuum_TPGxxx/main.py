@@ -32,16 +32,26 @@
 # Device: Pfeiffer Vacuum TPGxxx
 
 
-import time
+import importlib.util
+from pathlib import Path
 
 from EmptyDeviceClass import EmptyDevice
 
+# Import the TPG protocol helper from the libraries folder of the driver
+_spec = importlib.util.spec_from_file_location(
+    "tpg_protocol", Path(__file__).resolve().parent / "libraries" / "tpg_protocol.py"
+)
+tpg_protocol = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(tpg_protocol)
+
 class Device(EmptyDevice):
     """
     <h3>Pfeiffer vacuum Multi Gauge TPGxxx</h3>
     <p>Supported models: TPG 251 A, TPG 252 A,&nbsp;TPG 256 A,&nbsp;TPG 361,&nbsp;TPG 362,&nbsp;TPG 366,&nbsp;</p>
     <p><strong>Usage:</strong></p>
     <p>This driver can be used with controllers for one, two, or six channels. As default, only the first channel is read out. Select further channels to be read out according to the channels your controller provides.</p>
+    <p>With acquisition "Query per point", all selected channels are read with a single query (PRX) if the controller supports it, otherwise channel by channel.</p>
+    <p>With acquisition "Continuous", the controller sends the pressures of all channels in the selected interval (COM). They are read in the background and each point returns the latest pressures without waiting, e.g. to log pump-down curves at a high rate.</p>
     <p><strong>Manual:</strong>&nbsp;</p>
     <p>TPG256A:&nbsp;<a href="https://www.idealvac.com/files/ManualsII/Pfeiffer_MultiGauge256A_OpInstructions.pdf">https://www.idealvac.com/files/ManualsII/Pfeiffer_MultiGauge256A_OpInstructions.pdf</a></p>
     """
@@ -60,6 +70,8 @@ def __init__(self):
                                 "bytesize": 8,
                                 "stopbits": 1,
                                 }
+
+        self.client = None
                                 
         # The device returns a status as the first digit according to this dict
         self.status = {
@@ -75,7 +87,10 @@ def __init__(self):
        
     def set_GUIparameter(self):
 
-        GUIparameter = {}
+        GUIparameter = {
+            "Acquisition": ["Query per point", "Continuous"],
+            "Continuous interval": list(tpg_protocol.CONTINUOUS_INTERVALS.keys()),
+        }
         
         for i in range(6): 
         
@@ -87,6 +102,9 @@ def set_GUIparameter(self):
         return GUIparameter
 
     def get_GUIparameter(self, parameter={}):
+
+        self.acquisition = parameter.get("Acquisition", "Query per point")
+        self.continuous_interval = parameter.get("Continuous interval", "100 ms")
            
         self.variables = []
         self.units = []
@@ -116,31 +134,40 @@ def get_GUIparameter(self, parameter={}):
 
 
     def initialize(self):
-        pass
         # print(self.variables[0])
         # self.variables[0] = self.channel1
         # print(self.variables[0])
 
+        # the client uses the pyserial port as the ACK/ENQ protocol needs binary control characters
+        self.client = tpg_protocol.TPGClient(self.port.port)
+
+    def configure(self):
+        if self.acquisition == "Continuous":
+            self.client.start_continuous(tpg_protocol.CONTINUOUS_INTERVALS[self.continuous_interval])
+
+    def unconfigure(self):
+        if self.client.running:
+            self.client.stop_continuous()
+
     def call(self):
-        
+
+        if self.acquisition == "Continuous":
+            self.client.check_error()
+            measurements = self.client.latest().measurements
+            measurements = {i: measurements[i - 1] for i in self.channels}
+        else:
+            measurements = self.client.read_pressures(self.channels)
+
         # Empty list to be filled with values
         varlist = []
                   
         for i in self.channels:
-        
-            self.port.write(f"PR{i}\r")
-            self.port.read()
-            self.port.write(chr(0x05)) # send ENQ
-            readout = self.port.read()
-            #print(readout)
-            
-            status, pressure = readout.split(',')
             
             # append the pressure value
-            varlist.append(float(pressure))
+            varlist.append(measurements[i].pressure)
             
             # append the status value
-            varlist.append(self.status[int(status)])
+            varlist.append(self.status[measurements[i].status])
             
         return varlist
 
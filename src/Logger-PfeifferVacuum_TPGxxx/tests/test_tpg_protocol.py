@@ -0,0 +1,91 @@
+import importlib.util
+import time
+import unittest
+from pathlib import Path
+
+
+def load_library(name: str):  # noqa: ANN201
+    """Import a module from the libraries folder of the driver."""
+    file_path = Path(__file__).resolve().parent.parent / "libraries" / f"{name}.py"
+    spec = importlib.util.spec_from_file_location(name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+tpg_protocol = load_library("tpg_protocol")
+tpg_emulator = load_library("tpg_emulator")
+
+Measurement = tpg_protocol.Measurement
+TPGClient = tpg_protocol.TPGClient
+TPGEmulator = tpg_emulator.TPGEmulator
+
+
+class TestParseMeasurements(unittest.TestCase):
+    """Test parsing of replies."""
+
+    def test_pairs(self) -> None:
+        """Replies consist of pairs of status and pressure."""
+        measurements = tpg_protocol.parse_measurements("0,1.0000E-03,5,2.0000E+01\r\n")
+        self.assertEqual(measurements, [Measurement(0, 1e-3), Measurement(5, 20.0)])  # noqa: PT009
+
+    def test_invalid(self) -> None:
+        """An incomplete reply raises a TPGError."""
+        with self.assertRaises(tpg_protocol.TPGError):  # noqa: PT027
+            tpg_protocol.parse_measurements("0,1.0000E-03,5")
+
+
+class TestQuery(unittest.TestCase):
+    """Test reading pressures with the ACK/ENQ protocol."""
+
+    def test_single_query(self) -> None:
+        """All gauges are read with one 'PRX' query."""
+        emulator = TPGEmulator(channels=6, start_pressure=1e-3, base_pressure=1e-3)
+        emulator.status[1] = 5
+        client = TPGClient(emulator)
+
+        measurements = client.read_pressures([1, 2, 6])
+        self.assertEqual(emulator.received_mnemonics, ["PRX"])  # noqa: PT009
+        self.assertEqual(measurements[2].status, 5)  # noqa: PT009
+        self.assertAlmostEqual(measurements[6].pressure, 1e-3)  # noqa: PT009
+
+    def test_fallback(self) -> None:
+        """Controllers without 'PRX' are read gauge by gauge and 'PRX' is not tried again."""
+        emulator = TPGEmulator(channels=2, supports_prx=False)
+        client = TPGClient(emulator)
+
+        client.read_pressures([1, 2])
+        client.read_pressures([1, 2])
+        self.assertFalse(client.supports_prx)  # noqa: PT009
+        self.assertEqual(emulator.received_mnemonics, ["PRX", "PR1", "PR2", "PR1", "PR2"])  # noqa: PT009
+
+    def test_not_acknowledged(self) -> None:
+        """A mnemonic that is not acknowledged raises a TPGError."""
+        client = TPGClient(TPGEmulator(channels=1))
+        with self.assertRaises(tpg_protocol.TPGError):  # noqa: PT027
+            client.query("PR3")
+
+
+class TestContinuous(unittest.TestCase):
+    """Test the continuous output read in the background."""
+
+    def test_continuous(self) -> None:
+        """Readings arrive in the interval and the pressure decreases, a query works after stopping."""
+        emulator = TPGEmulator(channels=2, time_constant=0.1)
+        client = TPGClient(emulator)
+
+        client.start_continuous(0)
+        first = client.latest()
+        time.sleep(0.35)
+        client.check_error()
+        readings = client.readings_since(first.timestamp)
+        client.stop_continuous()
+
+        self.assertFalse(client.running)  # noqa: PT009
+        self.assertGreaterEqual(len(readings), 2)  # noqa: PT009
+        self.assertLess(readings[-1].measurements[0].pressure, first.measurements[0].pressure)  # noqa: PT009
+        self.assertEqual(len(client.read_pressures([1, 2])), 2)  # noqa: PT009
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -95,7 +95,25 @@ def __init__(self):
             
 
         self.model = None  # get this from the device later
-        
+
+        self.spectrum_points = 101  # number of lines with wavelength and intensity returned by D5/M5
+
+        self._buffer = bytearray()  # received bytes that are not yet returned as line
+
+        # data codes that are requested with a single write in 'request_result'
+        self.data_codes = []
+
+        # keys of self._last_results filled by the values of each data code
+        self.data_code_keys = {
+            1: ["Luminance", "CIE 1931 x", "CIE 1931 y"],
+            2: ["Tristim 1", "Tristim 2", "Tristim 3"],
+            3: ["Luminance", "CIE 1976 u", "CIE 1976 v"],
+            4: ["Luminance", "Color temperature", "Color deviation CIE 1976"],
+            5: ["Peak wavelength", "Integrated power", "Integrated photons", "Wavelength", "Intensity"],
+            6: ["Luminance", "CIE 1931 x", "CIE 1931 y", "CIE 1976 u", "CIE 1976 v"],
+            7: ["Luminance", "CIE 1960 x", "CIE 1960 y"],
+        }
+
         self._last_results = {}
 
         # 1 status, units, Photometric brightness, CIE 1931 x,y 
@@ -173,7 +191,24 @@ def get_GUIparameter(self, parameter):
         self.take_color_temperature = parameter["Color temperature"]
         self.take_spectrum = parameter["Spectrum"]
         self.take_CIE1960xy = parameter["CIE 1960 xy"]
-                        
+
+        # CIE 1931 xy and CIE 1976 uv are both returned by data code 6
+        self.data_codes = []
+        if self.take_CIE1931xy and self.take_CIE1976uv:
+            self.data_codes.append(6)
+        elif self.take_CIE1931xy:
+            self.data_codes.append(1)
+        elif self.take_CIE1976uv:
+            self.data_codes.append(3)
+        if self.take_tristim:
+            self.data_codes.append(2)
+        if self.take_color_temperature:
+            self.data_codes.append(4)
+        if self.take_spectrum:
+            self.data_codes.append(5)
+        if self.take_CIE1960xy:
+            self.data_codes.append(7)
+
         self.variables = []
         self.units = []
         self.plottype = []
@@ -282,44 +317,31 @@ def configure(self):
         
                                 
     def measure(self):
-        self.take_measurement()
-        
+        # The measurement is only started here. The reply is read in 'request_result' so that other instruments
+        # can be processed during the exposure.
+        self.clear_buffer()
+        self.write_message("M0")
+
     def request_result(self):
         """ 'request_result' can be used to ask an instrument to send data """
-        pass
-        
+
+        # reply of M0 is returned when the measurement is finished
+        self.read_lines(1, timeout=30)
+
+        # all selected data codes of the last measurement are requested at once
+        self.write_message("\r".join(["D%i" % code for code in self.data_codes]))
+
     def read_result(self):
     
-        # The get_functions used here populate self._last_results which is used
-        # in 'call' to create the list of returned variables
-    
-        self.results = []
-
-        # CIE1931xy
-        if self.take_CIE1931xy:
-            self.get_last_CIE1931xy()
-            
-        # Tristim
-        if self.take_tristim:
-            self.get_last_tristim()
-            
-        # CIE1976uv
-        if self.take_CIE1976uv:
-            self.get_last_CIE1976uv()
-            
-        # Color temperature
-        if self.take_color_temperature:
-            self.get_last_color_temperature()
+        # The replies populate self._last_results which is used in 'call' to create the list of returned variables
+        for code in self.data_codes:
+            if code == 5:
+                values = self.read_spectrum_reply(timeout=30)[2:]
+            else:
+                values = self.parse_values(self.read_lines(1, timeout=30)[0])
 
-        # Spectrum
-        if self.take_spectrum:
-            self.get_last_spectrum()
+            self._last_results.update(zip(self.data_code_keys[code], values))
 
-        # CIE1960xy
-        if self.take_CIE1960xy:
-            CIEuv = self.get_last_CIE1960xy()
-        
-       
     def call(self):
      
         results = []
@@ -336,42 +358,70 @@ def send_message(self, message, timeout=1.0):
         light measurements)
         """
 
-        # self.port.port.reset_input_buffer()
+        self.write_message(message)
 
-        # Method 1
-        for char in message:
-            self.port.write(char)
-            self.port.port.flush()   
-        self.port.write('\r')
+        if message in ('D5', 'M5'): # we need a spectrum which will have multiple lines
+            reply = self.read_spectrum_reply(timeout)
+        else:
+            reply = self.read_lines(1, timeout)[0]
+
+        return reply
+
+    def write_message(self, message):
+        """Writes a message including the carriage return with a single write
+        """
+        self.port.write(message + '\r')
+
+    def read_lines(self, number, timeout=1.0):
+        """Returns the given number of lines
+
+        All bytes that are available are read at once and kept in a buffer until the lines are complete.
+        """
 
-        # time.sleep(0.1)  # PR650 gets upset if hurried!
+        eol = b'\r\n'
 
-        # get feedback (within timeout limit)
         self.port.port.timeout = timeout
+        while self._buffer.count(eol) < number:
+            chunk = self.port.port.read(max(1, self.port.port.in_waiting))
+            if not chunk:
+                raise Exception("PR-655: No reply within %1.1f s" % timeout)
+            self._buffer += chunk
 
-        if message in ('D5', 'M5'): # we need a spectrum which will have multiple lines
-            
-            w = []  # Wavelengths
-            p = []  # Power values
-        
-            reply = []
-            reply += self.port.read().split(",")  # reading the first line with the error code and some parameters
+        end = 0
+        for _ in range(number):
+            end = self._buffer.index(eol, end) + len(eol)
+
+        block = bytes(self._buffer[:end])
+        del self._buffer[:end]
+
+        return block.decode('latin-1').split('\r\n')[:number]
+
+    def clear_buffer(self):
+        """Discards all received bytes that were not read yet
+        """
+        self._buffer.clear()
+        self.port.port.reset_input_buffer()
+
+    def read_spectrum_reply(self, timeout=1.0):
+        """Reads the reply of D5/M5 consisting of a header line and a block of spectral data
+
+        Returns:
+            list: status, units, peak wavelength, integrated power, integrated photons, wavelengths, intensities
+        """
+
+        lines = self.read_lines(1 + self.spectrum_points, timeout)
+
+        reply = lines[0].split(",")
+        reply[2:5] = map(float, reply[2:5])
+        reply += list(self.parse_spectrum_output(lines[1:]))
 
-            # Reading the spectra
-            for i in range(101):
-                vals = self.port.read().split(",")
-                w.append(float(vals[0]))
-                p.append(float(vals[1]))
-                
-            reply.append(np.asarray(w))
-            reply.append(np.asarray(p))
-            
-        else:
-            reply = self.port.read()
-            
-                
         return reply
 
+    @staticmethod
+    def parse_values(reply):
+        """Returns the float values of a reply without status and units
+        """
+        return np.array(reply.split(',')[2:], dtype=float)
 
     def start_remote_mode(self):
         """Sets the instrument into remote mode
@@ -631,7 +681,7 @@ def get_spectrum(self, cmd='M5'):
         # if self.model == "PR650":
             # raw = self.send_message('d5')
         
-        result = self.send_message(cmd, timeout = 30)[2:]  # return first values as string, and spectra is already correctly formatted
+        result = self.send_message(cmd, timeout = 30)[2:]  # values and spectra are already correctly formatted
         self._last_results["Peak wavelength"] = float(result[0])
         self._last_results["Integrated power"] = float(result[1])
         self._last_results["Integrated photons"] = float(result[2])
@@ -676,49 +726,23 @@ def get_last_CIE1960xy(self):
         return self.get_CIE1960xy(cmd='D7')
 
 
-    def parse_spectrum_output(self, rawStr):
-        """Parses the strings from the PR650 as received after sending
-        the command 'd5'.
-        The input argument "rawStr" can be the output from a single
-        phosphor spectrum measurement or a list of 3 such measurements
-        [rawR, rawG, rawB].
+    @staticmethod
+    def parse_spectrum_output(lines):
+        """Parses the lines of spectral data as received after sending the command 'D5'
+        
+        Each line is a string like '380,1.234e-003'. All lines are converted with a single conversion.
+
+        Returns:
+            np.array: wavelengths in nm
+            np.array: intensities
         """
 
-        if len(rawStr) == 3:
-            RGB = True
-            rawR = rawStr[0][2:]
-            rawG = rawStr[1][2:]
-            rawB = rawStr[2][2:]
-            nPoints = len(rawR)
-        else:
-            RGB = False
-            nPoints = len(rawStr)
-            raw = rawStr[2:]
-
-        nm = []
-        if RGB:
-            power = [[], [], []]
-            for n in range(nPoints):
-                # each entry in list is a string like this:
-                thisNm, thisR = rawR[n].split(',')
-                thisR = thisR.replace('\r\n', '')
-                thisNm, thisG = rawG[n].split(',')
-                thisG = thisG.replace('\r\n', '')
-                thisNm, thisB = rawB[n].split(',')
-                thisB = thisB.replace('\r\n', '')
-                exec('nm.append(%s)' % thisNm)
-                exec('power[0].append(%s)' % thisR)
-                exec('power[1].append(%s)' % thisG)
-                exec('power[2].append(%s)' % thisB)
-        else:
-            power = []
-            for n, point in enumerate(rawStr):
-                # each entry in list is a string like this:
-                thisNm, thisPower = point.split(',')
-                nm.append(thisNm)
-                power.append(thisPower.replace('\r\n', ''))
-
-        return np.asarray(nm), np.asarray(power)
+        if isinstance(lines, (list, tuple)):
+            lines = '\n'.join(lines)
+
+        data = np.array(lines.replace(',', ' ').split(), dtype=float).reshape(-1, 2)
+
+        return data[:, 0], data[:, 1]
         
 
 
@@ -31,10 +31,17 @@
 # Device: STM-100
 
 
-import time
+import importlib.util
+from pathlib import Path
 
 from EmptyDeviceClass import EmptyDevice
 
+_spec = importlib.util.spec_from_file_location(
+    "deposition_protocol", Path(__file__).resolve().parent / "libraries" / "deposition_protocol.py"
+)
+deposition_protocol = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(deposition_protocol)
+
 class Device(EmptyDevice):
 
     """
@@ -77,8 +84,8 @@ def __init__(self):
         self.plottype = [True, True, False, False, True]
         self.savetype = [True, True, True, True, True]
         
-        self.STX = chr(0x02)
-        
+        self.codec = None
+
     def set_GUIparameter(self):
         
         GUIparameter = {
@@ -105,7 +112,12 @@ def get_GUIparameter(self, parameter = {}):
             
         
     """ semantic standard functions start here """    
-        
+
+    def connect(self):
+
+        framing = deposition_protocol.SyconFraming()
+        self.codec = deposition_protocol.FrameCodec(self.port, framing, timeout=2, verify=True)
+
     def initialize(self):
     
         self.writeCommand("@")
@@ -155,26 +167,21 @@ def configure(self):
 
     def call(self):
     
-        # Thickness
-        self.writeCommand("S")    
-        self.d = self.readAnswer()[0]
+        # Thickness, rate and xtal status are requested together
+        (self.d, _), (self.r, _), (xtal_status, _) = self.queryGroup(["S", "T", "M"])
+
         try:
             self.d = float(self.d)/10 
         except:
             self.d = float('nan')
         
-        # Rate
-        self.writeCommand("T")
-        self.r = self.readAnswer()[0]
         try:
             self.r = float(self.r)
         except:
             self.r = float('nan')
         
-        
         # Xtal used
-        self.writeCommand("M")
-        if self.readAnswer()[0] == "@":
+        if xtal_status == "@":
             self.writeCommand("V")
             self.v = self.readAnswer()[0]
             self.v = float(self.v)
@@ -188,43 +195,34 @@ def call(self):
         
     def readAnswer(self):
         """ returns a tuple containing answer string and success character """
-                       
-        x = self.port.read(1)
-        #print("First character:", x[0])       
-        
-        if x[0] == ord(self.STX):
-                    
-            length = self.port.read(1)[0]  # read length character
-            #print("Length:", length)
-            
-            success = self.port.read(1).decode('latin-1') # read success character
-            #print("Success:", success)
-            
-            if length > 1:
-                answer = self.port.read(length-1).decode('latin-1') # read message
-            else:
-                answer = ""
-                
-            #print("Answer:", answer)    
-                
-            checksum = self.port.read(1).decode('latin-1')  # read check sum
-            
-            if not checksum == self.calculate_checksum(success + answer):       
-                self.message_Box("Sycon STM-100: Incorrect checksum. Please check whether you have a proper connection!")
-                
-            return answer, success
+
+        try:
+            reply = self.codec.read()
+        except ValueError:
+            self.message_Box("Sycon STM-100: Incorrect checksum. Please check whether you have a proper connection!")
+            return "", ""
+
+        return reply.data, reply.response
  
     def writeCommand(self, cmd):
     
-        length = chr(len(cmd))
-        checksum = self.calculate_checksum(cmd)
-        cmd_to_write = (self.STX + length + cmd + checksum).encode("latin1")
-        self.port.write(cmd_to_write)
-        
-        
-    def calculate_checksum(self, cmd):
-        
-        return chr(sum([ord(char) for char in cmd]) % 256)
+        self.codec.write(cmd)
+
+    def queryGroup(self, cmds):
+        """ sends several commands at once and returns a list of tuples containing answer string and success character """
+
+        try:
+            replies = self.codec.query_many(cmds)
+        except ValueError:
+            self.codec.clear()
+            self.message_Box("Sycon STM-100: Incorrect checksum. Please check whether you have a proper connection!")
+            return [("", "")] * len(cmds)
+        except TimeoutError:
+            # replies of the remaining commands might still arrive and must not be taken for later replies
+            self.codec.clear()
+            return [("", "")] * len(cmds)
+
+        return [(reply.data, reply.response) for reply in replies]
 
 
     """ setter/getter functions start here """
@@ -36,12 +36,24 @@
 from pysweepme.FolderManager import addFolderToPATH
 addFolderToPATH()
 
-from yoctopuce.yocto_api import *
-from yoctopuce.yocto_genericsensor import *
-
 from pysweepme.EmptyDeviceClass import EmptyDevice
 
 
+# Yoctopuce classes are imported on first use in 'import_yoctopuce'
+YAPI = None
+YRefParam = None
+YGenericSensor = None
+
+
+def import_yoctopuce():
+    """ imports the Yoctopuce library only when needed, as importing yocto_api takes long """
+
+    global YAPI, YRefParam, YGenericSensor
+
+    from yoctopuce.yocto_api import YAPI, YRefParam
+    from yoctopuce.yocto_genericsensor import YGenericSensor
+
+
 class Device(EmptyDevice):
 
     description =   """
@@ -141,6 +153,8 @@ def get_GUIparameter(self, parameter):
         self.port_serial = parameter["Port"]
       
     def find_Ports(self):
+
+        import_yoctopuce()
     
         errmsg = YRefParam()
 
@@ -185,6 +199,8 @@ def find_Ports(self):
 
     def connect(self):
 
+        import_yoctopuce()
+
 
         # initialize the API. However, it is anyway done during 'RegisterHub'
         # YAPI.InitAPI()
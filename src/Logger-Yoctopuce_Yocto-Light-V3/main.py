@@ -36,12 +36,24 @@
 from pysweepme.FolderManager import addFolderToPATH
 addFolderToPATH()
 
-from yoctopuce.yocto_api import *
-from yoctopuce.yocto_lightsensor import *
-
 from pysweepme.EmptyDeviceClass import EmptyDevice
 
 
+# Yoctopuce classes are imported on first use in 'import_yoctopuce'
+YAPI = None
+YRefParam = None
+YLightSensor = None
+
+
+def import_yoctopuce():
+    """ imports the Yoctopuce library only when needed, as importing yocto_api takes long """
+
+    global YAPI, YRefParam, YLightSensor
+
+    from yoctopuce.yocto_api import YAPI, YRefParam
+    from yoctopuce.yocto_lightsensor import YLightSensor
+
+
 class Device(EmptyDevice):
 
     description =   """
@@ -64,11 +76,11 @@ def __init__(self):
         
         
         self.measure_types = {
-                                "Human eye" : YLightSensor.MEASURETYPE_HUMAN_EYE, 
-                                "Wide spectrum" : YLightSensor.MEASURETYPE_WIDE_SPECTRUM, 
-                                "Infrared" : YLightSensor.MEASURETYPE_INFRARED, 
-                                "High rate" : YLightSensor.MEASURETYPE_HIGH_RATE,
-                                "High energy": YLightSensor.MEASURETYPE_HIGH_ENERGY,
+                                "Human eye" : "MEASURETYPE_HUMAN_EYE", 
+                                "Wide spectrum" : "MEASURETYPE_WIDE_SPECTRUM", 
+                                "Infrared" : "MEASURETYPE_INFRARED", 
+                                "High rate" : "MEASURETYPE_HIGH_RATE",
+                                "High energy": "MEASURETYPE_HIGH_ENERGY",
                             }
 
     def set_GUIparameter(self):
@@ -87,6 +99,8 @@ def get_GUIparameter(self, parameter):
         self.port_serial = parameter["Port"]
       
     def find_Ports(self):
+
+        import_yoctopuce()
     
         errmsg = YRefParam()
 
@@ -132,6 +146,8 @@ def find_Ports(self):
         
     def connect(self):
 
+        import_yoctopuce()
+
         
         # initialize the API. However, it is anyway done during 'RegisterHub'
         # YAPI.InitAPI()
@@ -168,7 +184,7 @@ def initialize(self):
     def configure(self):
         
         # Measure type
-        self.sensor.set_measureType(self.measure_types[self.selected_measure_type])
+        self.sensor.set_measureType(getattr(YLightSensor, self.measure_types[self.selected_measure_type]))
 
 
     def call(self):
@@ -36,14 +36,28 @@
 from pysweepme.FolderManager import addFolderToPATH
 addFolderToPATH()
 
-from yoctopuce.yocto_api import *
-from yoctopuce.yocto_temperature import *
-from yoctopuce.yocto_humidity import *
-from yoctopuce.yocto_pressure import *
-
 from pysweepme.EmptyDeviceClass import EmptyDevice
 
 
+# Yoctopuce classes are imported on first use in 'import_yoctopuce'
+YAPI = None
+YRefParam = None
+YHumidity = None
+YPressure = None
+YTemperature = None
+
+
+def import_yoctopuce():
+    """ imports the Yoctopuce library only when needed, as importing yocto_api takes long """
+
+    global YAPI, YRefParam, YHumidity, YPressure, YTemperature
+
+    from yoctopuce.yocto_api import YAPI, YRefParam
+    from yoctopuce.yocto_humidity import YHumidity
+    from yoctopuce.yocto_pressure import YPressure
+    from yoctopuce.yocto_temperature import YTemperature
+
+
 class Device(EmptyDevice):
 
     description =   """
@@ -80,6 +94,8 @@ def get_GUIparameter(self, parameter):
         self.port_serial = parameter["Port"]
       
     def find_Ports(self):
+
+        import_yoctopuce()
     
         errmsg = YRefParam()
 
@@ -126,6 +142,8 @@ def find_Ports(self):
         
     def connect(self):
 
+        import_yoctopuce()
+
         
         # initialize the API. However, it is anyway done during 'RegisterHub'
         # YAPI.InitAPI()
@@ -37,12 +37,24 @@
 from pysweepme.FolderManager import addFolderToPATH
 addFolderToPATH()
 
-from yoctopuce.yocto_api import *
-from yoctopuce.yocto_temperature import *
-
 from pysweepme.EmptyDeviceClass import EmptyDevice
 
 
+# Yoctopuce classes are imported on first use in 'import_yoctopuce'
+YAPI = None
+YRefParam = None
+YTemperature = None
+
+
+def import_yoctopuce():
+    """ imports the Yoctopuce library only when needed, as importing yocto_api takes long """
+
+    global YAPI, YRefParam, YTemperature
+
+    from yoctopuce.yocto_api import YAPI, YRefParam
+    from yoctopuce.yocto_temperature import YTemperature
+
+
 class Device(EmptyDevice):
 
     description =   """
@@ -59,17 +71,19 @@ def __init__(self):
         self.shortname = "Yocto-Thermocouple" # short name will be shown in the sequencer
 
         self.sensor_types = {
-                               "Type K": YTemperature.SENSORTYPE_TYPE_K,
-                               "Type E": YTemperature.SENSORTYPE_TYPE_E, 
-                               "Type J": YTemperature.SENSORTYPE_TYPE_J, 
-                               "Type N": YTemperature.SENSORTYPE_TYPE_N, 
-                               "Type R": YTemperature.SENSORTYPE_TYPE_R, 
-                               "Type S": YTemperature.SENSORTYPE_TYPE_S, 
-                               "Type T": YTemperature.SENSORTYPE_TYPE_T, 
+                               "Type K": "SENSORTYPE_TYPE_K",
+                               "Type E": "SENSORTYPE_TYPE_E", 
+                               "Type J": "SENSORTYPE_TYPE_J", 
+                               "Type N": "SENSORTYPE_TYPE_N", 
+                               "Type R": "SENSORTYPE_TYPE_R", 
+                               "Type S": "SENSORTYPE_TYPE_S", 
+                               "Type T": "SENSORTYPE_TYPE_T", 
         
                             }
 
     def find_Ports(self):
+
+        import_yoctopuce()
     
         errmsg = YRefParam()
 
@@ -155,6 +169,8 @@ def get_GUIparameter(self, parameter):
             
     def connect(self):
 
+        import_yoctopuce()
+
 
         # initialize the API. However, it is anyway done during 'RegisterHub'
         # YAPI.InitAPI()
@@ -188,7 +204,7 @@ def initialize(self):
                 return False  
             else:
                 self.temperature1.set_unit(self.temperature_unit)
-                self.temperature1.set_sensorType(self.sensor_types[self.sensor_type])
+                self.temperature1.set_sensorType(getattr(YTemperature, self.sensor_types[self.sensor_type]))
 
         if self.sensor2:
             if not (self.temperature2.isOnline()): 
@@ -196,7 +212,7 @@ def initialize(self):
                 return False
             else:
                 self.temperature2.set_unit(self.temperature_unit)
-                self.temperature2.set_sensorType(self.sensor_types[self.sensor_type])
+                self.temperature2.set_sensorType(getattr(YTemperature, self.sensor_types[self.sensor_type]))
         
 
     def configure(self):
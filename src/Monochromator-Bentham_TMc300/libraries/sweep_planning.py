@@ -0,0 +1,210 @@
+# This Device Class is published under the terms of the MIT License.
+# Required Third Party Libraries, which are included in the Device Class
+# package for convenience purposes, may have a different license. You can
+# find those in the corresponding folders or contact the maintainer.
+#
+# MIT License
+#
+# Copyright (c) 2024 SweepMe! GmbH (sweep-me.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import NamedTuple
+
+# Times in s the hardware needs to settle after the Bentham API returns from selecting a wavelength
+WAVELENGTH_SETTLING = 0.1
+GRATING_SETTLING = 0.8
+FILTER_SETTLING = 2.0
+FILTER_SETTLING_PER_POSITION = 0.5  # additional time per position if the wheel does not move to the next filter
+SAM_SETTLING = 5.5  # mirror swing of the swing away mirror (SAM) that selects the lamp
+
+
+class HardwareState(NamedTuple):
+    """Positions of all parts that move when a wavelength is selected."""
+
+    wavelength: float
+    grating: int
+    filter: int
+    sam: int
+    """State of the swing away mirror, 0 below and 1 above the switch wavelength."""
+
+
+def parse_filter_string(filter_string: str) -> tuple[list[int], list[float]]:
+    """Parse a filter changing string like '1 <- 400 nm -> 2 <- 700 nm -> 3'.
+
+    Args:
+        filter_string: Filter positions separated by the wavelengths in nm at which the next filter is used.
+
+    Returns:
+        Filter positions and the switch wavelengths between them, one wavelength less than positions.
+    """
+    filter_readout = filter_string.replace("<", "").replace(">", "").replace("nm", "").replace(" ", "").split("-")
+    filter_list = list(map(int, filter_readout[::2]))
+    switch_wavelengths = list(map(float, filter_readout[1::2]))
+    return filter_list, switch_wavelengths
+
+
+def settling_time(previous: HardwareState | None, new: HardwareState) -> float:
+    """Return the time to wait after selecting a new wavelength.
+
+    Only parts that have moved are waited for. The settling times of the moved parts are added up, as the earlier
+    driver versions waited for each part in turn and it is not verified that the parts settle at the same time.
+
+    Args:
+        previous: State before the wavelength was selected, None if unknown.
+        new: State after the wavelength was selected.
+
+    Returns:
+        Settling time in s.
+    """
+    if previous is None:
+        return WAVELENGTH_SETTLING + GRATING_SETTLING + FILTER_SETTLING + SAM_SETTLING
+
+    times = [0.0]
+    if new.wavelength != previous.wavelength:
+        times.append(WAVELENGTH_SETTLING)
+    if new.grating != previous.grating:
+        times.append(GRATING_SETTLING)
+    if new.filter != previous.filter:
+        filter_time = FILTER_SETTLING
+        # the wheel needs more time if it does not just move to the next filter position
+        if new.filter - previous.filter != 1:
+            filter_time += FILTER_SETTLING_PER_POSITION * abs(new.filter - previous.filter)
+        times.append(filter_time)
+    if new.sam != previous.sam:
+        times.append(SAM_SETTLING)
+
+    return sum(times)
+
+
+def fixed_settling_time(previous: HardwareState, new: HardwareState) -> float:
+    """Return the settling time of earlier driver versions that waited for all moved parts one after another.
+
+    This is used as reference for the simulation of sweep times.
+
+    Args:
+        previous: State before the wavelength was selected.
+        new: State after the wavelength was selected.
+
+    Returns:
+        Settling time in s.
+    """
+    total = WAVELENGTH_SETTLING
+    if new.sam != previous.sam:
+        total += SAM_SETTLING
+    if new.grating != previous.grating:
+        total += GRATING_SETTLING
+    if new.filter != previous.filter:
+        total += FILTER_SETTLING
+        if new.filter - previous.filter != 1:
+            total += FILTER_SETTLING_PER_POSITION * abs(new.filter - previous.filter)
+    return total
+
+
+class BandModel:
+    """Predicts the hardware state for a wavelength from the wavelengths at which gratings, filters and lamps switch."""
+
+    def __init__(
+        self,
+        grating_switches: list[float] | None = None,
+        filters: list[int] | None = None,
+        filter_switches: list[float] | None = None,
+        sam_switch: float | None = None,
+    ) -> None:
+        """Initialize the model.
+
+        Args:
+            grating_switches: Wavelengths in nm at which the next grating is used.
+            filters: Filter positions from short to long wavelengths, default is a fixed filter 1.
+            filter_switches: Wavelengths in nm at which the next filter of 'filters' is used.
+            sam_switch: Wavelength in nm at which the swing away mirror switches the lamp.
+        """
+        self.grating_switches = sorted(grating_switches or [])
+        self.filters = filters or [1]
+        self.filter_switches = sorted(filter_switches or [])
+        self.sam_switch = sam_switch
+
+        if len(self.filters) != len(self.filter_switches) + 1:
+            msg = "There must be exactly one filter more than filter switch wavelengths."
+            raise ValueError(msg)
+
+        self.switches = sorted(
+            set(self.grating_switches + self.filter_switches + ([sam_switch] if sam_switch is not None else [])),
+        )
+
+    def state(self, wavelength: float) -> HardwareState:
+        """Return the predicted hardware state for the given wavelength in nm."""
+        grating = 1 + bisect_right(self.grating_switches, wavelength)
+        filter_position = self.filters[bisect_right(self.filter_switches, wavelength)]
+        sam = int(self.sam_switch is not None and wavelength >= self.sam_switch)
+        return HardwareState(wavelength, grating, filter_position, sam)
+
+    def band(self, wavelength: float) -> int:
+        """Return the index of the wavelength range between two switch wavelengths."""
+        return bisect_right(self.switches, wavelength)
+
+
+def order_wavelengths(wavelengths: list[float], model: BandModel, descending: bool = False) -> list[float]:
+    """Reorder wavelengths so that every grating, filter and lamp switch happens only once.
+
+    Wavelengths are grouped by the range between two switch wavelengths and the ranges are visited in ascending or
+    descending order. Within a range, the given order is kept, e.g. for repeated measurements at one wavelength.
+
+    Args:
+        wavelengths: Wavelengths in nm in the order of the sweep.
+        model: Band model of the monochromator.
+        descending: If True, start with the longest wavelength range.
+
+    Returns:
+        Reordered wavelengths.
+    """
+    return sorted(wavelengths, key=model.band, reverse=descending)
+
+
+def sweep_settling_time(
+    wavelengths: list[float],
+    model: BandModel,
+    initial: HardwareState | None = None,
+    adaptive: bool = True,
+) -> float:
+    """Return the total time spent on settling during a sweep.
+
+    Args:
+        wavelengths: Wavelengths in nm in the order of the sweep.
+        model: Band model of the monochromator.
+        initial: Hardware state before the sweep, default is the state at the first wavelength.
+        adaptive: If False, the fixed settling times of earlier driver versions are used.
+
+    Returns:
+        Total settling time in s.
+    """
+    if not wavelengths:
+        return 0.0
+
+    total = 0.0
+    previous = model.state(wavelengths[0]) if initial is None else initial
+    for wavelength in wavelengths:
+        state = model.state(wavelength)
+        total += settling_time(previous, state) if adaptive else fixed_settling_time(previous, state)
+        previous = state
+    return total
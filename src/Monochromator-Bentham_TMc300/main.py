@@ -29,6 +29,7 @@
 
 # deal with dlls
 import ctypes  # bentham dll reading
+import importlib.util
 import os
 
 # path management
@@ -45,6 +46,13 @@
 
 addFolderToPATH()
 
+# Import the sweep planning helper from the libraries folder of the driver
+_spec = importlib.util.spec_from_file_location(
+    "sweep_planning", pathlib.Path(__file__).resolve().parent / "libraries" / "sweep_planning.py"
+)
+sweep_planning = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(sweep_planning)
+
 HTML_driver_descript = """
         <p>Driver for the Bentham TMc300 monochromator and tuneable light source</p>
         <p>&nbsp;</p>
@@ -71,6 +79,8 @@
         <li>End position (optional): goes back to this wavelength after the run</li>
         <li>Bias light selection, use "None" if not available</li>
         <li>Besides wavelength in nm, users can also vary energy in eV.</li>
+        <li>Settling times are only waited for the parts that moved. Use plan_sweep() or the script
+         "sweep_time_simulation.py" to find a wavelength order with fewer filter and lamp changes.</li>
         </ul>
         <p>&nbsp;</p>
         <p><strong>Requirements:</strong></p>
@@ -408,31 +418,56 @@ def goto_wavelength(self, wl):
             self.close_shutter()
             return
 
-        prev_filter = self.get_fwheel_pos()
-        prev_grating = self.get_grating_pos()
+        previous_state = self.get_hardware_state()
 
         self.set_wavelength(wl)
 
-        if (
-            wl == self.sam_switch
-        ):  # TODO: check whether we have to toggle using the last
-            time.sleep(5.5)  # let the mirror swing settle
-
-        new_grating = self.get_grating_pos()
-
-        if new_grating != prev_grating:
-            # somehow the API fails to sleep after sam/MC grating changes
-            time.sleep(0.8)
-
-        new_filter = self.get_fwheel_pos()
-        if new_filter != prev_filter:
-            # somehow the API fails to sleep after sam/MC grating changes
-            time.sleep(2.0)
-            if (
-                new_filter - prev_filter != 1
-            ):  # more time if change several filter positions
-                time.sleep(0.5 * abs(new_filter - prev_filter))
-        time.sleep(0.1)
+        new_state = self.get_hardware_state(wl)
+
+        # somehow the API fails to sleep after sam/MC grating/filter changes, so we only wait for the parts that moved
+        time.sleep(sweep_planning.settling_time(previous_state, new_state))
+
+    def get_hardware_state(self, wl=None):
+        """returns the positions of wavelength, grating, filter wheel and swing away mirror (SAM)
+
+        The SAM state is derived from the switch wavelength as the mirror is switched by the API.
+        """
+        if wl is None:
+            wl = self.get_wavelength()
+
+        return sweep_planning.HardwareState(
+            wavelength=float(wl),
+            grating=self.get_grating_pos(),
+            filter=self.get_fwheel_pos(),
+            sam=int(wl >= self.sam_switch),
+        )
+
+    def get_band_model(self):
+        """returns a model that predicts the filter and SAM state for each wavelength from the GUI settings
+
+        Grating changes are defined in the .atr file and are not known here.
+        """
+        if self.filter_string == "Auto":
+            filters, filter_switches = [1], []
+        else:
+            try:
+                filters, filter_switches = [int(self.filter_string)], []
+            except ValueError:
+                filters, filter_switches = sweep_planning.parse_filter_string(self.filter_string)
+
+        return sweep_planning.BandModel(
+            filters=filters,
+            filter_switches=filter_switches,
+            sam_switch=self.sam_switch,
+        )
+
+    def plan_sweep(self, wavelengths, descending=False):
+        """returns the wavelengths reordered so that each filter and lamp change only happens once
+
+        The sweep order is defined by the sweep values in SweepMe!, so this function can be used to create a
+        list of sweep values, e.g. in a script or by copying the result to the sweep value field.
+        """
+        return sweep_planning.order_wavelengths(list(wavelengths), self.get_band_model(), descending)
 
     def set_wavelength(self, wl):
 
@@ -0,0 +1,44 @@
+# %%
+"""Simulate the settling time of a wavelength sweep with the TMc300 timing model.
+
+The script compares the fixed settling times of earlier driver versions with the adaptive settling of
+'goto_wavelength' for an EQE spectrum in the given order and after reordering with 'order_wavelengths'.
+Grating, filter and lamp switch wavelengths are example values and should be adapted to the .atr file and the
+Filter and Lamp settings in SweepMe!.
+"""
+
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+
+_spec = importlib.util.spec_from_file_location(
+    "sweep_planning", Path(__file__).resolve().parent / "libraries" / "sweep_planning.py"
+)
+sweep_planning = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(sweep_planning)
+
+filters, filter_switches = sweep_planning.parse_filter_string(
+    "1 <- 400 nm -> 2 <- 700 nm -> 3 <- 750 nm -> 4 <- 800 nm -> 5"
+)
+model = sweep_planning.BandModel(
+    grating_switches=[650.0],
+    filters=filters,
+    filter_switches=filter_switches,
+    sam_switch=600.0,
+)
+
+# EQE spectrum with a coarse overview and a fine band edge scan that revisits the filter bands
+overview = np.arange(300.0, 1101.0, 10.0)
+band_edge = np.arange(690.0, 820.0, 1.0)
+wavelengths = list(overview) + list(band_edge)
+
+# %%
+fixed = sweep_planning.sweep_settling_time(wavelengths, model, adaptive=False)
+adaptive = sweep_planning.sweep_settling_time(wavelengths, model)
+ordered = sweep_planning.sweep_settling_time(sweep_planning.order_wavelengths(wavelengths, model), model)
+
+print("Number of wavelengths: %d" % len(wavelengths))
+print("Fixed settling:                %7.1f s" % fixed)
+print("Adaptive settling:             %7.1f s" % adaptive)
+print("Adaptive settling, reordered:  %7.1f s" % ordered)
@@ -0,0 +1,78 @@
+import importlib.util
+import unittest
+from pathlib import Path
+
+# Import the sweep planning helper
+file_path = Path(__file__).resolve().parent.parent / "libraries" / "sweep_planning.py"
+spec = importlib.util.spec_from_file_location("sweep_planning", file_path)
+sweep_planning = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(sweep_planning)
+
+HardwareState = sweep_planning.HardwareState
+
+
+class TestSettlingTime(unittest.TestCase):
+    """Test that only moved parts are waited for."""
+
+    def test_only_wavelength(self) -> None:
+        """Without grating, filter or mirror change, only the wavelength settling is needed."""
+        previous = HardwareState(500.0, 1, 2, 0)
+        self.assertEqual(sweep_planning.settling_time(previous, HardwareState(510.0, 1, 2, 0)), 0.1)  # noqa: PT009
+        self.assertEqual(sweep_planning.settling_time(previous, previous), 0.0)  # noqa: PT009
+
+    def test_moved_parts_added(self) -> None:
+        """The settling times of all moved parts are added up."""
+        previous = HardwareState(590.0, 1, 2, 0)
+        with_sam = HardwareState(610.0, 2, 3, 1)
+        without_sam = HardwareState(610.0, 2, 3, 0)
+        self.assertAlmostEqual(sweep_planning.settling_time(previous, with_sam), 8.4)  # noqa: PT009
+        self.assertAlmostEqual(sweep_planning.settling_time(previous, without_sam), 2.9)  # noqa: PT009
+
+    def test_filter_jump(self) -> None:
+        """The filter wheel needs more time if it skips positions or moves backwards."""
+        previous = HardwareState(800.0, 1, 5, 0)
+        new = HardwareState(300.0, 1, 1, 0)
+        self.assertAlmostEqual(sweep_planning.settling_time(previous, new), 4.1)  # noqa: PT009
+
+    def test_unknown_state(self) -> None:
+        """Without previous state, all parts are waited for."""
+        self.assertAlmostEqual(sweep_planning.settling_time(None, HardwareState(500.0, 1, 1, 0)), 8.4)  # noqa: PT009
+
+
+class TestOrdering(unittest.TestCase):
+    """Test the band model and the reordering of wavelengths."""
+
+    def setUp(self) -> None:
+        """Create a model with filter changes at 400 nm and 700 nm and a lamp change at 600 nm."""
+        filters, filter_switches = sweep_planning.parse_filter_string("1 <- 400 nm -> 2 <- 700 nm -> 3")
+        self.model = sweep_planning.BandModel(
+            grating_switches=[650.0],
+            filters=filters,
+            filter_switches=filter_switches,
+            sam_switch=600.0,
+        )
+
+    def test_state(self) -> None:
+        """The state is predicted from the switch wavelengths."""
+        self.assertEqual(self.model.state(350.0), HardwareState(350.0, 1, 1, 0))  # noqa: PT009
+        self.assertEqual(self.model.state(600.0), HardwareState(600.0, 1, 2, 1))  # noqa: PT009
+        self.assertEqual(self.model.state(800.0), HardwareState(800.0, 2, 3, 1))  # noqa: PT009
+
+    def test_each_switch_once(self) -> None:
+        """Wavelengths are grouped by band and the order within a band is kept."""
+        wavelengths = [300.0, 500.0, 800.0, 310.0, 510.0, 810.0, 500.0]
+        ordered = sweep_planning.order_wavelengths(wavelengths, self.model)
+        self.assertEqual(ordered, [300.0, 310.0, 500.0, 510.0, 500.0, 800.0, 810.0])  # noqa: PT009
+        self.assertLess(  # noqa: PT009
+            sweep_planning.sweep_settling_time(ordered, self.model),
+            sweep_planning.sweep_settling_time(wavelengths, self.model),
+        )
+
+    def test_invalid_filters(self) -> None:
+        """The number of filters must match the number of switch wavelengths."""
+        with self.assertRaises(ValueError):  # noqa: PT027
+            sweep_planning.BandModel(filters=[1, 2], filter_switches=[])
+
+
+if __name__ == "__main__":
+    unittest.main()
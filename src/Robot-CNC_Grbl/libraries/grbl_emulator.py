@@ -0,0 +1,264 @@
+# This Device Class is published under the terms of the MIT License.
+# Required Third Party Libraries, which are included in the Device Class
+# package for convenience purposes, may have a different license. You can
+# find those in the corresponding folders or contact the maintainer.
+#
+# MIT License
+#
+# Copyright (c) 2024 SweepMe! GmbH (sweep-me.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from __future__ import annotations
+
+import math
+import re
+import time
+from collections import deque
+from typing import NamedTuple
+
+
+class Block(NamedTuple):
+    """Planned linear move."""
+
+    start: tuple[float, float, float]
+    end: tuple[float, float, float]
+    duration: float
+
+
+class GrblEmulator:
+    """Serial port stand-in that behaves like a Grbl 1.1 controller, e.g. to test the driver without a machine.
+
+    The emulator has a receive buffer of limited size and a planner with a limited number of blocks. A line is parsed,
+    acknowledged with 'ok' and moved to the planner as soon as the planner has space. Moves are executed one after
+    another with constant feed rate, so that the position in the status reports changes over time. System commands
+    starting with '$' wait until all planned moves have finished, like in Grbl.
+
+    The emulator raises an OverflowError if more bytes are sent than fit into the receive buffer.
+    """
+
+    def __init__(
+        self,
+        rx_buffer_size: int = 128,
+        planner_size: int = 15,
+        time_scale: float = 1.0,
+        timeout: float = 0.1,
+        homing_time: float = 0.0,
+    ) -> None:
+        """Initialize the emulator in idle state at the home position.
+
+        Args:
+            rx_buffer_size: Size of the serial receive buffer in bytes.
+            planner_size: Number of moves that can be planned in advance.
+            time_scale: Factor to speed up (< 1) or slow down (> 1) the moves compared to the feed rate.
+            timeout: Read timeout in s, like the timeout of a serial port.
+            homing_time: Duration of the homing cycle in s.
+        """
+        self.rx_buffer_size = rx_buffer_size
+        self.planner_size = planner_size
+        self.time_scale = time_scale
+        self.timeout = timeout
+        self.homing_time = homing_time
+
+        self.rx_buffer = bytearray()
+        self.tx_buffer = bytearray(b"\r\nGrbl 1.1h ['$' for help]\r\n")
+        self.planner: deque[Block] = deque()
+        self.block_start_time = 0.0
+        self.busy_until = 0.0  # end of a homing cycle or dwell
+
+        self.position = (0.0, 0.0, 0.0)  # position at the end of the planned moves
+        self.feed_rate = 0.0
+        self.is_absolute = True
+        self.is_alarm = False
+        self.is_homing = False
+
+        self.received_lines: list[str] = []
+        """All lines received, e.g. to check the sent G-code in tests."""
+
+        self.max_buffered = 0
+        """Largest number of bytes that have been in the receive buffer at the same time."""
+
+    @property
+    def in_waiting(self) -> int:
+        """Number of bytes that can be read."""
+        self._update()
+        return len(self.tx_buffer)
+
+    def write(self, data: bytes) -> int:
+        """Receive bytes, real-time commands are handled immediately."""
+        self._update()
+        for char in data:
+            if char == ord("?"):
+                self._send(self._status_report())
+            else:
+                self.rx_buffer.append(char)
+
+        if len(self.rx_buffer) > self.rx_buffer_size:
+            msg = "Receive buffer of the Grbl emulator overflowed."
+            raise OverflowError(msg)
+        self.max_buffered = max(self.max_buffered, len(self.rx_buffer))
+
+        self._update()
+        return len(data)
+
+    def readline(self) -> bytes:
+        """Return the next line or the bytes received until the timeout."""
+        deadline = time.perf_counter() + self.timeout
+        while True:
+            self._update()
+            index = self.tx_buffer.find(b"\n")
+            if index >= 0 or time.perf_counter() > deadline:
+                end = index + 1 if index >= 0 else len(self.tx_buffer)
+                line = bytes(self.tx_buffer[:end])
+                del self.tx_buffer[:end]
+                return line
+            time.sleep(0.001)
+
+    def reset_input_buffer(self) -> None:
+        """Discard all bytes that have not been read yet."""
+        self._update()
+        self.tx_buffer.clear()
+
+    def close(self) -> None:
+        """Nothing to close, only needed to be used like a serial port."""
+
+    def _send(self, text: str) -> None:
+        self.tx_buffer += (text + "\r\n").encode("ascii")
+
+    def _update(self) -> None:
+        """Execute the planned moves until now and parse received lines while the planner has space."""
+        now = time.perf_counter()
+
+        while self.planner and now >= self.block_start_time + self.planner[0].duration:
+            self.block_start_time += self.planner[0].duration
+            self.planner.popleft()
+        if not self.planner:
+            self.block_start_time = max(now, self.busy_until)
+
+        # the homing cycle is acknowledged once it has finished
+        if self.is_homing and now >= self.busy_until:
+            self.is_homing = False
+            self._send("ok")
+
+        while b"\n" in self.rx_buffer:
+            if len(self.planner) >= self.planner_size or now < self.busy_until:
+                break
+
+            index = self.rx_buffer.find(b"\n")
+            line = self.rx_buffer[:index].decode("ascii").strip().upper()
+
+            # system commands are only executed once all moves have finished
+            if line.startswith("$") and self.planner:
+                break
+
+            del self.rx_buffer[: index + 1]
+            if line:
+                self.received_lines.append(line)
+                reply = self._execute(line)
+                if reply:
+                    self._send(reply)
+
+    def _execute(self, line: str) -> str:
+        """Execute a line and return the reply, an empty string if the reply is sent later."""
+        if line.startswith("$"):
+            return self._execute_system_command(line)
+
+        if self.is_alarm:
+            return "error:9"  # G-code locked out during alarm
+
+        words = dict(re.findall(r"([A-Z])\s*(-?[\d.]+)", line))
+        gcodes = {int(float(value)) for letter, value in re.findall(r"(G)\s*(\d+)", line)}
+
+        if 90 in gcodes:
+            self.is_absolute = True
+        if 91 in gcodes:
+            self.is_absolute = False
+        if "F" in words:
+            self.feed_rate = float(words["F"])
+
+        if 4 in gcodes:
+            self.busy_until = max(time.perf_counter(), self._end_time()) + float(words.get("P", 0.0)) * self.time_scale
+            return "ok"
+
+        if gcodes & {0, 1}:
+            if 1 in gcodes and self.feed_rate <= 0.0:
+                return "error:22"  # undefined feed rate
+
+            target = list(self.position)
+            for axis, letter in enumerate("XYZ"):
+                if letter in words:
+                    value = float(words[letter])
+                    target[axis] = value if self.is_absolute else target[axis] + value
+
+            # G0 moves with the maximum rate that is assumed to be 5000 mm/min
+            feed_rate = 5000.0 if 0 in gcodes else self.feed_rate
+            distance = math.dist(self.position, target)
+            block = Block(self.position, tuple(target), distance / feed_rate * 60.0 * self.time_scale)
+            if not self.planner:
+                self.block_start_time = max(time.perf_counter(), self.busy_until)
+            self.planner.append(block)
+            self.position = block.end
+
+        return "ok"
+
+    def _execute_system_command(self, line: str) -> str:
+        """Execute a system command and return the reply, an empty string if the reply is sent later."""
+        if line == "$X":
+            self.is_alarm = False
+            self._send("[MSG:Caution: Unlocked]")
+        elif line == "$H":
+            self.is_alarm = False
+            self.is_homing = True
+            self.position = (0.0, 0.0, 0.0)
+            self.busy_until = time.perf_counter() + self.homing_time
+            return ""
+        elif line == "$$":
+            for setting in ["$0=10", "$1=25", "$10=1", "$110=5000.000", "$111=5000.000", "$112=500.000"]:
+                self._send(setting)
+        elif line == "$":
+            self._send("[HLP:$$ $# $G $I $N $x=val $Nx=line $J=line $SLP $C $X $H ~ ! ? ctrl-x]")
+        else:
+            return "error:3"  # not a valid statement
+        return "ok"
+
+    def _end_time(self) -> float:
+        """Return the time when all planned moves have finished."""
+        return self.block_start_time + sum(block.duration for block in self.planner)
+
+    def _status_report(self) -> str:
+        """Create the real-time status report for the current position."""
+        now = time.perf_counter()
+        if self.is_alarm:
+            state = "Alarm"
+        elif self.is_homing:
+            state = "Home"
+        elif self.planner:
+            state = "Run"
+        else:
+            state = "Idle"
+
+        if self.planner:
+            block = self.planner[0]
+            fraction = min(max((now - self.block_start_time) / block.duration, 0.0), 1.0) if block.duration else 1.0
+            position = tuple(s + (e - s) * fraction for s, e in zip(block.start, block.end))
+        else:
+            position = self.position
+
+        return "<%s|MPos:%.3f,%.3f,%.3f|FS:%d,0>" % (state, *position, self.feed_rate if state == "Run" else 0)
@@ -0,0 +1,311 @@
+# This Device Class is published under the terms of the MIT License.
+# Required Third Party Libraries, which are included in the Device Class
+# package for convenience purposes, may have a different license. You can
+# find those in the corresponding folders or contact the maintainer.
+#
+# MIT License
+#
+# Copyright (c) 2024 SweepMe! GmbH (sweep-me.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import NamedTuple, Protocol
+
+
+class SerialPort(Protocol):
+    """Minimal port interface needed by the streamer, fulfilled by serial.Serial and the GrblEmulator."""
+
+    @property
+    def in_waiting(self) -> int:
+        """Number of bytes that can be read without blocking."""
+
+    def write(self, data: bytes) -> int | None:
+        """Write the given bytes."""
+
+    def readline(self) -> bytes:
+        """Read until a line feed, an incomplete line is returned if the port timeout is reached."""
+
+    def reset_input_buffer(self) -> None:
+        """Discard all received bytes."""
+
+
+class GrblError(Exception):
+    """Raised if Grbl replies with an error or an alarm."""
+
+
+class GrblStatus(NamedTuple):
+    """Real-time status report."""
+
+    state: str
+    """Machine state, e.g. 'Idle', 'Run', 'Hold', or 'Alarm'."""
+
+    position: tuple[float, float, float]
+    """Machine position (MPos) or work position (WPos), depending on the status report setting $10."""
+
+
+def parse_status(report: str) -> GrblStatus:
+    """Parse a real-time status report of Grbl 1.1, e.g. '<Idle|MPos:0.000,0.000,0.000|FS:0,0>'.
+
+    The format of Grbl 0.9, e.g. '<Idle,MPos:0.000,0.000,0.000,WPos:0.000,0.000,0.000>', is supported as well.
+
+    Args:
+        report: Status report with or without angle brackets.
+
+    Returns:
+        Machine state and position.
+    """
+    report = report.strip().lstrip("<").rstrip(">")
+
+    if "|" in report:
+        fields = report.split("|")
+        # substates are separated by a colon, e.g. 'Hold:0'
+        state = fields[0].split(":")[0]
+        for field in fields[1:]:
+            if field.startswith(("MPos:", "WPos:")):
+                values = field[5:].split(",")
+                break
+        else:
+            msg = f"Status report '{report}' does not contain a position."
+            raise ValueError(msg)
+    else:
+        state, _, positions = report.partition(",")
+        index = positions.find("MPos:")
+        if index < 0:
+            index = positions.find("WPos:")
+        if index < 0:
+            msg = f"Status report '{report}' does not contain a position."
+            raise ValueError(msg)
+        values = positions[index + 5 :].split(",")
+
+    x, y, z = (float(value) for value in values[:3])
+    return GrblStatus(state, (x, y, z))
+
+
+class GrblStreamer:
+    """Streams G-code to Grbl with character-counting flow control.
+
+    Grbl has a serial receive buffer of 128 bytes and acknowledges every line with 'ok' or 'error:<code>' once it has
+    been parsed. Instead of waiting for each reply, the streamer keeps track of the number of bytes that are sent but
+    not acknowledged, and sends the next line as soon as it fits into the receive buffer. Thus, the planner of Grbl
+    always gets the next moves in time and can blend them without stopping in between.
+
+    Replies are processed whenever the streamer is used. Errors are collected and raised by
+    'wait_until_acknowledged' or 'check_errors', so that the line causing the error might not be the last one sent.
+    """
+
+    def __init__(self, port: SerialPort, rx_buffer_size: int = 128, timeout: float = 10.0) -> None:
+        """Initialize the streamer.
+
+        Args:
+            port: Open serial port with a read timeout that is small compared to the timeout of the streamer.
+            rx_buffer_size: Size of the serial receive buffer of Grbl in bytes.
+            timeout: Maximum time in s to wait for a reply.
+        """
+        self.port = port
+        self.rx_buffer_size = rx_buffer_size
+        self.timeout = timeout
+
+        self.pending: deque[int] = deque()
+        """Lengths of all lines that are sent but not acknowledged yet."""
+
+        self.messages: list[str] = []
+        """Feedback messages like settings or the welcome message that are not a reply or status report."""
+
+        self.errors: list[str] = []
+        self.status: GrblStatus | None = None
+
+        self._partial_line = b""
+
+    @property
+    def buffered(self) -> int:
+        """Number of bytes that are sent but not acknowledged yet."""
+        return sum(self.pending)
+
+    def wake_up(self, delay: float = 2.0) -> None:
+        """Wake up Grbl and discard the welcome message, as done by the streaming script of Grbl.
+
+        Args:
+            delay: Time in s to wait for Grbl to initialize, e.g. after an Arduino resets when the port is opened.
+        """
+        self.port.write(b"\r\n\r\n")
+        time.sleep(delay)
+        self.port.reset_input_buffer()
+        self._partial_line = b""
+        self.pending.clear()
+        self.messages.clear()
+
+    def send(self, line: str) -> None:
+        """Send a line as soon as it fits into the receive buffer of Grbl.
+
+        Args:
+            line: G-code or system command without line ending.
+        """
+        data = (line.strip() + "\n").encode("ascii")
+        if len(data) > self.rx_buffer_size:
+            msg = f"Line '{line}' is longer than the receive buffer of Grbl."
+            raise ValueError(msg)
+
+        deadline = time.perf_counter() + self.timeout
+        self.poll()
+        while self.buffered + len(data) > self.rx_buffer_size:
+            self._read_reply(deadline)
+
+        self.port.write(data)
+        self.pending.append(len(data))
+
+    def send_all(self, lines: list[str]) -> None:
+        """Stream several lines, the function returns as soon as the last line has been sent.
+
+        Args:
+            lines: G-code or system commands without line ending.
+        """
+        for line in lines:
+            self.send(line)
+
+    def poll(self) -> None:
+        """Process all replies that have been received so far without waiting."""
+        while self.port.in_waiting > 0:
+            self._handle(self.port.readline())
+
+    def wait_until_acknowledged(self, timeout: float | None = None) -> list[str]:
+        """Wait until all lines sent are acknowledged.
+
+        Args:
+            timeout: Maximum time in s to wait, default is the timeout of the streamer.
+
+        Returns:
+            Feedback messages received since the last call, e.g. the settings requested with '$$'.
+        """
+        deadline = time.perf_counter() + (self.timeout if timeout is None else timeout)
+        self.poll()
+        while self.pending:
+            self._read_reply(deadline)
+
+        self.check_errors()
+
+        messages = self.messages
+        self.messages = []
+        return messages
+
+    def command(self, line: str, timeout: float | None = None) -> list[str]:
+        """Send a line and wait for all replies.
+
+        Args:
+            line: G-code or system command without line ending.
+            timeout: Maximum time in s to wait, default is the timeout of the streamer.
+
+        Returns:
+            Feedback messages received.
+        """
+        self.send(line)
+        return self.wait_until_acknowledged(timeout)
+
+    def check_errors(self) -> None:
+        """Raise all errors and alarms received so far."""
+        if self.errors:
+            msg = "Grbl replied with " + ", ".join(self.errors)
+            self.errors = []
+            raise GrblError(msg)
+
+    def query_status(self, timeout: float | None = None) -> GrblStatus:
+        """Request a real-time status report.
+
+        The real-time command '?' is handled immediately by Grbl and does not take any space in the receive buffer.
+
+        Args:
+            timeout: Maximum time in s to wait, default is the timeout of the streamer.
+
+        Returns:
+            Machine state and position.
+        """
+        deadline = time.perf_counter() + (self.timeout if timeout is None else timeout)
+        self.status = None
+        self.port.write(b"?")
+        while self.status is None:
+            self._read_reply(deadline)
+        return self.status
+
+    def wait_until_idle(self, timeout: float, min_interval: float = 0.01, max_interval: float = 0.2) -> GrblStatus:
+        """Wait until all lines are acknowledged and the machine has finished all planned moves.
+
+        The status is requested with increasing intervals, so that short moves finish within milliseconds.
+
+        Args:
+            timeout: Maximum time in s to wait.
+            min_interval: First interval in s between two status requests.
+            max_interval: Longest interval in s between two status requests.
+
+        Returns:
+            Status report with state 'Idle'.
+        """
+        deadline = time.perf_counter() + timeout
+        self.wait_until_acknowledged(timeout)
+
+        interval = min_interval
+        while True:
+            status = self.query_status(max(deadline - time.perf_counter(), 0.0))
+            if status.state == "Idle":
+                return status
+            if status.state == "Alarm":
+                msg = "Grbl is in alarm state."
+                raise GrblError(msg)
+            if time.perf_counter() + interval > deadline:
+                msg = f"Grbl did not finish all moves within {timeout} s."
+                raise TimeoutError(msg)
+            time.sleep(interval)
+            interval = min(2 * interval, max_interval)
+
+    def _read_reply(self, deadline: float) -> None:
+        """Read and process one line, raise a TimeoutError if nothing is received until the deadline."""
+        if time.perf_counter() > deadline:
+            msg = "No reply from Grbl."
+            raise TimeoutError(msg)
+        self._handle(self.port.readline())
+
+    def _handle(self, line: bytes) -> None:
+        """Process a received line, an incomplete line is kept until the rest has been received."""
+        line = self._partial_line + line
+        if not line.endswith(b"\n"):
+            self._partial_line = line
+            return
+        self._partial_line = b""
+
+        text = line.decode("ascii", errors="replace").strip()
+
+        if not text:
+            return
+
+        if text == "ok":
+            if self.pending:
+                self.pending.popleft()
+        elif text.startswith("error"):
+            if self.pending:
+                self.pending.popleft()
+            self.errors.append(text)
+        elif text.startswith("<"):
+            self.status = parse_status(text)
+        elif text.startswith("ALARM"):
+            self.errors.append(text)
+        else:
+            self.messages.append(text)
@@ -33,13 +33,21 @@
 # Device: CNC Grbl
 
 
-import time
+import importlib.util
+from pathlib import Path
+
 import serial
 
 from ErrorMessage import error, debug
 
 from EmptyDeviceClass import EmptyDevice
 
+_spec = importlib.util.spec_from_file_location(
+    "grbl_streaming", Path(__file__).resolve().parent / "libraries" / "grbl_streaming.py"
+)
+grbl_streaming = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(grbl_streaming)
+
 
 class Device(EmptyDevice):
 
@@ -67,6 +75,8 @@ class Device(EmptyDevice):
                      is irrelevant and the robot will always go the (x, y) position in the safe height plate and then go
                       down to the touch height. However, when jump mode is deactivated, (x, y, z) values can be passed 
                       to the driver.</li>
+                    <li>If 'Reach position' is unchecked, moves are streamed to Grbl without waiting, so that Grbl can 
+                    plan consecutive moves in advance and blend them without stopping.</li>
                     </ul>
                     <p><strong>Warning:</strong></p>
                     <ul>
@@ -98,6 +108,7 @@ def __init__(self):
         self.port_types = ["COM"]
 
         self.reach_position_timeout = 60.0
+        self.homing_timeout = 120.0
     
     def set_GUIparameter(self):
 
@@ -142,7 +153,10 @@ def get_GUIparameter(self, parameter):
     """ here, semantic standard functions start that are called by SweepMe! during a measurement """
        
     def connect(self):   
-        self.pyserial_port = serial.Serial(self.port_string, 115200, timeout=30)
+        # a short read timeout as replies are processed while streaming, the streamer has its own timeout
+        self.pyserial_port = serial.Serial(self.port_string, 115200, timeout=0.1)
+        self.grbl = grbl_streaming.GrblStreamer(self.pyserial_port)
+        self.grbl.wake_up()
 
     def disconnect(self):    
         self.pyserial_port.close()
@@ -157,11 +171,12 @@ def deinitialize(self):
         if self.go_home_end:
             if self.jump_mode:
                 self.move_xyz(2000, self._last_xyzf[0], self._last_xyzf[1], self.movement_height)
-                self.reach_position()
             self.move_xyz(2000, 0, 0, 0)
+        # all streamed moves must be finished before the port is closed
+        self.wait_reach_position()
 
     def configure(self):
-        self._last_xyzf = [0, 0, 0, 0]
+        self._last_xyzf = (0, 0, 0, self.axes["feed rate"]["Value"])
 
     def unconfigure(self):
         pass
@@ -188,25 +203,29 @@ def apply(self):
         else: 
             z = self._last_xyzf[2]
 
-        if "feed" in self.sweepvalues and self.sweepvalues["feed rate"] != "nan":
-            feed_rate = int(self.sweepvalues["feed rate"])
+        if "feed rate" in self.sweepvalues and self.sweepvalues["feed rate"] != "nan":
+            feed_rate = int(float(self.sweepvalues["feed rate"]))
         else: 
             feed_rate = self._last_xyzf[3]
             
         # Jump mode
-        if self._last_xyzf[0:2] != (x, y, z, feed_rate):
+        if self._last_xyzf != (x, y, z, feed_rate):
             if self.jump_mode:
-                self.move_xyz(self._last_xyzf[3], self._last_xyzf[0], self._last_xyzf[1], self.movement_height)
-                self.wait_reach_position()
-                self.move_xyz(feed_rate, x, y, self.movement_height)
-                self.wait_reach_position()
-                self.move_xyz(feed_rate, x, y, z)
+                # the three moves are streamed at once and Grbl executes them one after another
+                self.move_path(
+                    [
+                        (self._last_xyzf[0], self._last_xyzf[1], self.movement_height),
+                        (x, y, self.movement_height),
+                        (x, y, z),
+                    ],
+                    feed_rate,
+                )
                 self.wait_reach_position()
             else: 
                 self.move_xyz(feed_rate, x, y, z)
                 if self.reach_position:
-                    self.reach_position()
-            self._last_xyzf = (x, y, z)
+                    self.wait_reach_position()
+            self._last_xyzf = (x, y, z, feed_rate)
             
     def call(self):
         x, y, z = self.get_position()
@@ -215,20 +234,12 @@ def call(self):
     """ here, convenience functions start """
 
     def write(self, msg):
-        # print("\nmsg:", (msg+"\r\n").encode())
-        self.pyserial_port.write((msg+"\r\n").encode())
-        time.sleep(.1)
-
-    def read(self):
-        answer = self.pyserial_port.read_until(b"ok\r\nok").strip().decode()
-        # another way to read the answer, sometimes fails
-        # answer = ""
-        # while self.pyserial_port.inWaiting():
-        #     answer += self.pyserial_port.readline().decode().strip() + "\n"
-        #     time.sleep(.1)
-        # print(answer)
-        
-        return answer
+        """ sends a line as soon as it fits into the receive buffer of Grbl, replies are processed later """
+        self.grbl.send(msg)
+
+    def read(self, timeout=None):
+        """ waits until all lines are acknowledged and returns all other messages received in the meantime """
+        return "\n".join(self.grbl.wait_until_acknowledged(timeout))
 
     def get_robot_paramters(self):
         self.write("$$")
@@ -251,28 +262,31 @@ def reset_robot(self):
         return answer
         
     def move_xyz(self, f, x, y, z):
+        """ streams a linear move, use 'wait_reach_position' to wait until the move has finished """
         self.write("G1 G90 F%d X%f Y%f Z%f" % (float(f), float(x), float(y), float(z)))
-        answer = self.read()
-        return answer
+
+    def move_path(self, positions, f):
+        """
+        streams linear moves to all given (x, y, z) positions at once, so that the planner of Grbl can blend
+        consecutive moves, use 'wait_reach_position' to wait until the last position is reached
+        """
+        self.grbl.send_all(["G1 G90 F%d X%f Y%f Z%f" % (float(f), float(x), float(y), float(z))
+                            for x, y, z in positions])
 
     def homing(self):
+        # Grbl acknowledges the homing command once the homing cycle has finished
         self.write("$H")
-        self.read()
+        self.read(self.homing_timeout)
         # sets the position to zero, pretty confusing command
         # self.write("G10 P0 L20 X0 Y0 Z0")
         # answer = self.read()
         
     def wait_reach_position(self):
-        time.sleep(0.2)
-        while self.get_state() == "Run":
-            time.sleep(0.2)
+        """ waits until all moves are acknowledged and Grbl reports the state 'Idle' """
+        self.grbl.wait_until_idle(self.reach_position_timeout)
                 
     def get_position(self):
-        self.write("$?")
-        answer = self.read().split("|")
-        return tuple(map(float, answer[1][5:].split(",")))
+        return self.grbl.query_status().position
 
     def get_state(self):
-        self.write("$?")
-        answer = self.read().split("|")
-        return answer[0][1:]
+        return self.grbl.query_status().state
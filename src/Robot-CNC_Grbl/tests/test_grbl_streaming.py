@@ -0,0 +1,107 @@
+import importlib.util
+import time
+import unittest
+from pathlib import Path
+
+
+def load_library(name: str):  # noqa: ANN201
+    """Import a module from the libraries folder of the driver."""
+    file_path = Path(__file__).resolve().parent.parent / "libraries" / f"{name}.py"
+    spec = importlib.util.spec_from_file_location(name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+grbl_streaming = load_library("grbl_streaming")
+grbl_emulator = load_library("grbl_emulator")
+
+GrblError = grbl_streaming.GrblError
+GrblStreamer = grbl_streaming.GrblStreamer
+GrblEmulator = grbl_emulator.GrblEmulator
+
+
+class TestParseStatus(unittest.TestCase):
+    """Test parsing of real-time status reports."""
+
+    def test_grbl_11(self) -> None:
+        """The status report of Grbl 1.1 separates fields by '|'."""
+        status = grbl_streaming.parse_status("<Run|MPos:1.000,-2.500,3.125|FS:500,0>")
+        self.assertEqual(status.state, "Run")  # noqa: PT009
+        self.assertEqual(status.position, (1.0, -2.5, 3.125))  # noqa: PT009
+
+    def test_substate_and_work_position(self) -> None:
+        """Substates are removed and the work position is used if the machine position is not reported."""
+        status = grbl_streaming.parse_status("<Hold:0|WPos:0.000,1.000,2.000|Bf:15,128>")
+        self.assertEqual(status.state, "Hold")  # noqa: PT009
+        self.assertEqual(status.position, (0.0, 1.0, 2.0))  # noqa: PT009
+
+    def test_grbl_09(self) -> None:
+        """The status report of Grbl 0.9 separates fields by ','."""
+        status = grbl_streaming.parse_status("<Idle,MPos:5.000,6.000,7.000,WPos:0.000,0.000,0.000>")
+        self.assertEqual(status.state, "Idle")  # noqa: PT009
+        self.assertEqual(status.position, (5.0, 6.0, 7.0))  # noqa: PT009
+
+
+class TestStreaming(unittest.TestCase):
+    """Test streaming with character-counting flow control against the emulator."""
+
+    def setUp(self) -> None:
+        """Create a fast emulator and a streamer that is connected to it."""
+        self.emulator = GrblEmulator(time_scale=0.001, timeout=0.01)
+        self.grbl = GrblStreamer(self.emulator, timeout=5.0)
+        self.grbl.wake_up(delay=0.0)
+
+    def test_receive_buffer_is_filled_but_never_overflows(self) -> None:
+        """Many moves are sent before the first one has finished, without exceeding the receive buffer."""
+        lines = ["G1 G90 F1000 X%f Y%f Z0.000000" % (i, i % 2) for i in range(60)]
+        self.grbl.send_all(lines)
+        self.grbl.wait_until_idle(timeout=5.0)
+
+        self.assertEqual(self.emulator.received_lines, lines)  # noqa: PT009
+        self.assertLessEqual(self.emulator.max_buffered, 128)  # noqa: PT009
+        self.assertGreater(self.emulator.max_buffered, 64)  # noqa: PT009
+
+    def test_final_position(self) -> None:
+        """The status report contains the position of the last move once the machine is idle."""
+        self.grbl.send_all(["G1 G90 F600 X1 Y2 Z-1", "G91", "G1 X1", "G90"])
+        status = self.grbl.wait_until_idle(timeout=5.0)
+        self.assertEqual(status.state, "Idle")  # noqa: PT009
+        self.assertEqual(status.position, (2.0, 2.0, -1.0))  # noqa: PT009
+
+    def test_status_during_move(self) -> None:
+        """The real-time status is reported while moves are running."""
+        emulator = GrblEmulator(time_scale=0.01, timeout=0.01)
+        grbl = GrblStreamer(emulator, timeout=5.0)
+        grbl.send("G1 F600 X10")  # takes 10 ms with the given time scale
+        self.assertEqual(grbl.query_status().state, "Run")  # noqa: PT009
+        self.assertEqual(grbl.wait_until_idle(timeout=5.0).position, (10.0, 0.0, 0.0))  # noqa: PT009
+
+    def test_system_command_waits_for_moves(self) -> None:
+        """Homing is acknowledged once the homing cycle has finished."""
+        emulator = GrblEmulator(timeout=0.01, homing_time=0.05)
+        grbl = GrblStreamer(emulator, timeout=5.0)
+        start_time = time.perf_counter()
+        grbl.command("$H")
+        self.assertGreaterEqual(time.perf_counter() - start_time, 0.05)  # noqa: PT009
+        self.assertEqual(grbl.query_status().state, "Idle")  # noqa: PT009
+
+    def test_messages(self) -> None:
+        """Feedback messages are returned by the command."""
+        messages = self.grbl.command("$$")
+        self.assertIn("$10=1", messages)  # noqa: PT009
+
+    def test_error(self) -> None:
+        """Errors are raised once the lines are acknowledged."""
+        self.grbl.send("G1 X1")  # no feed rate given
+        with self.assertRaises(GrblError):  # noqa: PT027
+            self.grbl.wait_until_acknowledged()
+
+    def test_line_too_long(self) -> None:
+        """Lines that do not fit into the receive buffer at all are rejected."""
+        with self.assertRaises(ValueError):  # noqa: PT027
+            self.grbl.send("G1 X1" + " " * 130 + "Y1")
+
+
+if __name__ == "__main__":
+    unittest.main()
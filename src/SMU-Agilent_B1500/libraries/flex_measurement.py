@@ -0,0 +1,169 @@
+# This Device Class is published under the terms of the MIT License.
+# Required Third Party Libraries, which are included in the Device Class
+# package for convenience purposes, may have a different license. You can
+# find those in the corresponding folders or contact the maintainer.
+#
+# MIT License
+#
+# Copyright (c) 2024 SweepMe! GmbH (sweep-me.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+from __future__ import annotations
+
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+CHANNEL_LETTERS = "ABCDEFGH"
+"""Letters used in the data header for the channels 1, 2, ..."""
+
+INVALID_VALUE = 1e37
+"""Values above are returned by the instrument if no valid data is available."""
+
+
+class DataPoint(NamedTuple):
+    """Value of the ASCII output format with header (FMT 1), e.g. 'NAI+1.23456E-03'."""
+
+    status: str
+    """'N' for normal, other letters e.g. for compliance ('C'), overflow ('V'), or oscillation ('X')."""
+
+    channel: int
+    data_type: str
+    """'I' or 'V' for measured current or voltage, 'i' or 'v' for the source output value of a sweep."""
+
+    value: float
+
+
+def parse_data(reply: str) -> list[DataPoint]:
+    """Parse a reply of the ASCII output format with header, values are separated by commas.
+
+    Args:
+        reply: Reply to a trigger like 'XE', 'TI', or 'TV'.
+
+    Returns:
+        Values in the order of the reply, invalid values are NaN.
+    """
+    data = []
+    for item in reply.strip().split(","):
+        if not item:
+            continue
+        value = float(item[3:])
+        if abs(value) >= INVALID_VALUE:
+            value = float("nan")
+        data.append(DataPoint(item[0], CHANNEL_LETTERS.index(item[1]) + 1, item[2], value))
+    return data
+
+
+def group_data(data: list[DataPoint]) -> dict[int, dict[str, list[float]]]:
+    """Return the values of each channel and data type, e.g. group_data(data)[2]["I"] for the currents of channel 2."""
+    groups: dict[int, dict[str, list[float]]] = {}
+    for point in data:
+        groups.setdefault(point.channel, {}).setdefault(point.data_type, []).append(point.value)
+    return groups
+
+
+class SharedMeasurement:
+    """Measures all channels that request a spot measurement at a point with a single trigger.
+
+    Each channel is a separate driver instance. During 'measure', every instance requests its channel. The first
+    instance that needs its result triggers the measurement of all requested channels, e.g. with 'MM 1' and 'XE', and
+    keeps the results for the other channels. Thus, the number of bus transactions does not grow with the number of
+    channels.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without requested channels."""
+        self.requested: list[int] = []
+        self.results: dict[int, dict[str, list[float]]] = {}
+
+    def request(self, channel: int) -> None:
+        """Request a measurement of the channel at the current point."""
+        if channel not in self.requested:
+            self.requested.append(channel)
+        self.results.pop(channel, None)
+
+    def result(self, channel: int, execute: Callable[[list[int]], list[DataPoint]]) -> dict[str, list[float]]:
+        """Return the values of the channel, the measurement is triggered if not done yet for this point.
+
+        Args:
+            channel: Channel number.
+            execute: Function that measures the given channels and returns the parsed reply.
+
+        Returns:
+            Values of the channel by data type.
+        """
+        if channel not in self.results:
+            channels = sorted(set(self.requested) | {channel})
+            self.requested = []
+            self.results = group_data(execute(channels))
+            if channel not in self.results:
+                msg = f"No data returned for channel {channel}."
+                raise ValueError(msg)
+        return self.results.pop(channel)
+
+
+def staircase(
+    start: float,
+    end: float,
+    steppoints_type: str,
+    steppoints_value: float,
+    dual: bool = False,
+) -> tuple[int, int, np.ndarray]:
+    """Return the parameters of a staircase sweep ('WV' or 'WI') and the source values of all steps.
+
+    Args:
+        start: Start value of the sweep.
+        end: End value of the sweep.
+        steppoints_type: 'Step width:', 'Points (lin.):', or 'Points (log.):'.
+        steppoints_value: Step width or number of points.
+        dual: If True, the sweep returns from the end to the start value.
+
+    Returns:
+        Sweep mode (1 linear, 2 logarithmic, plus 2 for a dual sweep), number of steps of a single sweep, and all
+        source values.
+    """
+    if steppoints_type.startswith("Step width"):
+        mode = 1
+        if steppoints_value == 0.0:
+            if end != start:
+                msg = "Start and end value must be equal if step width is zero."
+                raise ValueError(msg)
+            points = 1
+        else:
+            points = int(round(abs(end - start) / abs(steppoints_value))) + 1
+    elif steppoints_type.startswith("Points (lin.)"):
+        mode = 1
+        points = int(steppoints_value)
+    elif steppoints_type.startswith("Points (log.)"):
+        mode = 2
+        points = int(steppoints_value)
+    else:
+        msg = f"Unknown step type '{steppoints_type}'."
+        raise ValueError(msg)
+
+    values = np.geomspace(start, end, points) if mode == 2 else np.linspace(start, end, points)
+
+    if dual:
+        mode += 2
+        values = np.concatenate([values, values[::-1]])
+
+    return mode, points, values
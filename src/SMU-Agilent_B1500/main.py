@@ -31,14 +31,36 @@
 # Device: Agilent B1500
 
 
+import importlib.util
 import numpy as np
 import time
 from collections import OrderedDict
+from pathlib import Path
 
 from EmptyDeviceClass import EmptyDevice
 
+# Import the FLEX measurement helper from the libraries folder of the driver
+_spec = importlib.util.spec_from_file_location(
+    "flex_measurement", Path(__file__).resolve().parent / "libraries" / "flex_measurement.py"
+)
+flex_measurement = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(flex_measurement)
+
 class Device(EmptyDevice):
 
+    description = """
+                  <p><strong>Trigger</strong></p>
+                  <ul>
+                  <li>"Per channel": current and voltage of the channel are measured with separate commands (TI, TV).</li>
+                  <li>"All channels": all channels with this option are measured with a single trigger (MM 1, XE),
+                  e.g. all terminals of a transistor. The measured value is the compliance side, i.e. the current of a
+                  voltage source, and the source value is the value that is set.</li>
+                  </ul>
+                  <p><strong>List sweep</strong></p>
+                  <p>The channel sweeps with the staircase sweep of the instrument (WV, WI) and all values are read at
+                  once. Channels with trigger "All channels" are measured at each step of the sweep.</p>
+                  """
+
     multichannel = [" CH1", " CH2", " CH3", " CH4", " CH5", " CH6"]
 
     def __init__(self):
@@ -61,6 +83,9 @@ def __init__(self):
                                 }
                             
         self.port_identifications = ['Agilent Technologies,B1500A']
+
+        # maximum time in s to wait for the data of a staircase sweep
+        self.sweep_timeout = 600
         
         
         self.current_ranges = OrderedDict([
@@ -91,6 +116,16 @@ def set_GUIparameter(self):
                         "Range": list(self.current_ranges.keys()),
                         "Compliance": 100e-6,
                         "Average": 1,
+                        "Trigger": ["Per channel", "All channels"],
+
+                        "ListSweepCheck": True,
+                        "ListSweepStart": 0.0,
+                        "ListSweepEnd": 1.0,
+                        "ListSweepStepPointsType": ["Step width:", "Points (lin.):", "Points (log.):"],
+                        "ListSweepStepPointsValue": 0.1,
+                        "ListSweepDual": False,
+                        "ListSweepHoldtime": 0.1,
+                        "ListSweepDelaytime": 0.0,
                         }
                         
         return GUIparameter
@@ -113,6 +148,21 @@ def get_GUIparameter(self, parameter={}):
         self.pulse_meas_time = parameter['PulseMeasTime']
         
         self.average = int(parameter['Average'])
+
+        self.sweepvalue = parameter.get("SweepValue", "SweepEditor")
+        self.is_list_sweep = self.sweepvalue == "List sweep"
+        # a list sweep always includes the channels that are measured with a single trigger
+        self.is_shared = parameter.get("Trigger", "Per channel") == "All channels" or self.is_list_sweep
+        self.is_sweep_active = False
+
+        if self.is_list_sweep:
+            self.listsweep_start = float(parameter["ListSweepStart"])
+            self.listsweep_end = float(parameter["ListSweepEnd"])
+            self.listsweep_steppoints_type = parameter["ListSweepStepPointsType"]
+            self.listsweep_steppoints_value = float(parameter["ListSweepStepPointsValue"])
+            self.listsweep_dual = bool(parameter["ListSweepDual"])
+            self.listsweep_hold = float(parameter["ListSweepHoldtime"])
+            self.listsweep_delay = float(parameter["ListSweepDelaytime"])
         
         self.channel = self.device[-1]
         
@@ -138,10 +188,16 @@ def initialize(self):
             
             self.port.write("AZ 0")   # Auto-Zero off for faster measurements
             
-            self.port.write("FMT 2") # use to change the output format
+            self.port.write("FMT 1") # ASCII with header to assign the values of several channels
          
             # if initialize commands have been sent, we can add the the unique_DC_port_string to the dictionary that is seen by all Device Classes
-            self.device_communication[unique_DC_port_string] = True
+            # it also holds the channels that are measured with a single trigger
+            self.device_communication[unique_DC_port_string] = {
+                "Channels": [],
+                "Measurement": flex_measurement.SharedMeasurement(),
+            }
+
+        self.shared = self.device_communication[unique_DC_port_string]
           
     def configure(self):
     
@@ -170,12 +226,36 @@ def configure(self):
         
         self.port.write("AV %i" % self.average)
 
+        if self.is_list_sweep:
+            mode, points, self.sweep_values = flex_measurement.staircase(
+                self.listsweep_start,
+                self.listsweep_end,
+                self.listsweep_steppoints_type,
+                self.listsweep_steppoints_value,
+                self.listsweep_dual,
+            )
+            self.port.write("WT %1.4f,%1.4f" % (self.listsweep_hold, self.listsweep_delay))
+            if self.source == "Voltage [V]":
+                self.port.write("WV %s,%i,%s,%s,%s,%i,%s" % (self.channel, mode, self.vrange, self.listsweep_start, self.listsweep_end, points, self.protection))
+            if self.source == "Current [A]":
+                self.port.write("WI %s,%i,%s,%s,%s,%i,%s" % (self.channel, mode, self.irange, self.listsweep_start, self.listsweep_end, points, self.protection))
+            self.shared["Sweep"] = self.channel
+
+        if self.is_shared:
+            self.shared["Channels"].append(self.channel)
+
         # *LRN? is a function to ask for current status of certain parameters,
         # 0 = output on or off
         # self.port.write("*LRN? 0")
         # print(self.port.read())
         
     def unconfigure(self):
+        if self.channel in self.shared["Channels"]:
+            self.shared["Channels"].remove(self.channel)
+        if self.is_list_sweep:
+            self.shared.pop("Sweep", None)
+            self.shared.pop("Data", None)
+
         self.port.write("IN" + self.channel)
         # resets to zero volt
         # self.port.write("DZ")
@@ -211,7 +291,12 @@ def deinitialize(self):
         pass
     
     def poweron(self):
-        pass
+        # checked here, as all instances have finished 'configure' now
+        self.is_sweep_active = "Sweep" in self.shared
+
+        if self.is_list_sweep:
+            # all channels with a single trigger are measured at each step of the staircase sweep
+            self.set_measurement_mode(2, self.shared["Channels"])
         # In a previous version, the CN command was sent here. However, this leads to a reset of all parameters previously changed during 'configure' 
         # Therefore, the CN command should not be used here, but has been moved to the beginning of 'configure'
     
@@ -220,6 +305,10 @@ def poweroff(self):
       
     def apply(self):
 
+        # the values of a list sweep are set by the staircase sweep
+        if self.is_list_sweep:
+            return
+
         self.value = str(self.value)
         
         if self.source == "Voltage [V]":
@@ -237,24 +326,63 @@ def apply(self):
         # self.port.write("XE")
         
     def measure(self):
-        self.port.write("TI" + self.channel + ",0")      
-        self.port.write("TV" + self.channel + ",0")  
+        if self.is_shared and self.is_sweep_active:
+            # the data of the previous point must not be used, the sweep is triggered by the first channel reading
+            self.shared.pop("Data", None)
+        elif self.is_shared:
+            self.shared["Measurement"].request(int(self.channel))
+        else:
+            self.port.write("TI" + self.channel + ",0")      
+            self.port.write("TV" + self.channel + ",0")  
+
+    def read_result(self):
+        # the first channel that needs the data triggers the staircase sweep and reads the data of all channels
+        if self.is_shared and self.is_sweep_active:
+            self.get_sweep_data()
         
     def call(self):
-        
-        answer = self.port.read()
-        # print("Current:", answer)
-        
-        # If NAI comes first, we have to strip it. Please toggle the lines, if needed.
-        i = float(answer)
-        # i = float(answer[3:])
-        
-        answer = self.port.read()
-        # print("Voltage:", answer)
-        
-        # If NAV comes first, we have to strip it. Please toggle the lines, if needed.
-        v = float(answer)
-        # v = float(answer[3:])
-    
-        return [v,i]
+
+        sense = "I" if self.source == "Voltage [V]" else "V"
+
+        if self.is_shared and self.is_sweep_active:
+            measured = np.array(self.get_sweep_data()[int(self.channel)][sense])
+            source = self.sweep_values if self.is_list_sweep else float(self.value) * np.ones(len(measured))
+        elif self.is_shared:
+            measured = self.shared["Measurement"].result(int(self.channel), self.execute_spot)[sense][0]
+            source = float(self.value)
+        else:
+            i = flex_measurement.parse_data(self.port.read())[0].value
+            v = flex_measurement.parse_data(self.port.read())[0].value
+            return [v, i]
+
+        if sense == "I":
+            return [source, measured]
+        else:
+            return [measured, source]
+
+    def get_sweep_data(self):
+        """Return the data of all channels of the staircase sweep, the sweep is triggered if not done yet for this point."""
+        if "Data" not in self.shared:
+            self.port.write("XE")
+            timeout = self.port.port.timeout
+            self.port.port.timeout = self.sweep_timeout * 1000  # ms
+            try:
+                answer = self.port.read()
+            finally:
+                self.port.port.timeout = timeout
+            self.shared["Data"] = flex_measurement.group_data(flex_measurement.parse_data(answer))
+        return self.shared["Data"]
+
+    def execute_spot(self, channels):
+        """Measure the given channels with a single trigger and return the parsed data."""
+        self.set_measurement_mode(1, channels)
+        self.port.write("XE")
+        return flex_measurement.parse_data(self.port.read())
+
+    def set_measurement_mode(self, mode, channels):
+        """Set the measurement mode (MM) for the given channels, only if it differs from the mode set before."""
+        command = "MM %i,%s" % (mode, ",".join(str(channel) for channel in channels))
+        if self.shared.get("MM") != command:
+            self.port.write(command)
+            self.shared["MM"] = command
         
\ No newline at end of file
@@ -0,0 +1,78 @@
+import importlib.util
+import math
+import unittest
+from pathlib import Path
+
+# Import the FLEX measurement helper
+file_path = Path(__file__).resolve().parent.parent / "libraries" / "flex_measurement.py"
+spec = importlib.util.spec_from_file_location("flex_measurement", file_path)
+flex_measurement = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(flex_measurement)
+
+DataPoint = flex_measurement.DataPoint
+
+
+class TestParseData(unittest.TestCase):
+    """Test parsing of the ASCII output format with header."""
+
+    def test_channels(self) -> None:
+        """Channel letters and data types are assigned and invalid values are NaN."""
+        data = flex_measurement.parse_data("NAI+1.23450E-03,CBI-1.00000E-01,NDV+9.90000E+37\r\n")
+        self.assertEqual(data[0], DataPoint("N", 1, "I", 1.2345e-3))  # noqa: PT009
+        self.assertEqual(data[1].status, "C")  # noqa: PT009
+        self.assertEqual(data[1].channel, 2)  # noqa: PT009
+        self.assertTrue(math.isnan(data[2].value))  # noqa: PT009
+
+    def test_group(self) -> None:
+        """Values of a sweep are grouped by channel and data type."""
+        data = flex_measurement.parse_data("NAI+1.0E-03,NBI+2.0E-03,NAI+3.0E-03,NBI+4.0E-03")
+        groups = flex_measurement.group_data(data)
+        self.assertEqual(groups[1]["I"], [1e-3, 3e-3])  # noqa: PT009
+        self.assertEqual(groups[2]["I"], [2e-3, 4e-3])  # noqa: PT009
+
+
+class TestSharedMeasurement(unittest.TestCase):
+    """Test that all requested channels are measured with one trigger."""
+
+    def test_single_trigger(self) -> None:
+        """The first channel to read triggers the measurement of all requested channels."""
+        triggers = []
+
+        def execute(channels: list) -> list:
+            triggers.append(channels)
+            return [DataPoint("N", channel, "I", 0.1 * channel) for channel in channels]
+
+        shared = flex_measurement.SharedMeasurement()
+        for _ in range(2):
+            for channel in [3, 1, 2]:
+                shared.request(channel)
+            results = [shared.result(channel, execute)["I"][0] for channel in [2, 3, 1]]
+            self.assertEqual(results, [0.2, 0.1 * 3, 0.1])  # noqa: PT009
+        self.assertEqual(triggers, [[1, 2, 3], [1, 2, 3]])  # noqa: PT009
+
+    def test_missing_channel(self) -> None:
+        """A ValueError is raised if the instrument does not return data for a channel."""
+        shared = flex_measurement.SharedMeasurement()
+        shared.request(1)
+        with self.assertRaises(ValueError):  # noqa: PT027
+            shared.result(1, lambda _channels: [])
+
+
+class TestStaircase(unittest.TestCase):
+    """Test the parameters of staircase sweeps."""
+
+    def test_step_width(self) -> None:
+        """The number of steps follows from the step width, a dual sweep returns to the start."""
+        mode, points, values = flex_measurement.staircase(0.0, 1.0, "Step width:", 0.25, dual=True)
+        self.assertEqual((mode, points), (3, 5))  # noqa: PT009
+        self.assertEqual(values.tolist(), [0.0, 0.25, 0.5, 0.75, 1.0, 1.0, 0.75, 0.5, 0.25, 0.0])  # noqa: PT009
+
+    def test_logarithmic(self) -> None:
+        """Logarithmic sweeps use mode 2."""
+        mode, points, values = flex_measurement.staircase(1e-6, 1e-3, "Points (log.):", 4)
+        self.assertEqual((mode, points), (2, 4))  # noqa: PT009
+        self.assertAlmostEqual(values[1], 1e-5)  # noqa: PT009
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -30,10 +30,20 @@
 # Type: SMU
 # Device: Agilent 29xx
 
+import numpy as np
+
 from pysweepme.EmptyDeviceClass import EmptyDevice
 
 class Device(EmptyDevice):
 
+    description = """
+                  <p><strong>List sweep</strong></p>
+                  <p>All values of the list are loaded into the instrument and measured with the timer trigger of the
+                  instrument. Each point starts after the 'Point period in s', the measurement starts after the
+                  'ListSweepDelaytime' and takes the integration time given by 'Speed'. If both channels use a list
+                  sweep, they are started with the same trigger. All results are fetched at the end as binary data.</p>
+                  """
+
     def __init__(self):
         
         super().__init__()
@@ -59,6 +69,9 @@ def __init__(self):
                         "Current in A": "CURR",
                         }
 
+        self.line_frequency = 50.0  # Hz, see ':SYST:LFR'
+        self.list_capacity = 2500  # maximum number of points of a list
+
     def set_GUIparameter(self):
         
         GUIparameter = {
@@ -69,6 +82,16 @@ def set_GUIparameter(self):
                         "Speed": ["Fast", "Medium", "Slow"],
                         "Compliance": 100e-6,
                         # "Average": 1, # not yet supported
+
+                        "ListSweepCheck": True,
+                        "ListSweepType": ["Sweep", "Custom"],
+                        "ListSweepStart": 0.0,
+                        "ListSweepEnd": 1.0,
+                        "ListSweepStepPointsType": ["Step width:", "Points (lin.):", "Points (log.):"],
+                        "ListSweepStepPointsValue": 0.1,
+                        "ListSweepCustomValues": "",
+                        "ListSweepDelaytime": 0.0,
+                        "Point period in s": 0.01,
                         }
                         
         return GUIparameter
@@ -90,14 +113,44 @@ def get_GUIparameter(self, parameter = {}):
             
         self.device = parameter['Device']      
         self.channel = str(parameter['Channel'])[-1]
+        self.port_string = parameter.get("Port", "")
+
+        # in case of 'List sweep', all values of the list are measured with one trigger and returned as arrays
+        self.is_list_sweep = parameter.get("SweepValue", "SweepEditor") == "List sweep"
+        self.listtype = parameter.get("ListSweepType", "Sweep")
+
+        if self.is_list_sweep and self.listtype == "Sweep":
+            self.listsweep_start = float(parameter["ListSweepStart"])
+            self.listsweep_end = float(parameter["ListSweepEnd"])
+            self.listsweep_steppoints_type = parameter["ListSweepStepPointsType"]
+            self.listsweep_steppoints_value = float(parameter["ListSweepStepPointsValue"])
+
+        if self.is_list_sweep and self.listtype == "Custom":
+            self.custom_values = str(parameter["ListSweepCustomValues"])
+
+        if self.is_list_sweep:
+            self.listsweep_delay = float(parameter.get("ListSweepDelaytime", 0.0))
+            self.point_period = float(parameter.get("Point period in s", 0.01))
 
     def initialize(self):
         # once at the beginning of the measurement
         self.port.write("*RST")
         self.port.write("SYST:BEEP:STAT OFF")  # control-Beep off
-        self.port.write(":SYST:LFR 50")  # LineFrequency = 50 Hz
+        self.port.write(":SYST:LFR %i" % self.line_frequency)  # LineFrequency = 50 Hz
         self.port.write(":OUTP%s:PROT ON" % self.channel)  # enables  over voltage / over current protection
 
+        # channels with list sweep are started together, so they are collected for the instrument
+        self.instrument_id = "%s_%s" % (self.device, self.port_string)
+        if self.instrument_id not in self.device_communication:
+            self.device_communication[self.instrument_id] = {"ListChannels": []}
+
+        if self.is_list_sweep:
+            # check the user input already here so that wrong values are reported before the run starts
+            self.list_values = self.get_list_values()
+            if len(self.list_values) > self.list_capacity:
+                msg = "List sweep is limited to %i points." % self.list_capacity
+                raise ValueError(msg)
+
     def configure(self):
 
         if self.source.startswith("Voltage"):
@@ -154,9 +207,16 @@ def configure(self):
         """
 
         self.port.write(":OUTP%s:PROT ON" % self.channel)    
+
+        if self.is_list_sweep:
+            self.configure_list_sweep()
         #self.port.write(":OUTP:LOW GRO") # LowGround
         #self.port.write(":OUTP:HCAP ON") # High capacity On
      
+    def unconfigure(self):
+        if self.is_list_sweep:
+            self.device_communication[self.instrument_id]["ListChannels"].remove(self.channel)
+
     def deinitialize(self):
         if self.four_wire:
             self.port.write("SYST:REM OFF")
@@ -174,10 +234,31 @@ def poweroff(self):
         self.port.write(":OUTP%s OFF" % self.channel)
                         
     def apply(self):
+
+        # the values of a list sweep are loaded in 'configure'
+        if self.is_list_sweep:
+            return
     
         self.port.write(":SOUR%s:%s %s" % (self.channel, self.commands[self.source], self.value))  # set source
 
+    def measure(self):
+
+        if self.is_list_sweep:
+            list_channels = self.device_communication[self.instrument_id]["ListChannels"]
+            # the first channel with a list sweep starts all of them, so that they run synchronized
+            if self.channel == min(list_channels):
+                self.port.write(":INIT (@%s)" % ",".join(sorted(list_channels)))
+
+    def read_result(self):
+
+        if self.is_list_sweep:
+            self.voltages, self.currents = self.fetch_list_results()
+
     def call(self):
+
+        if self.is_list_sweep:
+            return [self.voltages, self.currents]
+
         self.port.write(":MEAS? (@%s)" % self.channel) 
     
         answer = self.port.read()
@@ -188,3 +269,79 @@ def call(self):
         
         return [voltage, current]
 
+    def get_list_values(self):
+        """Returns the values of the 'List sweep' as numpy array."""
+
+        if self.listtype == "Custom":
+            try:
+                return np.array(self.custom_values.split(","), dtype=float)
+            except ValueError:
+                msg = "Wrong custom values format. Please use comma-separated values for custom list sweeps."
+                raise ValueError(msg)
+
+        if self.listsweep_steppoints_type.startswith("Step width"):
+            if self.listsweep_steppoints_value == 0.0:
+                if self.listsweep_end != self.listsweep_start:
+                    msg = "Start and end value must be equal if step width is zero."
+                    raise ValueError(msg)
+                return np.array([self.listsweep_start])
+            points = round(abs(self.listsweep_end - self.listsweep_start) / abs(self.listsweep_steppoints_value) + 1)
+            return np.linspace(self.listsweep_start, self.listsweep_end, points)
+
+        points = int(self.listsweep_steppoints_value)
+        if self.listsweep_steppoints_type.startswith("Points (log.)"):
+            return np.geomspace(self.listsweep_start, self.listsweep_end, points)
+        return np.linspace(self.listsweep_start, self.listsweep_end, points)
+
+    def configure_list_sweep(self):
+        """Loads the list and lets the timer trigger run through all points after a single ':INIT'."""
+
+        aperture = float(self.nplc) / self.line_frequency
+        if self.point_period < self.listsweep_delay + aperture:
+            msg = "The point period must be longer than the delay time plus the integration time of %1.4f s." % aperture
+            raise ValueError(msg)
+
+        source = self.commands[self.source]
+        list_string = ",".join("%1.6e" % value for value in self.list_values)
+
+        self.port.write(":SOUR%s:%s:MODE LIST" % (self.channel, source))
+        self.port.write(":SOUR%s:LIST:%s %s" % (self.channel, source, list_string))
+
+        # source and measurement of each point are triggered by the timer
+        self.port.write(":TRIG%s:SOUR TIM" % self.channel)
+        self.port.write(":TRIG%s:TIM %1.6e" % (self.channel, self.point_period))
+        self.port.write(":TRIG%s:COUN %i" % (self.channel, len(self.list_values)))
+        self.port.write(":TRIG%s:TRAN:DEL 0" % self.channel)
+        self.port.write(":TRIG%s:ACQ:DEL %1.6e" % (self.channel, self.listsweep_delay))
+
+        # voltage and current of each point, as returned by ':MEAS?'
+        self.port.write(":FORM:ELEM:SENS VOLT,CURR")
+
+        self.device_communication[self.instrument_id]["ListChannels"].append(self.channel)
+
+    def fetch_list_results(self):
+        """Waits until the list sweep has finished and reads all results with a single binary transfer.
+
+        Returns:
+            numpy.ndarray of voltages and numpy.ndarray of currents
+        """
+
+        # *OPC? returns as soon as all points are measured, so the timeout must cover the whole list
+        timeout = self.port.port.timeout
+        self.port.port.timeout = (len(self.list_values) * self.point_period + 10.0) * 1000  # ms
+        try:
+            self.port.write("*OPC?")
+            self.port.read()
+        finally:
+            self.port.port.timeout = timeout
+
+        # binary transfer is only used here, as ':MEAS?' of channels without list sweep is read in ASCII format
+        self.port.write(":FORM:DATA REAL,64")
+        try:
+            data = self.port.port.query_binary_values(
+                ":FETC:ARR? (@%s)" % self.channel, datatype="d", is_big_endian=True, container=np.array,
+            )
+        finally:
+            self.port.write(":FORM:DATA ASC")
+
+        return data[0::2], data[1::2]
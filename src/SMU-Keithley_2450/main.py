@@ -30,6 +30,8 @@
 # Type: SMU
 # Device: Keithley 2450
 
+import numpy as np
+
 from pysweepme.EmptyDeviceClass import EmptyDevice
 from pysweepme.ErrorMessage import debug
 
@@ -54,10 +56,16 @@ def __init__(self):
 
         self.is_power_on = False
 
+        # name of the TSP reading buffer that is created once per run and reused for every reading
+        self.buffer_name = "sweepmebuffer"
+        # name of the source configuration list used by the trigger model in case of 'List sweep'
+        self.configlist_name = "sweepmelist"
+
     def set_GUIparameter(self):
 
         gui_parameter = {
             "SweepMode": ["Voltage in V", "Current in A"],
+            "SweepValue": ["SweepEditor"],
             "RouteOut": ["Front", "Rear"],
             "Speed": ["Fast", "Medium", "Slow"],
             "Range": ["Auto",
@@ -81,6 +89,16 @@ def set_GUIparameter(self):
             "Average": 1,
             "Compliance": 100e-6,
             "4wire": False,
+
+            "ListSweepCheck": True,
+            "ListSweepType": ["Sweep", "Custom"],
+            "ListSweepStart": 0.0,
+            "ListSweepEnd": 1.0,
+            "ListSweepStepPointsType": ["Step width:", "Points (lin.):", "Points (log.):"],
+            "ListSweepStepPointsValue": 0.1,
+            "ListSweepCustomValues": "",
+            "ListSweepDual": False,
+            "ListSweepHoldtime": 0.1,
         }
 
         return gui_parameter
@@ -95,6 +113,38 @@ def get_GUIparameter(self, parameter={}):
         self.range = parameter["Range"]
         self.average = int(parameter["Average"])
 
+        self.sweepvalue = parameter.get("SweepValue", "SweepEditor")
+        self.listtype = parameter.get("ListSweepType", "Sweep")
+
+        if self.sweepvalue == "List sweep" and self.listtype == "Sweep":
+            self.listsweep_start = float(parameter["ListSweepStart"])
+            self.listsweep_end = float(parameter["ListSweepEnd"])
+            self.listsweep_steppoints_type = parameter["ListSweepStepPointsType"]
+            self.listsweep_steppoints_value = float(parameter["ListSweepStepPointsValue"])
+            self.listsweep_dual = bool(parameter["ListSweepDual"])
+
+        if self.sweepvalue == "List sweep" and self.listtype == "Custom":
+            self.custom_values = str(parameter["ListSweepCustomValues"])
+
+        # source delay, time between applying source value and measurement, use None (later AUTO) if empty
+        try:
+            self.listsweep_hold = float(parameter["ListSweepHoldtime"])
+        except (KeyError, ValueError):
+            self.listsweep_hold = None
+
+        # in case of a list sweep, the time stamp of each measurement point must be saved additionally
+        # to every (V,I) tuple
+        if self.sweepvalue == "List sweep":
+            self.variables = ["Voltage", "Current", "Timestamp"]
+            self.units = ["V", "A", "s"]
+            self.plottype = [True, True, True]  # True to plot data
+            self.savetype = [True, True, True]  # True to save data
+        else:
+            self.variables = ["Voltage", "Current"]
+            self.units = ["V", "A"]
+            self.plottype = [True, True]  # True to plot data
+            self.savetype = [True, True]  # True to save data
+
     def connect(self):
 
         self.port.write("*LANG?")
@@ -136,6 +186,24 @@ def initialize(self):
 
             # self.port.write("localnode.linefreq = 50")  # unused because not everyone has 50 Hz
 
+        if self.sweepvalue == "List sweep":
+            if self.language != "TSP":
+                msg = ("Keithley 2450: 'List sweep' uses the trigger model and requires the TSP command set. "
+                       "Please change the command set of the instrument via Menu -> System -> Settings.")
+                raise ValueError(msg)
+
+            if self.listtype == "Sweep" and self.listsweep_steppoints_type.startswith("Step width"):
+                if self.listsweep_steppoints_value == 0.0 and self.listsweep_end != self.listsweep_start:
+                    msg = "Start and end value must be equal if step width is zero."
+                    raise ValueError(msg)
+
+            if self.listtype == "Custom":
+                try:
+                    self.custom_list = list(map(float, self.custom_values.split(",")))
+                except ValueError:
+                    msg = "Wrong custom values format. Please use comma-separated values for custom list sweeps."
+                    raise ValueError(msg)
+
     def configure(self):
 
         if self.language == "SCPI2400":
@@ -180,6 +248,17 @@ def configure(self):
         if self.route_out == "Rear":
             self.route_rear()
 
+        if self.language == "TSP":
+            # The reading buffer is created only once per run. Before, a new buffer was allocated with every reading.
+            if self.sweepvalue == "List sweep":
+                self.configure_list_sweep()
+            else:
+                self.make_buffer(100)
+                self.port.write("%s.fillmode = buffer.FILL_CONTINUOUS" % self.buffer_name)
+
+        # let's ensure all parameters are set before we continue
+        self.wait_for_complete()
+
     def deinitialize(self):
         self.rsen_off()
         self.route_front()
@@ -216,10 +295,8 @@ def apply(self):
         elif self.language == "TSP":
             self.port.write("smu.source.level = %s" % self.value)
 
-        # needed to trigger a measurement and thus to trigger the final output of the level
-        # should be replaced by TSP command 'waitcomplete()' or SCPI '*OPC?' handling
-        self.measure()
-        self.call()
+        # waiting for the operation to be completed makes sure that the new level is output before measuring
+        self.wait_for_complete()
 
     def measure(self):
 
@@ -227,22 +304,29 @@ def measure(self):
             self.port.write("READ?")
 
         elif self.language == "TSP":
-            self.port.write("data = buffer.make(10)")
-            self.port.write("smu.measure.read(data)")
+            if self.sweepvalue == "List sweep":
+                # runs the complete sweep that has been set up in configure
+                self.port.write("%s.clear()" % self.buffer_name)
+                self.port.write("trigger.model.initiate()")
+            else:
+                self.port.write("smu.measure.read(%s)" % self.buffer_name)
 
             # way to directly trigger sending the reading:
-            # self.port.write("print(smu.measure.read(data))")
+            # self.port.write("print(smu.measure.read(%s))" % self.buffer_name)
             # print("Reading", self.port.read())
 
     def call(self):
 
         if self.language == "SCPI2400":
             answer = self.port.read().split(",")
-            self.v, self.i = answer[0:2]
+            self.v, self.i = map(float, answer[0:2])
 
         elif self.language == "TSP":
 
-            self.port.write("printbuffer(1, 1, data.readings, data.sourcevalues)")
+            if self.sweepvalue == "List sweep":
+                return self.read_list_sweep()
+
+            self.port.write("printbuffer({0}.n, {0}.n, {0}.readings, {0}.sourcevalues)".format(self.buffer_name))
             answer = self.port.read().split(",")
 
             if self.source.startswith("Voltage"):
@@ -281,8 +365,137 @@ def convert_unit_prefix(number_text: str):
 
         return number_text
 
+    def get_list_sweep_values(self):
+        """Returns the source values of the 'List sweep' as numpy array.
+
+        Only used for the 'Custom' list type. Values of the 'Sweep' type are generated by the instrument itself.
+        """
+        return np.array(self.custom_list, dtype=float)
+
+    def get_list_sweep_points(self):
+        """Returns the number of points for a 'List sweep' of type 'Sweep'."""
+
+        if self.listsweep_steppoints_type.startswith("Step width"):
+            if self.listsweep_steppoints_value == 0.0:
+                return 1
+            return round(abs(self.listsweep_end - self.listsweep_start) / abs(self.listsweep_steppoints_value) + 1)
+
+        return int(self.listsweep_steppoints_value)
+
+    @staticmethod
+    def parse_binary_buffer(data, number_of_values):
+        """Converts a binary 'printbuffer' answer in format REAL64 to a numpy array.
+
+        The answer starts with the header '#0' that is followed by 8 bytes per value and is terminated by a newline.
+
+        Args:
+            data: bytes as returned by the instrument
+            number_of_values: number of float values to be extracted
+
+        Returns:
+            numpy.ndarray with the float values
+        """
+        start = data.find(b"#0")
+        if start < 0:
+            msg = "Keithley 2450: No header found in binary buffer data."
+            raise ValueError(msg)
+
+        return np.frombuffer(data, dtype="<f8", count=number_of_values, offset=start + 2)
+
     # Functions that wrap communication commands start here #
 
+    def wait_for_complete(self):
+        """Waits until all previous commands have been processed by the instrument."""
+
+        if self.language == "SCPI2400":
+            self.port.write("*OPC?")
+            self.port.read()
+
+        elif self.language == "TSP":
+            self.port.write("waitcomplete() print(1)")
+            self.port.read()
+
+    def make_buffer(self, capacity):
+        """Creates the TSP reading buffer that is reused for all readings of a run.
+
+        An already existing buffer with the same name is deleted beforehand.
+
+        Args:
+            capacity: number of readings the buffer can store
+        """
+        self.port.write("if {0} ~= nil then buffer.delete({0}) end".format(self.buffer_name))
+        self.port.write("%s = buffer.make(%i)" % (self.buffer_name, max(int(capacity), 10)))
+
+    def configure_list_sweep(self):
+        """Sets up the trigger model of the instrument to run the 'List sweep' with a single initiate."""
+
+        delay = "smu.DELAY_AUTO" if self.listsweep_hold is None else "%.6f" % self.listsweep_hold
+
+        # an existing configuration list of a previous run must be removed before the same name can be used again
+        self.port.write('pcall(smu.source.configlist.delete, "%s")' % self.configlist_name)
+
+        if self.listtype == "Sweep":
+            points = self.get_list_sweep_points()
+            dual = "smu.ON" if self.listsweep_dual else "smu.OFF"
+
+            # a dual sweep runs from start to stop and back again, so twice as many readings are stored
+            self.make_buffer(2 * points if self.listsweep_dual else points)
+
+            if self.listsweep_steppoints_type.startswith("Points (log.)"):
+                self.port.write('smu.source.sweeplog("%s", %s, %s, %i, %s, 1, smu.RANGE_BEST, smu.OFF, %s, %s)' % (
+                    self.configlist_name, repr(self.listsweep_start), repr(self.listsweep_end), points, delay, dual,
+                    self.buffer_name,
+                ))
+            else:
+                self.port.write('smu.source.sweeplinear("%s", %s, %s, %i, %s, 1, smu.RANGE_BEST, smu.OFF, %s, %s)' % (
+                    self.configlist_name, repr(self.listsweep_start), repr(self.listsweep_end), points, delay, dual,
+                    self.buffer_name,
+                ))
+
+        elif self.listtype == "Custom":
+            values = self.get_list_sweep_values()
+            self.make_buffer(len(values))
+
+            # the source configuration list is filled by a loop on the instrument so that only one message is needed
+            self.port.write('smu.source.configlist.create("%s")' % self.configlist_name)
+            self.port.write('for _, level in ipairs({%s}) do smu.source.level = level '
+                            'smu.source.configlist.store("%s") end' % (
+                                ",".join(format(value, ".6e") for value in values), self.configlist_name,
+                            ))
+            self.port.write('smu.source.sweeplist("%s", 1, %s, 1, smu.OFF, %s)' % (
+                self.configlist_name, delay, self.buffer_name,
+            ))
+
+    def read_list_sweep(self):
+        """Waits for the trigger model to finish and reads all readings of the 'List sweep' in one binary transfer.
+
+        Returns:
+            list of numpy arrays with voltages, currents and relative time stamps
+        """
+
+        self.port.write("waitcomplete() print(%s.n)" % self.buffer_name)
+        points = int(float(self.port.read()))
+
+        self.port.write("format.data = format.REAL64")
+        self.port.write("format.byteorder = format.LITTLEENDIAN")
+        self.port.write("printbuffer(1, {0}.n, {0}.sourcevalues, {0}.readings, {0}.relativetimestamps)".format(
+            self.buffer_name,
+        ))
+        # header '#0', 3 values with 8 bytes per point and the terminating newline
+        data = self.port.port.read_bytes(2 + 3 * 8 * points + 1)
+        self.port.write("format.data = format.ASCII")
+
+        values = self.parse_binary_buffer(data, 3 * points).reshape((points, 3))
+        source_values, readings, self.t = values[:, 0], values[:, 1], values[:, 2]
+
+        if self.source.startswith("Voltage"):
+            self.v, self.i = source_values, readings
+        else:
+            self.i, self.v = source_values, readings
+
+        return [self.v, self.i, self.t]
+
+
     def route_front(self):
 
         # if self.language == "SCPI2400":
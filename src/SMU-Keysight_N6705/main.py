@@ -29,10 +29,20 @@
 # Type: SMU
 # Device: Keysight N6705
 
+import importlib.util
 from collections import OrderedDict
+from pathlib import Path
+
 from EmptyDeviceClass import EmptyDevice
 from ErrorMessage import debug
 
+# Import the channel readout helper from the libraries folder of the driver
+_spec = importlib.util.spec_from_file_location(
+    "channel_readout", Path(__file__).resolve().parent / "libraries" / "channel_readout.py"
+)
+channel_readout = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(channel_readout)
+
 
 class Device(EmptyDevice):
 
@@ -50,6 +60,10 @@ class Device(EmptyDevice):
                             
                         - Opt 2A option:
                             - 200 µA measurement range
+
+                        Each channel is used with its own driver instance. At each measurement point, the first
+                        instance reads voltage, current, and status of all used channels with a single query and the
+                        other instances use these values.
                     """
 
     def __init__(self):
@@ -121,6 +135,7 @@ def get_GUIparameter(self, parameter={}):
         self.pulseofflevel = parameter['PulseOffLevel']
 
         self.device = parameter['Device']
+        self.port_string = parameter['Port']
         self.channel = parameter['Channel']
 
     def initialize(self):
@@ -130,9 +145,17 @@ def initialize(self):
 
     def configure(self):
 
+        # Voltage, current, and status of all channels are read together, shared by all instances using the same port
+        self.readout = channel_readout.get_shared_readout(self.device_communication, "N6705_" + self.port_string)
+        self.readout.register(int(self.channel))
+
         self.port.write(f"SYST:CHAN:MODEL? (@{self.channel})")
         self.channel_model = self.port.read()
 
+        # the models of all channels are needed to read the current of each channel with the right command
+        self.channel_models = self.device_communication.setdefault("N6705_models_" + self.port_string, {})
+        self.channel_models[int(self.channel)] = self.channel_model
+
         if self.source.startswith("Voltage"):
             # 4 wires
             if self.four_wires:
@@ -198,6 +221,9 @@ def configure(self):
 
         self.port.write(f"SENSE:SWEEP:POINTS {self.npoints}, (@{self.channel})")
 
+    def unconfigure(self):
+        self.readout.unregister(int(self.channel))
+
     def poweron(self):
         if self.pulse:
             self.port.write(f"ARB:COUNT INF, (@{self.channel})")
@@ -225,20 +251,59 @@ def apply(self):
         else:
             self.port.write(f"{self.commands[self.source]} {self.value}, (@{self.channel})")
 
-    def call(self):
-        self.port.write(f"MEAS:VOLT? (@{self.channel})")
-        voltage = float(self.port.read())
+        # values read before the change must not be used by any channel
+        self.readout.invalidate()
 
-        # modules N6761A and N6762A have simultaneous V/I measurement
-        if self.channel_model.startswith('N676'):
-            self.port.write(f"FETCH:CURR? (@{self.channel})")
-        else:
-            self.port.write(f"MEAS:CURR? (@{self.channel})")
+    def measure(self):
+        self.voltage, self.current, regvalue = self.readout.read(int(self.channel), self.read_channels)
 
-        current = float(self.port.read())
+        # questionable status condition register
+        self.ovp = bool(regvalue & (1))
+        self.ocp = bool(regvalue & (1<<1))
 
-        # check questionable status condition register
-        self.port.write(f"STAT:QUES:COND? (@{self.channel})")
-        regvalue = int(self.port.read())
-        
-        return [voltage, current, bool(regvalue & (1)), bool(regvalue & (1<<1))]
+    def call(self):
+        return [self.voltage, self.current, self.ovp, self.ocp]
+
+    def read_channels(self, channels):
+        """Read voltage, current, and questionable status condition of the given channels with a single query.
+
+        Returns:
+            dict: (voltage, current, status register) per channel
+        """
+        # modules N6761A and N6762A have simultaneous V/I measurement, so that their current is fetched from the
+        # acquisition of the voltage measurement
+        fetched = [channel for channel in channels if self.channel_models.get(channel, "").startswith("N676")]
+        measured = [channel for channel in channels if channel not in fetched]
+
+        queries = [("MEAS:VOLT?", channels), ("FETC:CURR?", fetched), ("MEAS:CURR?", measured),
+                   ("STAT:QUES:COND?", channels)]
+        queries = [(command, query_channels) for command, query_channels in queries if query_channels]
+
+        self.port.write(";:".join(
+            "%s (@%s)" % (command, ",".join(str(channel) for channel in query_channels))
+            for command, query_channels in queries
+        ))
+        answer = self.port.read()
+
+        values = {}
+        parts = answer.split(";")
+        if len(parts) != len(queries):
+            msg = f"Keysight N6705: Unexpected answer '{answer}' for channels {channels}."
+            raise Exception(msg)
+        for (command, query_channels), part in zip(queries, parts):
+            part = part.split(",")
+            if len(part) != len(query_channels):
+                msg = f"Keysight N6705: Unexpected answer '{answer}' for channels {channels}."
+                raise Exception(msg)
+            values[command] = dict(zip(query_channels, part))
+
+        currents = {**values.get("FETC:CURR?", {}), **values.get("MEAS:CURR?", {})}
+
+        return {
+            channel: (
+                float(values["MEAS:VOLT?"][channel]),
+                float(currents[channel]),
+                int(float(values["STAT:QUES:COND?"][channel])),
+            )
+            for channel in channels
+        }
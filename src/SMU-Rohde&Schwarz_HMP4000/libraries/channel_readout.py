@@ -0,0 +1,142 @@
+# This Device Class is published under the terms of the MIT License.
+# Required Third Party Libraries, which are included in the Device Class
+# package for convenience purposes, may have a different license. You can
+# find those in the corresponding folders or contact the maintainer.
+#
+# MIT License
+#
+# Copyright (c) 2024 SweepMe! GmbH (sweep-me.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+from __future__ import annotations
+
+import time
+from typing import Any, Callable
+
+
+class SharedReadout:
+    """Reads all outputs of a multi-output power supply at once and hands the values to the instance of each output.
+
+    Each output is a separate driver instance. The first instance that measures at a point reads all registered outputs
+    with a single combined query and keeps the values of the other outputs. The other instances take their values
+    from the cache instead of selecting their output and querying it again. Whenever an output is changed, the cache
+    is cleared, so that no instance gets values that were read before the change.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without registered outputs."""
+        self.channels: list[int] = []
+        self.values: dict[int, Any] = {}
+
+    def register(self, channel: int) -> None:
+        """Add an output to the outputs read at each point."""
+        if channel not in self.channels:
+            self.channels.append(channel)
+        self.invalidate()
+
+    def unregister(self, channel: int) -> None:
+        """Remove an output from the outputs read at each point."""
+        if channel in self.channels:
+            self.channels.remove(channel)
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Discard all cached values, e.g. after an output has been changed."""
+        self.values = {}
+
+    def read(self, channel: int, read_all: Callable[[list[int]], dict[int, Any]]) -> Any:  # noqa: ANN401
+        """Return the values of an output, all outputs are read if the values are not cached.
+
+        Args:
+            channel: Output number.
+            read_all: Function that reads the given outputs with a combined query and returns the values per output.
+
+        Returns:
+            Values of the output as returned by read_all.
+        """
+        if channel not in self.values:
+            channels = sorted(set(self.channels) | {channel})
+            self.values = read_all(channels)
+        return self.values.pop(channel)
+
+
+def get_shared_readout(device_communication: dict, key: str) -> SharedReadout:
+    """Return the readout for the given key, e.g. the port, that is shared by all instances in the same run.
+
+    Args:
+        device_communication: Dictionary shared by all driver instances.
+        key: Identifier of the instrument.
+
+    Returns:
+        Shared readout, created if it does not exist yet.
+    """
+    if key not in device_communication:
+        device_communication[key] = SharedReadout()
+    return device_communication[key]
+
+
+def is_settled(
+    set_value: float,
+    source_value: float,
+    limit: float,
+    limit_value: float,
+    tolerance: float,
+    limit_fraction: float = 0.99,
+) -> bool:
+    """Return whether an output has settled in constant voltage (CV) or constant current (CC) mode.
+
+    The output has settled if the measured source value is within the tolerance of the set value, or if the other
+    quantity has reached its limit, i.e. the output has changed to the other regulation mode.
+
+    Args:
+        set_value: Value that has been set, e.g. the voltage in CV mode.
+        source_value: Measured value of the sourced quantity.
+        limit: Limit of the other quantity, e.g. the current limit in CV mode.
+        limit_value: Measured value of the other quantity.
+        tolerance: Maximum difference between set and measured source value.
+        limit_fraction: Fraction of the limit at which the limit counts as reached.
+
+    Returns:
+        True if settled.
+    """
+    if abs(source_value - set_value) <= tolerance:
+        return True
+    return abs(limit_value) >= limit_fraction * abs(limit)
+
+
+def wait_until(condition: Callable[[], bool], timeout: float, interval: float = 0.02) -> bool:
+    """Poll a condition until it is fulfilled.
+
+    Args:
+        condition: Function that returns True once fulfilled.
+        timeout: Maximum time in s to wait.
+        interval: Time in s between two checks.
+
+    Returns:
+        True if the condition has been fulfilled, False if the timeout has been reached.
+    """
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            return False
+        time.sleep(interval)
+    return True
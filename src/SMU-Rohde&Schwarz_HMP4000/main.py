@@ -31,14 +31,29 @@
 # Type: SMU
 # Device: Rohde&Schwarz HMP4000
 
-from ErrorMessage import error
+import importlib.util
+from pathlib import Path
+
+from ErrorMessage import debug, error
 from EmptyDeviceClass import EmptyDevice
 
+# Import the channel readout helper from the libraries folder of the driver
+_spec = importlib.util.spec_from_file_location(
+    "channel_readout", Path(__file__).resolve().parent / "libraries" / "channel_readout.py"
+)
+channel_readout = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(channel_readout)
+
 
 class Device(EmptyDevice):
 
     description = """
-    
+                  <p><strong>Multiple channels</strong><br />Each channel is used with its own driver instance. At each
+                  measurement point, the first instance reads voltage and current of all used channels with a single
+                  query and the other instances use these values.</p>
+                  <p><strong>With wait</strong><br />After setting a new value, the output is polled until the set
+                  value is reached (CV/CC mode) or the compliance is reached (change to CC/CV mode), but not longer
+                  than 2 s.</p>
                   """
 
     def __init__(self):
@@ -66,6 +81,10 @@ def __init__(self):
                         "Voltage in V": "VOLT",
                         "Current in A": "CURR",
                         }
+
+        # Polling of the settled output if "(with wait)" is selected
+        self.settle_timeout = 2.0  # in s
+        self.settle_tolerance = {"Voltage": 0.005, "Current": 0.001}  # in V and A
                                  
     def set_GUIparameter(self):
         
@@ -111,6 +130,10 @@ def initialize(self):
         # print("Identifier:", identifier)
 
     def configure(self):
+        # Voltage and current of all channels are read together, shared by all instances using the same port
+        self.readout = channel_readout.get_shared_readout(self.device_communication, "HMP4000_" + self.port_string)
+        self.readout.register(self.channel)
+
         self.port.write("INST OUT%i" % self.channel)
         self.port.write("OUTP:SEL ON")
         
@@ -123,6 +146,8 @@ def configure(self):
             self.port.write("CURR 0")
             
     def unconfigure(self):
+        self.readout.unregister(self.channel)
+
         self.port.write("INST OUT%i" % self.channel)
         self.port.write("OUTP:SEL OFF")
           
@@ -146,20 +171,45 @@ def apply(self):
         elif self.source.startswith("Current"):
             self.port.write("CURR %1.3f" % float(self.value))
 
+        # values read before the change must not be used by any channel
+        self.readout.invalidate()
+
         # wait for achieving the set voltage or set current before
         # other channels are changed
         if "(with wait)" in self.source:
-            time.sleep(0.5)
-         
-    def measure(self): 
-        self.port.write("INST OUT%i" % self.channel)
-        
-        self.port.write("MEAS:VOLT?")
-        self.v = float(self.port.read())
-        
-        self.port.write("MEAS:CURR?")
-        self.i = float(self.port.read())
-        # print(self.v, self.i)
-                
+            if not channel_readout.wait_until(self.is_settled, self.settle_timeout):
+                debug("HMP4000: Channel %i not settled within %1.1f s." % (self.channel, self.settle_timeout))
+
+    def measure(self):
+        self.v, self.i = self.readout.read(self.channel, self.read_channels)
+
     def call(self):
         return [self.v, self.i]
+
+    def read_channels(self, channels):
+        """Read voltage and current of the given channels with a single query.
+
+        Returns:
+            dict: (voltage, current) per channel
+        """
+        command = ";:".join("INST OUT%i;:MEAS:VOLT?;:MEAS:CURR?" % channel for channel in channels)
+        self.port.write(command)
+        answer = [float(value) for value in self.port.read().split(";")]
+
+        if len(answer) != 2 * len(channels):
+            msg = "HMP4000: Unexpected number of values %i for channels %s." % (len(answer), channels)
+            raise Exception(msg)
+
+        return {channel: (answer[2 * n], answer[2 * n + 1]) for n, channel in enumerate(channels)}
+
+    def is_settled(self):
+        """Return whether the output has reached the set value or the compliance."""
+        voltage, current = self.read_channels([self.channel])[self.channel]
+
+        if self.source.startswith("Voltage"):
+            return channel_readout.is_settled(
+                float(self.value), voltage, float(self.protection), current, self.settle_tolerance["Voltage"],
+            )
+        return channel_readout.is_settled(
+            float(self.value), current, float(self.protection), voltage, self.settle_tolerance["Current"],
+        )
@@ -0,0 +1,85 @@
+import importlib.util
+import unittest
+from pathlib import Path
+
+# Import the channel readout helper
+file_path = Path(__file__).resolve().parent.parent / "libraries" / "channel_readout.py"
+spec = importlib.util.spec_from_file_location("channel_readout", file_path)
+channel_readout = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(channel_readout)
+
+
+class MockSupply:
+    """Power supply that returns the channel number as voltage and counts the combined queries."""
+
+    def __init__(self) -> None:
+        """Start without queries."""
+        self.queries = []
+
+    def read_all(self, channels: list[int]) -> dict[int, tuple[float, float]]:
+        """Return voltage and current per channel."""
+        self.queries.append(channels)
+        return {channel: (float(channel), 0.1 * channel) for channel in channels}
+
+
+class TestSharedReadout(unittest.TestCase):
+    """Test sharing a combined readout between the instances of several channels."""
+
+    def setUp(self) -> None:
+        """Register three channels of one instrument."""
+        self.device_communication = {}
+        self.readout = channel_readout.get_shared_readout(self.device_communication, "HMP4000_COM1")
+        for channel in [3, 1, 2]:
+            self.readout.register(channel)
+        self.supply = MockSupply()
+
+    def test_same_readout_for_same_key(self) -> None:
+        """Instances using the same port get the same readout, other ports a new one."""
+        self.assertIs(channel_readout.get_shared_readout(self.device_communication, "HMP4000_COM1"), self.readout)  # noqa: PT009
+        self.assertIsNot(channel_readout.get_shared_readout(self.device_communication, "HMP4000_COM2"), self.readout)  # noqa: PT009
+
+    def test_single_query_per_point(self) -> None:
+        """The first channel reads all channels, the others use the cached values."""
+        for _point in range(2):
+            for channel in [2, 1, 3]:
+                self.assertEqual(self.readout.read(channel, self.supply.read_all)[0], channel)  # noqa: PT009
+
+        self.assertEqual(self.supply.queries, [[1, 2, 3], [1, 2, 3]])  # noqa: PT009
+
+    def test_invalidate_after_change(self) -> None:
+        """Values read before an output has been changed are not used."""
+        self.readout.read(1, self.supply.read_all)
+        self.readout.invalidate()
+        self.readout.read(2, self.supply.read_all)
+
+        self.assertEqual(len(self.supply.queries), 2)  # noqa: PT009
+
+    def test_unregister(self) -> None:
+        """Unregistered channels are not read anymore."""
+        self.readout.unregister(3)
+        self.readout.read(1, self.supply.read_all)
+
+        self.assertEqual(self.supply.queries, [[1, 2]])  # noqa: PT009
+
+
+class TestSettled(unittest.TestCase):
+    """Test the detection of a settled output."""
+
+    def test_constant_voltage(self) -> None:
+        """The output is settled once the set voltage is reached."""
+        self.assertTrue(channel_readout.is_settled(5.0, 4.998, 1.0, 0.2, 0.005))  # noqa: PT009
+        self.assertFalse(channel_readout.is_settled(5.0, 4.5, 1.0, 0.2, 0.005))  # noqa: PT009
+
+    def test_constant_current(self) -> None:
+        """The output is settled if it is limited by the compliance."""
+        self.assertTrue(channel_readout.is_settled(5.0, 2.0, 1.0, 0.999, 0.005))  # noqa: PT009
+
+    def test_wait_until(self) -> None:
+        """Waiting ends as soon as the condition is fulfilled or after the timeout."""
+        results = iter([False, False, True])
+        self.assertTrue(channel_readout.wait_until(lambda: next(results), 1.0, 0.001))  # noqa: PT009
+        self.assertFalse(channel_readout.wait_until(lambda: False, 0.01, 0.001))  # noqa: PT009
+
+
+if __name__ == "__main__":
+    unittest.main()
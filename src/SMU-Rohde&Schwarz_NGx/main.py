@@ -29,11 +29,19 @@
 # Type: SMU
 # Device: Rohde&Schwarz NGx
 
-import time
+import importlib.util
+from pathlib import Path
 
-from pysweepme.ErrorMessage import error
+from pysweepme.ErrorMessage import debug, error
 from pysweepme.EmptyDeviceClass import EmptyDevice
 
+# Import the channel readout helper from the libraries folder of the driver
+_spec = importlib.util.spec_from_file_location(
+    "channel_readout", Path(__file__).resolve().parent / "libraries" / "channel_readout.py"
+)
+channel_readout = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(channel_readout)
+
 
 class Device(EmptyDevice):
     description = """
@@ -45,6 +53,10 @@ class Device(EmptyDevice):
     The setting can be found under "USB Class" from the "Network Connections" dialog.</li>
     <li>To use '4-wire' just include the Sense connectors of the instrument into your circuit and 
     it will automatically change to 4-wire mode.</li>
+    <li>Each channel is used with its own driver instance. At each measurement point, the first instance reads voltage
+    and current of all used channels with a single query and the other instances use these values.</li>
+    <li>With wait: After setting a new value, the output is polled until the set value is reached (CV/CC mode) or the
+    compliance is reached (change to CC/CV mode), but not longer than 2 s.</li>
     </ul> 
     """
 
@@ -67,6 +79,10 @@ def __init__(self):
                                 # "Exception": False,
                                 }
 
+        # Polling of the settled output if "(with wait)" is selected
+        self.settle_timeout = 2.0  # in s
+        self.settle_tolerance = {"Voltage": 0.005, "Current": 0.001}  # in V and A
+
     #       self.commands = {
     #                      "Voltage in V" : "VOLT",
     #                      "Current in A" : "CURR",
@@ -110,6 +126,10 @@ def initialize(self):
         self.reset_instrument()
 
     def configure(self):
+        # Voltage and current of all channels are read together, shared by all instances using the same port
+        self.readout = channel_readout.get_shared_readout(self.device_communication, "NGx_" + self.port_string)
+        self.readout.register(self.channel)
+
         self.set_voltage_range(self.voltage_range)
         self.set_current_range(self.current_range)
         self.set_channel(self.channel)
@@ -129,6 +149,7 @@ def configure(self):
             self.set_nplc(10)
 
     def unconfigure(self):
+        self.readout.unregister(self.channel)
 
         if self.source.startswith("Voltage"):
             self.set_voltage(0.0)
@@ -158,14 +179,17 @@ def apply(self):
         elif self.source.startswith("Current"):
             self.set_current(self.value)
 
+        # values read before the change must not be used by any channel
+        self.readout.invalidate()
+
         # wait for achieving the set voltage or set current before
         # other channels are changed
         if "(with wait)" in self.source:
-            time.sleep(0.5)
+            if not channel_readout.wait_until(self.is_settled, self.settle_timeout):
+                debug("NGx: Channel %i not settled within %1.1f s." % (self.channel, self.settle_timeout))
 
     def measure(self):
-        self.set_channel(self.channel)
-        self.v, self.i = self.read_data()
+        self.v, self.i = self.readout.read(self.channel, self.read_channels)
         # print(self.v, self.i)
 
     def call(self):
@@ -352,6 +376,46 @@ def read_data(self):
         voltage, current = self.port.read().split(",")
         return float(voltage), float(current)
 
+    def read_channels(self, channels):
+        """
+        This function reads voltage and current of several channels with a single query. The channels are selected
+        one after the other within the same command.
+        Args:
+            channels: list of int
+
+        Returns:
+            dict: (voltage, current) per channel
+        """
+        self.port.write(";:".join("INST:OUT%i;:READ?" % int(channel) for channel in channels))
+        answers = self.port.read().split(";")
+
+        if len(answers) != len(channels):
+            msg = "NGx: Unexpected number of readings %i for channels %s." % (len(answers), channels)
+            raise Exception(msg)
+
+        readings = {}
+        for channel, answer in zip(channels, answers):
+            voltage, current = answer.split(",")
+            readings[channel] = (float(voltage), float(current))
+        return readings
+
+    def is_settled(self):
+        """
+        This function checks whether the selected output has reached the set value in constant voltage or constant
+        current mode, or whether it has changed to the other mode because the compliance is reached.
+        Returns:
+            bool: True if settled
+        """
+        voltage, current = self.read_data()
+
+        if self.source.startswith("Voltage"):
+            return channel_readout.is_settled(
+                float(self.value), voltage, float(self.protection), current, self.settle_tolerance["Voltage"],
+            )
+        return channel_readout.is_settled(
+            float(self.value), current, float(self.protection), voltage, self.settle_tolerance["Current"],
+        )
+
     def set_voltage_range(self, voltage_range):
         """
         This function sets the voltage measurement range of the instrument. Available ranges are:
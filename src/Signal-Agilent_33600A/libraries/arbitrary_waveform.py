@@ -0,0 +1,141 @@
+# This Device Class is published under the terms of the MIT License.
+# Required Third Party Libraries, which are included in the Device Class
+# package for convenience purposes, may have a different license. You can
+# find those in the corresponding folders or contact the maintainer.
+#
+# MIT License
+#
+# Copyright (c) 2024 SweepMe! GmbH (sweep-me.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from __future__ import annotations
+
+import zlib
+from pathlib import Path
+from typing import Sequence, Union
+
+import numpy as np
+
+WaveformSource = Union[str, Path, np.ndarray, Sequence[float]]
+
+
+def load_samples(source: WaveformSource) -> np.ndarray:
+    """Return the samples of an arbitrary waveform as one-dimensional float array.
+
+    Args:
+        source: Samples as array or sequence, or the path of a file with the samples. Supported files are .npy files
+            and text files like .csv or .txt with one sample per row. If a file has several columns, e.g. time and
+            voltage, the last column is used.
+
+    Returns:
+        Samples of the waveform.
+    """
+    if isinstance(source, (str, Path)):
+        path = Path(source)
+        if not path.is_file():
+            msg = f"Arbitrary waveform file '{path}' does not exist."
+            raise FileNotFoundError(msg)
+
+        if path.suffix.lower() == ".npy":
+            samples = np.load(path)
+        else:
+            delimiter = "," if path.suffix.lower() == ".csv" else None
+            samples = np.loadtxt(path, delimiter=delimiter, comments="#", ndmin=2)[:, -1]
+    else:
+        samples = source
+
+    samples = np.asarray(samples, dtype=np.float64).ravel()
+
+    if samples.size == 0:
+        msg = "Arbitrary waveform does not contain any samples."
+        raise ValueError(msg)
+    if not np.all(np.isfinite(samples)):
+        msg = "Arbitrary waveform contains samples that are NaN or infinite."
+        raise ValueError(msg)
+
+    return samples
+
+
+def normalize(samples: np.ndarray) -> np.ndarray:
+    """Scale the samples to the range -1 to 1 without offset, so that amplitude and offset are set by the instrument.
+
+    Args:
+        samples: Samples of the waveform.
+
+    Returns:
+        Samples with a maximum absolute value of 1, or zeros if all samples are zero.
+    """
+    peak = np.max(np.abs(samples))
+    if peak == 0.0:
+        return np.zeros_like(samples)
+    return samples / peak
+
+
+def to_dac_codes(samples: np.ndarray, full_scale: int, byte_order: str = "<") -> np.ndarray:
+    """Convert samples to signed 16-bit DAC codes.
+
+    Args:
+        samples: Samples of the waveform.
+        full_scale: DAC code that corresponds to the largest absolute sample, e.g. 32767 or 8191 for a 14-bit DAC.
+        byte_order: '<' for little endian and '>' for big endian.
+
+    Returns:
+        Array of DAC codes with the given byte order.
+    """
+    codes = np.rint(normalize(samples) * full_scale)
+    return codes.astype(byte_order + "i2")
+
+
+def ieee_block(data: bytes) -> bytes:
+    """Wrap data into a definite length arbitrary block according to IEEE 488.2, e.g. b'#14abcd'.
+
+    Args:
+        data: Binary data.
+
+    Returns:
+        Header and data.
+    """
+    length = str(len(data))
+    if len(length) > 9:
+        msg = "Data is too long for a definite length IEEE 488.2 block."
+        raise ValueError(msg)
+    return b"#" + str(len(length)).encode("ascii") + length.encode("ascii") + data
+
+
+def checksum(data: bytes) -> int:
+    """Return the CRC-32 checksum of the data, e.g. to find out whether a waveform has changed."""
+    return zlib.crc32(data) & 0xFFFFFFFF
+
+
+def waveform_name(data: bytes, prefix: str = "SM") -> str:
+    """Return a short waveform name that is unique for the data.
+
+    The name contains the checksum of the data, so that an instrument catalog can be used to find out whether a
+    waveform has already been uploaded.
+
+    Args:
+        data: Binary waveform data.
+        prefix: Start of the name, must start with a letter.
+
+    Returns:
+        Name like 'SM_1A2B3C4D'.
+    """
+    return "%s_%08X" % (prefix, checksum(data))
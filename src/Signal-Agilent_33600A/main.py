@@ -30,8 +30,18 @@
 # Type: Signal
 # Device: Agilent_33600A
 
+import importlib.util
+from pathlib import Path
+
 from EmptyDeviceClass import EmptyDevice
 
+# Import the arbitrary waveform helper from the libraries folder of the driver
+_spec = importlib.util.spec_from_file_location(
+    "arbitrary_waveform", Path(__file__).resolve().parent / "libraries" / "arbitrary_waveform.py"
+)
+arbitrary_waveform = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(arbitrary_waveform)
+
 class Device(EmptyDevice):
 
     multichannel = [" CH1", " CH2"]
@@ -66,6 +76,13 @@ def __init__(self):
         
         self.waveform_standard_list = ["Sine", "Square", "Ramp", "Pulse", "Noise", "Triangle", "DC"]
 
+        # file extensions of waveform files that are uploaded instead of selected from the instrument memory
+        self.waveform_file_extensions = [".csv", ".txt", ".dat", ".npy"]
+
+        # name and number of points of the uploaded arbitrary waveform, used to skip uploading the same waveform again
+        self.arbitrary_waveform_name = None
+        self.arbitrary_waveform_points = 0
+
         self.plottype = [True] # True to plot data
         self.savetype = [True] # True to save data
         
@@ -93,7 +110,7 @@ def set_GUIparameter(self):
                         "DelayPhaseValue": 0,
                         "DutyCyclePulseWidth": ["Duty cycle [%]", "Pulse width [s]"],
                         "DutyCyclePulseWidthValue": 50,
-                        "Waveform" : ["Sine", "Square", "Ramp", "Pulse", "Noise", "Triangle", "DC", "Arbitrary: <file name>"],
+                        "Waveform" : ["Sine", "Square", "Ramp", "Pulse", "Noise", "Triangle", "DC", "Arbitrary: <file name>", "Arbitrary: <file.csv>"],
                         "Impedance": ["High-Z", "50 Ohm"],
                         #"Trigger": ["Not supported yet"] 
                         }
@@ -188,34 +205,51 @@ def configure(self):
                 
 
         ### Get Arbitrary Waveform ###
+
+        self.arbitrary_waveform_points = 0
         
         if self.waveform.startswith("Arbitrary:") or self.waveform not in self.waveform_standard_list:
         
-            # we strip off all file extensions and whitespaces and also the leading 'Arbitrary:" if it has been used
-            # further we only use uppercase as the device as anyway just knows uppercase file names 
-            waveform_command = self.waveform.replace("Arbitrary:","").strip().replace(".ARB","").replace(".arb","").replace(".Arb","").upper() 
-            
-            self.port.write("SOUR%s:FUNC ARB" % (self.channel))
-            self.port.write("FUNC:USER %s" % (waveform_command))
+            waveform_file = self.waveform.replace("Arbitrary:", "").strip()
 
-            # check if function is set correctly
-            self.port.write("FUNC:USER?")
-            answer = self.port.read()
+            if Path(waveform_file).suffix.lower() in self.waveform_file_extensions:
+                # samples from a file are uploaded and the sample rate is chosen such that the waveform is repeated
+                # with the selected frequency
+                waveform_path = Path(waveform_file)
+                if not waveform_path.is_absolute():
+                    waveform_path = Path(self.get_folder("CUSTOMFILES")) / waveform_path
+                self.upload_arbitrary_waveform(waveform_path)
 
-            #print(answer,waveform_command)
+                self.port.write("SOUR%s:APPL:ARB %s, %s, %s" % (self.channel, self.frequency * self.arbitrary_waveform_points, self.amplitude, self.offset))
+                waveform_type = "ARB"
 
-            if answer != waveform_command:
-                self.stop_Measurement("Cannot find the selected user function %s (check spelling/uppercases) " % waveform_command)
-                return False
-                
-            waveform_type = "USER"
+            else:
+                # we strip off all file extensions and whitespaces and also the leading 'Arbitrary:" if it has been used
+                # further we only use uppercase as the device as anyway just knows uppercase file names
+                waveform_command = waveform_file.replace(".ARB","").replace(".arb","").replace(".Arb","").upper()
+
+                self.port.write("SOUR%s:FUNC ARB" % (self.channel))
+                self.port.write("FUNC:USER %s" % (waveform_command))
+
+                # check if function is set correctly
+                self.port.write("FUNC:USER?")
+                answer = self.port.read()
+
+                #print(answer,waveform_command)
+
+                if answer != waveform_command:
+                    self.stop_Measurement("Cannot find the selected user function %s (check spelling/uppercases) " % waveform_command)
+                    return False
+
+                waveform_type = "USER"
         
         else:
             
             waveform_type = self.commands[self.waveform]
             
 
-        self.port.write("SOUR%s:APPL:%s %s, %s, %s" % (self.channel, waveform_type, self.frequency, self.amplitude, self.offset))
+        if waveform_type != "ARB":
+            self.port.write("SOUR%s:APPL:%s %s, %s, %s" % (self.channel, waveform_type, self.frequency, self.amplitude, self.offset))
             
         
         
@@ -312,7 +346,10 @@ def apply(self):
                     self.offset = (self.amplitudehilevelvalue + self.offsetlolevelvalue)/2.0
            
             
-            self.port.write("SOUR%s:FREQ %s" % (self.channel, self.frequency))  
+            if self.arbitrary_waveform_points > 0:
+                self.port.write("SOUR%s:FUNC:ARB:FREQ %s" % (self.channel, self.frequency))
+            else:
+                self.port.write("SOUR%s:FREQ %s" % (self.channel, self.frequency))
             self.port.write("SOUR%s:VOLT %s" % (self.channel, self.amplitude))  
             self.port.write("SOUR%s:VOLT:OFFS %s" % (self.channel, self.offset))  
                 
@@ -354,6 +391,10 @@ def call(self):
             answer = self.port.read().replace("\"", "").split(" ")[1].split(",")
             
             frequency, amplitude, offset = map(float, answer)
+
+            # for uploaded arbitrary waveforms, the sample rate is returned
+            if self.arbitrary_waveform_points > 0:
+                frequency = frequency / self.arbitrary_waveform_points
             
             if self.sweep_mode == "Frequency [Hz]":
                 returnvalue = frequency
@@ -380,5 +421,49 @@ def call(self):
                 returnvalue = self.value
 
             return [returnvalue]
-        
-                    
\ No newline at end of file
+
+    def upload_arbitrary_waveform(self, samples):
+        """uploads an arbitrary waveform as binary block and selects it for the channel
+
+        The samples can be given as array or as path of a .csv, .txt, or .npy file. They are normalized to the full
+        range of the DAC, so that amplitude and offset are defined by the instrument settings. The waveform name
+        contains a checksum of the data and the upload is skipped if the waveform is already in the volatile memory. The
+        volatile memory is only cleared if it has not enough space left for the waveform.
+
+        Args:
+            samples: array of samples or path of a waveform file
+
+        Returns:
+            str: name of the waveform in the volatile memory
+        """
+        codes = arbitrary_waveform.to_dac_codes(arbitrary_waveform.load_samples(samples), 32767, "<")
+        data = codes.tobytes()
+        name = arbitrary_waveform.waveform_name(data)
+
+        if name != self.arbitrary_waveform_name:
+            self.port.write("SOUR%s:DATA:VOL:CAT?" % self.channel)
+            catalog = self.port.read()
+
+            if name not in catalog:
+                # waveforms uploaded before are kept and only deleted if there is not enough space for the new one
+                self.port.write("SOUR%s:DATA:VOL:FREE?" % self.channel)
+                if int(float(self.port.read())) < len(codes):
+                    # a waveform that is in use cannot be deleted, so a built-in function is selected before
+                    self.port.write("SOUR%s:FUNC SIN" % self.channel)
+                    self.port.write("SOUR%s:DATA:VOL:CLE" % self.channel)
+
+                self.port.write("FORM:BORD SWAP")  # little endian as created by numpy
+                command = "SOUR%s:DATA:ARB:DAC %s," % (self.channel, name)
+                self.port.port.write_raw(command.encode("ascii") + arbitrary_waveform.ieee_block(data) + b"\n")
+
+                # wait until the waveform has been stored
+                self.port.write("*OPC?")
+                self.port.read()
+
+            self.port.write("SOUR%s:FUNC:ARB %s" % (self.channel, name))
+            self.arbitrary_waveform_name = name
+
+        self.arbitrary_waveform_points = len(codes)
+        self.port.write("SOUR%s:FUNC ARB" % self.channel)
+
+        return name
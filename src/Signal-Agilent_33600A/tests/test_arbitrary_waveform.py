@@ -0,0 +1,73 @@
+import importlib.util
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Import the arbitrary waveform helper
+file_path = Path(__file__).resolve().parent.parent / "libraries" / "arbitrary_waveform.py"
+spec = importlib.util.spec_from_file_location("arbitrary_waveform", file_path)
+arbitrary_waveform = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(arbitrary_waveform)
+
+
+class TestLoadSamples(unittest.TestCase):
+    """Test loading waveforms from arrays and files."""
+
+    def setUp(self) -> None:
+        """Create a temporary folder for waveform files."""
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+
+    def test_csv_with_time_column(self) -> None:
+        """The last column of a file is used and comments are ignored."""
+        path = Path(self.folder.name) / "waveform.csv"
+        path.write_text("# time, voltage\n0.0,0.5\n0.1,-1.0\n0.2,0.25\n")
+        np.testing.assert_array_equal(arbitrary_waveform.load_samples(path), [0.5, -1.0, 0.25])
+
+    def test_single_column_text_file(self) -> None:
+        """Text files with one sample per row are supported."""
+        path = Path(self.folder.name) / "waveform.txt"
+        path.write_text("0.0\n1.0\n")
+        np.testing.assert_array_equal(arbitrary_waveform.load_samples(str(path)), [0.0, 1.0])
+
+    def test_invalid_samples(self) -> None:
+        """Missing files, empty waveforms and NaN samples are rejected."""
+        with self.assertRaises(FileNotFoundError):  # noqa: PT027
+            arbitrary_waveform.load_samples(Path(self.folder.name) / "missing.csv")
+        with self.assertRaises(ValueError):  # noqa: PT027
+            arbitrary_waveform.load_samples([])
+        with self.assertRaises(ValueError):  # noqa: PT027
+            arbitrary_waveform.load_samples([0.0, np.nan])
+
+
+class TestBinaryBlock(unittest.TestCase):
+    """Test the conversion to DAC codes and IEEE 488.2 blocks."""
+
+    def test_dac_codes(self) -> None:
+        """Samples are normalized to the full scale of the DAC."""
+        codes = arbitrary_waveform.to_dac_codes(np.array([0.0, 2.0, -1.0]), 8191)
+        np.testing.assert_array_equal(codes, [0, 8191, -4096])
+        self.assertEqual(codes.tobytes()[:4], b"\x00\x00\xff\x1f")  # noqa: PT009
+
+    def test_big_endian(self) -> None:
+        """The byte order can be selected."""
+        codes = arbitrary_waveform.to_dac_codes(np.array([1.0]), 32767, ">")
+        self.assertEqual(codes.tobytes(), b"\x7f\xff")  # noqa: PT009
+
+    def test_ieee_block(self) -> None:
+        """The header contains the number of digits of the length and the length."""
+        self.assertEqual(arbitrary_waveform.ieee_block(b"abcd"), b"#14abcd")  # noqa: PT009
+        self.assertEqual(arbitrary_waveform.ieee_block(bytes(12345))[:7], b"#512345")  # noqa: PT009
+
+    def test_name_depends_on_data(self) -> None:
+        """The waveform name changes with the data and is short enough for the instrument memory."""
+        name = arbitrary_waveform.waveform_name(b"\x00\x01")
+        self.assertEqual(name, arbitrary_waveform.waveform_name(b"\x00\x01"))  # noqa: PT009
+        self.assertNotEqual(name, arbitrary_waveform.waveform_name(b"\x00\x02"))  # noqa: PT009
+        self.assertLessEqual(len(name), 12)  # noqa: PT009
+
+
+if __name__ == "__main__":
+    unittest.main()
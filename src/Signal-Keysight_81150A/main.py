@@ -30,8 +30,18 @@
 # Type: Signal
 # Device: Keysight 811x0A
 
+import importlib.util
+from pathlib import Path
+
 from pysweepme.EmptyDeviceClass import EmptyDevice
 
+# Import the arbitrary waveform helper from the libraries folder of the driver
+_spec = importlib.util.spec_from_file_location(
+    "arbitrary_waveform", Path(__file__).resolve().parent / "libraries" / "arbitrary_waveform.py"
+)
+arbitrary_waveform = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(arbitrary_waveform)
+
 
 class Device(EmptyDevice):
 
@@ -48,20 +58,18 @@ def __init__(self):
                                 # "Exception": False,
                                 }
         # to be defined by user
-        # self.commands = {"Sine": "SIN",
-        #                  "Square": "SQU",
-        #                  "Ramp": "RAMP",
-        #                  "Pulse": "PULS",
-        #                  "Noise": "NOIS",
-        #                  "DC": "DC",
-        #                  # "Arbitrary": "ARB",
-        #                  "Period [s]": "PER",
-        #                  "Frequency [Hz]": "FREQ",
-        #                  "HiLevel [V]": "VOLT:HIGH",
-        #                  "LoLevel [V]": "VOLT:LOW",
-        #                  "Amplitude [V]": "VOLT",
-        #                  "Offset [V]": "VOLT:OFFS",
-        #                  }
+        self.commands = {"Sine": "SIN",
+                         "Square": "SQU",
+                         "Ramp": "RAMP",
+                         "Pulse": "PULS",
+                         "Noise": "NOIS",
+                         "DC": "DC",
+                         "Arbitrary": "USER",
+                         }
+
+        # checksum of the arbitrary waveform uploaded to the volatile memory of each channel, used to skip uploading
+        # the same waveform again
+        self.arbitrary_waveform_checksums = {}
 
         self.plottype = [True]  # True to plot data
         self.savetype = [True]  # True to save data
@@ -80,7 +88,7 @@ def set_GUIparameter(self):
             "DelayPhaseValue": 0,
             "DutyCyclePulseWidth": ["Duty cycle in %", "Pulse width in s"],
             "DutyCyclePulseWidthValue": 50,
-            "Waveform": ["Sine", "Square", "Ramp", "Pulse", "Noise", "DC"],
+            "Waveform": ["Sine", "Square", "Ramp", "Pulse", "Noise", "DC", "Arbitrary: <file.csv>"],
             "Impedance": ["High-Z", "50 Ohm"],
             "Channel": ["Ch1", "Ch2"],
             # "Trigger": ["Not supported yet"]
@@ -165,7 +173,14 @@ def configure(self):
                 self.amplitude = self.amplitudehilevelvalue - self.offsetlolevelvalue
                 self.offset = (self.amplitudehilevelvalue - self.offsetlolevelvalue) / 2.0
 
-        waveform_type = self.commands[self.waveform]
+        if self.waveform.startswith("Arbitrary:"):
+            waveform_path = Path(self.waveform.replace("Arbitrary:", "").strip())
+            if not waveform_path.is_absolute():
+                waveform_path = Path(self.get_folder("CUSTOMFILES")) / waveform_path
+            self.upload_arbitrary_waveform(self.channel, waveform_path)
+            waveform_type = self.commands["Arbitrary"]
+        else:
+            waveform_type = self.commands[self.waveform]
 
         self.apply_waveform(self.channel, waveform_type, self.frequency, self.amplitude, self.offset)
 
@@ -433,6 +448,37 @@ def apply_waveform(self, channel, waveform_type, frequency, amplitude, offset):
         else:
             raise Exception("The input waveform is not valid.")
 
+    def upload_arbitrary_waveform(self, channel, samples):
+        """
+        This function uploads an arbitrary waveform as binary block to the volatile memory and selects it as user
+        waveform. The samples are normalized to the 14-bit range of the DAC, so that amplitude and offset are defined by
+        the instrument settings. The upload is skipped if the same waveform has already been uploaded to the channel.
+        Args:
+            channel: int or str
+            samples: array of samples or path of a .csv, .txt, or .npy file
+
+        Returns:
+            int: checksum of the waveform data
+        """
+        data = arbitrary_waveform.to_dac_codes(arbitrary_waveform.load_samples(samples), 8191, "<").tobytes()
+        checksum = arbitrary_waveform.checksum(data)
+
+        # each channel has its own volatile memory
+        if checksum != self.arbitrary_waveform_checksums.get(int(channel)):
+            self.port.write(":FORM:BORD SWAP")  # little endian as created by numpy
+            command = ":DATA%s:DAC VOLATILE, " % channel
+            self.port.port.write_raw(command.encode("ascii") + arbitrary_waveform.ieee_block(data) + b"\n")
+
+            # wait until the waveform has been stored
+            self.port.write("*OPC?")
+            self.port.read()
+
+            self.arbitrary_waveform_checksums[int(channel)] = checksum
+
+        self.port.write(":FUNC%s:USER VOLATILE" % channel)
+
+        return checksum
+
     def inquiry_waveform(self, channel):
         """
         This function reads and returns waveform parameters frequency, amplitude, and offset.
@@ -32,8 +32,10 @@
 # Device: Red pitaya STEMlab
 
 
+import importlib.util
 import numpy as np
 import time
+from pathlib import Path
 
 from pysweepme.FolderManager import addFolderToPATH
 addFolderToPATH()
@@ -42,6 +44,13 @@
 from pysweepme.ErrorMessage import error
 from pysweepme.EmptyDeviceClass import EmptyDevice
 
+# Import the arbitrary waveform helper from the libraries folder of the driver
+_spec = importlib.util.spec_from_file_location(
+    "arbitrary_waveform", Path(__file__).resolve().parent / "libraries" / "arbitrary_waveform.py"
+)
+arbitrary_waveform = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(arbitrary_waveform)
+
 
 class Device(EmptyDevice):
 
@@ -69,6 +78,9 @@ def __init__(self):
             "Gated": "GATED",
             }
                         
+        # number of samples of the arbitrary waveform buffer
+        self.arbitrary_buffer_size = 16384
+
         self.operationmodes = {
             "Continuous": "CONTINUOUS",
             "Burst": "BURST",
@@ -162,9 +174,7 @@ def configure(self):
         
         # set arbitrary waveform
         if self.waveforms[self.waveform] == "ARBITRARY":
-            self.waveformarray = np.loadtxt(self.waveformarray)
-            np.set_printoptions(threshold=np.nan)
-            self.port.write('SOUR{0}:TRAC:DATA:DATA {1}'.format(self.channel, np.array2string(self.waveformarray, precision=5, separator=",")[1:-1].replace(" ", "").replace("\n", "")))
+            self.set_arbitrary_waveform(self.waveformarray)
         
         # Set PWM duty cycle
         if self.waveform == "PWM":
@@ -333,6 +343,22 @@ def set_burst_mode(self):
             self.port.write('SOUR{0}:BURS:NOR {1}'.format(self.channel, self.burstnumber))            # set number of Periods in one Burst
             self.port.write('SOUR{0}:BURS:NCYC {1}'.format(self.channel, self.periodnumber))              # set number of repeated Bursts
 
+    def set_arbitrary_waveform(self, samples):
+        """Upload the samples of an arbitrary waveform in the range -1 to 1.
+
+        The samples can be given as array or as path of a .csv, .txt, or .npy file. The generator only accepts
+        comma-separated text, which is created at once for all samples instead of using np.array2string.
+        """
+        samples = arbitrary_waveform.load_samples(samples)
+
+        if len(samples) > self.arbitrary_buffer_size:
+            msg = "Arbitrary waveform has %i samples, but the generator buffer only has %i samples." % (
+                len(samples), self.arbitrary_buffer_size)
+            raise ValueError(msg)
+
+        data = ",".join(map("{:.5f}".format, samples))
+        self.port.write('SOUR{0}:TRAC:DATA:DATA {1}'.format(self.channel, data))
+
     def get_identification(self):
 
         self.port.write("*IDN?")
@@ -31,8 +31,18 @@
 # Type: Signal
 # Device: Siglent SDG2000X
 
+import importlib.util
+from pathlib import Path
+
 from pysweepme.EmptyDeviceClass import EmptyDevice
 
+# Import the arbitrary waveform helper from the libraries folder of the driver
+_spec = importlib.util.spec_from_file_location(
+    "arbitrary_waveform", Path(__file__).resolve().parent / "libraries" / "arbitrary_waveform.py"
+)
+arbitrary_waveform = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(arbitrary_waveform)
+
 
 class Device(EmptyDevice):
 
@@ -57,6 +67,12 @@ def __init__(self):
         
         self.waveform_standard_list = ["Sine", "Square", "Ramp", "Pulse", "Noise", "DC"]
 
+        # file extensions of waveform files that are uploaded instead of selected from the instrument memory
+        self.waveform_file_extensions = [".csv", ".txt", ".dat", ".npy"]
+
+        # name of the uploaded arbitrary waveform, used to skip uploading the same waveform again
+        self.arbitrary_waveform_name = None
+
         self.plottype = [True]  # True to plot data
         self.savetype = [True]  # True to save data
 
@@ -87,8 +103,8 @@ def set_GUIparameter(self):
                         # TODO Pulsewidth in ms or µs
                         "DutyCyclePulseWidth": ["Duty cycle in %", "Pulse width in s"],
                         "DutyCyclePulseWidthValue": 50,
-                        # Arbitrary not supported yet
-                        "Waveform" : ["Sine", "Square", "Ramp", "Pulse", "Noise", "DC", "Arbitrary: <file name>"],
+                        "Waveform" : ["Sine", "Square", "Ramp", "Pulse", "Noise", "DC", "Arbitrary: <file name>",
+                                      "Arbitrary: <file.csv>"],
                         "Impedance": ["High-Z", "50 Ohm"],
                         #"Trigger": ["Not supported yet"] 
                         }
@@ -177,8 +193,24 @@ def configure(self):
         if self.offsetlolevel == "Standard deviation in V":
             self.stdev = self.offsetlolevelvalue
         
-        # Set waveform with standard parameters        
-        waveform_type = self.commands[self.waveform]
+        # Select or upload arbitrary waveform
+        if self.waveform.startswith("Arbitrary:"):
+            waveform_file = self.waveform.replace("Arbitrary:", "").strip()
+
+            if Path(waveform_file).suffix.lower() in self.waveform_file_extensions:
+                waveform_path = Path(waveform_file)
+                if not waveform_path.is_absolute():
+                    waveform_path = Path(self.get_folder("CUSTOMFILES")) / waveform_path
+                self.upload_arbitrary_waveform(waveform_path)
+            else:
+                # waveform that is already stored on the instrument
+                self.port.write(f"{self.channel}:ARWV NAME,{waveform_file}")
+
+            waveform_type = self.commands["Arbitrary"]
+        else:
+            waveform_type = self.commands[self.waveform]
+
+        # Set waveform with standard parameters
         self.port.write(f"{self.channel}:BSWV "
                         f"WVTP,{waveform_type},"
                         f"FRQ,{self.frequency},"
@@ -301,4 +333,39 @@ def apply(self):
         
     def call(self):
         if self.sweep_mode != 'None':
-            return float(self.value)
\ No newline at end of file
+            return float(self.value)
+
+    def upload_arbitrary_waveform(self, samples):
+        """Upload an arbitrary waveform in binary form and select it for the channel.
+
+        The samples can be given as array or as path of a .csv, .txt, or .npy file. They are normalized to the full
+        range of the DAC, so that amplitude and offset are defined by the instrument settings. The waveform name
+        contains a checksum of the data and the upload is skipped if the waveform is already stored.
+
+        Args:
+            samples: Array of samples or path of a waveform file.
+
+        Returns:
+            str: Name of the user waveform.
+        """
+        data = arbitrary_waveform.to_dac_codes(arbitrary_waveform.load_samples(samples), 32767, "<").tobytes()
+        name = arbitrary_waveform.waveform_name(data)
+
+        if name != self.arbitrary_waveform_name:
+            self.port.write("STL? USER")
+            catalog = self.port.read()
+
+            if name not in catalog:
+                # the waveform data is sent as raw 16-bit little endian values after the WAVEDATA keyword
+                command = f"{self.channel}:WVDT WVNM,{name},WAVEDATA,"
+                self.port.port.write_raw(command.encode("ascii") + data)
+
+                # wait until the waveform has been stored
+                self.port.write("*OPC?")
+                self.port.read()
+
+            self.arbitrary_waveform_name = name
+
+        self.port.write(f"{self.channel}:ARWV NAME,{name}")
+
+        return name
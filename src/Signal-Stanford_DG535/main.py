@@ -30,9 +30,18 @@
 # Device: Stanford Research DG535
 
 
+import importlib.util
+from pathlib import Path
 
 from EmptyDeviceClass import EmptyDevice
 
+# Import the settings cache helper from the libraries folder of the driver
+_spec = importlib.util.spec_from_file_location(
+    "settings_cache", Path(__file__).resolve().parent / "libraries" / "settings_cache.py"
+)
+settings_cache = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(settings_cache)
+
 class Device(EmptyDevice):
     
     """
@@ -50,6 +59,9 @@ class Device(EmptyDevice):
     <li>Amplitude and offset can only be set if the Waveform is 'Variable". Please make sure that amplitude and offset do not lead to signals larger than 4 V.</li>
     <li>If there are several Signal modules in one branch, the lowest one will set the trigger mode and the frequency if internal trigger is used.</li>
     <li>Frequency will only bet set when trigger mode is set to "Internal".</li>
+    <li>Settings are only sent if they differ from the settings sent before, also across runs. The instrument is
+    only reset at the first run or if 'Reset at start' is selected, e.g. after settings were changed at the front
+    panel.</li>
     </ul>
     """
 
@@ -150,6 +162,7 @@ def set_GUIparameter(self):
                         # "DutyCyclePulseWidthValue": 50,
                         "Impedance" : list(self.impedances_dict.keys()),
                         "Trigger": list(self.triggers_dict.keys()),
+                        "Reset at start": False,
                         }
                         
         return GUIparameter               
@@ -179,6 +192,8 @@ def get_GUIparameter(self, parameter={}):
         self.delayvalue                  = parameter['DelayPhaseValue']
         self.impedance                   = parameter['Impedance']
         self.trigger_type                = parameter['Trigger']
+        self.reset_at_start              = parameter.get('Reset at start', False)
+        self.port_string                 = parameter['Port']
         
 
         if self.sweep_mode == 'None':
@@ -196,7 +211,11 @@ def get_GUIparameter(self, parameter={}):
     """ Here semantic standard functions start """
 
     def initialize(self):
-        self.clear_instrument()
+        # settings sent are remembered for the port and shared by all Signal modules using this instrument
+        self.settings = settings_cache.get_settings_cache(self.device_communication, "DG535 " + self.port_string)
+
+        if self.reset_at_start or not self.settings.valid:
+            self.clear_instrument()
         
         
         # Early exceptions if driver is misconfigured
@@ -289,6 +308,18 @@ def clear_instrument(self):
         """
            
         self.port.write("CL")
+        self.settings.reset()
+
+    def write_setting(self, command, key):
+        """
+        sends a setting command only if it differs from the last command sent for the same setting
+        
+        Parameters:
+            command(str): complete command
+            key(str): name of the setting, e.g. command header and channel
+        """
+        
+        self.settings.write(self.port, command, key)
                    
     def set_display_string(self, text):
     
@@ -339,7 +370,7 @@ def set_delay(self, channel, ref_channel, delay_time):
             ref_channel = self.channels_dict[ref_channel]
          
         # delay time is sent with ps resolution
-        self.port.write("DT %i,%i,%1.12f" % (int(channel), int(ref_channel), float(delay_time) ) )
+        self.write_setting("DT %i,%i,%1.12f" % (int(channel), int(ref_channel), float(delay_time) ), "DT %i" % int(channel))
         
     def get_delay(self, channel):
 
@@ -391,7 +422,7 @@ def set_impedance(self, channel, mode):
         if channel in self.channels_dict:
             channel = self.channels_dict[channel]
            
-        self.port.write("TZ %i,%i" % (int(channel), int(mode)) )
+        self.write_setting("TZ %i,%i" % (int(channel), int(mode)), "TZ %i" % int(channel))
         
     def get_impedance(self, channel):
 
@@ -429,7 +460,7 @@ def set_output_mode(self, channel, mode):
         else: 
             raise ValueError("Channel '%s' unknown." % channel)
             
-        self.port.write("OM %i,%i" % (int(channel), int(mode)) )    
+        self.write_setting("OM %i,%i" % (int(channel), int(mode)), "OM %i" % int(channel))
             
             
     def get_output_mode(self, channel):
@@ -456,7 +487,7 @@ def set_output_amplitude(self, channel, amplitude):
         else: 
             raise ValueError("Channel '%s' unknown." % channel)
             
-        self.port.write("OA %i,%1.3f" % (int(channel), float(amplitude)) )    
+        self.write_setting("OA %i,%1.3f" % (int(channel), float(amplitude)), "OA %i" % int(channel))
             
             
     def get_output_amplitude(self, channel):
@@ -488,7 +519,7 @@ def set_output_offset(self, channel, offset):
         else: 
             raise ValueError("Channel '%s' unknown." % channel)
             
-        self.port.write("OO %i,%1.3f" % (int(channel), float(offset)) )    
+        self.write_setting("OO %i,%1.3f" % (int(channel), float(offset)), "OO %i" % int(channel))
             
             
     def get_output_offset(self, channel):
@@ -532,7 +563,7 @@ def set_output_polarity(self, channel, polarity):
         else: 
             raise ValueError("Channel '%s' unknown." % channel)
             
-        self.port.write("OP %i,%i" % (int(channel), int(polarity)) )    
+        self.write_setting("OP %i,%i" % (int(channel), int(polarity)), "OP %i" % int(channel))
             
             
     def get_output_polarity(self, channel):
@@ -574,7 +605,7 @@ def set_trigger_mode(self, mode):
                 3 -> Burst
         """
 
-        self.port.write("TM %i" % (int(mode)))
+        self.write_setting("TM %i" % (int(mode)), "TM")
         
     def get_trigger_mode(self):
     
@@ -618,7 +649,7 @@ def set_trigger_rate(self, mode, rate):
             rate(float) -> Rate is given in Hz
         """
         
-        self.port.write("TR %i,%1.4f" % (int(mode), float(rate)) )
+        self.write_setting("TR %i,%1.4f" % (int(mode), float(rate)), "TR %i" % int(mode))
 
     def get_trigger_rate(self, mode):
     
@@ -646,7 +677,7 @@ def set_trigger_slope(self, mode):
                 1 -> rising edge
         """
 
-        self.port.write("TS %i" % (int(mode)))
+        self.write_setting("TS %i" % (int(mode)), "TS")
 
     def get_trigger_slope(self):
     
@@ -37,7 +37,7 @@
 from pysweepme.FolderManager import addFolderToPATH
 addFolderToPATH()
 
-import seabreeze.spectrometers as sb
+# seabreeze is imported in 'find_Ports' and 'connect' as importing it takes long
 
 from pysweepme.EmptyDeviceClass import EmptyDevice
 
@@ -80,6 +80,8 @@ def set_GUIparameter(self):
         
     def find_Ports(self):
     
+        import seabreeze.spectrometers as sb
+
         ports = [str(spec) for spec in sb.list_devices()]
     
         # returns a list of ports
@@ -107,6 +109,8 @@ def get_CalibrationFile_properties(self, port):
                    
     def connect(self):
                     
+        import seabreeze.spectrometers as sb
+
         devices = sb.list_devices()
         
         for i in devices:
@@ -38,7 +38,7 @@
 from pysweepme.FolderManager import addFolderToPATH
 addFolderToPATH()
            
-import seabreeze.spectrometers as sb
+# seabreeze is imported in 'find_Ports' and 'connect' as importing it takes long
 
 from pysweepme.EmptyDeviceClass import EmptyDevice
 
@@ -60,6 +60,8 @@ def __init__(self):
 
     def find_Ports(self):
 
+        import seabreeze.spectrometers as sb
+
         ports = [str(spec) for spec in sb.list_devices()]
 
         if isinstance(ports, bool):
@@ -112,6 +114,8 @@ def set_GUIparameter(self):
 
     def connect(self):
                     
+        import seabreeze.spectrometers as sb
+
         devices = sb.list_devices()
         
         for i in devices:
@@ -30,11 +30,20 @@
 # Type: Logger
 # Device: Landgraf HLL LA-1xx
 
+import importlib.util
 import time
+from pathlib import Path
+
 from ErrorMessage import error, debug
 
 from EmptyDeviceClass import EmptyDevice  # Class comes with SweepMe!
 
+_spec = importlib.util.spec_from_file_location(
+    "motion_wait", Path(__file__).resolve().parent / "libraries" / "motion_wait.py"
+)
+motion_wait = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(motion_wait)
+
 
 class Device(EmptyDevice):
 
@@ -117,6 +126,22 @@ def __init__(self):
             "µl": "UL",
         }
 
+        # conversion factors to µl and µl/s, used to predict the duration of a pumping program
+        self.volume_factors = {
+            "ML": 1000.0,
+            "UL": 1.0,
+        }
+        self.rate_factors = {
+            "UH": 1.0 / 3600.0,
+            "UM": 1.0 / 60.0,
+            "MH": 1000.0 / 3600.0,
+            "MM": 1000.0 / 60.0,
+        }
+
+        # additional time in s to wait for a program to finish after its predicted duration
+        self.program_timeout_margin = 60.0
+        self.program_start_time = None
+
     def set_GUIparameter(self):
 
         gui_parameter = {
@@ -186,6 +211,7 @@ def reconfigure(self, parameters, keys):
 
         if "Rate" in keys:
             rate = parameters["Rate"]
+            self.rate = rate
             if float(rate) < 0.0:
                 self.set_pumping_direction("WDR")
             else:
@@ -194,6 +220,7 @@ def reconfigure(self, parameters, keys):
 
         if "Volume" in keys:
             volume = parameters["Volume"]
+            self.volume = volume
             self.set_volume(volume)
 
     def unconfigure(self):
@@ -206,6 +233,7 @@ def start(self):
         self.stop_program()  # this finally stops the program
         self.clear_dispensed_volume()
         self.run_program()
+        self.program_start_time = time.perf_counter()
 
     def measure(self):
 
@@ -315,11 +343,37 @@ def get_status(self):
         return status
 
     def wait_for_program(self):
+        """
+        Waits until the pumping program has finished. The status is not requested during most of the predicted pumping
+        time, i.e. volume divided by rate. Afterwards, it is requested with increasing intervals.
+        """
 
-        while True:
+        predicted_time = self.predict_program_time()
+        if self.program_start_time is not None:
+            predicted_time = max(0.0, predicted_time - (time.perf_counter() - self.program_start_time))
 
-            if self.is_program_done():
-                break
+        motion_wait.wait_until(
+            self.is_program_done,
+            timeout=predicted_time + self.program_timeout_margin,
+            predicted_time=predicted_time,
+            min_interval=0.01,
+            max_interval=0.5,
+            is_aborted=self.is_run_stopped if hasattr(self, "is_run_stopped") else None,
+        )
+
+    def predict_program_time(self):
+        """
+        Returns:
+            float: predicted duration in s of the program with the set rate and volume, 0 if the rate is 0
+        """
+
+        rate = abs(float(self.rate)) * self.rate_factors[self.rate_units[self.rate_unit]]
+        volume = abs(float(self.volume)) * self.volume_factors[self.volume_units[self.volume_unit]]
+
+        if rate == 0.0:
+            return 0.0
+
+        return volume / rate
 
     def reset(self):
         """
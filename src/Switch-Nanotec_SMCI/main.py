@@ -31,10 +31,19 @@
 # Device: Nanotec SMCI
 
 
+import importlib.util
+from pathlib import Path
+
 from ErrorMessage import error, debug
 
 from EmptyDeviceClass import EmptyDevice # Class comes with SweepMe!
 
+_spec = importlib.util.spec_from_file_location(
+    "motion_wait", Path(__file__).resolve().parent / "libraries" / "motion_wait.py"
+)
+motion_wait = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(motion_wait)
+
 
 class Device(EmptyDevice):
 
@@ -77,6 +86,10 @@ def __init__(self):
                                 }
                                 
         self._verbose_mode = True
+
+        self.move_timeout = 60.0  # in s
+        self.target_position = None  # last set move position in steps, used to predict the duration of a move
+        self.predicted_move_time = 0.0  # in s
                                 
         self.ramp_modes = {
                             0: "Trapez",
@@ -124,7 +137,7 @@ def connect(self):
     def initialize(self):
         
         
-        self.set_automatic_status(0) # this is need to get an automatic status update once the move of the motor has finished
+        self.set_automatic_status(1) # this is need to get an automatic status update once the move of the motor has finished
         self.is_motor_referenced() # needs latest firmware
         
         # self.set_direction(0)  # !!! only for now needs to be removed later !!!
@@ -134,7 +147,9 @@ def initialize(self):
         
         self.set_position_mode(4) # change to external reference mode
         self.start_motor()       
+        self.predicted_move_time = 0.0  # the distance to the reference switch is unknown
         self.reach()
+        self.target_position = 0
                 
         self.set_position_mode(2) # change to absolute positions
                
@@ -145,6 +160,7 @@ def deinitialize(self):
               
             self.set_move_position(0)
             self.start_motor()  
+            self.predicted_move_time = self.predict_move_time(0)
         
             """
             self.set_position_mode(4) # change to external reference mode
@@ -158,6 +174,8 @@ def deinitialize(self):
             
             self.stop_motor_decel()   
 
+        self.set_automatic_status(0)
+
         
     def configure(self):
            
@@ -170,22 +188,55 @@ def unconfigure(self):
         
         
     def apply(self):
-        self.set_move_position(int(float(self.value)))
+        position = int(float(self.value))
+        self.set_move_position(position)
         self.start_motor()
+        self.predicted_move_time = self.predict_move_time(position)
       
     def reach(self):
-        # print("Auto status:", self.port.read())
-        
-        while True:
-            ready, zero, error = self.get_status()
-            
-            # print(ready)
-            
-            if ready:
-                break
-            if error:
-                self.stop_measurement("Error during reaching position")
+        """ waits for the status that the controller sends automatically at the end of a move """
+
+        # the status is only read once it arrived, so there is no serial traffic while the motor is moving
+        self._status = None
+
+        def is_status_received():
+            if self.port.port.in_waiting == 0:
                 return False
+            answer = self.port.read()
+            self.verboseprint("Auto status:", answer)
+            self._status = self.parse_status(answer[answer.find("j") + 1:])
+            return True
+
+        is_finished = motion_wait.wait_until(
+            is_status_received,
+            timeout=self.move_timeout,
+            predicted_time=self.predicted_move_time,
+            max_interval=0.02,
+            is_aborted=self.is_run_stopped if hasattr(self, "is_run_stopped") else None,
+        )
+
+        if not is_finished:
+            self.stop_motor_quick()
+            return False
+
+        ready, zero, error = self._status
+        if error:
+            self.stop_measurement("Error during reaching position")
+            return False
+
+    def predict_move_time(self, position):
+        """ returns the predicted duration of a move from the last to the given position in s, 0 if it is unknown """
+
+        previous_position = self.target_position
+        self.target_position = position
+
+        if previous_position is None:
+            return 0.0
+
+        distance = abs(position - previous_position)
+
+        # the acceleration ramp is not known, so only the maximum frequency in steps/s is used
+        return motion_wait.predict_move_time(distance, float(self.frequency_max))
 
 
     def call(self):
@@ -220,14 +271,17 @@ def get_status(self):
         self.verboseprint("Status:", answer)
         index = answer.find(cmd)
         
-        value = int(answer[index+len(cmd):])
-        
-        bit_string = '{:08b}'.format(value)[::-1]
+        return self.parse_status(answer[index+len(cmd):])
+
+    def parse_status(self, value):
+        """ returns the flags ready, at zero position, and position error of the given status byte """
+
+        bit_string = '{:08b}'.format(int(value))[::-1]
         
         self.verboseprint("Status:", bit_string)
         
         self.verboseprint("Ready:", bit_string[0])
-        self.verboseprint("At zero position:", bit_string[0])
+        self.verboseprint("At zero position:", bit_string[1])
         self.verboseprint("Position error:", bit_string[2])
        
 
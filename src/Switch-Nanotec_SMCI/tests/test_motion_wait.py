@@ -0,0 +1,102 @@
+import importlib.util
+import threading
+import time
+import unittest
+from pathlib import Path
+
+# Import the motion wait helper
+file_path = Path(__file__).resolve().parent.parent / "libraries" / "motion_wait.py"
+spec = importlib.util.spec_from_file_location("motion_wait", file_path)
+motion_wait = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(motion_wait)
+
+
+class StatusCounter:
+    """Stand-in for a status request that reports the end of a move after the given time."""
+
+    def __init__(self, duration: float) -> None:
+        """Start the simulated move."""
+        self.end_time = time.perf_counter() + duration
+        self.requests = 0
+
+    def __call__(self) -> bool:
+        """Return whether the simulated move has finished."""
+        self.requests += 1
+        return time.perf_counter() >= self.end_time
+
+
+class TestPrediction(unittest.TestCase):
+    """Test the prediction of move durations and the position tolerance."""
+
+    def test_trapezoidal_profile(self) -> None:
+        """Long moves reach the maximum velocity and need the ramp time in addition."""
+        self.assertAlmostEqual(motion_wait.predict_move_time(10.0, 5.0, 10.0), 2.5)  # noqa: PT009
+        self.assertAlmostEqual(motion_wait.predict_move_time(-10.0, 5.0, 10.0), 2.5)  # noqa: PT009
+
+    def test_triangular_profile(self) -> None:
+        """Short moves do not reach the maximum velocity."""
+        self.assertAlmostEqual(motion_wait.predict_move_time(1.0, 5.0, 10.0), 2 * (0.1**0.5))  # noqa: PT009
+
+    def test_unknown_velocity(self) -> None:
+        """Without velocity, no prediction is possible and without acceleration, the ramps are neglected."""
+        self.assertEqual(motion_wait.predict_move_time(10.0, 0.0), 0.0)  # noqa: PT009
+        self.assertAlmostEqual(motion_wait.predict_move_time(10.0, 5.0), 2.0)  # noqa: PT009
+
+    def test_tolerance(self) -> None:
+        """Positions are compared with tolerance and rotation stages wrap around."""
+        self.assertTrue(motion_wait.is_in_position(1.004, 1.0, 0.005))  # noqa: PT009
+        self.assertFalse(motion_wait.is_in_position(1.006, 1.0, 0.005))  # noqa: PT009
+        self.assertFalse(motion_wait.is_in_position(359.999, 0.0, 0.005))  # noqa: PT009
+        self.assertTrue(motion_wait.is_in_position(359.999, 0.0, 0.005, period=360.0))  # noqa: PT009
+        self.assertTrue(motion_wait.is_in_position(720.001, 0.0, 0.005, period=360.0))  # noqa: PT009
+
+
+class TestWaitUntil(unittest.TestCase):
+    """Test waiting for the end of a move."""
+
+    def test_short_move_finishes_quickly(self) -> None:
+        """A move that is already finished does not wait for any sleep interval."""
+        start_time = time.perf_counter()
+        self.assertTrue(motion_wait.wait_until(lambda: True, timeout=1.0))  # noqa: PT009
+        self.assertLess(time.perf_counter() - start_time, 0.01)  # noqa: PT009
+
+    def test_status_is_not_requested_during_predicted_time(self) -> None:
+        """Only a few requests are needed if the duration is predicted."""
+        status = StatusCounter(0.3)
+        self.assertTrue(motion_wait.wait_until(status, timeout=2.0, predicted_time=0.3))  # noqa: PT009
+        self.assertLess(status.requests, 10)  # noqa: PT009
+
+    def test_interval_increases(self) -> None:
+        """Without prediction, the interval between two requests increases up to the maximum interval."""
+        status = StatusCounter(0.5)
+        self.assertTrue(motion_wait.wait_until(status, timeout=2.0, max_interval=0.1))  # noqa: PT009
+        self.assertLess(status.requests, 15)  # noqa: PT009
+
+    def test_timeout(self) -> None:
+        """A move that does not finish raises a TimeoutError."""
+        with self.assertRaises(TimeoutError):  # noqa: PT027
+            motion_wait.wait_until(lambda: False, timeout=0.05)
+
+    def test_abort(self) -> None:
+        """Waiting returns False if it is aborted, also during the predicted time."""
+        self.assertFalse(motion_wait.wait_until(lambda: False, timeout=1.0, is_aborted=lambda: True))  # noqa: PT009
+        self.assertFalse(  # noqa: PT009
+            motion_wait.wait_until(lambda: False, timeout=1.0, predicted_time=1.0, is_aborted=lambda: True),
+        )
+
+    def test_notification_ends_predicted_time(self) -> None:
+        """An event set by a notification ends waiting before the predicted time has passed."""
+        event = threading.Event()
+        timer = threading.Timer(0.05, event.set)
+        timer.start()
+
+        start_time = time.perf_counter()
+        self.assertTrue(  # noqa: PT009
+            motion_wait.wait_until(event.is_set, timeout=2.0, predicted_time=1.0, sleep=event.wait),
+        )
+        self.assertLess(time.perf_counter() - start_time, 0.5)  # noqa: PT009
+        timer.join()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+# This Device Class is published under the terms of the MIT License.
+# Required Third Party Libraries, which are included in the Device Class
+# package for convenience purposes, may have a different license. You can
+# find those in the corresponding folders or contact the maintainer.
+#
+# MIT License
+#
+# Copyright (c) 2024 SweepMe! GmbH (sweep-me.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+from __future__ import annotations
+
+import math
+import time
+from typing import Callable
+
+
+def predict_move_time(distance: float, velocity: float, acceleration: float = 0.0) -> float:
+    """Return the duration of a move with a trapezoidal velocity profile.
+
+    Args:
+        distance: Distance of the move in any unit.
+        velocity: Maximum velocity in the same unit per s.
+        acceleration: Acceleration and deceleration in the same unit per s², 0 to neglect the ramps.
+
+    Returns:
+        Predicted duration in s, 0 if the velocity is unknown.
+    """
+    distance = abs(distance)
+    if velocity <= 0.0:
+        return 0.0
+    if acceleration <= 0.0:
+        return distance / velocity
+
+    ramp_distance = velocity**2 / acceleration  # acceleration plus deceleration
+    if distance < ramp_distance:
+        # triangular profile, the maximum velocity is not reached
+        return 2.0 * math.sqrt(distance / acceleration)
+    return distance / velocity + velocity / acceleration
+
+
+def is_in_position(position: float, target: float, tolerance: float, period: float | None = None) -> bool:
+    """Check whether a position is within the tolerance of the target.
+
+    Args:
+        position: Current position.
+        target: Target position.
+        tolerance: Maximum allowed deviation.
+        period: Period of a rotation stage, e.g. 360 for degrees, so that 359.99 and 0.0 are considered equal.
+
+    Returns:
+        True if the deviation is not larger than the tolerance.
+    """
+    deviation = abs(position - target)
+    if period:
+        deviation %= period
+        deviation = min(deviation, period - deviation)
+    return deviation <= tolerance
+
+
+def wait_until(
+    is_done: Callable[[], bool],
+    timeout: float,
+    predicted_time: float = 0.0,
+    min_interval: float = 0.005,
+    max_interval: float = 0.2,
+    is_aborted: Callable[[], bool] | None = None,
+    sleep: Callable[[float], object] = time.sleep,
+) -> bool:
+    """Wait until a move or program has finished.
+
+    The check is skipped for most of the predicted time, only the abort condition is evaluated. Afterwards, the
+    interval between two checks starts with min_interval and doubles up to max_interval, so that short moves finish
+    within milliseconds while long or unpredictable moves do not flood the controller with status requests.
+
+    If the controller notifies the end of a move by itself, is_done should only evaluate the notification, e.g. whether
+    a message is waiting at the port, and thus does not create any traffic. If the notification sets a
+    threading.Event, its wait method can be handed over as sleep to return as soon as the event is set.
+
+    Args:
+        is_done: Function that returns True once the move has finished.
+        timeout: Maximum time in s to wait.
+        predicted_time: Predicted duration of the move in s.
+        min_interval: First interval in s between two checks after the predicted time.
+        max_interval: Longest interval in s between two checks.
+        is_aborted: Function that returns True if waiting should be aborted, e.g. because the run was stopped.
+        sleep: Function used to wait for the given time in s.
+
+    Returns:
+        True if the move has finished, False if waiting was aborted.
+
+    Raises:
+        TimeoutError: If the move has not finished within the timeout.
+    """
+    start_time = time.perf_counter()
+    end_time = start_time + timeout
+
+    # 90% of the predicted time leaves some margin for a controller that is faster than predicted
+    first_check = start_time + 0.9 * min(predicted_time, timeout)
+    interval = min_interval
+
+    while True:
+        now = time.perf_counter()
+
+        if now < first_check:
+            if is_aborted is not None and is_aborted():
+                return False
+            # a sleep function like threading.Event.wait returns True if it was woken up by a notification
+            if sleep(min(first_check - now, max_interval)) and is_done():
+                return True
+            continue
+
+        if is_done():
+            return True
+
+        if is_aborted is not None and is_aborted():
+            return False
+
+        if now > end_time:
+            msg = f"Move did not finish within {timeout} s."
+            raise TimeoutError(msg)
+
+        sleep(min(interval, max(end_time - now, 0.0)))
+        interval = min(2 * interval, max_interval)
@@ -40,13 +40,20 @@
 Use an unconnected COM port adapter at CAN-IN of the master.<br>
 """
 
-import time
+import importlib.util
 from collections import OrderedDict
+from pathlib import Path
 
 from ErrorMessage import error
 
 from EmptyDeviceClass import EmptyDevice
 
+_spec = importlib.util.spec_from_file_location(
+    "motion_wait", Path(__file__).resolve().parent / "libraries" / "motion_wait.py"
+)
+motion_wait = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(motion_wait)
+
 class Device(EmptyDevice):
 
     def __init__(self):
@@ -243,31 +250,18 @@ def reach(self):
         „?“ = Fehler, unbekannter Achsenstatus
         """
        
-        time_ref =  time.perf_counter()
-        
-        
-        while True:
-        
-            status = self.query("ASTAT1")
-            
-            if status == "O":
-                break
-            
-            if status == "R":
-                break
-                
-            elif status == "T":
-                pass
-                
-            elif status == "P":
-                pass
-                                
-            elif status == "L":
-                break
-                
-            if time.perf_counter() - time_ref > self.time_max_moving:
-                self.write("STOP1")
-                break
+       
+        # the axis status is requested with increasing intervals as the controller does not report the end of a move
+        # by itself, "T" (trapezoidal move) and "P" (reference move) mean that the axis is still moving
+        try:
+            motion_wait.wait_until(
+                lambda: self.query("ASTAT1") in ["O", "R", "L"],
+                timeout=self.time_max_moving,
+                min_interval=0.01,
+                max_interval=0.25,
+            )
+        except TimeoutError:
+            self.write("STOP1")
                         
         self.write("MOFF1")    
             
@@ -30,10 +30,20 @@
 # Device: Ocean Controls KTx-290
 # Authors: Shayan Miri (sweep-me.net), Axel Fischer (sweep-me.net)
 
-import time
+from __future__ import annotations
+
+import importlib.util
+import math
+from pathlib import Path
 
 from pysweepme.EmptyDeviceClass import EmptyDevice
 
+_spec = importlib.util.spec_from_file_location(
+    "motion_wait", Path(__file__).resolve().parent / "libraries" / "motion_wait.py",
+)
+motion_wait = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(motion_wait)
+
 
 class Device(EmptyDevice):
     description = """
@@ -99,6 +109,12 @@ def __init__(self):
 
         self.move_timeout = 60.0
 
+        # frequency settings used to predict the duration of a move, the defaults are set until configure is called
+        self.initial_freq = 10
+        self.frequency_ramp = 1
+        self.final_freq = 1000
+        self.last_position = None  # latest target position in steps
+
     def set_GUIparameter(self):
 
         # If the checksum mode is activated, the last byte of message has to be the checksum. It's not implemented and
@@ -169,6 +185,7 @@ def initialize(self):
         #     self.set_position(self.axis, 0)
 
         self.initial_position = self.get_position(self.axis)
+        self.last_position = self.initial_position
 
     def deinitialize(self):
 
@@ -226,16 +243,7 @@ def apply(self):
         self.port.read()  # First reading is the axis address
 
         # reading the final message of the absolute move command in 'apply'
-        starttime = time.time()
-        while True:
-            answer = self.port.read()
-            if "!" in answer:
-                # print("Absolute move of axis %d finished." % self.axis)
-                break
-            if time.time() - starttime > self.move_timeout:
-                raise Exception("Timeout during absolute move of KTx-290")
-            if hasattr(self, "is_run_stopped") and self.is_run_stopped():
-                raise Exception("Measurement stopped while waiting to reach absolute position")
+        self.wait_for_move("absolute move", self.predict_move_time(value_converted))
 
     def call(self):
         return [self.value]
@@ -288,6 +296,7 @@ def set_initial_frequency(self, axis, freq):
         if axis in range(1, 17) and freq in range(10, 10000):
             self.port.write("@%d ACCS %d" % (axis, freq))
             self.port.read()
+            self.initial_freq = freq
         else:
             raise Exception("Arguments of function set_initial_frequency() are not correct: ", axis,
                             freq)
@@ -306,6 +315,7 @@ def set_frequency_ramp(self, axis, ramp):
         if axis in range(1, 17) and ramp in range(1, 10000):
             self.port.write("@%d ACCI %d" % (axis, ramp))
             self.port.read()
+            self.frequency_ramp = ramp
         else:
             raise Exception("Arguments of function set_frequency_ramp() are not correct: ", axis,
                             ramp)
@@ -323,6 +333,7 @@ def set_final_frequency(self, axis, freq):
         if axis in range(1, 17) and freq in range(10, 50001):
             self.port.write("@%d ACCF %d" % (axis, freq))
             self.port.read()
+            self.final_freq = freq
         else:
             raise Exception("Arguments of function set_final_frequency() are not correct: ", axis,
                             freq)
@@ -345,17 +356,8 @@ def absolute_move(self, axis, pos):
 
         self.port.read()  # First reading is the axis address
 
-        starttime = time.time()
-        while True:
-
-            answer = self.port.read()
-            if "!" in answer:
-                print("Absolute move of axis %d finished." % axis)
-                break
-            if time.time() - starttime > self.move_timeout:
-                raise Exception("Timeout during absolute move of KTx-290")
-            if hasattr(self, "is_run_stopped") and self.is_run_stopped():
-                raise Exception("Measurement stopped while waiting to reach absolute position")
+        self.wait_for_move("absolute move", self.predict_move_time(pos))
+        print("Absolute move of axis %d finished." % axis)
 
     def relative_move(self, axis, pos):
         """
@@ -374,19 +376,68 @@ def relative_move(self, axis, pos):
 
         self.port.read()  # First reading is the axis address
 
-        starttime = time.time()
-        while True:
+        target = None if self.last_position is None else self.last_position + pos
+        self.wait_for_move("relative move", self.predict_move_time(target))
+        print("Relative move of axis %d finished." % axis)
+
+    def wait_for_move(self, move: str, predicted_time: float = 0.0) -> None:
+        """
+        The controller sends a line containing '!' once a move has finished. The line is only read when data has
+        arrived at the port, so that waiting neither blocks for the port timeout nor sends any command.
+        Args:
+            move: name of the move used in error messages
+            predicted_time: predicted duration of the move in s
+
+        Returns:
+            None
+        """
+        def is_end_message_received():
+            while self.port.port.in_waiting > 0:
+                if "!" in self.port.read():
+                    return True
+            return False
+
+        try:
+            is_finished = motion_wait.wait_until(
+                is_end_message_received,
+                timeout=self.move_timeout,
+                predicted_time=predicted_time,
+                max_interval=0.02,
+                is_aborted=self.is_run_stopped if hasattr(self, "is_run_stopped") else None,
+            )
+        except TimeoutError as e:
+            raise Exception("Timeout during %s of KTx-290" % move) from e
+
+        if not is_finished:
+            raise Exception("Measurement stopped while waiting to finish %s" % move)
+
+    def predict_move_time(self, target: int | None) -> float:
+        """
+        This function predicts the duration of a move from the latest to the given target position and stores the
+        target as latest position. The frequency ramps linearly per step from the initial to the final frequency and
+        back, so that a ramp takes ln(f_final / f_initial) / ramp.
+        Args:
+            target: int, target position in steps, None if unknown
+
+        Returns:
+            float: predicted duration in s, 0 if the latest position is unknown
+        """
+        last_position = self.last_position
+        self.last_position = target
+
+        if last_position is None or target is None:
+            return 0.0
 
-            answer = self.port.read()
-            if "!" in answer:
-                print("Relative move of axis %d finished." % axis)
-                break
+        distance = abs(target - last_position)
+        ramp_steps = (self.final_freq - self.initial_freq) / self.frequency_ramp
 
-            if time.time() - starttime > self.move_timeout:
-                raise Exception("Timeout during relative move of KTx-290")
+        if distance < 2 * ramp_steps:
+            # the final frequency is not reached before the motor has to slow down again
+            peak_freq = self.initial_freq + self.frequency_ramp * distance / 2
+            return 2 * math.log(peak_freq / self.initial_freq) / self.frequency_ramp
 
-            if hasattr(self, "is_run_stopped") and self.is_run_stopped():
-                raise Exception("Measurement stopped while waiting to reach relative position")
+        ramp_time = math.log(self.final_freq / self.initial_freq) / self.frequency_ramp
+        return 2 * ramp_time + (distance - 2 * ramp_steps) / self.final_freq
 
     def set_positions(self, axis, positions):
         """
@@ -33,7 +33,9 @@
 # Device: Stanford SR570
 
 
+import importlib.util
 from collections import OrderedDict
+from pathlib import Path
 
 from ErrorMessage import error
 
@@ -41,6 +43,13 @@
 
 import numpy as np
 
+# Import the settings cache helper from the libraries folder of the driver
+_spec = importlib.util.spec_from_file_location(
+    "settings_cache", Path(__file__).resolve().parent / "libraries" / "settings_cache.py"
+)
+settings_cache = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(settings_cache)
+
 class Device(EmptyDevice):
 
     def __init__(self):
@@ -288,6 +297,7 @@ def set_GUIparameter(self):
                         "Gain mode": list(self.gain_modes.keys()),
                         "Invert signal": False,
                         "Blank front-end output": False,
+                        "Reset at start": False,
                         }
         
         return gui_parameter
@@ -339,9 +349,19 @@ def get_GUIparameter(self, parameter = {}):
         self.sweepmode = parameter["SweepMode"]
         # self.sweepvalue = parameter["SweepValue"]
 
+        self.port_string = parameter["Port"]
+        self.reset_at_start = parameter.get("Reset at start", False)
+
     def initialize(self):
-        self.port.write("*RST") # reset to default settings
-        answer = self.port.read()
+        # The SR570 has no readback. Thus, the settings sent are remembered for the port, so that only changed
+        # settings are sent in the next run. The SR570 is only reset if its state is unknown or a reset is requested,
+        # e.g. after the SR570 was switched off or its settings were changed at the front panel.
+        self.settings = settings_cache.get_settings_cache(self.device_communication, "SR570 " + self.port_string)
+
+        if self.reset_at_start or not self.settings.valid:
+            self.port.write("*RST") # reset to default settings
+            answer = self.port.read()
+            self.settings.reset()
        
     def connect(self):
     
@@ -356,68 +376,52 @@ def configure(self):
         answer = self.port.read()
         
         # Sensitivity
-        self.port.write("SENS %i" % self.sensitivities[self.sensitivity])
-        answer = self.port.read()
+        self.write_setting("SENS %i" % self.sensitivities[self.sensitivity])
         
         # Sensitivity calibration mode
-        self.port.write("SUCM %i" % self.sensitivity_uncalibration) # The manual says: 0 = cal, 1 = uncal. but in reality it switches off with 0 ???? 
-        answer = self.port.read()
+        self.write_setting("SUCM %i" % self.sensitivity_uncalibration) # The manual says: 0 = cal, 1 = uncal. but in reality it switches off with 0 ???? 
         
         # Uncalibrated sensitivity vernier
-        self.port.write("SUCV %i" % self.uncalibrated_sensitivity_vernier) #[0 ≤ n ≤ 100] (percent of full scale).
-        answer = self.port.read()
+        self.write_setting("SUCV %i" % self.uncalibrated_sensitivity_vernier) #[0 ≤ n ≤ 100] (percent of full scale).
         
         # Input offset current
-        self.port.write("IOON %i" % self.use_input_offset_current) # IOON n Turn the input offset current on (n=1) or off (n=0).
-        answer = self.port.read()
+        self.write_setting("IOON %i" % self.use_input_offset_current) # IOON n Turn the input offset current on (n=1) or off (n=0).
         
         # Input offset current
-        self.port.write("IOLV %i" % self.current_offset[self.input_offset_current]) # IOLV n Sets the calibrated input offset current level
-        answer = self.port.read()
+        self.write_setting("IOLV %i" % self.current_offset[self.input_offset_current]) # IOLV n Sets the calibrated input offset current level
         
         # Uncalibrated input offset vernier
-        self.port.write("IOUV %i" % int(round(self.uncalibrated_input_offset*10))) # IOUV n Sets the uncalibrated input offset vernier
-        answer = self.port.read()
+        self.write_setting("IOUV %i" % int(round(self.uncalibrated_input_offset*10))) # IOUV n Sets the uncalibrated input offset vernier
         
         # Input offset current sign
-        self.port.write("IOSN %i" % self.commands[self.input_offset_current_sign]) # IOSN n Sets the input offset current sign
-        answer = self.port.read()
+        self.write_setting("IOSN %i" % self.commands[self.input_offset_current_sign]) # IOSN n Sets the input offset current sign
         
         # Input offset calibration mode
-        self.port.write("IOUC %i" % self.input_offset_uncalibration) # IOUC n Sets the input offset cal mode. 0 = cal, 1 = uncal.
-        answer = self.port.read()
+        self.write_setting("IOUC %i" % self.input_offset_uncalibration) # IOUC n Sets the input offset cal mode. 0 = cal, 1 = uncal.
         
         # Gain mode
-        self.port.write("GNMD %i" % self.gain_modes[self.ground_mode]) # Sets the gain mode of the amplifier.
-        answer = self.port.read()
+        self.write_setting("GNMD %i" % self.gain_modes[self.ground_mode]) # Sets the gain mode of the amplifier.
         
         # Signal inverted
-        self.port.write("INVT %i" % self.signal_inverted) # Sets the signal invert sense. 0=noninverted, 1=inverted.
-        answer = self.port.read()
+        self.write_setting("INVT %i" % self.signal_inverted) # Sets the signal invert sense. 0=noninverted, 1=inverted.
         
         # Use bias voltage
-        self.port.write("BSON %i" % self.use_bias_voltage) # Turn the bias voltage on (n=1) or off (n=0).
-        answer = self.port.read()
+        self.write_setting("BSON %i" % self.use_bias_voltage) # Turn the bias voltage on (n=1) or off (n=0).
         
         # Bias voltage
-        self.port.write("BSLV %i" % int(round(self.bias_voltage * 1000))) # Sets the bias voltage level in the range. [-5000 ≤ n ≤ +5000] (-5.000 V to +5.000 V).
-        answer = self.port.read()
+        self.write_setting("BSLV %i" % int(round(self.bias_voltage * 1000))) # Sets the bias voltage level in the range. [-5000 ≤ n ≤ +5000] (-5.000 V to +5.000 V).
         
         # Filter type
-        self.port.write("FLTT %i" % self.filters[self.filter]) # FLTT n Sets the filter type
-        answer = self.port.read()
+        self.write_setting("FLTT %i" % self.filters[self.filter]) # FLTT n Sets the filter type
         
         # Low pass
-        self.port.write("LFRQ %i" % self.frequencies[self.lowpass]) # Sets the value of the lowpass filter     
-        answer = self.port.read()
+        self.write_setting("LFRQ %i" % self.frequencies[self.lowpass]) # Sets the value of the lowpass filter     
         
         # High pass
-        self.port.write("HFRQ %i" % self.frequencies[self.highpass]) # Sets the value of the lowpass filter
-        answer = self.port.read()
+        self.write_setting("HFRQ %i" % self.frequencies[self.highpass]) # Sets the value of the lowpass filter
         
         # Blank front-end output
-        self.port.write("BLNK %i" % self.blank_frontend) # Blanks the front-end output of the amplifier.
-        answer = self.port.read()
+        self.write_setting("BLNK %i" % self.blank_frontend) # Blanks the front-end output of the amplifier.
 
     def apply(self):
         
@@ -458,18 +462,15 @@ def apply(self):
                 
             self.sensitivity = str(number) + " " + conversion[exp_step]
             # print(sensitivity)
-            self.port.write("SENS %i" % self.sensitivities[self.sensitivity])
-            answer = self.port.read()
+            self.write_setting("SENS %i" % self.sensitivities[self.sensitivity])
 
         if self.sweepmode == "Voltage in V":
             # Use bias voltage
-            self.port.write("BSON 1")  # Turn the bias voltage on (n=1) or off (n=0).
-            answer = self.port.read()
+            self.write_setting("BSON 1")  # Turn the bias voltage on (n=1) or off (n=0).
             
             # Bias voltage
             # Sets the bias voltage level in the range. [-5000 ≤ n ≤ +5000] (-5.000 V to +5.000 V).
-            self.port.write("BSLV %i" % int(round(self.value * 1000)))
-            answer = self.port.read()
+            self.write_setting("BSLV %i" % int(round(self.value * 1000)))
             
             self.bias_voltage = self.value
 
@@ -477,9 +478,14 @@ def unconfigure(self):
         self.port.write("ROLD") # Resets the filter capacitors to clear an overload condition.
         answer = self.port.read()
         # Turn bias voltage off
-        self.port.write("BSON 0") # Turn the bias voltage on (n=1) or off (n=0).
+        self.write_setting("BSON 0") # Turn the bias voltage on (n=1) or off (n=0).
         
     def call(self):
         if not self.use_bias_voltage:
             self.bias_voltage = 0.0
         return self.sentivities_value[self.sensitivity], self.bias_voltage
+
+    def write_setting(self, command):
+        """Send a setting command only if it changes the setting that was sent last."""
+        if self.settings.write(self.port, command):
+            answer = self.port.read()
@@ -0,0 +1,75 @@
+import importlib.util
+import unittest
+from pathlib import Path
+
+# Import the settings cache helper
+file_path = Path(__file__).resolve().parent.parent / "libraries" / "settings_cache.py"
+spec = importlib.util.spec_from_file_location("settings_cache", file_path)
+settings_cache = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(settings_cache)
+
+
+class RecordingPort:
+    """Port that records all commands written."""
+
+    def __init__(self) -> None:
+        """Start without commands."""
+        self.commands = []
+
+    def write(self, command: str) -> None:
+        """Record the command."""
+        self.commands.append(command)
+
+
+class TestSettingsCache(unittest.TestCase):
+    """Test that only changed settings are sent."""
+
+    def setUp(self) -> None:
+        """Create a cache for a reset instrument."""
+        self.port = RecordingPort()
+        self.device_communication = {}
+        self.cache = settings_cache.get_settings_cache(self.device_communication, "SR570 COM1")
+        self.cache.reset()
+
+    def test_unchanged_settings_are_skipped(self) -> None:
+        """A setting is only sent again if its value changes."""
+        self.assertTrue(self.cache.write(self.port, "SENS 12"))  # noqa: PT009
+        self.assertFalse(self.cache.write(self.port, "SENS 12"))  # noqa: PT009
+        self.assertTrue(self.cache.write(self.port, "SENS 13"))  # noqa: PT009
+        self.cache.write(self.port, "DT 2,1,0.000001000000", key="DT 2")
+        self.cache.write(self.port, "DT 3,1,0.000001000000", key="DT 3")
+        self.assertEqual(  # noqa: PT009
+            self.port.commands, ["SENS 12", "SENS 13", "DT 2,1,0.000001000000", "DT 3,1,0.000001000000"],
+        )
+
+    def test_shared_by_port(self) -> None:
+        """Driver instances using the same port get the same cache, other ports get a new invalid cache."""
+        self.assertIs(settings_cache.get_settings_cache(self.device_communication, "SR570 COM1"), self.cache)  # noqa: PT009
+        self.assertFalse(settings_cache.get_settings_cache(self.device_communication, "SR570 COM2").valid)  # noqa: PT009
+
+    def test_invalid_cache_sends_all(self) -> None:
+        """Without known state, all settings are sent."""
+        self.cache.write(self.port, "SENS 12")
+        self.cache.invalidate()
+        self.assertTrue(self.cache.write(self.port, "SENS 12"))  # noqa: PT009
+        self.assertTrue(self.cache.write(self.port, "SENS 12"))  # noqa: PT009
+
+    def test_reset_and_forget(self) -> None:
+        """Settings are sent again after a reset or if they are forgotten."""
+        self.cache.write(self.port, "SENS 12")
+        self.cache.write(self.port, "BSLV 100")
+        self.cache.forget("SENS")
+        self.assertTrue(self.cache.write(self.port, "SENS 12"))  # noqa: PT009
+        self.assertFalse(self.cache.write(self.port, "BSLV 100"))  # noqa: PT009
+        self.cache.reset()
+        self.assertTrue(self.cache.write(self.port, "BSLV 100"))  # noqa: PT009
+
+    def test_update(self) -> None:
+        """Commands sent without the cache can be remembered, e.g. after a partial reset."""
+        self.cache.update(":CONF:CURR")
+        self.assertFalse(self.cache.write(self.port, ":CONF:CURR"))  # noqa: PT009
+        self.assertEqual(self.port.commands, [])  # noqa: PT009
+
+
+if __name__ == "__main__":
+    unittest.main()
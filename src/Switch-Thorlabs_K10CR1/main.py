@@ -29,12 +29,20 @@
 # Module: Switch
 # Device: Thorlabs Kinesis K10CR1
 
+import importlib.util
 import sys
 import time
+from pathlib import Path
 
 import clr
 from pysweepme.EmptyDeviceClass import EmptyDevice
 
+_spec = importlib.util.spec_from_file_location(
+    "motion_wait", Path(__file__).resolve().parent / "libraries" / "motion_wait.py",
+)
+motion_wait = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(motion_wait)
+
 clr.AddReference("System")
 from System import Decimal, Int32, UInt64
 
@@ -110,6 +118,7 @@ def __init__(self):
         self.is_simulation = False
 
         self.homing_timeout_s = 40.0  # in seconds
+        self.position_tolerance = 0.01  # in degree, maximum deviation from the target to finish a move
 
     def find_ports(self):
         """
@@ -321,8 +330,12 @@ def move(self, position):
         # use of modulo 360 if needed as the stage only accepts values between 0° and 360°
         # decimal_pos = Decimal(position % 360.0)
 
+        predicted_time = motion_wait.predict_move_time(
+            position - self.get_position(), self.max_velocity, self.acceleration,
+        )
+
         self.kinesis_device.MoveTo(decimal_pos, Int32(0))
-        self.wait(timeout_ms=self.timeout_ms, command="move")
+        self.wait(timeout_ms=self.timeout_ms, command="move", target=position, predicted_time=predicted_time)
 
         # self.kinesis_device.MoveTo(decimal_pos, move_call_back)
         # self.kinesis_device.Wait(Int32(timeout_ms))
@@ -331,17 +344,33 @@ def move(self, position):
             position = self.get_position()
             print(f"Move complete. New position is {position}")
 
-    def wait(self, timeout_ms, command="unknown command", allow_user_stop=True):
-        """ wait loop till device not busy"""
-        start_time = time.time()
-        time.sleep(0.1)  # wait for IsDeviceBusy to update
-        while self.kinesis_device.IsDeviceBusy:
-            time.sleep(0.1)
-            if hasattr(self, "is_run_stopped") and self.is_run_stopped() and allow_user_stop:
-                self.kinesis_device.StopImmediate()
-            if time.time() - start_time > timeout_ms / 1000:
+    def wait(self, timeout_ms, command="unknown command", allow_user_stop=True, target=None, predicted_time=0.0):
+        """ wait loop till device not busy and, if a target is given, the position is within the tolerance"""
+        timeout_s = timeout_ms / 1000
+
+        if target is None:
+            # IsDeviceBusy needs about 100 ms to update after a command, a target position is not affected by this
+            predicted_time = max(predicted_time, 0.1)
+
+        def is_done():
+            if self.kinesis_device.IsDeviceBusy:
+                return False
+            if target is None:
+                return True
+            return motion_wait.is_in_position(self.get_position(), target, self.position_tolerance, period=360.0)
+
+        def is_stopped():
+            return allow_user_stop and hasattr(self, "is_run_stopped") and self.is_run_stopped()
+
+        try:
+            if not motion_wait.wait_until(is_done, timeout_s, predicted_time, 0.01, 0.1, is_aborted=is_stopped):
+                # the run was stopped, so the target is not reached anymore
                 self.kinesis_device.StopImmediate()
-                raise TimeoutError(f"{command} timed out after {timeout_ms/1000}s")
+                motion_wait.wait_until(lambda: not self.kinesis_device.IsDeviceBusy, timeout_s, 0.1, 0.01, 0.1)
+        except TimeoutError as e:
+            self.kinesis_device.StopImmediate()
+            msg = f"{command} timed out after {timeout_s}s"
+            raise TimeoutError(msg) from e
 
         return None
 
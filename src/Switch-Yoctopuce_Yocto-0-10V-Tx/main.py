@@ -36,12 +36,25 @@
 
 from pysweepme.ErrorMessage import error, debug
 
-from yoctopuce.yocto_api import *
-from yoctopuce.yocto_voltageoutput import *
 
 from pysweepme.EmptyDeviceClass import EmptyDevice
 
 
+# Yoctopuce classes are imported on first use in 'import_yoctopuce'
+YAPI = None
+YRefParam = None
+YVoltageOutput = None
+
+
+def import_yoctopuce():
+    """ imports the Yoctopuce library only when needed, as importing yocto_api takes long """
+
+    global YAPI, YRefParam, YVoltageOutput
+
+    from yoctopuce.yocto_api import YAPI, YRefParam
+    from yoctopuce.yocto_voltageoutput import YVoltageOutput
+
+
 class Device(EmptyDevice):
 
     description =   """
@@ -90,6 +103,8 @@ def get_GUIparameter(self, parameter):
         self.idle_voltage = None if (parameter["Idle voltage in V"] == "") else float(parameter["Idle voltage in V"])
       
     def find_Ports(self):
+
+        import_yoctopuce()
     
         errmsg = YRefParam()
 
@@ -143,6 +158,8 @@ def find_Ports(self):
         
     def connect(self):
 
+        import_yoctopuce()
+
         ## initialize the API. However, it is anyway done during 'RegisterHub'
         # YAPI.InitAPI("usb")
         
@@ -36,12 +36,25 @@
 
 from pysweepme.ErrorMessage import error, debug
 
-from yoctopuce.yocto_api import *
-from yoctopuce.yocto_relay import *
 
 from pysweepme.EmptyDeviceClass import EmptyDevice
 
 
+# Yoctopuce classes are imported on first use in 'import_yoctopuce'
+YAPI = None
+YRefParam = None
+YRelay = None
+
+
+def import_yoctopuce():
+    """ imports the Yoctopuce library only when needed, as importing yocto_api takes long """
+
+    global YAPI, YRefParam, YRelay
+
+    from yoctopuce.yocto_api import YAPI, YRefParam
+    from yoctopuce.yocto_relay import YRelay
+
+
 class Device(EmptyDevice):
 
     description =   """
@@ -91,6 +104,8 @@ def get_GUIparameter(self, parameter):
         self.port_serial = parameter["Port"]
       
     def find_Ports(self):
+
+        import_yoctopuce()
     
         errmsg = YRefParam()
 
@@ -144,6 +159,8 @@ def find_Ports(self):
         
     def connect(self):
 
+        import_yoctopuce()
+
         ## initialize the API. However, it is anyway done during 'RegisterHub'
         # YAPI.InitAPI("usb")
         
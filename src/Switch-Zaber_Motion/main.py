@@ -33,17 +33,23 @@
 from FolderManager import addFolderToPATH
 addFolderToPATH()
 
-from zaber_motion import Units
-from zaber_motion.ascii import Connection
-from zaber_motion import Library
+# zaber_motion is imported in 'connect' as importing it takes long
 
-import time
+import importlib.util
 import os
+import threading
+from pathlib import Path
 
 from ErrorMessage import error, debug
 
 from EmptyDeviceClass import EmptyDevice # Class comes with SweepMe!
 
+_spec = importlib.util.spec_from_file_location(
+    "motion_wait", Path(__file__).resolve().parent / "libs" / "motion_wait.py"
+)
+motion_wait = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(motion_wait)
+
 
 class Device(EmptyDevice):
 
@@ -91,18 +97,25 @@ def __init__(self):
         self.port_types = ["COM"]  # Still, we let the port manager find some COM ports for us
         
         self._verbose_mode = False
+
+        self.move_timeout = 300.0  # in s
+
+        # set by alert messages of the device once the axis is idle, see 'on_alert'
+        self.idle_event = threading.Event()
+        self.alert_subscription = None
+        self.comm_alert = None
                 
         self.unit_types = {
-                      "steps": Units.NATIVE,
-                      "m": Units.LENGTH_METRES,
-                      "cm": Units.LENGTH_CENTIMETRES,
-                      "mm": Units.LENGTH_MILLIMETRES,
-                      "µm": Units.LENGTH_MICROMETRES,
-                      "nm": Units.LENGTH_NANOMETRES,
-                      "inch": Units.LENGTH_INCHES,
-                      "deg" : Units.ANGLE_DEGREES,
-                      "°" : Units.ANGLE_DEGREES,
-                      "rad" : Units.ANGLE_RADIANS,
+                      "steps": "NATIVE",
+                      "m": "LENGTH_METRES",
+                      "cm": "LENGTH_CENTIMETRES",
+                      "mm": "LENGTH_MILLIMETRES",
+                      "µm": "LENGTH_MICROMETRES",
+                      "nm": "LENGTH_NANOMETRES",
+                      "inch": "LENGTH_INCHES",
+                      "deg" : "ANGLE_DEGREES",
+                      "°" : "ANGLE_DEGREES",
+                      "rad" : "ANGLE_RADIANS",
                     }
                     
                     
@@ -135,13 +148,18 @@ def get_GUIparameter(self, parameter):
         
         self.do_reach_position = parameter["Reach position"]
         
-        self.unit = self.unit_types[parameter["Unit"]]
+        self.unit_type = self.unit_types[parameter["Unit"]]
         
         self.units = [parameter["Unit"]] 
         
         
     def connect(self):
-    
+
+        from zaber_motion import Library, Units
+        from zaber_motion.ascii import Connection
+
+        self.unit = getattr(Units, self.unit_type)
+
         # We store the database in public SweepMe! folder "DataDevices"
         # The database is contacted once and then the data is stored locally
         db_store = self.get_folder("DATADEVICES") + os.sep + self.driver_name
@@ -181,6 +199,10 @@ def connect(self):
         
 
     def disconnect(self):
+
+        if self.alert_subscription is not None:
+            self.alert_subscription.dispose()
+            self.alert_subscription = None
     
         connection_identifier = "Zaber_motion_%s" % self.port_string
         if connection_identifier in self.device_communication:
@@ -190,11 +212,17 @@ def disconnect(self):
 
         
     def initialize(self):
+
+        # the device sends an alert message once the axis is idle, so that there is no need to poll the axis status
+        self.comm_alert = self.axis.device.settings.get("comm.alert")
+        self.axis.device.settings.set("comm.alert", 1)
+        self.alert_subscription = self.connection.alert.subscribe(self.on_alert)
        
         self.axis.unpark()
        
         self.is_finding_reference = False
         if "WR" in self.axis.warnings.get_flags():
+            self.idle_event.clear()
             self.axis.home(wait_until_idle = False)
             self.is_finding_reference = True
 
@@ -202,7 +230,11 @@ def initialize(self):
     def deinitialize(self):
                 
         if self.go_home_after_run:       
+            self.idle_event.clear()
             self.axis.home(wait_until_idle = False) 
+
+        if self.comm_alert is not None:
+            self.axis.device.settings.set("comm.alert", self.comm_alert)
             
 
     def configure(self):
@@ -220,6 +252,7 @@ def unconfigure(self):
  
     def apply(self):
     
+        self.idle_event.clear()
         self.axis.move_absolute(float(self.value), unit = self.unit, wait_until_idle = False)
       
       
@@ -237,13 +270,24 @@ def call(self):
         
         
     def reach_position(self):
-    
-        i=0
-        while self.axis.is_busy():
-            i+=1
-            # print(i, "busy", self.axis.get_position(unit = self.unit))
-            time.sleep(0.05)
-    
+        """ waits until the axis is idle """
+
+        # Waiting for the event returns as soon as the alert message has arrived. The axis status is only requested
+        # with increasing intervals in case an alert message was missed, e.g. if the axis was idle already.
+        motion_wait.wait_until(
+            lambda: self.idle_event.is_set() or not self.axis.is_busy(),
+            timeout=self.move_timeout,
+            min_interval=0.05,
+            max_interval=1.0,
+            sleep=self.idle_event.wait,
+        )
+
+    def on_alert(self, alert):
+        """ called by the connection in a separate thread for each alert message, e.g. '!01 1 IDLE --' """
+
+        if alert.device_address == self.channel and alert.axis_number in (0, self.axis_id):
+            if alert.status == "IDLE":
+                self.idle_event.set()
 
         
  
\ No newline at end of file
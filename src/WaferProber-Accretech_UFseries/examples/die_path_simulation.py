@@ -0,0 +1,50 @@
+"""
+Offline comparison of die paths and per-die queries using the simulated prober of libs/prober_path.py.
+No prober or pysweepme installation is needed to run this example.
+"""
+
+import importlib.util
+import os
+
+import numpy as np
+
+# load the library from the libs folder of this driver
+library_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "libs", "prober_path.py")
+spec = importlib.util.spec_from_file_location("prober_path", library_path)
+prober_path = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(prober_path)
+
+# full wafer map: all dies of a 20 x 20 grid within a circle, listed column by column as e.g. exported from a map
+radius = 10
+dies = [
+    f"{x},{y}"
+    for x in range(-radius, radius)
+    for y in range(-radius, radius)
+    if (x + 0.5) ** 2 + (y + 0.5) ** 2 <= radius**2
+]
+np.random.default_rng(0).shuffle(dies)  # a random order such as a hand-picked list of dies
+
+# queries at each die without status cache: contact state three times, position twice, wafer id and die coordinate
+legacy_queries = ["contacted", "contacted", "contacted", "position", "position", "wafer_id", "die_coordinate"]
+
+# with status cache, the contact state and wafer id are known and position and die coordinate are requested once
+die_queries = ["position", "die_coordinate"]
+wafer_queries = ["contacted", "wafer_id"]
+
+print("Number of dies:", len(dies))
+print()
+print(f"{'Die path':<20}{'Cache':<8}{'Travel':>10}{'Queries':>10}{'Time in s':>12}")
+
+for die_path in prober_path.DIE_PATHS:
+    ordered_dies = prober_path.order_dies(dies, die_path)
+    for use_cache in [False, True]:
+        summary = prober_path.simulate_probing(
+            prober_path.SimulatedProber(),
+            ordered_dies,
+            die_queries if use_cache else legacy_queries,
+            wafer_queries if use_cache else None,
+            skip_adjacent_separation=use_cache,
+        )
+        print(
+            f"{die_path:<20}{use_cache!s:<8}{summary['travel']:>10}{summary['queries']:>10}{summary['time']:>12.1f}"
+        )
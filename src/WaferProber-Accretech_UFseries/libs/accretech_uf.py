@@ -241,10 +241,11 @@ def wait_until_status_byte(self, stb_success: int | tuple, timeout: float = 5.0)
         Returns:
             int: status byte
         """
-        # this is the name of the function calling acquire_status_byte
-        function_calling_name = inspect.stack()[1].function
-        now = datetime.now()  # current date and time
         if self._verbose:
+            # this is the name of the function calling wait_until_status_byte
+            # only the calling frame is accessed as inspect.stack() would collect the source context of all frames
+            function_calling_name = inspect.currentframe().f_back.f_code.co_name
+            now = datetime.now()  # current date and time
             print()
             print("-->", now.strftime("%H:%M:%S"), "Function:", function_calling_name)
 
@@ -266,11 +267,11 @@ def acquire_status_byte(self, timeout: float = 10.0) -> int:
         Returns:
             int: status byte
         """
-        # this is the name of the function calling acquire_status_byte
-        function_calling_name = inspect.stack()[1].function
-        if function_calling_name != "wait_until_status_byte" and function_calling_name != "acquire_status_byte":
-            now = datetime.now()  # current date and time
-            if self._verbose:
+        if self._verbose:
+            # this is the name of the function calling acquire_status_byte
+            function_calling_name = inspect.currentframe().f_back.f_code.co_name
+            if function_calling_name not in ("wait_until_status_byte", "acquire_status_byte"):
+                now = datetime.now()  # current date and time
                 print()
                 print("-->", now.strftime("%H:%M:%S"), "Function:", function_calling_name)
 
@@ -344,7 +345,7 @@ def query(self, cmd: str) -> str:
         return answer[len(cmd) :]
 
     def raise_error(self, stb: int) -> None:
-        function_calling_name = inspect.stack()[1].function
+        function_calling_name = inspect.currentframe().f_back.f_code.co_name
         stb_message = self.stb_codes[stb]
         msg = f"Accretech UF series function '{function_calling_name}' did not succeed: STB {stb} ('{stb_message}')"
         raise Exception(msg)
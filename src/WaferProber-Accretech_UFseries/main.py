@@ -48,6 +48,8 @@
 import os
 accretech_uf = imp.load_source("accretech_uf", os.path.dirname(os.path.abspath(__file__)) +
                                os.sep + r"libs\accretech_uf.py")
+prober_path = imp.load_source("prober_path", os.path.dirname(os.path.abspath(__file__)) +
+                              os.sep + "libs" + os.sep + "prober_path.py")
 
 # this is needed as a fallback solutions as pysweepme.UserInterface is not available for all 1.5.5 update versions
 try:
@@ -87,12 +89,15 @@ def __init__(self):
 
         self.verbosemode = True
 
+        self.die_path = "As defined"
+
     def set_GUIparameter(self):
 
         gui_parameter = {
             "SweepValueWafer": "Wafer table",
             "SweepValueDie": "Die table",
             "SweepValueSubsite": "Subsite table",
+            "Die path": prober_path.DIE_PATHS,
         }
         return gui_parameter
 
@@ -101,6 +106,7 @@ def get_GUIparameter(self, parameter):
         self.sweep_value_wafer = parameter["SweepValueWafer"]
         self.sweep_value_die = parameter["SweepValueDie"]
         self.sweep_value_subsite = parameter["SweepValueSubsite"]
+        self.die_path = parameter.get("Die path", "As defined")
 
     def get_probeplan(self, probeplan_path):
         # important function to retrieve the probe plan before the measurement starts,
@@ -125,7 +131,8 @@ def get_probeplan(self, probeplan_path):
 
         # Dies
         die_list = self.read_controlmap(probeplan_path)
-        dies = die_list
+        # dies are reordered to reduce the stage travel between consecutive dies
+        dies = prober_path.order_dies(die_list, self.die_path)
 
         # Subsites
         subsites = []  # Subsites cannot be defined via file or loaded from the wafer
@@ -255,6 +262,12 @@ def configure(self):
         # last absolute position
         self.last_position = (None, None)
 
+        # None as long as the contact state is unknown
+        self.is_contacted = None
+
+        # wafer id, position and die coordinate are only requested again after the wafer or die has changed
+        self.status_cache = prober_path.StatusCache()
+
     def unconfigure(self):
 
         # Chuck down
@@ -304,8 +317,7 @@ def apply(self):
             if wafer != self.last_wafer:
 
                 # We always separate if not already the case
-                if self.prober.is_chuck_contacted():
-                    self.prober.z_down()
+                self.z_down()
 
                 # this can be the case if only one wafer has to be tested or we reached the last one
                 if preload_wafer_str is None:
@@ -333,12 +345,17 @@ def apply(self):
                         # forwarded to the main chuck according to command "j3"
                         self.prober.preload_specified_wafer(*preload_wafer)
 
+                # a new wafer invalidates all status information
+                self.is_contacted = None
+                self.status_cache.invalidate()
+
             self.last_wafer = wafer
             self.last_wafer_str = wafer_str
 
-        self.last_wafer_id = self.prober.request_wafer_id()
+        if "wafer_id" not in self.status_cache:
+            self.print_status()
 
-        self.print_status()
+        self.last_wafer_id = self.status_cache.get("wafer_id", self.prober.request_wafer_id)
 
         # self.skip_die is handed over from the WaferProber module when the user clicks "Go to next die"
         if self.skip_die:
@@ -349,15 +366,15 @@ def apply(self):
             if die != self.last_die:
 
                 # We always separate if not already the case
-                if self.prober.is_chuck_contacted():
-                    self.prober.z_down()
+                self.z_down()
 
                 # In any case, the die must have changed, and we need to move to it
                 self.prober.move_specified_die(*die)  # die at index x,y
+                self.status_cache.invalidate("position", "die_coordinate")
 
                 # once we approach a die, we save the current absolute position at the start position of the die
                 # This position is then used to navigate to the correct position
-                self.current_die_position = self.prober.request_position()
+                self.current_die_position = self.status_cache.get("position", self.prober.request_position)
 
                 self.last_die = die
                 self.last_die_str = die_str
@@ -365,10 +382,6 @@ def apply(self):
 
         if subsite_str is not None:
 
-            # We always separate if not already the case
-            if self.prober.is_chuck_contacted():
-                self.prober.z_down()
-
             if subsite_str.startswith("A"):
                 # xy_subsite_pos is defined with respect to the initial start position of the die
                 # xy_move is the relative move from the current position to the next subsite position
@@ -389,21 +402,26 @@ def apply(self):
 
                 xy_move = np.array(new_sub) - np.array(self.last_sub)
 
-                self.prober.move_position(*xy_move)
+                if any(xy_move):
+                    # We always separate if not already the case
+                    self.z_down()
+
+                    self.prober.move_position(*xy_move)
+                    self.status_cache.invalidate("position")
 
                 self.last_sub_str = subsite_str
                 self.last_sub = new_sub
 
-        self.last_position = self.prober.request_position()
+        self.last_position = self.status_cache.get("position", self.prober.request_position)
 
-        self.die_x, self.die_y = self.prober.request_die_coordinate()
+        if "die_coordinate" not in self.status_cache:
+            self.die_x, self.die_y = self.status_cache.get("die_coordinate", self.prober.request_die_coordinate)
 
-        # We always get in contact if not done already
-        if not self.prober.is_chuck_contacted():
-            self.prober.z_up()
+            # Check whether dies are correct
+            self.print_die_info()
 
-        # Check whether dies are correct
-        self.print_die_info()
+        # We always get in contact if not done already
+        self.z_up()
 
     def call(self):
         return [
@@ -417,6 +435,26 @@ def call(self):
 
     # further convenience functions
 
+    def z_down(self):
+        """Separates the chuck if it is in contact. The contact state is only requested if unknown."""
+
+        if self.is_contacted is None:
+            self.is_contacted = self.prober.is_chuck_contacted()
+
+        if self.is_contacted:
+            self.prober.z_down()
+            self.is_contacted = False
+
+    def z_up(self):
+        """Contacts the chuck if it is separated. The contact state is only requested if unknown."""
+
+        if self.is_contacted is None:
+            self.is_contacted = self.prober.is_chuck_contacted()
+
+        if not self.is_contacted:
+            self.prober.z_up()
+            self.is_contacted = True
+
     def print_info(self):
 
         print()  # empty line for better readability
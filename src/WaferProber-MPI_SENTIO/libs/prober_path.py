@@ -0,0 +1,290 @@
+# This Device Class is published under the terms of the MIT License.
+# Required Third Party Libraries, which are included in the Device Class
+# package for convenience purposes, may have a different license. You can
+# find those in the corresponding folders or contact the maintainer.
+#
+# MIT License
+#
+# Copyright (c) 2022-2024 SweepMe! GmbH (sweep-me.net)
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+
+# SweepMe! driver library
+# Die path ordering, status caching and a simulated prober for the WaferProber drivers
+
+from __future__ import annotations
+
+from typing import Callable
+
+import numpy as np
+
+DIE_PATHS = ["As defined", "Serpentine", "Nearest neighbour"]
+"""Die path options that can be offered as GUI parameter."""
+
+
+def parse_die(die: str) -> tuple[int, int]:
+    """Return the x and y index of a die string such as '3,-2' or '3,-2#17'."""
+    x, y = die.split("#")[0].split(",")[:2]
+    return int(x), int(y)
+
+
+def is_adjacent(die: tuple[int, int] | None, other: tuple[int, int] | None) -> bool:
+    """Return True if both dies are identical or direct neighbours including diagonal neighbours."""
+    if die is None or other is None:
+        return False
+    return max(abs(die[0] - other[0]), abs(die[1] - other[1])) <= 1
+
+
+def serpentine_order(positions: np.ndarray) -> np.ndarray:
+    """Return the indices that sort the dies row by row with alternating x direction.
+
+    Args:
+        positions: Array of shape (n, 2) with x and y index of each die.
+
+    Returns:
+        Array of indices.
+    """
+    x, y = positions[:, 0], positions[:, 1]
+    row_number = np.unique(y, return_inverse=True)[1].ravel()
+    # x is reversed in every second row
+    x_direction = np.where(row_number % 2 == 0, x, -x)
+    return np.lexsort((x_direction, y))
+
+
+def nearest_neighbour_order(positions: np.ndarray) -> np.ndarray:
+    """Return the indices of a greedy nearest-neighbour path starting at the first die.
+
+    The distance is the larger of the x and y distance as both axes of the stage move at the same time. In case of
+    equal distances, the die with the smaller sum of x and y distance is taken.
+
+    Args:
+        positions: Array of shape (n, 2) with x and y index of each die.
+
+    Returns:
+        Array of indices.
+    """
+    number = len(positions)
+    order = np.zeros(number, dtype=int)
+    visited = np.zeros(number, dtype=bool)
+
+    current = 0
+    for i in range(number):
+        order[i] = current
+        visited[current] = True
+        if i == number - 1:
+            break
+        delta = np.abs(positions - positions[current])
+        distance = delta.max(axis=1) + 1e-3 * delta.sum(axis=1)
+        distance[visited] = np.inf
+        current = int(np.argmin(distance))
+
+    return order
+
+
+def order_dies(dies: list[str], die_path: str = "As defined") -> list[str]:
+    """Return the die strings reordered according to the given die path.
+
+    Args:
+        dies: List of die strings, e.g. ['0,0', '1,0'] or ['0,0#0', '1,0#1'].
+        die_path: One of DIE_PATHS.
+
+    Returns:
+        List of die strings.
+    """
+    if die_path not in DIE_PATHS:
+        msg = f"Die path '{die_path}' unknown. Use one of {DIE_PATHS}."
+        raise ValueError(msg)
+
+    if die_path == "As defined" or len(dies) < 3:
+        return list(dies)
+
+    positions = np.array([parse_die(die) for die in dies], dtype=int)
+
+    if die_path == "Serpentine":
+        order = serpentine_order(positions)
+    else:
+        order = nearest_neighbour_order(positions)
+
+    return [dies[i] for i in order]
+
+
+def path_travel(dies: list[str]) -> int:
+    """Return the stage travel of a die path in die pitches, using the larger of x and y distance of each step."""
+    if len(dies) < 2:
+        return 0
+    positions = np.array([parse_die(die) for die in dies], dtype=int)
+    return int(np.abs(np.diff(positions, axis=0)).max(axis=1).sum())
+
+
+class StatusCache:
+    """Values requested from the prober that remain valid until the stage moves or the wafer changes."""
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._values: dict[str, object] = {}
+
+    def __contains__(self, key: str) -> bool:
+        """Return True if a value is cached for the key."""
+        return key in self._values
+
+    def get(self, key: str, request: Callable[[], object]) -> object:
+        """Return the cached value or call request to retrieve and cache it."""
+        if key not in self._values:
+            self._values[key] = request()
+        return self._values[key]
+
+    def set(self, key: str, value: object) -> None:
+        """Store a value that is known without a request."""
+        self._values[key] = value
+
+    def invalidate(self, *keys: str) -> None:
+        """Remove the given keys or all values if no key is given."""
+        if not keys:
+            self._values.clear()
+        for key in keys:
+            self._values.pop(key, None)
+
+
+class SimulatedProber:
+    """Prober model that accumulates motion time and counts queries without any hardware.
+
+    It is used to compare die paths and the number of queries per die offline.
+    """
+
+    def __init__(
+        self,
+        die_pitch: tuple[float, float] = (5000.0, 5000.0),
+        velocity: float = 50000.0,
+        step_overhead: float = 0.05,
+        z_time: float = 0.3,
+        separation_time: float = 0.5,
+        query_time: float = 0.02,
+    ) -> None:
+        """Initialize the prober model.
+
+        Args:
+            die_pitch: Die size in x and y in µm.
+            velocity: Stage velocity in µm/s.
+            step_overhead: Time in s for acceleration and settling of each die step.
+            z_time: Time in s to move the chuck between contact and separation.
+            separation_time: Time in s to move the positioners to separation height.
+            query_time: Time in s of a single query.
+        """
+        self.die_pitch = die_pitch
+        self.velocity = velocity
+        self.step_overhead = step_overhead
+        self.z_time = z_time
+        self.separation_time = separation_time
+        self.query_time = query_time
+
+        self.die: tuple[int, int] | None = None
+        self.contacted = False
+
+        self.motion_time = 0.0
+        self.travel = 0
+        self.steps = 0
+        self.separations = 0
+        self.queries: dict[str, int] = {}
+
+    @property
+    def total_time(self) -> float:
+        """Time in s needed for all motions and queries."""
+        return self.motion_time + self.query_time * sum(self.queries.values())
+
+    def move_die(self, x: int, y: int) -> None:
+        """Move the stage to the die with index x, y."""
+        if self.die is not None and self.die != (x, y):
+            dx, dy = abs(x - self.die[0]), abs(y - self.die[1])
+            self.motion_time += self.step_overhead
+            self.motion_time += max(dx * self.die_pitch[0], dy * self.die_pitch[1]) / self.velocity
+            self.travel += max(dx, dy)
+            self.steps += 1
+        self.die = (x, y)
+
+    def z_up(self) -> None:
+        """Move the chuck to contact."""
+        if not self.contacted:
+            self.motion_time += self.z_time
+            self.contacted = True
+
+    def z_down(self) -> None:
+        """Move the chuck to separation."""
+        if self.contacted:
+            self.motion_time += self.z_time
+            self.contacted = False
+
+    def move_separation(self) -> None:
+        """Move the positioners to separation height."""
+        self.motion_time += self.separation_time
+        self.separations += 1
+
+    def query(self, name: str) -> None:
+        """Count a query such as 'position' or 'wafer_id'."""
+        self.queries[name] = self.queries.get(name, 0) + 1
+
+    def summary(self) -> dict[str, float]:
+        """Return travel, number of steps, separations and queries as well as the total time."""
+        return {
+            "travel": self.travel,
+            "steps": self.steps,
+            "separations": self.separations,
+            "queries": sum(self.queries.values()),
+            "time": self.total_time,
+        }
+
+
+def simulate_probing(
+    prober: SimulatedProber,
+    dies: list[str],
+    die_queries: list[str],
+    wafer_queries: list[str] | None = None,
+    skip_adjacent_separation: bool = True,
+) -> dict[str, float]:
+    """Step through all dies of a wafer with the simulated prober and return its summary.
+
+    Args:
+        prober: SimulatedProber instance.
+        dies: List of die strings in the order they are probed.
+        die_queries: Names of the queries run at each die, e.g. ['position', 'die_coordinate'].
+        wafer_queries: Names of the queries that are only run once per wafer because their result is cached.
+        skip_adjacent_separation: If True, the positioners are not moved to separation height between adjacent dies.
+
+    Returns:
+        Dictionary of the prober summary.
+    """
+    for name in wafer_queries or []:
+        prober.query(name)
+
+    for die in dies:
+        position = parse_die(die)
+
+        if not (skip_adjacent_separation and is_adjacent(prober.die, position)):
+            prober.move_separation()
+
+        prober.z_down()
+        prober.move_die(*position)
+
+        for name in die_queries:
+            prober.query(name)
+
+        prober.z_up()
+
+    return prober.summary()
@@ -38,9 +38,11 @@
 addFolderToPATH()
 
 import sentio
+import prober_path
 import importlib
 
 importlib.reload(sentio)
+importlib.reload(prober_path)
 
 
 class Device(EmptyDevice):
@@ -50,6 +52,10 @@ class Device(EmptyDevice):
     <li>This driver can communicate with MPI wafer probers through TCPIP and GPIB protocols. However,
     TCPIP is recommended, as the driver retrieves the probe plan at the beginning of the measurement, and due to slower
     data transfer rate of GPIB, this may take a long time.</li>
+    <li>Die path: The dies of the probe plan can be reordered row by row ('Serpentine') or always to the closest
+    remaining die ('Nearest neighbour') to reduce the stage travel.</li>
+    <li>Positioner separation: With 'Non-adjacent dies', the SiPh positioners are only moved to separation height
+    if the next die is not a direct neighbour of the current die. Make sure your setup allows this.</li>
     </ul>
     """
 
@@ -80,7 +86,10 @@ def set_GUIparameter(self):
             "Light at contact": ["As is", "On", "Off"],
             "Light at separation": ["As is", "On", "Off"],
             "": None,
-            "End position": ['None', 'Home', 'Center']
+            "End position": ['None', 'Home', 'Center'],
+            " ": None,
+            "Die path": prober_path.DIE_PATHS,
+            "Positioner separation": ["Every step", "Non-adjacent dies"],
         }
         return gui_parameter
 
@@ -90,6 +99,8 @@ def get_GUIparameter(self, parameter):
         self.is_light_contact = parameter["Light at contact"]
         self.is_light_separation = parameter["Light at separation"]
         self.end_position = parameter["End position"]
+        self.die_path = parameter.get("Die path", "As defined")
+        self.skip_adjacent_separation = parameter.get("Positioner separation", "Every step") == "Non-adjacent dies"
 
         if not (self.port_string.startswith("TCPIP") or self.port_string.startswith("GPIB")):
             self.port_manager = False
@@ -112,6 +123,9 @@ def get_probeplan(self):
             dies.append("%s,%s#%s" % (x, y, i))
             # dies.append("%s" % i)
 
+        # dies are reordered to reduce the stage travel, the die index after '#' is kept for stepping
+        dies = prober_path.order_dies(dies, self.die_path)
+
         subsites = []
         for i in range(0, self.prober.map_subsite_get_num()):
             subsites.append("%s" % i)
@@ -187,6 +201,10 @@ def configure(self):
 
         self.prober.move_chuck_separation()
 
+        self.last_die_index = None
+        self.last_die_position = None
+        self.last_subsite_index = None
+
         if self.is_light_contact == "On":
             self.prober.light_off_at_contact(False)
         elif self.is_light_contact == "Off":
@@ -214,13 +232,27 @@ def apply(self):
             self.subsite_index = None
         else:
             self.subsite_index = int(self.sweepvalues["Subsite"])
-        
-        self.prober.siph_move_separation("West")
-        self.prober.siph_move_separation("East")
+
+        die_position = prober_path.parse_die(self.sweepvalues["Die"])
+
+        # positioners only need to be separated for large steps
+        if not (self.skip_adjacent_separation and prober_path.is_adjacent(self.last_die_position, die_position)):
+            self.prober.siph_move_separation("West")
+            self.prober.siph_move_separation("East")
         self.prober.move_chuck_separation()
 
         # moving to new die and subsite
-        self.die_x, self.die_y, _ = self.prober.map_step_die_seq(self.die_index, self.subsite_index)
+        if self.die_index != self.last_die_index:
+            subsite_index = "" if self.subsite_index is None else self.subsite_index
+            self.die_x, self.die_y, _ = self.prober.map_step_die_seq(self.die_index, subsite_index)
+        elif self.subsite_index is not None and self.subsite_index != self.last_subsite_index:
+            # only the subsite changes on the current die
+            self.die_x, self.die_y, _ = self.prober.map_subsite_step(self.subsite_index)
+
+        self.last_die_index = self.die_index
+        self.last_die_position = die_position
+        self.last_subsite_index = self.subsite_index
+
         self.prober.move_chuck_contact()
 
     def call(self):
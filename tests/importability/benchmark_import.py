@@ -0,0 +1,161 @@
+"""Measure how long importing instrument drivers takes and how much memory it costs.
+
+Every driver is imported in a fresh python process, so that libraries already imported by other drivers do not
+distort the result. With `--sequence`, all given drivers are additionally imported one after another in a single
+process to show which libraries are shared between drivers and only loaded once.
+
+Usage:
+    From the root of the repository, call
+
+    `python ./tests/importability/benchmark_import.py [<driver-name> ...] [--sequence] [--json <file>]`
+
+    Without driver names, all drivers in the src directory are benchmarked.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import math
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+
+# Driver name and reason for skipping
+SKIPPED_DRIVERS = {
+    "Switch-FTDI_FTD2xx": "Driver requires installed manufacturer software",
+}
+
+# same port strings as in import_driver.py, as there is no universal port string that works for all devices
+PORT_STRINGS = ["", "USB", "0"]
+
+
+def load_driver(driver_name: str) -> dict:
+    """Import a driver via pysweepme and measure the duration and the increase of the resident memory.
+
+    Args:
+        driver_name: Name (folder) of the driver to import.
+
+    Returns:
+        Dictionary with the driver name, the import time in s, the memory increase in MB, and an error message.
+    """
+    import psutil
+    import pysweepme
+
+    process = psutil.Process()
+    rss_start = process.memory_info().rss
+    time_start = time.perf_counter()
+
+    error = ""
+    for port_string in PORT_STRINGS:
+        try:
+            pysweepme.get_driver(driver_name, folder="src", port_string=port_string)
+            error = ""
+            break
+        except Exception as e:  # noqa: BLE001
+            error = f"{type(e).__name__}: {e}"
+
+    return {
+        "driver": driver_name,
+        "time": time.perf_counter() - time_start,
+        "memory": (process.memory_info().rss - rss_start) / 1e6,
+        "error": error,
+    }
+
+
+def run_worker(driver_names: list[str]) -> None:
+    """Import the drivers one after another in the current process and print the results as json.
+
+    Args:
+        driver_names: Names (folders) of the drivers to import.
+    """
+    time_start = time.perf_counter()
+    import pysweepme  # noqa: F401
+
+    results = [{"driver": "pysweepme", "time": time.perf_counter() - time_start, "memory": 0.0, "error": ""}]
+    results.extend(load_driver(driver_name) for driver_name in driver_names)
+
+    print(json.dumps(results))  # noqa: T201
+
+
+def benchmark(driver_names: list[str]) -> list[dict]:
+    """Import the drivers in a new python process and return the measured results.
+
+    Args:
+        driver_names: Names (folders) of the drivers to import in the same process.
+
+    Returns:
+        List of result dictionaries, starting with the import of pysweepme itself.
+    """
+    completed = subprocess.run(  # noqa: S603
+        [sys.executable, __file__, "--worker", *driver_names],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    try:
+        # drivers might print to stdout themselves, so the json is taken from the last line
+        return json.loads(completed.stdout.strip().splitlines()[-1])
+    except (IndexError, json.JSONDecodeError):
+        error = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "No result"
+        return [{"driver": name, "time": float("nan"), "memory": float("nan"), "error": error} for name in driver_names]
+
+
+def print_table(title: str, results: list[dict]) -> None:
+    """Print the results sorted by import time.
+
+    Args:
+        title: Headline of the table.
+        results: List of result dictionaries.
+    """
+    print(f"\n{title}")  # noqa: T201
+    print(f"{'Driver':<50} {'Time in s':>10} {'Memory in MB':>13}  Error")  # noqa: T201
+    # failed imports have no valid time and are listed last
+    for result in sorted(results, key=lambda r: -r["time"] if not math.isnan(r["time"]) else math.inf):
+        print(  # noqa: T201
+            f"{result['driver']:<50} {result['time']:>10.3f} {result['memory']:>13.1f}  {result['error']}",
+        )
+
+
+def main() -> None:
+    """Parse the command line arguments and benchmark the drivers."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("drivers", nargs="*", help="Names of the drivers, default: all drivers in src")
+    parser.add_argument("--sequence", action="store_true", help="Also import all drivers in one process")
+    parser.add_argument("--json", type=Path, help="File to store the results as json")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.drivers)
+        return
+
+    driver_names = args.drivers or sorted(path.name for path in Path("src").iterdir() if (path / "main.py").exists())
+    for driver_name in driver_names:
+        if driver_name in SKIPPED_DRIVERS:
+            logging.info(f"Skipped {driver_name}. Reason: {SKIPPED_DRIVERS[driver_name]}")
+    driver_names = [name for name in driver_names if name not in SKIPPED_DRIVERS]
+
+    # every driver in its own process, the first entry is the import of pysweepme itself and not of interest here
+    isolated = []
+    for driver_name in driver_names:
+        result = benchmark([driver_name])[-1]
+        logging.info(f"{driver_name}: {result['time']:.3f} s")
+        isolated.append(result)
+    print_table("Import of each driver in a new process", isolated)
+
+    sequence = []
+    if args.sequence:
+        sequence = benchmark(driver_names)
+        print_table("Import of all drivers in one process", sequence)
+
+    if args.json:
+        args.json.write_text(json.dumps({"isolated": isolated, "sequence": sequence}, indent=4))
+
+
+if __name__ == "__main__":
+    main()
@@ -51,7 +51,6 @@ def is_compatible(driver_name: str) -> bool:
 
 # Driver name and reason for skipping
 SKIPPED_DRIVERS = {
-    "Logger-MCC_DAQ": "Driver requires installed manufacturer software",
     "Switch-FTDI_FTD2xx": "Driver requires installed manufacturer software",
 }
 